@@ -8,23 +8,28 @@ Simple is Great. Stability is Alpha.
 import asyncio
 import time
 from datetime import datetime
-import pandas as pd
-import ccxt
+try:
+    import ccxt.pro as ccxt_async  # async REST + watch_* push streams
+except ImportError:
+    import ccxt.async_support as ccxt_async
 
 from config_center import config
 from signals.harvester import SignalHarvester
 from execution.executor import GodbrainExecutor
+from execution.account_state import AccountState
 from engines.decision_engine import DecisionEngine
+from engines.symbol_pipeline import SymbolPipeline
 from ultimate_pack.ultimate_connector import UltimateConnector
 from ultimate_pack.filters.signal_filter import SignalFilter
+from ultimate_pack.feeds.candle_store import CandleStore
 
 # Initialize Components
 harvester = SignalHarvester()
-ultimate_brain = UltimateConnector()
+ultimate_brain = UltimateConnector(config.TRADING_PAIRS)
 signal_filters = {symbol: SignalFilter() for symbol in config.TRADING_PAIRS}
 
-# Exchange Setup
-okx = ccxt.okx({
+# Exchange Setup (async client: fetches never block the event loop)
+okx = ccxt_async.okx({
     "apiKey": config.OKX_KEY,
     "secret": config.OKX_SECRET,
     "password": config.OKX_PASS,
@@ -32,7 +37,9 @@ okx = ccxt.okx({
     "options": {"defaultType": "swap"}
 }) if config.OKX_KEY else None
 
-executor = GodbrainExecutor(okx)
+# Local balance / ticker / market snapshot: orders are sized without REST calls
+account = AccountState(okx) if okx else None
+executor = GodbrainExecutor(okx, account=account)
 
 # Edge AI Integration
 def get_edge_ai_enrichment(payload: dict) -> dict:
@@ -54,7 +61,8 @@ HEARTBEAT = {
     "boot_time": time.time(),
     "last_success": 0.0,
     "error_count": 0,
-    "total_loops": 0
+    "total_loops": 0,
+    "stage_timings": {}
 }
 
 async def health_check(request):
@@ -65,6 +73,7 @@ async def health_check(request):
         "last_success_ts": HEARTBEAT["last_success"],
         "error_count": HEARTBEAT["error_count"],
         "total_loops": HEARTBEAT["total_loops"],
+        "stage_timings": HEARTBEAT["stage_timings"],
         "version": "5.0-Stabilized"
     }
     return web.json_response(data)
@@ -86,6 +95,15 @@ async def main_loop():
     
     # Initialize Ultimate Pack
     await ultimate_brain.initialize()
+
+    # Account state streams + leverage, before the first signal
+    if account:
+        try:
+            await account.start(config.TRADING_PAIRS)
+            if config.APEX_LIVE:
+                await executor.warm_up(config.TRADING_PAIRS)
+        except Exception as ae:
+            print(f"[INIT] Account state start failed: {ae}")
     
     # Decision Engine Config
     decision_engine = DecisionEngine(
@@ -95,20 +113,25 @@ async def main_loop():
     )
 
 # Initialize Redis Connection
-    import redis
+    from infrastructure.redis_pool import get_async_redis
     redis_client = None
     try:
-        redis_client = redis.Redis(
+        redis_client = get_async_redis(
+            "agg",
             host=config.REDIS_HOST,
             port=config.REDIS_PORT,
             password=config.REDIS_PASS,
-            decode_responses=True,
-            socket_timeout=5
         )
         print(f"[INIT] Redis connected: {config.REDIS_HOST}:{config.REDIS_PORT}")
     except Exception as re:
         print(f"[INIT] Redis connection failed: {re}")
 
+    # Candle rings: after the first cycle only new/updated 1h bars are fetched
+    pipeline = SymbolPipeline(
+        okx, decision_engine, executor, signal_filters,
+        candles=CandleStore(capacity=100), account=account
+    )
+
     HEARTBEAT["status"] = "OK"
 
     while True:
@@ -116,87 +139,54 @@ async def main_loop():
         HEARTBEAT["total_loops"] += 1
         try:
             # 1) Refresh Signals
+            signals_start = time.perf_counter()
             harvester.refresh_dna()
             voltran_factor, voltran_score, rank = harvester.get_voltran_factor()
-            
-            # 2) Fetch Balance & Equity
-            equity_usd = 1000.0 # Fallback
-            per_coin_equity = 1000.0
-            if okx:
-                try:
-                    balance = okx.fetch_balance()
-                    equity_usd = float(balance["total"].get("USDT", 1000.0))
-                    free_usdt = float(balance["free"].get("USDT", 0))
-                    
-                    # CRITICAL: Divide equity among trading pairs to avoid margin conflicts
-                    num_pairs = len(config.TRADING_PAIRS) or 1
-                    per_coin_equity = equity_usd / num_pairs
-                    print(f"[LOOP] 💰 Equity Split: ${equity_usd:.0f} / {num_pairs} pairs = ${per_coin_equity:.0f}/coin")
-                    
-                    # 2.1) Persist to Redis for Mobile App
-                    if redis_client:
-                        try:
-                            import json
-                            snapshot = {
-                                "equity": equity_usd,
-                                "pnl": per_coin_equity, # Simplified P&L tracking
-                                "voltran_score": voltran_score,
-                                "dna_generation": 7060, # Fallback until real genetics link is confirmed
-                                "timestamp": time.time(),
-                                "status": HEARTBEAT["status"]
-                            }
-                            redis_client.set("state:voltran:snapshot", json.dumps(snapshot))
-                            redis_client.set("state:equity:live", str(equity_usd))
-                        except Exception as rex:
-                            print(f"[LOOP] Redis write error: {rex}")
-                        
-                except Exception as be:
-                    print(f"[LOOP] ⚠️ Balance fetch error: {be}")
-                    HEARTBEAT["error_count"] += 1
-
-            # 3) Process Symbols
-            for symbol in config.TRADING_PAIRS:
-                try:
-                    # Fetch OHLCV
-                    ohlcv_raw = []
-                    if okx:
-                        try:
-                            ohlcv_raw = okx.fetch_ohlcv(symbol, "1h", limit=100)
-                        except Exception as oe:
-                            print(f"[{symbol}] ⚠️ OHLCV fetch error: {oe}")
-                            HEARTBEAT["error_count"] += 1
-                            continue
-                            
-                    if not ohlcv_raw: continue
-                    
-                    df = pd.DataFrame(ohlcv_raw, columns=["timestamp", "open", "high", "low", "close", "vol"])
-                    
-                    # Run Decision Engine
-                    result = await decision_engine.run_symbol_cycle(
-                        symbol=symbol,
-                        equity_usd=equity_usd,
-                        per_coin_equity=per_coin_equity,
-                        ohlcv=df,
-                        voltran_factor=voltran_factor,
-                        voltran_score=voltran_score,
-                        signal_filter=signal_filters[symbol]
-                    )
-
-                    if not result: continue
-
-                    # Log & Execution
-                    if result["type"] == "execute":
-                        print(f"[{datetime.now().strftime('%H:%M:%S')}] {result['status_line']}\n  {result['log_msg']}")
-                        
-                        # Edge AI Enrichment
-                        enriched_payload = get_edge_ai_enrichment(result.get("extras", {}))
-                        
-                        # Live Trade
-                        await executor.execute_trade(symbol, result["raw_action"], result["size_usd"])
-
-                except Exception as sym_e:
-                    print(f"[{symbol}] ❌ Symbol Processing Error: {sym_e}")
-                    HEARTBEAT["error_count"] += 1
+            signals_elapsed = time.perf_counter() - signals_start
+
+            # 2) Balance, OHLCV, decisions and execution for all pairs at once
+            report = await pipeline.run_cycle(config.TRADING_PAIRS, voltran_factor, voltran_score)
+            equity_usd = report.equity_usd
+            per_coin_equity = report.per_coin_equity
+
+            for key, error in report.errors.items():
+                print(f"[{key}] ⚠️ {error}")
+            HEARTBEAT["error_count"] += len(report.errors)
+
+            if report.balance:
+                num_pairs = len(config.TRADING_PAIRS) or 1
+                print(f"[LOOP] 💰 Equity Split: ${equity_usd:.0f} / {num_pairs} pairs = ${per_coin_equity:.0f}/coin")
+
+                # 2.1) Persist to Redis for Mobile App
+                if redis_client:
+                    try:
+                        import json
+                        snapshot = {
+                            "equity": equity_usd,
+                            "pnl": per_coin_equity, # Simplified P&L tracking
+                            "voltran_score": voltran_score,
+                            "dna_generation": 7060, # Fallback until real genetics link is confirmed
+                            "timestamp": time.time(),
+                            "status": HEARTBEAT["status"]
+                        }
+                        pipe = redis_client.pipeline(transaction=False)
+                        pipe.set("state:voltran:snapshot", json.dumps(snapshot))
+                        pipe.set("state:equity:live", str(equity_usd))
+                        await pipe.execute()
+                    except Exception as rex:
+                        print(f"[LOOP] Redis write error: {rex}")
+
+            # 3) Log executed decisions
+            for symbol, result in report.decisions.items():
+                if result["type"] == "execute":
+                    print(f"[{datetime.now().strftime('%H:%M:%S')}] {result['status_line']}\n  {result['log_msg']}")
+
+                    # Edge AI Enrichment
+                    enriched_payload = get_edge_ai_enrichment(result.get("extras", {}))
+
+            timings = {"signals": signals_elapsed, **report.stages}
+            HEARTBEAT["stage_timings"] = {k: round(v, 3) for k, v in timings.items()}
+            print("[LOOP] ⏱️ " + " | ".join(f"{k}: {v:.2f}s" for k, v in timings.items()))
 
             HEARTBEAT["last_success"] = time.time()
 
@@ -210,8 +200,17 @@ async def main_loop():
         wait_time = max(5, 60 - elapsed)
         await asyncio.sleep(wait_time)
 
+async def run():
+    try:
+        await main_loop()
+    finally:
+        if account:
+            await account.stop()
+        if okx:
+            await okx.close()
+
 if __name__ == "__main__":
     try:
-        asyncio.run(main_loop())
+        asyncio.run(run())
     except KeyboardInterrupt:
         print("\n[BYE] Godbrain resting.")
@@ -30,6 +30,8 @@ import asyncio
 import warnings
 import os
 
+from .vault_index import Cursor, GenomeVaultIndex
+
 warnings.filterwarnings('ignore')
 
 # Redis configuration
@@ -38,7 +40,7 @@ REDIS_PORT = int(os.getenv('REDIS_PORT', '16379'))
 REDIS_PASS = os.getenv('REDIS_PASS', 'voltran2024')
 
 try:
-    import redis
+    from infrastructure.redis_pool import get_redis
     HAS_REDIS = True
 except ImportError:
     HAS_REDIS = False
@@ -135,13 +137,13 @@ class ContinuousLabInterface:
         self.redis = None
         if HAS_REDIS:
             try:
-                self.redis = redis.Redis(
-                    host=REDIS_HOST, 
+                self.redis = get_redis(
+                    "anomaly_hunter",
+                    host=REDIS_HOST,
                     port=REDIS_PORT,
                     password=REDIS_PASS,
-                    decode_responses=True
+                    check=True,
                 )
-                self.redis.ping()
             except:
                 self.redis = None
         
@@ -151,6 +153,7 @@ class ContinuousLabInterface:
         self.vault_path = self.root / "quantum_lab" / "godbrain_core" / "vault"
         self.wisdom_path = self.root / "quantum_lab" / "wisdom"
         self._last_generation = 0
+        self.index = GenomeVaultIndex(self.vault_path)
     
     def get_current_generation(self) -> int:
         """Get current generation count from live lab."""
@@ -211,70 +214,41 @@ class ContinuousLabInterface:
             time.sleep(1)
     
     def get_genomes_range(self, start_gen: int, end_gen: int) -> List[Dict]:
-        """Get genomes in generation range."""
-        genomes = []
-        
-        if self.vault_path.exists():
-            for f in self.vault_path.glob("genome_*.json"):
-                try:
-                    with open(f, encoding='utf-8') as fp:
-                        g = json.load(fp)
-                        gen = g.get("generation", 0)
-                        if start_gen <= gen <= end_gen:
-                            genomes.append(g)
-                except:
-                    continue
-        
-        return sorted(genomes, key=lambda x: x.get("generation", 0))
-    
-    def get_all_metrics(self) -> pd.DataFrame:
-        """Get all metrics from all genomes as DataFrame."""
+        """Get genomes in generation range (only the matching files are read)."""
         genomes = []
         
-        # Read from evolution_log.jsonl
-        evolution_log = self.vault_path / "evolution_log.jsonl"
-        if evolution_log.exists():
+        self.index.refresh()
+        for f in self.index.genome_files(start_gen, end_gen):
             try:
-                with open(evolution_log, encoding='utf-8') as f:
-                    for line in f:
-                        try:
-                            g = json.loads(line.strip())
-                            genomes.append({
-                                "generation": g.get("generation", 0),
-                                "f_stab": g.get("f_stab", 0),
-                                "f_energy": g.get("f_energy", 0),
-                                "lineage_depth": g.get("lineage_depth", 0),
-                                "timestamp": g.get("timestamp", ""),
-                                "alive": g.get("alive", True),
-                            })
-                        except:
-                            continue
+                with open(f, encoding='utf-8') as fp:
+                    genomes.append(json.load(fp))
             except:
-                pass
-        
-        # Also try individual genome files
-        if self.vault_path.exists():
-            for f in self.vault_path.glob("genome_*.json"):
-                try:
-                    with open(f, encoding='utf-8') as fp:
-                        g = json.load(fp)
-                        genomes.append({
-                            "generation": g.get("generation", 0),
-                            "f_stab": g.get("f_stab", g.get("fitness", {}).get("f_stab", 0)),
-                            "f_energy": g.get("f_energy", g.get("fitness", {}).get("f_energy", 0)),
-                            "lineage_depth": g.get("lineage_depth", 0),
-                            "timestamp": g.get("timestamp", ""),
-                        })
-                except:
-                    continue
-        
-        if not genomes:
-            return pd.DataFrame(columns=["generation", "f_stab", "f_energy", "lineage_depth"])
+                continue
         
-        return pd.DataFrame(genomes).sort_values("generation")
+        return genomes
+    
+    def get_all_metrics(self) -> pd.DataFrame:
+        """
+        Get all metrics (evolution_log.jsonl + genome files) as DataFrame.
+        Served from the vault index; only records added since the last call
+        are parsed. timestamp is epoch seconds.
+        """
+        try:
+            self.index.refresh()
+        except OSError as e:
+            print(f"[ANOMALY] Vault index refresh failed: {e}")
+        return self.index.metrics_frame()
+    
+    def get_new_metrics(self, cursor: Cursor = (0, 0, 0, 0)) -> Tuple[pd.DataFrame, Cursor]:
+        """Metrics indexed since `cursor` plus the cursor to pass next time."""
+        try:
+            self.index.refresh()
+        except OSError as e:
+            print(f"[ANOMALY] Vault index refresh failed: {e}")
+        return self.index.metrics_since(cursor)
 
 
 # Import AnomalyHunter for convenient access
 from .hunter import AnomalyHunter
 
-__all__ = ['AnomalyType', 'NobelPotential', 'Anomaly', 'ContinuousLabInterface', 'AnomalyHunter']
+__all__ = ['AnomalyType', 'NobelPotential', 'Anomaly', 'ContinuousLabInterface', 'GenomeVaultIndex', 'AnomalyHunter']
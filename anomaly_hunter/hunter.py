@@ -26,6 +26,7 @@ from .detectors import (
     SymmetryBreakingDetector,
     EntropyReversalDetector,
 )
+from .streaming import StreamingDetectorSet, replay
 
 
 class AnomalyHunter:
@@ -50,6 +51,10 @@ class AnomalyHunter:
         
         self.anomalies: List[Anomaly] = []
         self.scan_count = 0
+        
+        # Incremental path used by monitor(): only new rows are processed
+        self.stream = StreamingDetectorSet()
+        self._cursor = (0, 0, 0, 0)
     
     def scan(self) -> List[Anomaly]:
         """Perform one-time scan of all available data."""
@@ -95,6 +100,34 @@ class AnomalyHunter:
         
         return found_anomalies
     
+    def scan_incremental(self) -> List[Anomaly]:
+        """Feed only metrics added since the last call to the streaming detectors."""
+        df, self._cursor = self.lab.get_new_metrics(self._cursor)
+        if df.empty:
+            return []
+        
+        found_anomalies = self.stream.update(df)
+        print(f"📊 +{len(df)} records ({self.stream.history.n} total), {len(found_anomalies)} new anomalies")
+        
+        self.anomalies.extend(found_anomalies)
+        self.scan_count += 1
+        self._save_discoveries(found_anomalies)
+        if found_anomalies:
+            self._print_summary(found_anomalies)
+        return found_anomalies
+    
+    def replay(self, batch_size: int = 1000) -> dict:
+        """Offline check: replay full history through the streaming detectors vs batch."""
+        report = replay(self.lab.get_all_metrics(), batch_size)
+        for name, result in report.items():
+            if name != "_timing":
+                mark = "✓" if result["match"] else "✗"
+                print(f"  {mark} {name}: streaming={result['streaming']} batch={result['batch']}")
+        timing = report["_timing"]
+        print(f"  {timing['rows']} rows in {timing['batches']} batches: "
+              f"streaming {timing['streaming_seconds']:.3f}s, batch {timing['batch_seconds']:.3f}s")
+        return report
+    
     async def monitor(self, interval_seconds: int = 300):
         """Continuously monitor for anomalies."""
         print("╔══════════════════════════════════════════════════════════════════╗")
@@ -110,7 +143,7 @@ class AnomalyHunter:
             if current_gen > last_gen:
                 print(f"\n[{datetime.now().strftime('%H:%M:%S')}] Gen {last_gen} → {current_gen}")
                 
-                anomalies = self.scan()
+                anomalies = self.scan_incremental()
                 
                 for anomaly in anomalies:
                     yield anomaly
@@ -176,5 +209,7 @@ if __name__ == "__main__":
     import sys
     if len(sys.argv) > 1 and sys.argv[1] == "--monitor":
         asyncio.run(monitor())
+    elif len(sys.argv) > 1 and sys.argv[1] == "--replay":
+        AnomalyHunter().replay()
     else:
         main()
@@ -0,0 +1,325 @@
+# -*- coding: utf-8 -*-
+"""
+GODBRAIN ANOMALY HUNTER - Vault Index
+Append-only columnar metrics store over the Physics Lab genome vault.
+
+The vault grows forever (evolution_log.jsonl + one genome_*.json per
+genome); re-reading it on every scan does not scale. The index lives in
+<vault>/.index and is brought up to date incrementally:
+
+    - evolution_log.jsonl is tailed from a saved byte offset
+    - genome files are listed only when the vault directory changed, and
+      only files not seen before are parsed
+
+Each metric column is a flat binary file read back with np.memmap. Genome
+files additionally keep their file name so a generation range resolves to
+exactly the files to load.
+
+The index assumes a single writer (the hunter process); readers only need
+the vault itself.
+"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+METRIC_COLUMNS = {
+    "generation": "<i8",
+    "f_stab": "<f8",
+    "f_energy": "<f8",
+    "lineage_depth": "<i8",
+    "alive": "u1",
+    "timestamp": "<f8",     # epoch seconds, NaN when the record has none
+}
+
+# (log rows, genome rows, log rebuilds, genome rebuilds)
+Cursor = Tuple[int, int, int, int]
+
+
+def _epoch(value) -> float:
+    if value is None or value == "":
+        return np.nan
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        pass
+    try:
+        return datetime.fromisoformat(str(value)).timestamp()
+    except ValueError:
+        return np.nan
+
+
+def _log_row(g: Dict) -> tuple:
+    return (
+        int(g.get("generation", 0)),
+        float(g.get("f_stab", 0) or 0),
+        float(g.get("f_energy", 0) or 0),
+        int(g.get("lineage_depth", 0) or 0),
+        1 if g.get("alive", True) else 0,
+        _epoch(g.get("timestamp")),
+    )
+
+
+def _genome_row(g: Dict) -> tuple:
+    fitness = g.get("fitness", {}) or {}
+    return (
+        int(g.get("generation", 0)),
+        float(g.get("f_stab", fitness.get("f_stab", 0)) or 0),
+        float(g.get("f_energy", fitness.get("f_energy", 0)) or 0),
+        int(g.get("lineage_depth", 0) or 0),
+        1 if g.get("alive", True) else 0,
+        _epoch(g.get("timestamp")),
+    )
+
+
+class ColumnStore:
+    """Fixed set of columns, one append-only binary file per column."""
+
+    def __init__(self, path: Path, columns: Dict[str, str]):
+        self.path = Path(path)
+        self.columns = {name: np.dtype(dt) for name, dt in columns.items()}
+        self.rows = 0
+
+    def _file(self, name: str) -> Path:
+        return self.path / f"{name}.bin"
+
+    def open(self, rows: int) -> None:
+        """Adopt `rows` committed rows, dropping anything written after the last commit."""
+        self.path.mkdir(parents=True, exist_ok=True)
+        for name, dt in self.columns.items():
+            f = self._file(name)
+            size = f.stat().st_size if f.exists() else 0
+            if size > rows * dt.itemsize:
+                with open(f, "r+b") as fh:
+                    fh.truncate(rows * dt.itemsize)
+            elif size < rows * dt.itemsize:
+                rows = size // dt.itemsize        # lost a tail: shrink to what's there
+        self.rows = rows
+
+    def append(self, rows: List[tuple]) -> None:
+        if not rows:
+            return
+        cols = list(zip(*rows))
+        for (name, dt), values in zip(self.columns.items(), cols):
+            with open(self._file(name), "ab") as fh:
+                fh.write(np.asarray(values, dtype=dt).tobytes())
+        self.rows += len(rows)
+
+    def column(self, name: str) -> np.ndarray:
+        """Read-only memory map of a column (empty array when there are no rows)."""
+        dt = self.columns[name]
+        if self.rows == 0:
+            return np.empty(0, dtype=dt)
+        return np.memmap(self._file(name), dtype=dt, mode="r", shape=(self.rows,))
+
+    def clear(self) -> None:
+        for name in self.columns:
+            self._file(name).unlink(missing_ok=True)
+        self.rows = 0
+
+
+class GenomeVaultIndex:
+    """
+    Incremental index of a genome vault.
+
+    Usage:
+        index = GenomeVaultIndex(vault_path)
+        index.refresh()
+        df = index.metrics_frame()
+        files = index.genome_files(1000, 2000)
+    """
+
+    LOG_NAME = "evolution_log.jsonl"
+    GENOME_GLOB = "genome_*.json"
+
+    def __init__(self, vault_path: Path, index_path: Optional[Path] = None):
+        self.vault_path = Path(vault_path)
+        self.index_path = Path(index_path) if index_path else self.vault_path / ".index"
+        self.log = ColumnStore(self.index_path / "log", METRIC_COLUMNS)
+        self.genomes = ColumnStore(self.index_path / "genomes", METRIC_COLUMNS)
+        self._names_file = self.index_path / "genomes" / "names.txt"
+        self._state_file = self.index_path / "state.json"
+        self.state = {"log_offset": 0, "log_rows": 0, "genome_rows": 0, "dir_mtime_ns": 0,
+                      "log_rebuilds": 0, "genome_rebuilds": 0}
+        self._names: List[str] = []
+        self._known: set = set()
+        self._order: Optional[np.ndarray] = None     # genome rows sorted by generation
+        self._opened = False
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _open(self) -> bool:
+        """Load (or create) the index; False when there is no vault to index."""
+        if self._opened:
+            return True
+        if not self.vault_path.exists():
+            return False
+        if self._state_file.exists():
+            try:
+                self.state.update(json.loads(self._state_file.read_text(encoding="utf-8")))
+            except (OSError, ValueError):
+                pass
+        self.log.open(self.state["log_rows"])
+        self.genomes.open(self.state["genome_rows"])
+        if self.log.rows != self.state["log_rows"]:
+            # Column files lost rows the offset already covers: re-tail the log
+            self._clear_log()
+        if self._names_file.exists():
+            self._names = self._names_file.read_text(encoding="utf-8").splitlines()[:self.genomes.rows]
+        if len(self._names) != self.genomes.rows:
+            self.genomes.clear()
+            self._names = []
+            self.state["dir_mtime_ns"] = 0
+            self.state["genome_rebuilds"] += 1
+        with open(self._names_file, "w", encoding="utf-8") as fh:
+            fh.write("".join(n + "\n" for n in self._names))
+        self._known = set(self._names)
+        self._opened = True
+        self._commit()
+        return True
+
+    def _commit(self) -> None:
+        """Columns are written first; the state file makes them visible."""
+        self.state["log_rows"] = self.log.rows
+        self.state["genome_rows"] = self.genomes.rows
+        tmp = self._state_file.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.state), encoding="utf-8")
+        os.replace(tmp, self._state_file)
+
+    # ------------------------------------------------------------------
+    # Incremental update
+    # ------------------------------------------------------------------
+
+    def refresh(self) -> int:
+        """Index whatever the vault gained since the last call; returns new rows."""
+        if not self._open():
+            return 0
+        added = self._tail_log() + self._scan_genomes()
+        if added:
+            self._commit()
+        return added
+
+    def _tail_log(self) -> int:
+        path = self.vault_path / self.LOG_NAME
+        if not path.exists():
+            return 0
+        size = path.stat().st_size
+        if size < self.state["log_offset"]:
+            # Log was rotated or truncated: rebuild from its start
+            self._clear_log()
+        if size == self.state["log_offset"]:
+            return 0
+
+        with open(path, "rb") as fh:
+            fh.seek(self.state["log_offset"])
+            chunk = fh.read(size - self.state["log_offset"])
+        end = chunk.rfind(b"\n") + 1          # leave a half-written last line for next time
+        rows = []
+        for line in chunk[:end].splitlines():
+            try:
+                rows.append(_log_row(json.loads(line)))
+            except (ValueError, TypeError, AttributeError):
+                continue
+        self.log.append(rows)
+        self.state["log_offset"] += end
+        return len(rows)
+
+    def _clear_log(self) -> None:
+        """Drop the log columns; the rebuild count invalidates old cursors."""
+        self.log.clear()
+        self.state["log_offset"] = 0
+        self.state["log_rebuilds"] += 1
+
+    def _scan_genomes(self) -> int:
+        mtime = self.vault_path.stat().st_mtime_ns
+        if mtime == self.state["dir_mtime_ns"]:
+            return 0
+        new = []
+        with os.scandir(self.vault_path) as it:
+            for entry in it:
+                name = entry.name
+                if name.startswith("genome_") and name.endswith(".json") and name not in self._known:
+                    new.append(name)
+        rows, names = [], []
+        for name in sorted(new):
+            try:
+                with open(self.vault_path / name, encoding="utf-8") as fp:
+                    rows.append(_genome_row(json.load(fp)))
+                names.append(name)
+            except (OSError, ValueError, TypeError, AttributeError):
+                continue            # possibly still being written; retried on the next change
+        if rows:
+            self.genomes.append(rows)
+            with open(self._names_file, "a", encoding="utf-8") as fh:
+                fh.write("".join(n + "\n" for n in names))
+            self._names.extend(names)
+            self._known.update(names)
+            self._order = None
+        if len(rows) == len(new):
+            self.state["dir_mtime_ns"] = mtime
+        return len(rows)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def metrics_frame(self) -> pd.DataFrame:
+        """All indexed metrics (log records, then genome files) sorted by generation."""
+        frames = []
+        for store in (self.log, self.genomes) if self._open() else ():
+            if store.rows:
+                cols = {name: store.column(name) for name in store.columns}
+                cols["alive"] = cols["alive"].astype(bool)
+                frames.append(pd.DataFrame(cols))
+        if not frames:
+            return pd.DataFrame(columns=list(METRIC_COLUMNS))
+        return pd.concat(frames, ignore_index=True).sort_values("generation", kind="stable")
+
+    def metrics_since(self, cursor: Cursor = (0, 0, 0, 0)) -> Tuple[pd.DataFrame, Cursor]:
+        """
+        Rows indexed after `cursor` (log rows, genome rows, log rebuilds,
+        genome rebuilds) and the new cursor, for consumers that only want
+        what is new. A store rebuilt since the cursor is returned whole.
+        """
+        if not self._open():
+            return pd.DataFrame(columns=list(METRIC_COLUMNS)), cursor
+        log_rows, genome_rows, log_rebuilds, genome_rebuilds = cursor
+        frames = []
+        for store, since, rebuilds, key in (
+            (self.log, log_rows, log_rebuilds, "log_rebuilds"),
+            (self.genomes, genome_rows, genome_rebuilds, "genome_rebuilds"),
+        ):
+            if rebuilds != self.state[key] or since > store.rows:
+                since = 0
+            if store.rows > since:
+                cols = {name: np.array(store.column(name)[since:]) for name in store.columns}
+                cols["alive"] = cols["alive"].astype(bool)
+                frames.append(pd.DataFrame(cols))
+        new_cursor = (self.log.rows, self.genomes.rows,
+                      self.state["log_rebuilds"], self.state["genome_rebuilds"])
+        if not frames:
+            return pd.DataFrame(columns=list(METRIC_COLUMNS)), new_cursor
+        df = pd.concat(frames, ignore_index=True).sort_values("generation", kind="stable")
+        return df.reset_index(drop=True), new_cursor
+
+    def genome_files(self, start_gen: int, end_gen: int) -> List[Path]:
+        """Genome files with start_gen <= generation <= end_gen, in generation order."""
+        if not self._open() or not self.genomes.rows:
+            return []
+        gens = self.genomes.column("generation")
+        if self._order is None or len(self._order) != len(gens):
+            self._order = np.argsort(gens, kind="stable")
+        sorted_gens = gens[self._order]
+        lo = np.searchsorted(sorted_gens, start_gen, side="left")
+        hi = np.searchsorted(sorted_gens, end_gen, side="right")
+        return [self.vault_path / self._names[i] for i in self._order[lo:hi]]
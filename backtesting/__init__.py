@@ -4,6 +4,7 @@ GODBRAIN Institutional Backtesting Framework
 Features:
 - Multi-exchange historical data (Binance, OKX, Bybit)
 - Realistic execution modeling (fees, slippage)
+- Vectorized bar mode for long multi-symbol runs
 - Institutional metrics (Sharpe, Sortino, VaR, CVaR)
 - Walk-forward optimization (anti-overfitting)
 - GODBRAIN DNA/genetics integration
@@ -19,8 +20,9 @@ Usage:
     print(result.summary())
 """
 
-from .engine import BacktestEngine, BacktestConfig, BacktestResult, Strategy, BacktestContext
+from .engine import BacktestEngine, BacktestConfig, BacktestResult, Strategy, BacktestContext, BarArrays
 from .data_manager import HistoricalDataManager
+from .ohlcv_store import OHLCVStore
 from .metrics import MetricsCalculator
 from .walk_forward import WalkForwardOptimizer, WalkForwardConfig, WalkForwardResult
 from .strategies import GODBRAINStrategy
@@ -30,8 +32,10 @@ __all__ = [
     'BacktestConfig',
     'BacktestResult',
     'BacktestContext',
+    'BarArrays',
     'Strategy',
     'HistoricalDataManager',
+    'OHLCVStore',
     'MetricsCalculator',
     'WalkForwardOptimizer',
     'WalkForwardConfig',
@@ -7,11 +7,13 @@ import os
 import asyncio
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import List, Dict, Optional
 import json
 
+from .ohlcv_store import OHLCVStore, _to_ms
+
 # Try to import ccxt, fallback if not available
 try:
     import ccxt.async_support as ccxt
@@ -30,8 +32,8 @@ class HistoricalDataManager:
     - Multiple timeframes (1m, 5m, 15m, 1h, 4h, 1d)
     - Automatic gap detection and filling
     - Data validation and cleaning
-    - Efficient storage (Parquet format)
-    - Caching for fast access
+    - Partitioned, memory-mapped storage (OHLCVStore) shared across processes
+    - Incremental sync: only the missing tail is downloaded
     
     Usage:
         dm = HistoricalDataManager()
@@ -47,7 +49,7 @@ class HistoricalDataManager:
     def __init__(self, data_dir: str = None):
         self.data_dir = Path(data_dir or os.getenv("GODBRAIN_DATA_DIR", "data/historical"))
         self.data_dir.mkdir(parents=True, exist_ok=True)
-        self.cache: Dict[str, pd.DataFrame] = {}
+        self.store = OHLCVStore(self.data_dir / "store")
         self._exchanges: Dict[str, object] = {}
     
     async def _get_exchange(self, exchange_name: str):
@@ -73,28 +75,41 @@ class HistoricalDataManager:
         progress_callback: callable = None
     ) -> pd.DataFrame:
         """
-        Download historical OHLCV data.
+        Download historical OHLCV data into the store.
+        
+        If the store already covers ``start_date``, fetching resumes at
+        the last stored candle, which is re-downloaded in case it was still
+        open when stored. Naive datetimes are taken as UTC, like the store.
         
         Args:
             symbol: Trading pair (e.g., "BTC/USDT")
             exchange: Exchange name (binance, okx, bybit)
             timeframe: Candle timeframe (1m, 5m, 15m, 1h, 4h, 1d)
             start_date: Start datetime
-            end_date: End datetime (default: now)
+            end_date: End datetime (default: now, UTC)
             progress_callback: Optional callback for progress updates
         
         Returns:
-            DataFrame with columns: timestamp, open, high, low, close, volume
+            DataFrame indexed by timestamp with columns: open, high, low, close, volume
         """
-        end_date = end_date or datetime.now()
-        ex = await self._get_exchange(exchange)
+        end_date = end_date or datetime.now(timezone.utc)
         
         all_candles = []
-        current = int(start_date.timestamp() * 1000)
-        end_ts = int(end_date.timestamp() * 1000)
+        current = _to_ms(start_date)
+        end_ts = _to_ms(end_date)
         
         # Timeframe to milliseconds
         tf_ms = self._timeframe_to_ms(timeframe)
+        
+        # Resume from the stored tail instead of re-downloading the range
+        bounds = self.store.bounds(symbol, timeframe, exchange)
+        if bounds and bounds[0] <= current:
+            current = max(current, bounds[1])
+        
+        if current >= end_ts:
+            return self.store.read_frame(symbol, timeframe, start_date, end_date, exchange)
+        
+        ex = await self._get_exchange(exchange)
         total_candles = (end_ts - current) // tf_ms
         downloaded = 0
         
@@ -128,28 +143,13 @@ class HistoricalDataManager:
                 await asyncio.sleep(5)
         
         await ex.close()
+        self._exchanges.pop(exchange, None)
         
-        # Create DataFrame
-        df = pd.DataFrame(
-            all_candles,
-            columns=['timestamp', 'open', 'high', 'low', 'close', 'volume']
-        )
-        
-        # Convert timestamp to datetime
-        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-        df.set_index('timestamp', inplace=True)
-        
-        # Remove duplicates
-        df = df[~df.index.duplicated(keep='first')]
-        
-        # Sort by timestamp
-        df.sort_index(inplace=True)
-        
-        # Save to disk
-        self._save_data(df, symbol, exchange, timeframe)
+        # Merge into the store; the refetched last bar replaces the stored one
+        written = self.store.write(symbol, timeframe, all_candles, exchange)
         
-        print(f"[DATA] Downloaded {len(df)} candles")
-        return df
+        print(f"[DATA] Downloaded {len(all_candles)} candles, {written} new")
+        return self.store.read_frame(symbol, timeframe, start_date, end_date, exchange)
     
     def _timeframe_to_ms(self, tf: str) -> int:
         """Convert timeframe string to milliseconds."""
@@ -163,15 +163,30 @@ class HistoricalDataManager:
         return value * multipliers[unit]
     
     def _get_file_path(self, symbol: str, exchange: str, timeframe: str) -> Path:
-        """Get file path for data storage."""
+        """Get legacy single-file Parquet path."""
         safe_symbol = symbol.replace("/", "_")
         return self.data_dir / f"{exchange}_{safe_symbol}_{timeframe}.parquet"
     
-    def _save_data(self, df: pd.DataFrame, symbol: str, exchange: str, timeframe: str):
-        """Save data to Parquet file."""
+    def _import_legacy(self, symbol: str, exchange: str, timeframe: str) -> bool:
+        """Move a legacy whole-range Parquet file into the store once."""
+        if self.store.partitions(symbol, timeframe, exchange):
+            return False
+        
         path = self._get_file_path(symbol, exchange, timeframe)
-        df.to_parquet(path)
-        print(f"[DATA] Saved to {path}")
+        if not path.exists():
+            return False
+        
+        self.store.write(symbol, timeframe, pd.read_parquet(path), exchange)
+        print(f"[DATA] Imported {path} into store")
+        return True
+    
+    def _covers(self, symbol: str, exchange: str, timeframe: str,
+                start_date: datetime, end_date: datetime) -> bool:
+        """Whether the store holds the full requested range."""
+        bounds = self.store.bounds(symbol, timeframe, exchange)
+        if bounds is None:
+            return False
+        return bounds[0] <= _to_ms(start_date) and bounds[1] >= _to_ms(end_date)
     
     async def load(
         self,
@@ -194,28 +209,13 @@ class HistoricalDataManager:
         Returns:
             DataFrame with OHLCV data
         """
-        cache_key = f"{exchange}_{symbol}_{timeframe}"
-        
-        # Check cache
-        if cache_key in self.cache:
-            df = self.cache[cache_key]
-            return df[(df.index >= start_date) & (df.index <= end_date)]
-        
-        # Try to load from file
-        path = self._get_file_path(symbol, exchange, timeframe)
+        self._import_legacy(symbol, exchange, timeframe)
         
-        if path.exists():
-            df = pd.read_parquet(path)
-            
-            # Check if we have data for requested range
-            if df.index.min() <= start_date and df.index.max() >= end_date:
-                self.cache[cache_key] = df
-                return df[(df.index >= start_date) & (df.index <= end_date)]
+        if not self._covers(symbol, exchange, timeframe, start_date, end_date):
+            # Fetches only what is missing after the stored tail
+            await self.download(symbol, exchange, timeframe, start_date, end_date)
         
-        # Download missing data
-        df = await self.download(symbol, exchange, timeframe, start_date, end_date)
-        self.cache[cache_key] = df
-        return df[(df.index >= start_date) & (df.index <= end_date)]
+        return self.store.read_frame(symbol, timeframe, start_date, end_date, exchange)
     
     def load_sync(
         self,
@@ -230,13 +230,12 @@ class HistoricalDataManager:
         
         Returns None if data not available.
         """
-        path = self._get_file_path(symbol, exchange, timeframe)
+        self._import_legacy(symbol, exchange, timeframe)
         
-        if not path.exists():
+        if not self.store.partitions(symbol, timeframe, exchange):
             return None
         
-        df = pd.read_parquet(path)
-        return df[(df.index >= start_date) & (df.index <= end_date)]
+        return self.store.read_frame(symbol, timeframe, start_date, end_date, exchange)
     
     def validate_data(self, df: pd.DataFrame) -> Dict:
         """
@@ -279,29 +278,8 @@ class HistoricalDataManager:
         return results
     
     def list_available_data(self) -> List[Dict]:
-        """List all available data files."""
-        files = list(self.data_dir.glob("*.parquet"))
-        result = []
-        
-        for f in files:
-            parts = f.stem.split("_")
-            if len(parts) >= 3:
-                exchange = parts[0]
-                timeframe = parts[-1]
-                symbol = "_".join(parts[1:-1]).replace("_", "/")
-                
-                df = pd.read_parquet(f)
-                result.append({
-                    'exchange': exchange,
-                    'symbol': symbol,
-                    'timeframe': timeframe,
-                    'rows': len(df),
-                    'start': df.index.min(),
-                    'end': df.index.max(),
-                    'file': str(f)
-                })
-        
-        return result
+        """List all series available in the store."""
+        return self.store.list_series()
     
     async def sync_all(
         self,
@@ -318,7 +296,7 @@ class HistoricalDataManager:
                     try:
                         await self.download(
                             symbol, exchange, timeframe,
-                            start_date, datetime.now()
+                            start_date, datetime.now(timezone.utc)
                         )
                     except Exception as e:
                         print(f"[SYNC] Error: {e}")
@@ -13,6 +13,7 @@ from abc import ABC, abstractmethod
 from .models.trade import Trade, TradeType
 from .models.position import Position
 from .metrics import MetricsCalculator
+from .indicators import IndicatorStore
 from .utils.fee_models import TieredFeeModel
 from .utils.slippage_models import VolumeSlippageModel
 
@@ -44,6 +45,9 @@ class BacktestConfig:
     # Data
     timeframe: str = "1h"
     
+    # Engine
+    engine_mode: str = "event"      # event, vectorized
+    
     # Leverage
     use_leverage: bool = True
     max_leverage: int = 10
@@ -65,6 +69,48 @@ class BacktestState:
     current_drawdown: float = 0.0
 
 
+@dataclass
+class BarArrays:
+    """
+    OHLCV data for all symbols as aligned NumPy matrices.
+    
+    Each field is shaped (n_symbols, n_bars) and indexed by
+    ``rows[symbol]`` and the bar position in ``index``.
+    """
+    
+    index: pd.Index
+    symbols: List[str]
+    rows: Dict[str, int]
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    
+    FIELDS = ('open', 'high', 'low', 'close', 'volume')
+    
+    @classmethod
+    def from_frames(cls, data: Dict[str, pd.DataFrame], index: pd.Index) -> 'BarArrays':
+        """Align every symbol frame on ``index`` and stack its columns."""
+        symbols = list(data.keys())
+        n_bars = len(index)
+        matrices = {name: np.full((len(symbols), n_bars), np.nan) for name in cls.FIELDS}
+        
+        for row, symbol in enumerate(symbols):
+            df = data[symbol]
+            positions = df.index.get_indexer(index)
+            for name in cls.FIELDS:
+                if name in df.columns:
+                    matrices[name][row] = df[name].to_numpy(dtype=np.float64)[positions]
+        
+        return cls(
+            index=index,
+            symbols=symbols,
+            rows={symbol: row for row, symbol in enumerate(symbols)},
+            **matrices
+        )
+
+
 class Strategy(ABC):
     """
     Abstract base class for trading strategies.
@@ -109,6 +155,7 @@ class BacktestContext:
         self.data = data
         self.state = state
         self.config = config
+        self.indicators = IndicatorStore(data)
         self._current_idx = 0
     
     @property
@@ -138,56 +185,22 @@ class BacktestContext:
     
     def get_indicator(self, symbol: str, indicator: str, **kwargs) -> pd.Series:
         """
-        Calculate and return indicator values.
+        Return indicator values up to the current bar.
         
         Supported: sma, ema, rsi, macd, bbands, atr
-        """
-        df = self.get_ohlcv(symbol, lookback=kwargs.get('period', 14) * 3)
-        
-        if indicator == 'sma':
-            return df['close'].rolling(kwargs['period']).mean()
-        
-        elif indicator == 'ema':
-            return df['close'].ewm(span=kwargs['period']).mean()
-        
-        elif indicator == 'rsi':
-            delta = df['close'].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(kwargs['period']).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(kwargs['period']).mean()
-            rs = gain / loss
-            return 100 - (100 / (1 + rs))
-        
-        elif indicator == 'atr':
-            high = df['high']
-            low = df['low']
-            close = df['close'].shift(1)
-            tr = pd.concat([
-                high - low,
-                (high - close).abs(),
-                (low - close).abs()
-            ], axis=1).max(axis=1)
-            return tr.rolling(kwargs['period']).mean()
-        
-        elif indicator == 'macd':
-            fast = df['close'].ewm(span=kwargs.get('fast', 12)).mean()
-            slow = df['close'].ewm(span=kwargs.get('slow', 26)).mean()
-            macd = fast - slow
-            signal = macd.ewm(span=kwargs.get('signal', 9)).mean()
-            return pd.DataFrame({'macd': macd, 'signal': signal, 'histogram': macd - signal})
-        
-        elif indicator == 'bbands':
-            period = kwargs.get('period', 20)
-            std = kwargs.get('std', 2)
-            sma = df['close'].rolling(period).mean()
-            rolling_std = df['close'].rolling(period).std()
-            return pd.DataFrame({
-                'upper': sma + (rolling_std * std),
-                'middle': sma,
-                'lower': sma - (rolling_std * std)
-            })
         
-        else:
-            raise ValueError(f"Unknown indicator: {indicator}")
+        Indicators are computed once over the full series by the
+        IndicatorStore; each call returns a view of the same lookback
+        window (period * 3) of the cached result. The series' warm-up
+        rows are NaN; later windows carry full-history values throughout.
+        The window is read-only: mutating it (``fillna(inplace=True)``,
+        element assignment) raises, or copies under pandas copy-on-write,
+        and never reaches the cache; ``.copy()`` it to edit.
+        """
+        values = self.indicators.get(symbol, indicator, **kwargs)
+        lookback = kwargs.get('period', 14) * 3
+        start_idx = max(0, self._current_idx - lookback)
+        return values.iloc[start_idx:self._current_idx + 1]
 
 
 class BacktestEngine:
@@ -200,6 +213,7 @@ class BacktestEngine:
     - Stop-loss and take-profit handling
     - Equity curve tracking
     - Drawdown monitoring
+    - Vectorized mode (engine_mode="vectorized") using BarArrays
     """
     
     def __init__(self, config: BacktestConfig):
@@ -207,6 +221,8 @@ class BacktestEngine:
         self.data: Dict[str, pd.DataFrame] = {}
         self.strategy: Optional[Strategy] = None
         self.state: Optional[BacktestState] = None
+        self.bars: Optional[BarArrays] = None
+        self._bar_idx = 0
         self.metrics_calc = MetricsCalculator()
         
         # Fee and slippage models
@@ -255,6 +271,9 @@ class BacktestEngine:
         if not self.data:
             raise ValueError("No data loaded")
         
+        if self.config.engine_mode not in ("event", "vectorized"):
+            raise ValueError(f"Unknown engine mode: {self.config.engine_mode}")
+        
         # Initialize state
         self.state = BacktestState(
             cash=self.config.initial_capital,
@@ -270,6 +289,11 @@ class BacktestEngine:
             else:
                 common_index = common_index.intersection(df.index)
         
+        # Vectorized mode: build symbol x bar arrays once, index by position
+        self.bars = None
+        if self.config.engine_mode == "vectorized":
+            self.bars = BarArrays.from_frames(self.data, common_index)
+        
         context = BacktestContext(self.data, self.state, self.config)
         self.strategy.init(context)
         
@@ -278,6 +302,7 @@ class BacktestEngine:
         # Main loop
         for i, timestamp in enumerate(common_index):
             context._current_idx = i
+            self._bar_idx = i
             self.state.timestamp = timestamp
             
             self._update_equity()
@@ -305,13 +330,20 @@ class BacktestEngine:
         
         return self._calculate_results()
     
+    def _current_price(self, symbol: str) -> float:
+        """Close price of symbol at the current bar."""
+        if self.bars is not None:
+            return self.bars.close[self.bars.rows[symbol], self._bar_idx]
+        
+        idx = self.data[symbol].index.get_loc(self.state.timestamp)
+        return self.data[symbol].iloc[idx]['close']
+    
     def _update_equity(self) -> None:
         """Update equity based on positions."""
         position_value = 0.0
         
         for symbol, position in self.state.positions.items():
-            idx = self.data[symbol].index.get_loc(self.state.timestamp)
-            current_price = self.data[symbol].iloc[idx]['close']
+            current_price = self._current_price(symbol)
             pnl = (current_price - position.entry_price) * position.size
             if position.side == 'short':
                 pnl = -pnl
@@ -344,8 +376,7 @@ class BacktestEngine:
         if symbol in self.state.positions:
             return
         
-        idx = self.data[symbol].index.get_loc(self.state.timestamp)
-        current_price = self.data[symbol].iloc[idx]['close']
+        current_price = self._current_price(symbol)
         
         size_pct = min(signal.get('size', 0.1), self.config.max_position_pct)
         position_value = self.state.equity * size_pct
@@ -386,8 +417,7 @@ class BacktestEngine:
             return
         
         position = self.state.positions[symbol]
-        idx = self.data[symbol].index.get_loc(self.state.timestamp)
-        current_price = self.data[symbol].iloc[idx]['close']
+        current_price = self._current_price(symbol)
         
         exit_side = 'sell' if position.side == 'long' else 'buy'
         slippage = self.slippage_model.calculate(current_price, position.size * current_price, exit_side)
@@ -421,8 +451,7 @@ class BacktestEngine:
         to_close = []
         
         for symbol, position in self.state.positions.items():
-            idx = self.data[symbol].index.get_loc(self.state.timestamp)
-            current_price = self.data[symbol].iloc[idx]['close']
+            current_price = self._current_price(symbol)
             
             if position.stop_loss:
                 if position.side == 'long' and current_price <= position.stop_loss:
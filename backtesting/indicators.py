@@ -0,0 +1,204 @@
+"""
+GODBRAIN Indicator Store
+Computes each indicator once over the full series and serves per-bar views.
+"""
+
+import time
+from typing import Dict, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+
+IndicatorValue = Union[pd.Series, pd.DataFrame]
+
+
+def compute_indicator(df: pd.DataFrame, indicator: str, **kwargs) -> IndicatorValue:
+    """
+    Calculate indicator over an OHLCV frame.
+
+    Supported: sma, ema, rsi, macd, bbands, atr
+    """
+    if indicator == 'sma':
+        return df['close'].rolling(kwargs['period']).mean()
+
+    elif indicator == 'ema':
+        return df['close'].ewm(span=kwargs['period']).mean()
+
+    elif indicator == 'rsi':
+        delta = df['close'].diff()
+        gain = (delta.where(delta > 0, 0)).rolling(kwargs['period']).mean()
+        loss = (-delta.where(delta < 0, 0)).rolling(kwargs['period']).mean()
+        rs = gain / loss
+        return 100 - (100 / (1 + rs))
+
+    elif indicator == 'atr':
+        high = df['high']
+        low = df['low']
+        close = df['close'].shift(1)
+        tr = pd.concat([
+            high - low,
+            (high - close).abs(),
+            (low - close).abs()
+        ], axis=1).max(axis=1)
+        return tr.rolling(kwargs['period']).mean()
+
+    elif indicator == 'macd':
+        fast = df['close'].ewm(span=kwargs.get('fast', 12)).mean()
+        slow = df['close'].ewm(span=kwargs.get('slow', 26)).mean()
+        macd = fast - slow
+        signal = macd.ewm(span=kwargs.get('signal', 9)).mean()
+        return pd.DataFrame({'macd': macd, 'signal': signal, 'histogram': macd - signal})
+
+    elif indicator == 'bbands':
+        period = kwargs.get('period', 20)
+        std = kwargs.get('std', 2)
+        sma = df['close'].rolling(period).mean()
+        rolling_std = df['close'].rolling(period).std()
+        return pd.DataFrame({
+            'upper': sma + (rolling_std * std),
+            'middle': sma,
+            'lower': sma - (rolling_std * std)
+        })
+
+    else:
+        raise ValueError(f"Unknown indicator: {indicator}")
+
+
+def warmup_bars(indicator: str, **kwargs) -> int:
+    """
+    Leading rows a rolling indicator leaves NaN on a fresh frame.
+
+    IndicatorStore masks these rows once per cached series, so views
+    into it never need a masked copy.
+
+    RSI's first value on a fresh frame averages only period - 1 deltas, so
+    that row counts as warm-up too. EWM-based indicators (ema, macd) emit
+    a value from the first bar.
+    """
+    if indicator == 'rsi':
+        return kwargs['period']
+    if indicator in ('sma', 'atr'):
+        return kwargs['period'] - 1
+    if indicator == 'bbands':
+        return kwargs.get('period', 20) - 1
+    return 0
+
+
+def _freeze(value: IndicatorValue) -> IndicatorValue:
+    """Same values, index and labels on a read-only float64 array."""
+    values = value.to_numpy(dtype=np.float64, copy=True)
+    values.flags.writeable = False
+    if isinstance(value, pd.Series):
+        return pd.Series(values, index=value.index, name=value.name, copy=False)
+    return pd.DataFrame(values, index=value.index, columns=value.columns, copy=False)
+
+
+class IndicatorStore:
+    """
+    Per-(symbol, indicator, params) indicator cache.
+
+    Every indicator is causal (rolling / EWM), so computing it once over
+    the whole series gives the same value at bar i as recomputing it on
+    bars [0..i]. The series' own warm-up rows (see warmup_bars) are
+    masked to NaN once, when the key is first computed, so the head of
+    the series reads as on a fresh frame and callers can slice views.
+    Cached values sit on read-only arrays: a write through a view raises
+    (or, with pandas copy-on-write, copies) instead of corrupting the
+    cache for every later bar and strategy.
+    Rolling indicators (sma, rsi, atr, bbands) match the old
+    trailing-window recomputation at every bar past the window's warm-up;
+    EWM-based ones (ema, macd) are no longer truncated to the lookback
+    window.
+
+    Usage:
+        store = IndicatorStore(data)
+        rsi = store.get("BTC/USDT", "rsi", period=14)   # full series
+    """
+
+    def __init__(self, data: Dict[str, pd.DataFrame]):
+        self.data = data
+        self._cache: Dict[Tuple, IndicatorValue] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(symbol: str, indicator: str, kwargs: Dict) -> Tuple:
+        return (symbol, indicator, tuple(sorted(kwargs.items())))
+
+    def get(self, symbol: str, indicator: str, **kwargs) -> IndicatorValue:
+        """Return the full-series indicator, computing it on first use."""
+        key = self._key(symbol, indicator, kwargs)
+
+        value = self._cache.get(key)
+        if value is None:
+            self.misses += 1
+            value = compute_indicator(self.data[symbol], indicator, **kwargs)
+            warmup = warmup_bars(indicator, **kwargs)
+            if warmup:
+                value.iloc[:warmup] = np.nan
+            value = _freeze(value)
+            self._cache[key] = value
+        else:
+            self.hits += 1
+
+        return value
+
+    def clear(self) -> None:
+        """Drop all cached indicators (e.g. after data changes)."""
+        self._cache.clear()
+
+
+def _benchmark(n_bars: int = 100_000, legacy_bars: int = 5_000) -> Dict[str, float]:
+    """
+    Bars/sec of the RSI+ATR lookups GODBRAINStrategy makes per bar.
+
+    The legacy path (recompute on a trailing window every bar) is timed on
+    the first ``legacy_bars`` bars only; it is far too slow for 100k.
+    """
+    from .engine import BacktestConfig, BacktestContext, BacktestState
+    from datetime import datetime
+
+    rng = np.random.default_rng(42)
+    close = 100 * np.cumprod(1 + rng.normal(0, 0.002, n_bars))
+    df = pd.DataFrame({
+        'open': close,
+        'high': close * 1.002,
+        'low': close * 0.998,
+        'close': close,
+        'volume': rng.uniform(1000, 5000, n_bars),
+    }, index=pd.date_range("2020-01-01", periods=n_bars, freq="1min"))
+    data = {"BTC/USDT": df}
+
+    config = BacktestConfig(start_date=datetime(2020, 1, 1), end_date=datetime(2021, 1, 1))
+    context = BacktestContext(data, BacktestState(), config)
+
+    start = time.perf_counter()
+    for i in range(legacy_bars):
+        window = df.iloc[max(0, i - 42):i + 1]
+        compute_indicator(window, 'rsi', period=14)
+        compute_indicator(window, 'atr', period=14)
+    legacy_rate = legacy_bars / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for i in range(n_bars):
+        context._current_idx = i
+        context.get_indicator("BTC/USDT", 'rsi', period=14)
+        context.get_indicator("BTC/USDT", 'atr', period=14)
+    cached_rate = n_bars / (time.perf_counter() - start)
+
+    return {
+        'legacy_bars_per_sec': legacy_rate,
+        'cached_bars_per_sec': cached_rate,
+        'speedup': cached_rate / legacy_rate,
+    }
+
+
+if __name__ == "__main__":
+    print("Indicator Store Benchmark (RSI + ATR, 100k bars)")
+    print("=" * 50)
+
+    report = _benchmark()
+    print(f"Before: {report['legacy_bars_per_sec']:,.0f} bars/sec")
+    print(f"After:  {report['cached_bars_per_sec']:,.0f} bars/sec")
+    print(f"Speedup: {report['speedup']:.1f}x")
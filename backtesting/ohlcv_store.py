@@ -0,0 +1,286 @@
+"""
+GODBRAIN OHLCV Store
+Partitioned, memory-mapped candle storage shared by all backtests.
+
+Layout:
+    {root}/{exchange}/{symbol}/{timeframe}/{YYYY-MM}.npy
+    {root}/{exchange}/{symbol}/{timeframe}/meta.json   (original symbol)
+
+Each partition is a float64 array shaped (6, n_bars) holding the columns
+timestamp (ms since epoch, exact in float64), open, high, low, close,
+volume. Rows are sorted by timestamp. Partitions are opened with
+``mmap_mode='r'``, so every process reading the same cache dir shares the
+OS page cache instead of loading its own copy.
+"""
+
+import json
+import os
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+COLUMNS = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+TimeLike = Union[datetime, pd.Timestamp, int]
+
+
+def _to_ms(value: TimeLike) -> int:
+    """Datetime (naive = UTC, like the stored index) or ms int to ms."""
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    return pd.Timestamp(value).value // 1_000_000
+
+
+def _month_of(ts_ms: np.ndarray) -> np.ndarray:
+    """Partition month ('YYYY-MM') for each ms timestamp."""
+    return ts_ms.astype('datetime64[ms]').astype('datetime64[M]').astype(str)
+
+
+class OHLCVStore:
+    """
+    Columnar OHLCV store partitioned by symbol/timeframe/month.
+
+    Features:
+    - Range reads only open the month partitions they overlap
+    - Partitions are memory-mapped; single-partition reads are zero-copy
+    - Writes merge into existing partitions and only rewrite the months
+      whose bars changed; incoming bars replace stored ones, so a candle
+      that was still forming when it was stored gets corrected
+    - Atomic partition replace, so concurrent readers never see a partial file
+
+    Usage:
+        store = OHLCVStore("data/historical/store")
+        store.write("BTC/USDT", "1h", df, exchange="binance")
+        df = store.read_frame("BTC/USDT", "1h", start, end)
+    """
+
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    # ------------------------------------------------------------------
+    # Paths
+    # ------------------------------------------------------------------
+
+    def _series_dir(self, symbol: str, timeframe: str, exchange: str) -> Path:
+        safe_symbol = symbol.replace("/", "_").replace(":", "-")
+        return self.root / exchange / safe_symbol / timeframe
+
+    def partitions(self, symbol: str, timeframe: str, exchange: str = "binance") -> List[Path]:
+        """Partition files in time order."""
+        directory = self._series_dir(symbol, timeframe, exchange)
+        if not directory.exists():
+            return []
+        return sorted(directory.glob("????-??.npy"))
+
+    @contextmanager
+    def _write_lock(self, directory: Path) -> Iterator[None]:
+        """Serialize writers of one series across processes."""
+        directory.mkdir(parents=True, exist_ok=True)
+        if fcntl is None:
+            yield
+            return
+        with open(directory / ".lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _open(path: Path) -> np.ndarray:
+        return np.load(path, mmap_mode='r')
+
+    def bounds(self, symbol: str, timeframe: str, exchange: str = "binance") -> Optional[Tuple[int, int]]:
+        """(first, last) stored timestamp in ms, or None if empty."""
+        parts = self.partitions(symbol, timeframe, exchange)
+        if not parts:
+            return None
+        first = self._open(parts[0])
+        last = self._open(parts[-1])
+        return int(first[0, 0]), int(last[0, -1])
+
+    def read_arrays(
+        self,
+        symbol: str,
+        timeframe: str,
+        start: TimeLike,
+        end: TimeLike,
+        exchange: str = "binance"
+    ) -> List[np.ndarray]:
+        """
+        Memory-mapped (6, k) views covering [start, end], one per partition.
+
+        Only partitions whose month overlaps the range are opened.
+        """
+        start_ms, end_ms = _to_ms(start), _to_ms(end)
+        first_month, last_month = _month_of(np.array([start_ms, end_ms]))
+
+        views = []
+        for path in self.partitions(symbol, timeframe, exchange):
+            if not first_month <= path.stem <= last_month:
+                continue
+            part = self._open(path)
+            ts = part[0]
+            lo = np.searchsorted(ts, start_ms, side='left')
+            hi = np.searchsorted(ts, end_ms, side='right')
+            if hi > lo:
+                views.append(part[:, lo:hi])
+        return views
+
+    def read_frame(
+        self,
+        symbol: str,
+        timeframe: str,
+        start: TimeLike,
+        end: TimeLike,
+        exchange: str = "binance"
+    ) -> pd.DataFrame:
+        """
+        OHLCV DataFrame indexed by timestamp for [start, end].
+
+        Ranges inside one partition wrap the memory map without copying;
+        ranges spanning months copy only the requested bars.
+        """
+        views = self.read_arrays(symbol, timeframe, start, end, exchange)
+        if not views:
+            return pd.DataFrame(columns=COLUMNS[1:], index=pd.DatetimeIndex([], name='timestamp'))
+
+        block = views[0] if len(views) == 1 else np.concatenate(views, axis=1)
+        index = pd.to_datetime(block[0].astype(np.int64), unit='ms')
+        index.name = 'timestamp'
+        return pd.DataFrame(block[1:].T, index=index, columns=COLUMNS[1:], copy=False)
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _to_block(candles: Union[pd.DataFrame, np.ndarray, List]) -> np.ndarray:
+        """Normalize ccxt rows or an OHLCV frame to a sorted (6, n) block."""
+        if isinstance(candles, pd.DataFrame):
+            df = candles
+            if 'timestamp' in df.columns:
+                ts = pd.to_datetime(df['timestamp'])
+            else:
+                ts = pd.to_datetime(df.index)
+            ts_ms = ts.to_numpy(dtype='datetime64[ms]').astype(np.int64)
+            block = np.vstack([ts_ms.astype(np.float64)] + [
+                df[c].to_numpy(dtype=np.float64) for c in COLUMNS[1:]
+            ])
+        else:
+            rows = np.asarray(candles, dtype=np.float64)
+            block = rows.reshape(-1, len(COLUMNS)).T
+
+        order = np.argsort(block[0], kind='stable')
+        return np.ascontiguousarray(block[:, order])
+
+    @staticmethod
+    def _save_atomic(path: Path, block: np.ndarray) -> None:
+        tmp = path.with_name(f".{path.stem}.{os.getpid()}.tmp.npy")
+        np.save(tmp, block)
+        os.replace(tmp, path)
+
+    def write(
+        self,
+        symbol: str,
+        timeframe: str,
+        candles: Union[pd.DataFrame, np.ndarray, List],
+        exchange: str = "binance"
+    ) -> int:
+        """
+        Merge candles into the store.
+
+        Incoming bars replace stored bars with the same timestamp (the last
+        stored candle may have been fetched while still open). Only
+        partitions whose contents change are rewritten.
+
+        Returns:
+            Number of new bars written (replaced bars are not counted)
+        """
+        block = self._to_block(candles)
+        if block.shape[1] == 0:
+            return 0
+
+        directory = self._series_dir(symbol, timeframe, exchange)
+        months = _month_of(block[0].astype(np.int64))
+        written = 0
+
+        with self._write_lock(directory):
+            self._write_meta(directory, symbol)
+            for month in np.unique(months):
+                incoming = block[:, months == month]
+                # Keep the last of any duplicate timestamps in the batch
+                _, last = np.unique(incoming[0][::-1], return_index=True)
+                incoming = incoming[:, incoming.shape[1] - 1 - last]
+                path = directory / f"{month}.npy"
+
+                if path.exists():
+                    existing = np.load(path)
+                    overlap = np.isin(existing[0], incoming[0])
+                    new_bars = incoming.shape[1] - int(overlap.sum())
+                    if new_bars == 0 and np.array_equal(existing[:, overlap], incoming):
+                        continue
+                    merged = np.concatenate([existing[:, ~overlap], incoming], axis=1)
+                    merged = merged[:, np.argsort(merged[0], kind='stable')]
+                else:
+                    new_bars = incoming.shape[1]
+                    merged = incoming
+
+                self._save_atomic(path, np.ascontiguousarray(merged))
+                written += new_bars
+
+        return written
+
+    @staticmethod
+    def _write_meta(directory: Path, symbol: str) -> None:
+        """Record the original symbol; the directory name is not reversible."""
+        meta = directory / "meta.json"
+        if not meta.exists():
+            tmp = directory / f".meta.{os.getpid()}.tmp"
+            tmp.write_text(json.dumps({'symbol': symbol}))
+            os.replace(tmp, meta)
+
+    @staticmethod
+    def _read_symbol(directory: Path) -> str:
+        """Original symbol of a series dir (best-effort guess for pre-meta dirs)."""
+        meta = directory / "meta.json"
+        if meta.exists():
+            return json.loads(meta.read_text())['symbol']
+        return directory.parent.name.replace("_", "/").replace("-", ":")
+
+    def list_series(self) -> List[Dict]:
+        """All stored series with their row counts and time bounds."""
+        result = []
+        for tf_dir in sorted(self.root.glob("*/*/*")):
+            if not tf_dir.is_dir():
+                continue
+            exchange, _, timeframe = tf_dir.relative_to(self.root).parts
+            symbol = self._read_symbol(tf_dir)
+            parts = self.partitions(symbol, timeframe, exchange)
+            if not parts:
+                continue
+            first, last = self.bounds(symbol, timeframe, exchange)
+            result.append({
+                'exchange': exchange,
+                'symbol': symbol,
+                'timeframe': timeframe,
+                'rows': sum(self._open(p).shape[1] for p in parts),
+                'start': pd.to_datetime(first, unit='ms'),
+                'end': pd.to_datetime(last, unit='ms'),
+                'file': str(tf_dir)
+            })
+        return result
@@ -25,6 +25,7 @@ async def main():
     parser.add_argument('--days', type=int, default=180)
     parser.add_argument('--capital', type=float, default=10000)
     parser.add_argument('--walk-forward', action='store_true')
+    parser.add_argument('--workers', type=int, default=1)
     
     args = parser.parse_args()
     
@@ -70,7 +71,8 @@ async def main():
                 'rsi_period': [7, 14, 21],
                 'rsi_oversold': [25, 30, 35],
                 'rsi_overbought': [65, 70, 75]
-            }
+            },
+            n_workers=args.workers
         )
         
         optimizer = WalkForwardOptimizer(wf_config)
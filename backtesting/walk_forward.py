@@ -3,13 +3,25 @@ GODBRAIN Walk-Forward Optimization
 Prevents overfitting through rolling out-of-sample validation.
 """
 
+import asyncio
+import logging
+import math
+import os
+import shutil
+import tempfile
 import numpy as np
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
-from typing import List, Dict, Type
+from typing import List, Dict, Optional, Tuple, Type
 from datetime import datetime, timedelta
+from pathlib import Path
 import itertools
 
+from .engine import BacktestConfig, BacktestEngine, BacktestResult
+
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class WalkForwardConfig:
@@ -23,6 +35,12 @@ class WalkForwardConfig:
     parameter_grid: Dict = field(default_factory=dict)
     
     min_trades: int = 20           # Minimum trades per window
+    
+    # Grid search execution
+    n_workers: int = 1             # >1 evaluates combos in a process pool
+    halving_rounds: int = 0        # Successive-halving rungs before full window (0 = off)
+    halving_eta: int = 3           # Keep top 1/eta combos per rung
+    early_stop_min_trades: bool = True  # Drop combos below scaled min_trades in rungs
 
 
 @dataclass
@@ -57,11 +75,9 @@ class WalkForwardOptimizer:
         self,
         strategy_class: Type,
         data: Dict[str, pd.DataFrame],
-        backtest_config: 'BacktestConfig'
+        backtest_config: BacktestConfig
     ) -> WalkForwardResult:
         """Run walk-forward optimization."""
-        from .engine import BacktestEngine, BacktestConfig
-        
         first_symbol = list(data.keys())[0]
         start_date = data[first_symbol].index.min()
         end_date = data[first_symbol].index.max()
@@ -73,30 +89,40 @@ class WalkForwardOptimizer:
         
         results = []
         
-        for i, window in enumerate(windows):
-            print(f"\n[WFO] Window {i+1}/{len(windows)}")
-            
-            # Optimize on in-sample
-            best_params, is_metric = await self._optimize_in_sample(
-                strategy_class, data, window['is_start'], window['is_end'], backtest_config
-            )
-            
-            print(f"[WFO] Best params: {best_params}, IS {self.config.metric}: {is_metric:.4f}")
-            
-            # Test on out-of-sample
-            oos_result = await self._test_out_of_sample(
-                strategy_class, data, window['oos_start'], window['oos_end'],
-                backtest_config, best_params
-            )
-            
-            print(f"[WFO] OOS {self.config.metric}: {getattr(oos_result, self.config.metric):.4f}")
-            
-            results.append({
-                'window': window,
-                'best_params': best_params,
-                'is_metric': is_metric,
-                'oos_result': oos_result
-            })
+        # One pool and one memory-mapped copy of the data for every window
+        workers = None
+        if self.config.n_workers > 1 and self.config.parameter_grid:
+            workers = _WorkerPool(data, self.config.n_workers)
+        
+        try:
+            for i, window in enumerate(windows):
+                print(f"\n[WFO] Window {i+1}/{len(windows)}")
+                
+                # Optimize on in-sample
+                best_params, is_metric = await self._optimize_in_sample(
+                    strategy_class, data, window['is_start'], window['is_end'], backtest_config,
+                    workers
+                )
+                
+                print(f"[WFO] Best params: {best_params}, IS {self.config.metric}: {is_metric:.4f}")
+                
+                # Test on out-of-sample
+                oos_result = await self._test_out_of_sample(
+                    strategy_class, data, window['oos_start'], window['oos_end'],
+                    backtest_config, best_params
+                )
+                
+                print(f"[WFO] OOS {self.config.metric}: {getattr(oos_result, self.config.metric):.4f}")
+                
+                results.append({
+                    'window': window,
+                    'best_params': best_params,
+                    'is_metric': is_metric,
+                    'oos_result': oos_result
+                })
+        finally:
+            if workers is not None:
+                workers.close()
         
         return self._aggregate_results(results)
     
@@ -127,63 +153,90 @@ class WalkForwardOptimizer:
     
     async def _optimize_in_sample(
         self, strategy_class: Type, data: Dict, start: datetime, end: datetime,
-        base_config: 'BacktestConfig'
+        base_config: BacktestConfig, workers: Optional['_WorkerPool'] = None
     ) -> tuple:
-        """Find optimal parameters on in-sample data."""
-        from .engine import BacktestEngine, BacktestConfig
+        """
+        Find optimal parameters on in-sample data.
         
-        best_params = {}
-        best_metric = -np.inf
+        With n_workers > 1 combos run on ``workers`` (shared across windows
+        by run()); without one a pool is created for this call only.
+        """
+        window_data = _slice_window(data, start, end)
         
         param_names = list(self.config.parameter_grid.keys())
         param_values = list(self.config.parameter_grid.values())
         
         if not param_names:
             # No parameters to optimize
-            config = BacktestConfig(
-                start_date=start, end_date=end,
-                initial_capital=base_config.initial_capital,
-                timeframe=base_config.timeframe
+            metric, _ = await _evaluate_params(
+                strategy_class, {}, window_data, start, end,
+                _config_kwargs(base_config), self.config.metric
             )
-            engine = BacktestEngine(config)
-            engine.set_data({k: v[(v.index >= start) & (v.index <= end)] for k, v in data.items()})
-            engine.set_strategy(strategy_class())
-            result = await engine.run()
-            return {}, getattr(result, self.config.metric)
-        
-        for combo in itertools.product(*param_values):
-            params = dict(zip(param_names, combo))
-            
-            config = BacktestConfig(
-                start_date=start, end_date=end,
-                initial_capital=base_config.initial_capital,
-                timeframe=base_config.timeframe
+            return {}, metric
+        
+        combos = [dict(zip(param_names, combo)) for combo in itertools.product(*param_values)]
+        
+        owned = None
+        if self.config.n_workers > 1:
+            if workers is None:
+                workers = owned = _WorkerPool(data, self.config.n_workers)
+            evaluate = _PoolEvaluator(
+                strategy_class, window_data, start, end,
+                _config_kwargs(base_config), self.config.metric, workers
+            )
+        else:
+            evaluate = _SerialEvaluator(
+                strategy_class, window_data, start, end,
+                _config_kwargs(base_config), self.config.metric
             )
+        
+        try:
+            candidates = list(range(len(combos)))
             
-            engine = BacktestEngine(config)
-            engine.set_data({k: v[(v.index >= start) & (v.index <= end)] for k, v in data.items()})
+            # Successive halving on growing prefixes of the window
+            for rung in range(self.config.halving_rounds, 0, -1):
+                if len(candidates) <= 1:
+                    break
+                fraction = float(self.config.halving_eta) ** -rung
+                scores = await evaluate(combos, candidates, fraction)
+                candidates = self._halve(candidates, scores, fraction)
+                logger.info("Halving rung %.3f: %d combos left", fraction, len(candidates))
             
-            try:
-                strategy = strategy_class(**params)
-                engine.set_strategy(strategy)
-                result = await engine.run()
-                metric_value = getattr(result, self.config.metric)
-                
-                if metric_value > best_metric and result.total_trades >= self.config.min_trades:
-                    best_metric = metric_value
-                    best_params = params
-            except Exception as e:
-                print(f"[WFO] Error with params {params}: {e}")
+            scores = await evaluate(combos, candidates, 1.0)
+        finally:
+            if owned is not None:
+                owned.close()
+        
+        best_params = {}
+        best_metric = -np.inf
+        
+        # Walk candidates in grid order so ties resolve like the serial search
+        for idx in candidates:
+            metric_value, trades = scores[idx]
+            if metric_value > best_metric and trades >= self.config.min_trades:
+                best_metric = metric_value
+                best_params = combos[idx]
         
         return best_params, best_metric
     
+    def _halve(
+        self, candidates: List[int], scores: Dict[int, Tuple[float, int]], fraction: float
+    ) -> List[int]:
+        """Keep the top 1/eta candidates of a rung, in grid order."""
+        survivors = candidates
+        if self.config.early_stop_min_trades:
+            min_trades = self.config.min_trades * fraction
+            survivors = [i for i in survivors if scores[i][1] >= min_trades] or candidates
+        
+        keep = max(1, math.ceil(len(candidates) / self.config.halving_eta))
+        ranked = sorted(survivors, key=lambda i: (-_rank_value(scores[i][0]), i))
+        return sorted(ranked[:keep])
+    
     async def _test_out_of_sample(
         self, strategy_class: Type, data: Dict, start: datetime, end: datetime,
-        base_config: 'BacktestConfig', params: Dict
-    ) -> 'BacktestResult':
+        base_config: BacktestConfig, params: Dict
+    ) -> BacktestResult:
         """Test strategy on out-of-sample data."""
-        from .engine import BacktestEngine, BacktestConfig
-        
         config = BacktestConfig(
             start_date=start, end_date=end,
             initial_capital=base_config.initial_capital,
@@ -247,3 +300,196 @@ class WalkForwardOptimizer:
             parameter_stability=stability,
             robustness_score=robustness
         )
+
+
+
+# =============================================================================
+# Grid evaluation helpers
+# =============================================================================
+
+_OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+# Per-worker cache of memory-mapped data, keyed by _WorkerPool directory
+_WORKER_DATA: Dict[str, Dict[str, pd.DataFrame]] = {}
+
+
+def _slice_window(data: Dict[str, pd.DataFrame], start: datetime, end: datetime) -> Dict[str, pd.DataFrame]:
+    """Slice every frame to [start, end] with a binary search on the sorted index."""
+    sliced = {}
+    for symbol, df in data.items():
+        lo = df.index.searchsorted(start, side='left')
+        hi = df.index.searchsorted(end, side='right')
+        sliced[symbol] = df.iloc[lo:hi]
+    return sliced
+
+
+def _prefix_end(start: datetime, end: datetime, fraction: float) -> datetime:
+    """End of the first ``fraction`` of a window."""
+    if fraction >= 1.0:
+        return end
+    return start + (end - start) * fraction
+
+
+def _rank_value(metric: float) -> float:
+    """Metric value usable for sorting (NaN ranks last)."""
+    return -np.inf if metric is None or metric != metric else metric
+
+
+def _config_kwargs(base_config: BacktestConfig) -> Dict:
+    """BacktestConfig fields carried into every grid backtest."""
+    return {
+        'initial_capital': base_config.initial_capital,
+        'timeframe': base_config.timeframe,
+        'engine_mode': base_config.engine_mode,
+    }
+
+
+async def _evaluate_params(
+    strategy_class: Type, params: Dict, data: Dict[str, pd.DataFrame],
+    start: datetime, end: datetime, config_kwargs: Dict, metric: str
+) -> Tuple[float, int]:
+    """Run one backtest and return (metric, total_trades)."""
+    config = BacktestConfig(start_date=start, end_date=end, **config_kwargs)
+    engine = BacktestEngine(config)
+    engine.set_data(data)
+    engine.set_strategy(strategy_class(**params))
+    result = await engine.run()
+    return getattr(result, metric), result.total_trades
+
+
+def _write_window(data: Dict[str, pd.DataFrame], directory: Path) -> None:
+    """Write frames as .npy files workers can memory-map; the index as UTC ns plus its tz."""
+    for i, (symbol, df) in enumerate(data.items()):
+        columns = [c for c in _OHLCV_COLUMNS if c in df.columns]
+        tz = getattr(df.index, "tz", None)
+        np.save(directory / f"{i}_values.npy", df[columns].to_numpy(dtype=np.float64))
+        np.save(directory / f"{i}_index.npy", df.index.values.astype("datetime64[ns]").view(np.int64))
+        (directory / f"{i}_meta.txt").write_text(
+            symbol + "\n" + ",".join(columns) + "\n" + (str(tz) if tz is not None else "")
+        )
+
+
+def _load_window(directory: str) -> Dict[str, pd.DataFrame]:
+    """Open a window written by _write_window, memory-mapped and cached per worker."""
+    data = _WORKER_DATA.get(directory)
+    if data is not None:
+        return data
+    
+    _WORKER_DATA.clear()
+    data = {}
+    path = Path(directory)
+    for meta in sorted(path.glob("*_meta.txt"), key=lambda p: int(p.name.split("_")[0])):
+        i = meta.name.split("_")[0]
+        symbol, columns, tz = meta.read_text().split("\n")
+        values = np.load(path / f"{i}_values.npy", mmap_mode='r')
+        index = pd.DatetimeIndex(np.load(path / f"{i}_index.npy").view("datetime64[ns]"))
+        if tz:
+            index = index.tz_localize("UTC").tz_convert(tz)
+        data[symbol] = pd.DataFrame(values, index=index, columns=columns.split(","), copy=False)
+    
+    _WORKER_DATA[directory] = data
+    return data
+
+
+def _evaluate_in_worker(
+    directory: str, strategy_class: Type, params: Dict, start: datetime,
+    end: datetime, config_kwargs: Dict, metric: str
+) -> Tuple[float, int]:
+    """Process-pool entry point: evaluate one combo on [start, end] of the shared data."""
+    data = _slice_window(_load_window(directory), start, end)
+    try:
+        return asyncio.run(_evaluate_params(
+            strategy_class, params, data, start, end, config_kwargs, metric
+        ))
+    except Exception as e:
+        print(f"[WFO] Error with params {params}: {e}")
+        return -np.inf, 0
+
+
+class _SerialEvaluator:
+    """Evaluate combos one after another in this process."""
+    
+    def __init__(
+        self, strategy_class: Type, data: Dict[str, pd.DataFrame], start: datetime,
+        end: datetime, config_kwargs: Dict, metric: str
+    ):
+        self.strategy_class = strategy_class
+        self.data = data
+        self.start = start
+        self.end = end
+        self.config_kwargs = config_kwargs
+        self.metric = metric
+    
+    async def __call__(
+        self, combos: List[Dict], candidates: List[int], fraction: float
+    ) -> Dict[int, Tuple[float, int]]:
+        end = _prefix_end(self.start, self.end, fraction)
+        data = _slice_window(self.data, self.start, end)
+        scores = {}
+        for idx in candidates:
+            try:
+                scores[idx] = await _evaluate_params(
+                    self.strategy_class, combos[idx], data, self.start, end,
+                    self.config_kwargs, self.metric
+                )
+            except Exception as e:
+                print(f"[WFO] Error with params {combos[idx]}: {e}")
+                scores[idx] = (-np.inf, 0)
+        return scores
+
+
+class _WorkerPool:
+    """
+    Process pool plus the full dataset as memory-mapped .npy files.
+    
+    Built once per run(): every window's grid search submits to the same
+    workers, and each worker maps the data on its first task and slices
+    windows out of it from then on.
+    """
+    
+    def __init__(self, data: Dict[str, pd.DataFrame], n_workers: int):
+        self.directory = tempfile.mkdtemp(prefix="godbrain_wfo_")
+        _write_window(data, Path(self.directory))
+        self.executor = ProcessPoolExecutor(max_workers=min(n_workers, os.cpu_count() or 1))
+    
+    def close(self) -> None:
+        self.executor.shutdown(wait=True)
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+class _PoolEvaluator(_SerialEvaluator):
+    """
+    Evaluate combos on a _WorkerPool.
+    
+    Scores are keyed by grid index, so results do not depend on worker
+    count or completion order.
+    """
+    
+    def __init__(
+        self, strategy_class: Type, data: Dict[str, pd.DataFrame], start: datetime,
+        end: datetime, config_kwargs: Dict, metric: str, workers: _WorkerPool
+    ):
+        super().__init__(strategy_class, data, start, end, config_kwargs, metric)
+        self.workers = workers
+    
+    async def __call__(
+        self, combos: List[Dict], candidates: List[int], fraction: float
+    ) -> Dict[int, Tuple[float, int]]:
+        loop = asyncio.get_running_loop()
+        end = _prefix_end(self.start, self.end, fraction)
+        
+        futures = {
+            loop.run_in_executor(
+                self.workers.executor, _evaluate_in_worker, self.workers.directory, self.strategy_class,
+                combos[idx], self.start, end, self.config_kwargs, self.metric
+            ): idx
+            for idx in candidates
+        }
+        
+        scores = {}
+        pending = set(futures)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                scores[futures[future]] = future.result()
+        return scores
@@ -14,8 +14,10 @@ Kullanım:
   - apex.py: Loop içinde get_last_tick() ile tick al
 
 Transport seçenekleri:
-  1. Redis (önerilen, production)
-  2. File-based (fallback, Redis yoksa)
+  1. Redis Streams (önerilen, production): XADD MAXLEN + consumer group,
+     XREADGROUP ile blocking read, ack / replay
+  2. File journal (fallback, Redis yoksa): arka planda batch yazılır,
+     tail index ile geçmiş okunur
   
 ═══════════════════════════════════════════════════════════════════════════════
 """
@@ -23,9 +25,12 @@ Transport seçenekleri:
 import os
 import json
 import time
+import queue
+import atexit
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Dict, Any
+from collections import deque
+from typing import Optional, Dict, Any, List, Tuple
 from dataclasses import dataclass, asdict
 import threading
 
@@ -41,19 +46,22 @@ TICK_LATEST = QUANTUM_ROOT / "logs" / "tick_latest.json"
 # REDIS SETUP (Optional)
 # =============================================================================
 
-_redis_client = None
 _REDIS_AVAILABLE = False
-REDIS_TICK_KEY = "godbrain:tick_stream"
+# The pre-streams bridge kept a LIST at "godbrain:tick_stream" (no TTL); a
+# stream can't live under that key, so the stream gets its own name.
+REDIS_TICK_KEY = "godbrain:tick_stream:v2"
 REDIS_TICK_LATEST = "godbrain:tick_latest"
+REDIS_TICK_GROUP = os.getenv("GODBRAIN_TICK_GROUP", "apex")
+# Stable across restarts, so a restarted consumer finds its own pending ticks
+REDIS_TICK_CONSUMER = os.getenv("GODBRAIN_TICK_CONSUMER", REDIS_TICK_GROUP)
+STREAM_MAXLEN = 1000
 
 try:
     import redis
-    redis_dsn = os.getenv("GODBRAIN_REDIS_DSN", "redis://localhost:6379/0")
-    _redis_client = redis.from_url(redis_dsn, decode_responses=True)
-    _redis_client.ping()
-    _REDIS_AVAILABLE = True
-except:
-    _REDIS_AVAILABLE = False
+    from redis.connection import parse_url
+    from infrastructure.redis_pool import get_redis
+except ImportError:
+    redis = None
 
 
 # =============================================================================
@@ -99,6 +107,380 @@ class TickData:
         return cls.from_dict(json.loads(json_str))
 
 
+# =============================================================================
+# REDIS STREAMS BUS
+# =============================================================================
+
+class StreamTickBus:
+    """
+    Tick bus on a Redis stream.
+
+    publish() is one round trip (XADD with approximate MAXLEN + latest SET).
+    Consumers share a group, so every tick is delivered to exactly one of
+    them; read() blocks server-side in XREADGROUP instead of polling.
+    Entries stay pending until ack(); replay_pending() re-delivers what this
+    consumer read but never acked (e.g. crashed before executing), and
+    claim_stale() takes over what another consumer left pending for longer
+    than ``claim_idle_ms``. The consumer name is stable (GODBRAIN_TICK_CONSUMER,
+    default: the group), so a restarted process finds its own pending ticks.
+    """
+
+    def __init__(
+        self,
+        client,
+        stream: str = REDIS_TICK_KEY,
+        latest_key: str = REDIS_TICK_LATEST,
+        group: str = REDIS_TICK_GROUP,
+        consumer: Optional[str] = None,
+        maxlen: int = STREAM_MAXLEN,
+        claim_idle_ms: int = 60_000,
+    ):
+        self.client = client
+        self.stream = stream
+        self.latest_key = latest_key
+        self.group = group
+        self.consumer = consumer or REDIS_TICK_CONSUMER
+        self.maxlen = maxlen
+        self.claim_idle_ms = claim_idle_ms
+        self._next_claim = 0.0
+        self._stream_ready = False
+        self._group_ready = False
+
+    def ensure_stream(self) -> None:
+        """Drop a non-stream value left on the key (e.g. the old tick LIST) so XADD works."""
+        if self._stream_ready:
+            return
+        kind = self.client.type(self.stream)
+        kind = kind.decode() if isinstance(kind, bytes) else kind
+        if kind not in ("none", "stream"):
+            print(f"[BRIDGE] Replacing legacy {kind} at {self.stream} with a stream")
+            self.client.delete(self.stream)
+        self._stream_ready = True
+
+    def ensure_group(self) -> None:
+        if self._group_ready:
+            return
+        self.ensure_stream()
+        try:
+            # "0": a new group also receives ticks published before it existed
+            self.client.xgroup_create(self.stream, self.group, id="0", mkstream=True)
+        except Exception as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        self._group_ready = True
+
+    def publish(self, tick: "TickData") -> str:
+        self.ensure_stream()
+        raw = tick.to_json()
+        pipe = self.client.pipeline(transaction=False)
+        pipe.xadd(self.stream, {"tick": raw}, maxlen=self.maxlen, approximate=True)
+        pipe.set(self.latest_key, raw)
+        entry_id, _ = pipe.execute()
+        return entry_id
+
+    def publish_many(self, ticks: List["TickData"]) -> List[str]:
+        """Burst publish: all XADDs in one pipeline."""
+        if not ticks:
+            return []
+        self.ensure_stream()
+        pipe = self.client.pipeline(transaction=False)
+        for tick in ticks:
+            pipe.xadd(self.stream, {"tick": tick.to_json()}, maxlen=self.maxlen, approximate=True)
+        pipe.set(self.latest_key, ticks[-1].to_json())
+        return pipe.execute()[:-1]
+
+    @staticmethod
+    def _decode(response) -> List[Tuple[str, "TickData"]]:
+        out = []
+        for _stream, entries in response or []:
+            for entry_id, fields in entries:
+                if fields and fields.get("tick"):
+                    out.append((entry_id, TickData.from_json(fields["tick"])))
+        return out
+
+    def read(self, count: int = 1, block_ms: Optional[int] = None) -> List[Tuple[str, "TickData"]]:
+        """Next undelivered ticks for this consumer, oldest first (not yet acked)."""
+        self.ensure_group()
+        response = self.client.xreadgroup(
+            self.group, self.consumer, {self.stream: ">"}, count=count, block=block_ms
+        )
+        return self._decode(response)
+
+    def replay_pending(self, count: int = 100) -> List[Tuple[str, "TickData"]]:
+        """Ticks delivered to this consumer but never acked."""
+        self.ensure_group()
+        response = self.client.xreadgroup(self.group, self.consumer, {self.stream: "0"}, count=count)
+        return self._decode(response)
+
+    def claim_stale(self, count: int = 100) -> List[Tuple[str, "TickData"]]:
+        """XAUTOCLAIM ticks other consumers left unacked for claim_idle_ms."""
+        self.ensure_group()
+        response = self.client.xautoclaim(
+            self.stream, self.group, self.consumer, self.claim_idle_ms, start_id="0-0", count=count
+        )
+        entries = response[1] if response else []
+        return self._decode([(self.stream, entries)])
+
+    def next(self, block_ms: Optional[int] = None,
+             claim_interval: float = 30.0) -> Optional[Tuple[str, "TickData"]]:
+        """
+        One tick to execute, unacked: this consumer's pending ticks first,
+        then stale ones claimed from others (checked every claim_interval
+        seconds), then a blocking read of new ones.
+        """
+        entries = self.replay_pending(count=1)
+        if not entries and time.monotonic() >= self._next_claim:
+            self._next_claim = time.monotonic() + claim_interval
+            entries = self.claim_stale()
+        if not entries:
+            entries = self.read(count=1, block_ms=block_ms)
+        return entries[0] if entries else None
+
+    def ack(self, *entry_ids: str) -> int:
+        return self.client.xack(self.stream, self.group, *entry_ids) if entry_ids else 0
+
+    def latest(self) -> Optional["TickData"]:
+        raw = self.client.get(self.latest_key)
+        return TickData.from_json(raw) if raw else None
+
+    def history(self, count: int = 10) -> List["TickData"]:
+        """Newest first, straight from the stream (no consumption)."""
+        return [TickData.from_json(f["tick"]) for _, f in self.client.xrevrange(self.stream, count=count)]
+
+    def clear(self) -> None:
+        self.client.delete(self.stream, self.latest_key)
+        self._stream_ready = False
+        self._group_ready = False
+
+
+# =============================================================================
+# FILE JOURNAL (fallback)
+# =============================================================================
+
+class TickJournal:
+    """
+    Append-only JSONL tick journal written by a background thread.
+
+    publish() only enqueues; the writer drains the queue in batches, appends
+    them with one write and replaces the latest file once per batch.
+
+    History reads go through a tail index: byte offsets of the last
+    `index_size` lines, seeded by reading the file backwards from EOF and
+    extended with only the bytes appended since the previous read (by this
+    or any other process). No read ever scans the whole file.
+    """
+
+    BLOCK = 64 * 1024
+
+    def __init__(
+        self,
+        path: Path = TICK_FILE,
+        latest_path: Path = TICK_LATEST,
+        index_size: int = 1000,
+        max_batch: int = 1000,
+    ):
+        self.path = Path(path)
+        self.latest_path = Path(latest_path)
+        self.index_size = index_size
+        self.max_batch = max_batch
+        self._queue: "queue.Queue[Optional[TickData]]" = queue.Queue()
+        self._published = threading.Condition()
+        self._writer: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._offsets: deque = deque(maxlen=index_size)
+        self._indexed_to = 0
+        self._index_lock = threading.Lock()
+        self.batches_written = 0
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def _ensure_writer(self) -> None:
+        if self._writer is not None:
+            return
+        with self._start_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._run, name="tick-journal", daemon=True)
+                self._writer.start()
+
+    def publish(self, tick: "TickData") -> None:
+        self._ensure_writer()
+        self._queue.put(tick)
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Block until everything published so far is on disk."""
+        if self._writer is None:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            markers = [item for item in batch if isinstance(item, threading.Event)]
+            ticks = [item for item in batch if isinstance(item, TickData)]
+            if ticks:
+                try:
+                    self._write(ticks)
+                except Exception as e:
+                    print(f"[DATA_FEEDS] File publish failed: {e}")
+            for marker in markers:
+                marker.set()
+
+    def _write(self, ticks: List["TickData"]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        lines = [t.to_json() + "\n" for t in ticks]
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("".join(lines))
+
+        # Readers see either the old or the new latest tick, never a partial file
+        tmp = self.latest_path.with_name(f"{self.latest_path.name}.{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(lines[-1].rstrip("\n"))
+        os.replace(tmp, self.latest_path)
+
+        self.batches_written += 1
+        with self._published:
+            self._published.notify_all()
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def take_latest(self, consume: bool = True, max_age: float = 30.0) -> Optional["TickData"]:
+        """
+        The latest tick if fresher than max_age. Consuming renames the file
+        first, so only one consumer can win a given tick.
+        """
+        path = self.latest_path
+        if consume:
+            claimed = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.claimed")
+            try:
+                os.replace(path, claimed)
+            except OSError:
+                return None
+            path = claimed
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                raw = f.read().strip()
+        except OSError:
+            return None
+        finally:
+            if consume:
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+        if not raw:
+            return None
+        tick = TickData.from_json(raw)
+        return tick if time.time() - tick.timestamp <= max_age else None
+
+    def wait(self, timeout: float) -> None:
+        """Sleep until this process writes a batch, or timeout."""
+        with self._published:
+            self._published.wait(timeout)
+
+    def _seed_index(self, f, size: int) -> None:
+        """Line starts of the last index_size lines, reading backwards from EOF."""
+        offsets: List[int] = []
+        pos = size
+        while pos > 0 and len(offsets) <= self.index_size:
+            step = min(self.BLOCK, pos)
+            pos -= step
+            f.seek(pos)
+            block = f.read(step)
+            nl = block.rfind(b"\n")
+            while nl != -1:
+                if pos + nl + 1 < size:         # a trailing newline starts nothing
+                    offsets.append(pos + nl + 1)
+                nl = block.rfind(b"\n", 0, nl)
+        if pos == 0 and size:
+            offsets.append(0)
+        self._offsets.clear()
+        self._offsets.extend(reversed(offsets[:self.index_size]))
+
+    def _extend_index(self, f, size: int) -> None:
+        """Index only the bytes appended since the last read."""
+        start = self._indexed_to
+        f.seek(start - 1)
+        chunk = f.read(size - start + 1)        # includes the last indexed byte
+        nl = chunk.find(b"\n")
+        while nl != -1:
+            if start + nl < size:
+                self._offsets.append(start + nl)
+            nl = chunk.find(b"\n", nl + 1)
+
+    def _update_index(self, f) -> int:
+        size = f.seek(0, os.SEEK_END)
+        if size < self._indexed_to or not self._offsets:
+            self._seed_index(f, size)        # first read, or file truncated/rotated
+        elif size > self._indexed_to:
+            self._extend_index(f, size)
+        self._indexed_to = size
+        return size
+
+    def history(self, count: int = 10) -> List["TickData"]:
+        """Last `count` ticks on disk, newest first."""
+        if count <= 0 or not self.path.exists():
+            return []
+        with self._index_lock, open(self.path, "rb") as f:
+            size = self._update_index(f)
+            if not self._offsets:
+                return []
+            # One extra line in case the last one is still being written
+            start = self._offsets[-min(count + 1, len(self._offsets))]
+            f.seek(start)
+            data = f.read(size - start)
+
+        ticks = []
+        for line in reversed(data.splitlines()):
+            try:
+                ticks.append(TickData.from_json(line))
+            except Exception:
+                pass
+            if len(ticks) >= count:
+                break
+        return ticks
+
+    def clear_latest(self) -> None:
+        try:
+            self.latest_path.unlink()
+        except OSError:
+            pass
+
+
+_journal = TickJournal()
+atexit.register(_journal.flush, 5.0)
+
+_bus: Optional[StreamTickBus] = None
+
+
+def _get_bus() -> Optional[StreamTickBus]:
+    """Stream bus on the shared Redis pool; None while Redis is unreachable."""
+    global _bus, _REDIS_AVAILABLE
+    if redis is None:
+        return None
+    try:
+        params = parse_url(os.getenv("GODBRAIN_REDIS_DSN", "redis://localhost:6379/0"))
+        client = get_redis("data_feeds", check=True, **params)
+    except Exception:
+        client = None
+    _REDIS_AVAILABLE = client is not None
+    if client is None:
+        return None
+    if _bus is None or _bus.client.connection_pool is not client.connection_pool:
+        _bus = StreamTickBus(client)
+    return _bus
+
+
 # =============================================================================
 # PUBLISH / GET API
 # =============================================================================
@@ -140,30 +522,17 @@ def publish_tick(
     success = False
     
     # 1. Try Redis first
-    if _REDIS_AVAILABLE and _redis_client:
+    bus = _get_bus()
+    if bus:
         try:
-            # Push to list (stream)
-            _redis_client.lpush(REDIS_TICK_KEY, tick.to_json())
-            # Trim to last 1000 ticks
-            _redis_client.ltrim(REDIS_TICK_KEY, 0, 999)
-            # Also set latest for quick access
-            _redis_client.set(REDIS_TICK_LATEST, tick.to_json())
+            bus.publish(tick)
             success = True
         except Exception as e:
             print(f"[DATA_FEEDS] Redis publish failed: {e}")
     
-    # 2. Always write to file as backup
+    # 2. Always journal to file as backup (written in the background)
     try:
-        TICK_FILE.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Append to stream file
-        with open(TICK_FILE, "a", encoding="utf-8") as f:
-            f.write(tick.to_json() + "\n")
-        
-        # Write latest
-        with open(TICK_LATEST, "w", encoding="utf-8") as f:
-            f.write(tick.to_json())
-        
+        _journal.publish(tick)
         success = True
     except Exception as e:
         print(f"[DATA_FEEDS] File publish failed: {e}")
@@ -183,6 +552,10 @@ def get_last_tick(
     """
     Get the last tick for Apex consumption.
     
+    On Redis the tick is acked as soon as it is delivered, so a crash
+    before executing it loses it; use read_tick() / ack_tick() to ack
+    only after execution.
+    
     Args:
         block: If True, wait for tick (up to timeout)
         timeout: Max seconds to wait
@@ -191,53 +564,72 @@ def get_last_tick(
     Returns:
         TickData if available, None otherwise
     """
-    start_time = time.time()
+    # 1. Redis: blocking read in the consumer group, acked on delivery
+    bus = _get_bus()
+    if bus:
+        try:
+            if not consume:
+                return bus.latest()
+            entries = bus.read(count=1, block_ms=int(timeout * 1000) if block else None)
+            if entries:
+                entry_id, tick = entries[0]
+                bus.ack(entry_id)
+                return tick
+            # The journal holds the same ticks: reading it too would double-exec
+            return None
+        except Exception:
+            pass
     
+    # 2. Fall back to file
+    deadline = time.time() + timeout
     while True:
-        tick_data = None
-        
-        # 1. Try Redis first
-        if _REDIS_AVAILABLE and _redis_client:
-            try:
-                if consume:
-                    # Pop from list (consume)
-                    raw = _redis_client.rpop(REDIS_TICK_KEY)
-                else:
-                    # Just peek at latest
-                    raw = _redis_client.get(REDIS_TICK_LATEST)
-                
-                if raw:
-                    tick_data = TickData.from_json(raw)
-            except Exception as e:
-                pass
-        
-        # 2. Fall back to file
-        if tick_data is None and TICK_LATEST.exists():
-            try:
-                with open(TICK_LATEST, "r", encoding="utf-8") as f:
-                    raw = f.read().strip()
-                    if raw:
-                        tick_data = TickData.from_json(raw)
-                        
-                        # Check if it's fresh (within last 30 seconds)
-                        if tick_data and (time.time() - tick_data.timestamp) > 30:
-                            tick_data = None  # Stale tick
-                        
-                        # Consume by clearing file
-                        if tick_data and consume:
-                            with open(TICK_LATEST, "w", encoding="utf-8") as f:
-                                f.write("")
-            except Exception as e:
-                pass
+        try:
+            tick_data = _journal.take_latest(consume=consume)
+        except Exception:
+            tick_data = None
         
         if tick_data:
             return tick_data
         
-        # Check timeout
-        if not block or (time.time() - start_time) >= timeout:
+        remaining = deadline - time.time()
+        if not block or remaining <= 0:
             return None
         
-        time.sleep(0.1)
+        # Wakes immediately on in-process publishes; polls for other writers
+        _journal.wait(min(remaining, 0.1))
+
+
+def read_tick(block: bool = True, timeout: float = 1.0) -> Optional[Tuple[Optional[str], TickData]]:
+    """
+    (entry_id, tick) to execute, left pending until ack_tick(entry_id).
+    
+    Ticks read before a crash (by this consumer, or by one idle for
+    longer than the claim window) are returned again first. Without
+    Redis the file journal is consumed and entry_id is None.
+    """
+    bus = _get_bus()
+    if bus:
+        try:
+            return bus.next(block_ms=int(timeout * 1000) if block else None)
+        except Exception:
+            pass
+    
+    tick = get_last_tick(block=block, timeout=timeout, consume=True)
+    return (None, tick) if tick else None
+
+
+def ack_tick(entry_id: Optional[str]) -> bool:
+    """Mark a tick from read_tick() as executed."""
+    if entry_id is None:
+        return True
+    bus = _get_bus()
+    if not bus:
+        return False
+    try:
+        return bus.ack(entry_id) > 0
+    except Exception as e:
+        print(f"[DATA_FEEDS] Tick ack failed: {e}")
+        return False
 
 
 def get_tick_stream(count: int = 10) -> list:
@@ -250,53 +642,34 @@ def get_tick_stream(count: int = 10) -> list:
     Returns:
         List of TickData (newest first)
     """
-    ticks = []
-    
     # Try Redis
-    if _REDIS_AVAILABLE and _redis_client:
+    bus = _get_bus()
+    if bus:
         try:
-            raw_list = _redis_client.lrange(REDIS_TICK_KEY, 0, count - 1)
-            ticks = [TickData.from_json(r) for r in raw_list]
-            return ticks
-        except:
+            return bus.history(count)
+        except Exception:
             pass
     
-    # Fall back to file
-    if TICK_FILE.exists():
-        try:
-            with open(TICK_FILE, "r", encoding="utf-8") as f:
-                lines = f.readlines()
-            
-            # Get last N lines
-            recent = lines[-count:] if len(lines) >= count else lines
-            recent.reverse()  # Newest first
-            
-            for line in recent:
-                try:
-                    ticks.append(TickData.from_json(line.strip()))
-                except:
-                    pass
-        except:
-            pass
-    
-    return ticks
+    # Fall back to file (tail index: cost grows with count, not file size)
+    try:
+        _journal.flush(1.0)
+        return _journal.history(count)
+    except Exception:
+        return []
 
 
 def clear_tick_stream():
     """Clear all pending ticks (for reset/cleanup)."""
     
-    if _REDIS_AVAILABLE and _redis_client:
+    bus = _get_bus()
+    if bus:
         try:
-            _redis_client.delete(REDIS_TICK_KEY)
-            _redis_client.delete(REDIS_TICK_LATEST)
-        except:
+            bus.clear()
+        except Exception:
             pass
     
-    try:
-        if TICK_LATEST.exists():
-            TICK_LATEST.unlink()
-    except:
-        pass
+    _journal.flush(1.0)
+    _journal.clear_latest()
 
 
 # =============================================================================
@@ -305,8 +678,10 @@ def clear_tick_stream():
 
 def get_feed_status() -> dict:
     """Get data feed status."""
+    bus = _get_bus()
     return {
         "redis_available": _REDIS_AVAILABLE,
+        "transport": "redis_stream" if bus else "file_journal",
         "tick_file": str(TICK_FILE),
         "tick_latest": str(TICK_LATEST),
         "tick_file_exists": TICK_FILE.exists(),
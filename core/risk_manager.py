@@ -22,7 +22,6 @@ Usage:
         # Limit breached, do not trade
 """
 
-import os
 import json
 import time
 from dataclasses import dataclass, asdict
@@ -429,20 +428,11 @@ def get_risk_manager(redis_client: Optional[redis.Redis] = None) -> RiskManager:
     if _risk_manager_instance is None:
         # Try to create Redis client if not provided
         if redis_client is None:
-            try:
-                redis_host = os.getenv("REDIS_HOST", "127.0.0.1")
-                redis_port = int(os.getenv("REDIS_PORT", "6379"))
-                redis_pass = os.getenv("REDIS_PASS", None)
-                redis_client = redis.Redis(
-                    host=redis_host,
-                    port=redis_port,
-                    password=redis_pass,
-                    decode_responses=True,
-                )
-                redis_client.ping()  # Test connection
-            except Exception as e:
-                print(f"[RISK MANAGER] Redis not available, using in-memory state: {e}")
-                redis_client = None
+            from infrastructure.redis_pool import get_redis
+            # Host/port/password from REDIS_HOST / REDIS_PORT / REDIS_PASS
+            redis_client = get_redis("risk_manager", check=True)
+            if redis_client is None:
+                print("[RISK MANAGER] Redis not available, using in-memory state")
         
         _risk_manager_instance = RiskManager(redis_client)
     
@@ -1,11 +1,12 @@
 import http.server
 import socketserver
 import json
-import socket
 import webbrowser
 from threading import Thread
 import time
 
+from infrastructure.redis_pool import get_redis
+
 PORT = 5000
 REDIS_HOST = '127.0.0.1'
 REDIS_PORT = 16379
@@ -14,32 +15,15 @@ REDIS_PASS = 'voltran2024'
 def get_redis_data():
     data = {"price": 0.0, "mode": "WAITING", "action": "LOADING", "confidence": 0}
     try:
-        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        s.settimeout(0.5)
-        s.connect((REDIS_HOST, REDIS_PORT))
-        s.sendall(f'AUTH {REDIS_PASS}\r\n'.encode())
-        s.recv(1024)
-        
-        # 1. GET REAL PRICE
-        s.sendall(b'GET godbrain:market:ticker\r\n')
-        price_resp = s.recv(1024).decode('utf-8', errors='ignore').strip()
-        
-        # Redis protocol parsing (\r\n90000...)
-        if '$' in price_resp:
-             lines = price_resp.split('\r\n')
-             for i, line in enumerate(lines):
-                 if line.startswith('$'):
-                     try: data['price'] = float(lines[i+1])
-                     except: pass
-        
-        # 2. GET STRATEGY
-        s.sendall(b'GET godbrain:model:linear\r\n')
-        strat_resp = s.recv(4096).decode('utf-8', errors='ignore')
-        
-        if '{' in strat_resp:
-            start = strat_resp.find('{')
-            end = strat_resp.rfind('}') + 1
-            model = json.loads(strat_resp[start:end])
+        r = get_redis("dashboard", host=REDIS_HOST, port=REDIS_PORT, password=REDIS_PASS,
+                      socket_timeout=0.5, socket_connect_timeout=0.5)
+        # 1. REAL PRICE + 2. STRATEGY in one round trip
+        price, strat = r.mget(["godbrain:market:ticker", "godbrain:model:linear"])
+        try: data['price'] = float(price)
+        except: pass
+
+        if strat:
+            model = json.loads(strat)
             data['mode'] = model.get('version', 'UNK')
             
             # Recalculate Logic based on REAL PRICE
@@ -57,7 +41,6 @@ def get_redis_data():
             if conf > thr: data['action'] = "SNIPE! [BUY]"
             else: data['action'] = "WAITING..."
 
-        s.close()
     except:
         pass
     return data
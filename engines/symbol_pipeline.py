@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+"""
+GODBRAIN v5 – SymbolPipeline
+Runs one orchestrator cycle for all trading pairs concurrently.
+
+Stages per cycle:
+  1) fetch    – balance, tickers and every symbol's OHLCV fanned out at once
+  2) decide   – DecisionEngine.run_symbol_cycle for all symbols concurrently
+  3) execute  – trades one at a time (each sizes off the margin left by the last)
+
+Every fetch and decision has its own timeout, so one slow symbol only
+costs that symbol. Order placement is never timed out: cancelling it
+could abandon an order the exchange already accepted. Works with ccxt.async_support clients; sync clients are run
+in a worker thread so they never block the event loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import pandas as pd
+
+from execution.account_state import AccountState
+from execution.executor import call_exchange
+from ultimate_pack.feeds.candle_store import CandleRing, CandleStore
+
+
+OHLCV_COLUMNS = ["timestamp", "open", "high", "low", "close", "vol"]
+
+
+@dataclass
+class PipelineConfig:
+    timeframe: str = "1h"
+    ohlcv_limit: int = 100
+    fetch_timeout: float = 10.0       # per-symbol OHLCV, balance, tickers
+    decision_timeout: float = 15.0    # per-symbol DecisionEngine cycle
+    equity_fallback: float = 1000.0   # used when there is no exchange / balance
+
+
+@dataclass
+class CycleReport:
+    """What one cycle did and where the time went (seconds)."""
+    stages: Dict[str, float] = field(default_factory=dict)
+    symbols: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+    balance: Optional[Dict] = None
+    equity_usd: float = 0.0
+    per_coin_equity: float = 0.0
+    decisions: Dict[str, Dict] = field(default_factory=dict)
+    orders: Dict[str, Any] = field(default_factory=dict)
+
+    def record(self, symbol: str, stage: str, seconds: float) -> None:
+        self.symbols.setdefault(symbol, {})[stage] = seconds
+
+
+class SymbolPipeline:
+    """
+    Concurrent per-symbol fetch → decide → execute pipeline for agg.py.
+
+    Usage:
+        pipeline = SymbolPipeline(okx, decision_engine, executor, signal_filters)
+        report = await pipeline.run_cycle(config.TRADING_PAIRS, voltran_factor, voltran_score)
+        print(report.stages)   # {'fetch': 0.41, 'decide': 0.12, 'execute': 0.0, 'total': 0.53}
+    """
+
+    def __init__(
+        self,
+        exchange: Any,
+        decision_engine: Any,
+        executor: Any,
+        signal_filters: Dict[str, Any],
+        config: Optional[PipelineConfig] = None,
+        candles: Optional[CandleStore] = None,
+        account: Optional[AccountState] = None,
+    ) -> None:
+        self.exchange = exchange
+        self.decision_engine = decision_engine
+        self.executor = executor
+        self.signal_filters = signal_filters
+        self.config = config or PipelineConfig()
+        # With a CandleStore only new/updated bars are fetched each cycle
+        self.candles = candles
+        # Balance / tickers fetched here also refresh the executor's local state
+        self.account = account
+
+    # ------------------------------------------------------------------
+    # Stage 1: fetch
+    # ------------------------------------------------------------------
+
+    async def _timed(self, report: CycleReport, key: str, stage: str, coro, timeout: Optional[float]):
+        """Await coro (with a timeout unless None); record its time, return None on failure."""
+        start = time.perf_counter()
+        try:
+            if timeout is None:
+                return await coro
+            return await asyncio.wait_for(coro, timeout)
+        except asyncio.TimeoutError:
+            report.errors[key] = f"{stage} timeout after {timeout:.0f}s"
+        except Exception as e:
+            report.errors[key] = f"{stage} error: {e}"
+        finally:
+            report.record(key, stage, time.perf_counter() - start)
+        return None
+
+    async def _fetch_ohlcv(self, symbol: str) -> Union[pd.DataFrame, CandleRing, None]:
+        if self.candles is not None:
+            since, limit = self.candles.fetch_window(symbol, self.config.timeframe)
+            raw = await call_exchange(
+                self.exchange.fetch_ohlcv, symbol, self.config.timeframe, since=since, limit=limit
+            )
+            ring = self.candles.update(symbol, raw or [])
+            return ring if len(ring) else None
+
+        raw = await call_exchange(
+            self.exchange.fetch_ohlcv, symbol, self.config.timeframe, limit=self.config.ohlcv_limit
+        )
+        if not raw:
+            return None
+        return pd.DataFrame(raw, columns=OHLCV_COLUMNS)
+
+    async def fetch_all(
+        self, symbols: List[str], report: CycleReport
+    ) -> Tuple[Optional[Dict], Dict[str, float], Dict[str, Any]]:
+        """Balance, last prices and OHLCV (frames or candle rings), all requested at once."""
+        if not self.exchange:
+            return None, {}, {}
+
+        timeout = self.config.fetch_timeout
+        balance_task = self._timed(
+            report, "_balance", "balance", call_exchange(self.exchange.fetch_balance), timeout
+        )
+        tickers_task = self._timed(
+            report, "_tickers", "tickers", call_exchange(self.exchange.fetch_tickers, symbols), timeout
+        )
+        ohlcv_tasks = [
+            self._timed(report, symbol, "fetch", self._fetch_ohlcv(symbol), timeout)
+            for symbol in symbols
+        ]
+        balance, tickers, *frames = await asyncio.gather(balance_task, tickers_task, *ohlcv_tasks)
+
+        prices = {}
+        for symbol, ticker in (tickers or {}).items():
+            if ticker and ticker.get("last"):
+                prices[symbol] = float(ticker["last"])
+        ohlcv = {symbol: df for symbol, df in zip(symbols, frames) if df is not None}
+        return balance, prices, ohlcv
+
+    def split_equity(self, balance: Optional[Dict], num_pairs: int) -> Tuple[float, float]:
+        """(total equity, equity per pair). Falls back like the old loop."""
+        if not balance:
+            fallback = self.config.equity_fallback
+            return fallback, fallback
+        equity_usd = float(balance["total"].get("USDT", self.config.equity_fallback))
+        return equity_usd, equity_usd / (num_pairs or 1)
+
+    # ------------------------------------------------------------------
+    # Full cycle
+    # ------------------------------------------------------------------
+
+    async def run_cycle(self, symbols: List[str], voltran_factor: float, voltran_score: float) -> CycleReport:
+        """Fetch, decide and execute for every symbol; returns the cycle report."""
+        report = CycleReport()
+        cycle_start = time.perf_counter()
+
+        # 1) Fetch
+        start = time.perf_counter()
+        balance, prices, ohlcv = await self.fetch_all(symbols, report)
+        report.balance = balance
+        if self.account is not None:
+            self.account.apply_balance(balance)
+            self.account.apply_tickers({s: {"last": p} for s, p in prices.items()})
+        report.equity_usd, report.per_coin_equity = self.split_equity(balance, len(symbols))
+        report.stages["fetch"] = time.perf_counter() - start
+
+        # 2) Decide (all symbols with data, concurrently)
+        start = time.perf_counter()
+        ready = [s for s in symbols if s in ohlcv]
+        results = await asyncio.gather(*[
+            self._timed(
+                report, symbol, "decide",
+                self.decision_engine.run_symbol_cycle(
+                    symbol=symbol,
+                    equity_usd=report.equity_usd,
+                    per_coin_equity=report.per_coin_equity,
+                    ohlcv=ohlcv[symbol],
+                    voltran_factor=voltran_factor,
+                    voltran_score=voltran_score,
+                    signal_filter=self.signal_filters[symbol],
+                ),
+                self.config.decision_timeout,
+            )
+            for symbol in ready
+        ])
+        report.decisions = {s: r for s, r in zip(ready, results) if r}
+        report.stages["decide"] = time.perf_counter() - start
+
+        # 3) Execute (serial: each trade sizes off the margin the previous one left).
+        #    No timeout: a cancelled placement may still have reached the exchange.
+        start = time.perf_counter()
+        for symbol, result in report.decisions.items():
+            if result.get("type") != "execute":
+                continue
+            report.orders[symbol] = await self._timed(
+                report, symbol, "execute",
+                self.executor.execute_trade(
+                    symbol, result["raw_action"], result["size_usd"], price=prices.get(symbol)
+                ),
+                None,
+            )
+        report.stages["execute"] = time.perf_counter() - start
+
+        report.stages["total"] = time.perf_counter() - cycle_start
+        return report
@@ -1,12 +1,14 @@
 # -*- coding: utf-8 -*-
 """
 GODBRAIN - Advanced Execution
-TWAP, VWAP, Iceberg, Smart Routing
+TWAP, VWAP, Iceberg, Smart Routing, shared order dispatch
 """
 
 from .twap import TWAPExecutor
 from .vwap import VWAPExecutor
 from .iceberg import IcebergExecutor
 from .smart_router import SmartOrderRouter
+from .order_dispatcher import ChildOrder, OrderDispatcher, RealClock, SimulatedClock
 
-__all__ = ['TWAPExecutor', 'VWAPExecutor', 'IcebergExecutor', 'SmartOrderRouter']
+__all__ = ['TWAPExecutor', 'VWAPExecutor', 'IcebergExecutor', 'SmartOrderRouter',
+           'ChildOrder', 'OrderDispatcher', 'RealClock', 'SimulatedClock']
@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+"""
+GODBRAIN ACCOUNT STATE
+Local balance / position / ticker snapshot plus a market metadata cache,
+so GodbrainExecutor can size orders without REST round trips.
+
+Sources, in order of preference:
+  1) push: ccxt.pro watch_balance / watch_positions / watch_tickers
+  2) whatever the orchestrator already fetched this cycle (apply_*)
+  3) REST reconciliation when a snapshot is older than max_age
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from execution.executor import call_exchange
+
+
+@dataclass(frozen=True)
+class MarketInfo:
+    """Contract metadata needed for sizing (cached once per symbol)."""
+    symbol: str
+    contract_size: float
+    amount_precision: Optional[float] = None
+    min_amount: Optional[float] = None
+
+
+class AccountState:
+    """
+    Push-updated account snapshot with REST reconciliation.
+
+    Usage:
+        account = AccountState(okx)
+        await account.start(config.TRADING_PAIRS)   # watchers + first reconcile
+        free = account.free()                        # local, no round trip
+        price = account.last_price("TIA/USDT:USDT")
+    """
+
+    def __init__(
+        self,
+        exchange: Any,
+        quote: str = "USDT",
+        max_age: float = 30.0,
+        reconcile_interval: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.exchange = exchange
+        self.quote = quote
+        self.max_age = max_age
+        self.reconcile_interval = reconcile_interval
+        self.clock = clock
+
+        self.balance: Dict[str, Dict[str, float]] = {"free": {}, "total": {}}
+        self.positions: Dict[str, Dict] = {}
+        self.tickers: Dict[str, float] = {}
+        self.markets: Dict[str, MarketInfo] = {}
+        self._updated: Dict[str, float] = {}
+        self._symbols: List[str] = []
+        self._tasks: List[asyncio.Task] = []
+
+    # ------------------------------------------------------------------
+    # Snapshot updates
+    # ------------------------------------------------------------------
+
+    def _touch(self, key: str) -> None:
+        self._updated[key] = self.clock()
+
+    def age(self, key: str) -> float:
+        """Seconds since ``key`` ('balance', 'positions', 'ticker:<symbol>') was updated."""
+        updated = self._updated.get(key)
+        return float("inf") if updated is None else self.clock() - updated
+
+    def is_fresh(self, key: str) -> bool:
+        return self.age(key) <= self.max_age
+
+    def apply_balance(self, balance: Optional[Dict]) -> None:
+        """ccxt balance structure (REST or watch_balance)."""
+        if not balance:
+            return
+        for side in ("free", "total"):
+            values = balance.get(side) or {}
+            self.balance[side] = {k: float(v) for k, v in values.items() if v is not None}
+        self._touch("balance")
+
+    def apply_tickers(self, tickers: Optional[Dict[str, Dict]]) -> None:
+        """ccxt tickers dict ({symbol: ticker}) or a single watch_ticker result."""
+        if not tickers:
+            return
+        if "symbol" in tickers and "last" in tickers:
+            tickers = {tickers["symbol"]: tickers}
+        for symbol, ticker in tickers.items():
+            if ticker and ticker.get("last"):
+                self.tickers[symbol] = float(ticker["last"])
+                self._touch(f"ticker:{symbol}")
+
+    def apply_positions(self, positions: Optional[Iterable[Dict]], replace: bool = False) -> None:
+        """
+        ccxt positions. watch_positions pushes only the ones that changed,
+        so they are merged by symbol and closed ones (0 contracts) dropped;
+        ``replace`` is for a full REST fetch_positions snapshot.
+        """
+        if positions is None:
+            return
+        if replace:
+            self.positions = {}
+        for p in positions:
+            symbol = p.get("symbol")
+            if not symbol:
+                continue
+            size = p.get("contracts", p.get("size"))
+            if size is not None and float(size) == 0:
+                self.positions.pop(symbol, None)
+            else:
+                self.positions[symbol] = p
+        self._touch("positions")
+
+    def reserve_margin(self, margin: float) -> None:
+        """Deduct margin of an order just placed until the next balance update."""
+        free = self.balance["free"]
+        free[self.quote] = max(0.0, free.get(self.quote, 0.0) - margin)
+
+    # ------------------------------------------------------------------
+    # Reads (local)
+    # ------------------------------------------------------------------
+
+    def free(self) -> float:
+        return self.balance["free"].get(self.quote, 0.0)
+
+    def total(self) -> float:
+        return self.balance["total"].get(self.quote, 0.0)
+
+    def last_price(self, symbol: str) -> Optional[float]:
+        """Last price if the ticker is fresh, else None."""
+        if not self.is_fresh(f"ticker:{symbol}"):
+            return None
+        return self.tickers.get(symbol)
+
+    def market(self, symbol: str) -> MarketInfo:
+        """Cached contract metadata; read from the client's loaded markets once."""
+        info = self.markets.get(symbol)
+        if info is None:
+            market = self.exchange.market(symbol)
+            limits = (market.get("limits") or {}).get("amount") or {}
+            info = MarketInfo(
+                symbol=symbol,
+                contract_size=float(market.get("contractSize") or 1.0),
+                amount_precision=(market.get("precision") or {}).get("amount"),
+                min_amount=limits.get("min"),
+            )
+            self.markets[symbol] = info
+        return info
+
+    # ------------------------------------------------------------------
+    # REST reconciliation
+    # ------------------------------------------------------------------
+
+    async def load_markets(self) -> None:
+        """Load exchange markets and warm the metadata cache."""
+        await call_exchange(self.exchange.load_markets)
+        for symbol in self._symbols:
+            try:
+                self.market(symbol)
+            except Exception as e:
+                print(f"[ACCOUNT] ⚠️ No market info for {symbol}: {e}")
+
+    async def reconcile(self, symbols: Optional[List[str]] = None) -> None:
+        """Refresh balance, positions and tickers over REST (concurrently)."""
+        symbols = symbols if symbols is not None else self._symbols
+        calls = {"balance": call_exchange(self.exchange.fetch_balance)}
+        if symbols:
+            calls["tickers"] = call_exchange(self.exchange.fetch_tickers, symbols)
+        if hasattr(self.exchange, "fetch_positions"):
+            calls["positions"] = call_exchange(self.exchange.fetch_positions, symbols or None)
+
+        results = await asyncio.gather(*calls.values(), return_exceptions=True)
+        for name, result in zip(calls, results):
+            if isinstance(result, Exception):
+                print(f"[ACCOUNT] ⚠️ {name} reconcile failed: {result}")
+            elif name == "balance":
+                self.apply_balance(result)
+            elif name == "tickers":
+                self.apply_tickers(result)
+            else:
+                self.apply_positions(result, replace=True)
+
+    async def ensure_balance(self) -> None:
+        """REST balance refresh only if the local snapshot is stale."""
+        if not self.is_fresh("balance"):
+            self.apply_balance(await call_exchange(self.exchange.fetch_balance))
+
+    # ------------------------------------------------------------------
+    # Push updates
+    # ------------------------------------------------------------------
+
+    async def _watch(self, name: str, watch: Callable, apply: Callable) -> None:
+        backoff = 1.0
+        while True:
+            try:
+                apply(await watch())
+                backoff = 1.0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"[ACCOUNT] ⚠️ {name} stream error: {e} (retry in {backoff:.0f}s)")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+    async def _reconcile_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.reconcile_interval)
+            await self.reconcile()
+
+    async def start(self, symbols: List[str]) -> None:
+        """Load markets, reconcile once, then follow push streams where supported."""
+        self._symbols = list(symbols)
+        await self.load_markets()
+        await self.reconcile()
+
+        ex = self.exchange
+        if hasattr(ex, "watch_balance"):
+            self._tasks.append(asyncio.create_task(self._watch("balance", ex.watch_balance, self.apply_balance)))
+        if hasattr(ex, "watch_positions"):
+            self._tasks.append(asyncio.create_task(self._watch("positions", ex.watch_positions, self.apply_positions)))
+        if hasattr(ex, "watch_tickers") and self._symbols:
+            self._tasks.append(asyncio.create_task(
+                self._watch("tickers", lambda: ex.watch_tickers(self._symbols), self.apply_tickers)
+            ))
+        self._tasks.append(asyncio.create_task(self._reconcile_loop()))
+        print(f"[ACCOUNT] Tracking {len(self._symbols)} symbols ({len(self._tasks) - 1} push streams)")
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
@@ -4,16 +4,42 @@ GODBRAIN EXECUTION ENGINE
 Handles OKX order placement, contract sizing, and leverage management.
 """
 
+import asyncio
+import inspect
 import math
 import time
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, TYPE_CHECKING
 from config_center import config
 
+if TYPE_CHECKING:
+    from execution.account_state import AccountState
+
+
+async def call_exchange(method, *args, **kwargs):
+    """
+    Call a ccxt method without blocking the event loop.
+
+    ccxt.async_support methods are awaited; sync client methods run in a
+    worker thread.
+    """
+    if inspect.iscoroutinefunction(method):
+        return await method(*args, **kwargs)
+    result = await asyncio.to_thread(method, *args, **kwargs)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
 class GodbrainExecutor:
     """Handles execution logic for OKX."""
     
-    def __init__(self, okx_client):
+    LEVERAGE = 10
+
+    def __init__(self, okx_client, account: Optional["AccountState"] = None):
         self.okx = okx_client
+        # With an AccountState, balance / price / contract size come from
+        # local snapshots and create_market_order is the only round trip
+        self.account = account
         self.last_set_leverage = {}
 
     def map_symbol(self, raw_symbol: str) -> str:
@@ -22,12 +48,56 @@ class GodbrainExecutor:
         base = raw_symbol.split(":")[0]
         return base.replace("/", "-") + "-SWAP"
 
-    async def get_amount_from_usd(self, symbol: str, action: str, size_usd: float) -> float:
-        """Calculates OKX contract amount from USD size."""
+    async def warm_up(self, symbols: List[str]) -> None:
+        """Lock leverage for every symbol up front, off the signal path."""
+        for symbol in symbols:
+            await self._ensure_leverage(self.map_symbol(symbol))
+
+    async def _ensure_leverage(self, market_symbol: str) -> None:
+        if market_symbol in self.last_set_leverage:
+            return
+        try:
+            await call_exchange(self.okx.set_leverage, self.LEVERAGE, market_symbol)
+            self.last_set_leverage[market_symbol] = time.time()
+            print(f"[EXEC] ⚡ 10x leverage locked for {market_symbol}")
+        except Exception as le:
+            print(f"[EXEC] ⚠️ Leverage set failed (might be already set): {le}")
+
+    async def _available_margin(self) -> Optional[float]:
+        """Free USDT margin: local snapshot if an AccountState is attached, else REST."""
         try:
-            market = self.okx.market(symbol)
-            price = self.okx.fetch_ticker(symbol)["last"]
-            contract_size = float(market.get("contractSize", 1.0))
+            if self.account is not None:
+                await self.account.ensure_balance()
+                current_free, current_total = self.account.free(), self.account.total()
+            else:
+                balance = await call_exchange(self.okx.fetch_balance)
+                # For cross-margin swap, use 'total' or check 'info' for actual available
+                current_free = float(balance["free"].get("USDT", 0))
+                current_total = float(balance["total"].get("USDT", 0))
+        except Exception as be:
+            print(f"[EXEC] ⚠️ Balance refresh failed: {be}")
+            return None
+
+        # Fallback: If free is 0, use 40% of TOTAL equity (conservative for cross-margin)
+        if current_free < 1:
+            # Use 40% of total - cross-margin reserves the rest
+            current_free = current_total * 0.40 if current_total > 5 else 0
+            if current_free > 0:
+                print(f"[EXEC] 🔓 UNLOCKED: Using 40% of total equity: ${current_free:.2f}")
+        return current_free
+
+    async def get_amount_from_usd(self, symbol: str, action: str, size_usd: float,
+                                  price: Optional[float] = None) -> float:
+        """Calculates OKX contract amount from USD size (price: prefetched last, optional)."""
+        try:
+            if price is None and self.account is not None:
+                price = self.account.last_price(symbol)
+            if price is None:
+                price = (await call_exchange(self.okx.fetch_ticker, symbol))["last"]
+            if self.account is not None:
+                contract_size = self.account.market(symbol).contract_size
+            else:
+                contract_size = float(self.okx.market(symbol).get("contractSize", 1.0))
             
             # Amount in contracts
             amount_contracts = size_usd / (price * contract_size)
@@ -44,10 +114,12 @@ class GodbrainExecutor:
             print(f"[EXEC] ❌ Amount calc error for {symbol}: {e}")
             return 0.0
 
-    async def execute_trade(self, symbol: str, action: str, size_usd: float) -> Optional[Dict]:
+    async def execute_trade(self, symbol: str, action: str, size_usd: float,
+                            price: Optional[float] = None) -> Optional[Dict]:
         """
         Executes a trade on OKX with 10x leverage and aggressive scaling.
         Fail-safe: returns None on any error to prevent partial/incorrect fills.
+        price: last price already fetched this cycle (skips a ticker request).
         """
         if not self.okx:
             print("[EXEC] ❌ No OKX client provided.")
@@ -61,30 +133,11 @@ class GodbrainExecutor:
         
         try:
             # 1) Setup Leverage (10x)
-            if market_symbol not in self.last_set_leverage:
-                try:
-                    self.okx.set_leverage(10, market_symbol)
-                    self.last_set_leverage[market_symbol] = time.time()
-                    print(f"[EXEC] ⚡ 10x leverage locked for {market_symbol}")
-                except Exception as le:
-                    print(f"[EXEC] ⚠️ Leverage set failed (might be already set): {le}")
+            await self._ensure_leverage(market_symbol)
 
             # 2) Refresh Available Margin for 'YA HERRO YA MERRO' scaling
-            try:
-                balance = self.okx.fetch_balance()
-                # For cross-margin swap, use 'total' or check 'info' for actual available
-                current_free = float(balance["free"].get("USDT", 0))
-                
-                # Fallback: If free is 0, use 40% of TOTAL equity (conservative for cross-margin)
-                if current_free < 1:
-                    current_total = float(balance["total"].get("USDT", 0))
-                    # Use 40% of total - cross-margin reserves the rest
-                    current_free = current_total * 0.40 if current_total > 5 else 0
-                    if current_free > 0:
-                        print(f"[EXEC] 🔓 UNLOCKED: Using 40% of total equity: ${current_free:.2f}")
-                        
-            except Exception as be:
-                print(f"[EXEC] ⚠️ Balance refresh failed: {be}")
+            current_free = await self._available_margin()
+            if current_free is None:
                 return None
 
             # 3) YA HERRO YA MERRO: Scale to full available margin with 10x
@@ -97,7 +150,7 @@ class GodbrainExecutor:
                 return None
 
             # 4) Calculate contracts
-            amount = await self.get_amount_from_usd(symbol, action, all_in_size_usd)
+            amount = await self.get_amount_from_usd(symbol, action, all_in_size_usd, price)
             
             if amount <= 0:
                 return None
@@ -106,7 +159,9 @@ class GodbrainExecutor:
             side = action.lower() # 'buy' or 'sell'
             print(f"[EXEC] 🚀 EXECUTE {action} {market_symbol} | Amount: {amount} contracts (~${all_in_size_usd:.0f})")
             
-            order = self.okx.create_market_order(market_symbol, side, amount)
+            order = await call_exchange(self.okx.create_market_order, market_symbol, side, amount)
+            if self.account is not None:
+                self.account.reserve_margin(all_in_size_usd / self.LEVERAGE)
             print(f"[EXEC] ✅ Order Placed: {order.get('id', 'N/A')}")
             return order
 
@@ -5,11 +5,14 @@ Show only partial size, refill on execution.
 """
 
 import asyncio
+import uuid
 from datetime import datetime
 from typing import Dict, List, Optional
 from dataclasses import dataclass
 import random
 
+from execution.order_dispatcher import ChildOrder, OrderDispatcher
+
 
 @dataclass
 class IcebergOrder:
@@ -30,18 +33,30 @@ class IcebergExecutor:
     
     Shows only a fraction of total size in the order book.
     Automatically refills when visible portion is executed.
+    With a dispatcher, each visible chunk is a child order submitted once
+    the previous one has filled.
     
     Usage:
         executor = IcebergExecutor(exchange_manager)
         order = await executor.execute('BTC', 'buy', 10, visible_qty=1)
+
+        executor = IcebergExecutor(dispatcher=dispatcher, venue='okx')
     """
     
-    def __init__(self, exchange_manager=None):
+    def __init__(self, exchange_manager=None, dispatcher: Optional[OrderDispatcher] = None,
+                 venue: str = "default"):
         self.exchange_manager = exchange_manager
+        self.dispatcher = dispatcher
+        self.venue = venue
         self._active_orders: Dict[str, IcebergOrder] = {}
+
+    def _now(self) -> datetime:
+        if self.dispatcher is not None:
+            return datetime.fromtimestamp(self.dispatcher.clock.time())
+        return datetime.now()
     
     async def execute(self, symbol: str, side: str, total_qty: float,
-                     visible_qty: float) -> IcebergOrder:
+                     visible_qty: float, parent_id: str = "") -> IcebergOrder:
         """
         Execute iceberg order.
         
@@ -50,6 +65,7 @@ class IcebergExecutor:
             side: 'buy' or 'sell'
             total_qty: Total quantity to execute
             visible_qty: Quantity visible in order book
+            parent_id: Reuse to retry idempotently; default is unique per call
         """
         order = IcebergOrder(
             symbol=symbol,
@@ -60,17 +76,23 @@ class IcebergExecutor:
             remaining_quantity=total_qty,
             fills=[],
             status='active',
-            start_time=datetime.now()
+            start_time=self._now()
         )
         
-        order_id = f"{symbol}_{datetime.now().timestamp()}"
+        order_id = parent_id or f"iceberg:{uuid.uuid4().hex}"
         self._active_orders[order_id] = order
         
         # Simulate execution
         while order.remaining_quantity > 0:
             # Place visible portion
             qty_to_place = min(visible_qty, order.remaining_quantity)
-            fill = await self._place_and_fill(symbol, side, qty_to_place)
+            if self.dispatcher is not None:
+                fill = await self._dispatch_chunk(order_id, symbol, side, qty_to_place, len(order.fills))
+                if fill is None:
+                    order.status = 'cancelled'
+                    return order
+            else:
+                fill = await self._place_and_fill(symbol, side, qty_to_place)
             
             order.fills.append(fill)
             order.executed_quantity += fill['quantity']
@@ -79,6 +101,22 @@ class IcebergExecutor:
         order.status = 'completed'
         return order
     
+    async def _dispatch_chunk(self, order_id: str, symbol: str, side: str,
+                              qty: float, chunk: int) -> Optional[Dict]:
+        """Submit one visible chunk through the dispatcher; None if it failed."""
+        try:
+            result = await self.dispatcher.submit(ChildOrder(
+                symbol, side, qty, venue=self.venue, parent_id=order_id, slice_id=chunk,
+            ))
+        except Exception as e:
+            print(f"[ICEBERG] ⚠️ Chunk {chunk} failed: {e}")
+            return None
+        return {
+            'quantity': result.get('filled') or qty,
+            'price': result.get('average') or result.get('price') or 0,
+            'timestamp': self._now().isoformat()
+        }
+    
     async def _place_and_fill(self, symbol: str, side: str, qty: float) -> Dict:
         """Place order and get fill."""
         if self.exchange_manager:
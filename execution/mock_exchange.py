@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+"""
+GODBRAIN MOCK EXCHANGE
+In-memory, async stand-in for the ccxt OKX swap client.
+
+Covers what the orchestrator and executor use: load_markets / market,
+fetch_balance / fetch_tickers / fetch_ticker / fetch_positions /
+fetch_ohlcv, set_leverage, create_market_order, the OrderDispatcher
+surface (create_order / create_orders / cancel_order / cancel_orders,
+advertised in ``has``), and the ccxt.pro style watch_balance /
+watch_tickers / watch_positions push streams.
+
+Every REST call is logged in ``calls`` and can carry simulated latency,
+so tests can count round trips and measure signal-to-order time.
+"""
+
+import asyncio
+import itertools
+import time
+from typing import Dict, List, Optional
+
+
+class MockExchange:
+    """
+    Usage:
+        ex = MockExchange(prices={"TIA/USDT:USDT": 5.0}, balance_usdt=1000, latency=0.05)
+        executor = GodbrainExecutor(ex, account=AccountState(ex))
+    """
+
+    def __init__(
+        self,
+        prices: Dict[str, float],
+        balance_usdt: float = 1000.0,
+        contract_sizes: Optional[Dict[str, float]] = None,
+        latency: float = 0.0,
+    ):
+        self.latency = latency
+        self.has = {"createOrders": True, "cancelOrders": True}
+        self.prices = dict(prices)
+        self.markets: Dict[str, Dict] = {}
+        for symbol in prices:
+            self.markets[symbol] = {
+                "symbol": symbol,
+                "id": symbol.split(":")[0].replace("/", "-") + "-SWAP",
+                "contractSize": (contract_sizes or {}).get(symbol, 1.0),
+                "precision": {"amount": 1.0},
+                "limits": {"amount": {"min": 1.0}},
+            }
+        self._by_id = {m["id"]: s for s, m in self.markets.items()}
+        self.free = float(balance_usdt)
+        self.total = float(balance_usdt)
+        self.leverage: Dict[str, int] = {}
+        self.positions: Dict[str, Dict] = {}
+        self.orders: List[Dict] = []
+        self.open_orders: Dict[str, Dict] = {}
+        self.calls: List[str] = []
+        self._order_ids = itertools.count(1)
+        self._waiters: Dict[str, List[asyncio.Future]] = {}
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    async def _rest(self, name: str) -> None:
+        self.calls.append(name)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    def _resolve(self, symbol: str) -> str:
+        return self._by_id.get(symbol, symbol)
+
+    def _balance(self) -> Dict:
+        used = self.total - self.free
+        return {
+            "free": {"USDT": self.free},
+            "used": {"USDT": used},
+            "total": {"USDT": self.total},
+        }
+
+    def _ticker(self, symbol: str) -> Dict:
+        price = self.prices[symbol]
+        return {"symbol": symbol, "last": price, "bid": price, "ask": price, "timestamp": int(time.time() * 1000)}
+
+    def _push(self, stream: str, value) -> None:
+        for fut in self._waiters.pop(stream, []):
+            if not fut.done():
+                fut.set_result(value)
+
+    async def _next(self, stream: str):
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(stream, []).append(fut)
+        return await fut
+
+    # ------------------------------------------------------------------
+    # Test controls
+    # ------------------------------------------------------------------
+
+    def set_price(self, symbol: str, price: float) -> None:
+        self.prices[symbol] = price
+        self._push("tickers", {symbol: self._ticker(symbol)})
+
+    def set_balance(self, free: float, total: Optional[float] = None) -> None:
+        self.free = free
+        self.total = free if total is None else total
+        self._push("balance", self._balance())
+
+    # ------------------------------------------------------------------
+    # ccxt REST surface
+    # ------------------------------------------------------------------
+
+    async def load_markets(self, reload: bool = False) -> Dict[str, Dict]:
+        await self._rest("load_markets")
+        return self.markets
+
+    def market(self, symbol: str) -> Dict:
+        return self.markets[self._resolve(symbol)]
+
+    async def fetch_balance(self, params=None) -> Dict:
+        await self._rest("fetch_balance")
+        return self._balance()
+
+    async def fetch_ticker(self, symbol: str) -> Dict:
+        await self._rest("fetch_ticker")
+        return self._ticker(self._resolve(symbol))
+
+    async def fetch_tickers(self, symbols: Optional[List[str]] = None) -> Dict[str, Dict]:
+        await self._rest("fetch_tickers")
+        return {s: self._ticker(s) for s in (symbols or self.prices) if s in self.prices}
+
+    async def fetch_positions(self, symbols: Optional[List[str]] = None) -> List[Dict]:
+        await self._rest("fetch_positions")
+        return [p for s, p in self.positions.items() if not symbols or s in symbols]
+
+    async def fetch_ohlcv(self, symbol: str, timeframe: str = "1h", since=None, limit: int = 100) -> List[List[float]]:
+        await self._rest("fetch_ohlcv")
+        price = self.prices[self._resolve(symbol)]
+        now = int(time.time() // 3600) * 3_600_000
+        start = since if since is not None else now - (limit - 1) * 3_600_000
+        return [[t, price, price, price, price, 0.0] for t in range(start, now + 1, 3_600_000)][:limit]
+
+    async def set_leverage(self, leverage: int, symbol: str, params=None) -> Dict:
+        await self._rest("set_leverage")
+        self.leverage[self._resolve(symbol)] = leverage
+        return {"leverage": leverage}
+
+    def _fill(self, symbol: str, side: str, amount: float, client_id: Optional[str] = None) -> Dict:
+        unified = self._resolve(symbol)
+        market = self.markets[unified]
+        price = self.prices[unified]
+        leverage = self.leverage.get(unified, 1)
+        margin = amount * market["contractSize"] * price / leverage
+        if margin > self.free + 1e-9:
+            raise ValueError(f"Insufficient margin: need {margin:.2f}, free {self.free:.2f}")
+
+        self.free -= margin
+        signed = amount if side == "buy" else -amount
+        pos = self.positions.setdefault(unified, {"symbol": unified, "contracts": 0.0, "side": side})
+        pos["contracts"] += signed
+        order = {
+            "id": str(next(self._order_ids)),
+            "clientOrderId": client_id,
+            "symbol": unified,
+            "side": side,
+            "amount": amount,
+            "filled": amount,
+            "price": price,
+            "average": price,
+            "status": "closed",
+        }
+        self.orders.append(order)
+        self._push("balance", self._balance())
+        self._push("positions", list(self.positions.values()))
+        return order
+
+    def _place(self, symbol: str, type: str, side: str, amount: float,
+               price: Optional[float] = None, params=None) -> Dict:
+        client_id = (params or {}).get("clientOrderId")
+        if type == "market":
+            return self._fill(symbol, side, amount, client_id)
+        order = {
+            "id": str(next(self._order_ids)),
+            "clientOrderId": client_id,
+            "symbol": self._resolve(symbol),
+            "side": side,
+            "amount": amount,
+            "filled": 0.0,
+            "price": price,
+            "status": "open",
+        }
+        self.orders.append(order)
+        self.open_orders[order["id"]] = order
+        return order
+
+    async def create_market_order(self, symbol: str, side: str, amount: float, params=None) -> Dict:
+        await self._rest("create_market_order")
+        return self._fill(symbol, side, amount)
+
+    async def create_order(self, symbol: str, type: str, side: str, amount: float,
+                           price: Optional[float] = None, params=None) -> Dict:
+        await self._rest("create_order")
+        return self._place(symbol, type, side, amount, price, params)
+
+    async def create_orders(self, orders: List[Dict], params=None) -> List[Dict]:
+        await self._rest("create_orders")
+        return [
+            self._place(o["symbol"], o["type"], o["side"], o["amount"], o.get("price"), o.get("params"))
+            for o in orders
+        ]
+
+    def _cancel(self, order_id: str) -> Dict:
+        order = self.open_orders.pop(order_id)
+        order["status"] = "canceled"
+        return order
+
+    async def cancel_order(self, id: str, symbol: Optional[str] = None, params=None) -> Dict:
+        await self._rest("cancel_order")
+        return self._cancel(id)
+
+    async def cancel_orders(self, ids: List[str], symbol: Optional[str] = None, params=None) -> List[Dict]:
+        await self._rest("cancel_orders")
+        return [self._cancel(i) for i in ids]
+
+    # ------------------------------------------------------------------
+    # ccxt.pro push surface
+    # ------------------------------------------------------------------
+
+    async def watch_balance(self, params=None) -> Dict:
+        return await self._next("balance")
+
+    async def watch_tickers(self, symbols: Optional[List[str]] = None) -> Dict[str, Dict]:
+        return await self._next("tickers")
+
+    async def watch_positions(self, symbols=None, params=None) -> List[Dict]:
+        return await self._next("positions")
+
+    async def close(self) -> None:
+        for futures in self._waiters.values():
+            for fut in futures:
+                fut.cancel()
+        self._waiters.clear()
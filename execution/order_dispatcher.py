@@ -0,0 +1,439 @@
+# -*- coding: utf-8 -*-
+"""
+GODBRAIN ORDER DISPATCHER
+Shared child-order queue for the execution algos (TWAP, VWAP, Iceberg,
+SmartOrderRouter).
+
+Per venue:
+  - priority queue of due child orders, plus a schedule of future ones
+  - TokenBucket rate limit (infrastructure/rate_limiter)
+  - batch place / cancel when the client supports create_orders / cancel_orders
+Across venues:
+  - idempotent client order IDs (same parent + slice -> same ID); orders
+    without a parent_id get a fresh one, so only explicit IDs deduplicate
+  - duplicate intents (same symbol, side, type, price and params) are
+    coalesced into one exchange order
+
+Time comes from a clock object: RealClock in production, SimulatedClock
+in tests so a 4h TWAP runs in milliseconds.
+"""
+
+import asyncio
+import hashlib
+import heapq
+import itertools
+import time
+import uuid
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from execution.executor import call_exchange
+from infrastructure.rate_limiter import TokenBucket
+
+
+# ============================================================================
+# CLOCKS
+# ============================================================================
+
+class RealClock:
+    """Wall clock; sleeps on the event loop."""
+
+    def time(self) -> float:
+        return time.time()
+
+    async def sleep(self, seconds: float) -> None:
+        await asyncio.sleep(max(0.0, seconds))
+
+    async def wait(self, event: asyncio.Event, timeout: Optional[float]) -> None:
+        """Wait for ``event`` or ``timeout`` seconds, whichever comes first."""
+        if timeout is None:
+            await event.wait()
+            return
+        sleeper = asyncio.ensure_future(self.sleep(timeout))
+        waiter = asyncio.ensure_future(event.wait())
+        try:
+            await asyncio.wait({sleeper, waiter}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            sleeper.cancel()
+            waiter.cancel()
+
+
+class SimulatedClock(RealClock):
+    """
+    Deterministic virtual time.
+
+    sleep() parks the caller on a heap; a driver task advances ``now`` to
+    the earliest wake-up after yielding to the event loop ``settle_steps``
+    times. This is a fixed budget, not idle detection: a task that needs
+    more than ``settle_steps`` hops between two sleeps sees time jump
+    under it, so raise it for deeper await chains. Only valid when nothing
+    awaits real I/O (mock venues, no latency).
+    """
+
+    def __init__(self, start: float = 0.0, settle_steps: int = 20):
+        self.now = float(start)
+        self.settle_steps = settle_steps
+        self._sleepers: List[Tuple[float, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._driver: Optional[asyncio.Task] = None
+
+    def time(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._sleepers, (self.now + max(0.0, seconds), next(self._seq), fut))
+        if self._driver is None or self._driver.done():
+            self._driver = asyncio.ensure_future(self._drive())
+        await fut
+
+    async def _drive(self) -> None:
+        while self._sleepers:
+            for _ in range(self.settle_steps):
+                await asyncio.sleep(0)
+            while self._sleepers and self._sleepers[0][2].done():
+                heapq.heappop(self._sleepers)      # cancelled sleeper
+            if not self._sleepers:
+                break
+            wake = self._sleepers[0][0]
+            self.now = max(self.now, wake)
+            while self._sleepers and self._sleepers[0][0] <= wake:
+                _, _, fut = heapq.heappop(self._sleepers)
+                if not fut.done():
+                    fut.set_result(None)
+
+
+# ============================================================================
+# ORDERS
+# ============================================================================
+
+def client_order_id(parent_id: str, slice_id: int, prefix: str = "gb") -> str:
+    """Deterministic exchange client ID (OKX clOrdId: <=32 alphanumerics)."""
+    digest = hashlib.sha1(f"{parent_id}:{slice_id}".encode()).hexdigest()
+    return f"{prefix}{digest[:24]}"
+
+
+@dataclass
+class ChildOrder:
+    """One exchange order an algo wants placed."""
+    symbol: str
+    side: str
+    amount: float
+    venue: str = "default"
+    type: str = "market"
+    price: Optional[float] = None
+    priority: int = 5                  # lower is sent first
+    not_before: float = 0.0            # clock time; 0 = as soon as possible
+    parent_id: str = ""
+    slice_id: int = 0
+    client_order_id: str = ""
+    params: Dict[str, Any] = field(default_factory=dict)
+
+    def __post_init__(self):
+        if not self.client_order_id:
+            # Ad-hoc orders are independent: never let two of them share an ID
+            self.parent_id = self.parent_id or f"adhoc:{uuid.uuid4().hex}"
+            self.client_order_id = client_order_id(self.parent_id, self.slice_id)
+
+    @property
+    def coalesce_key(self) -> Tuple:
+        # params are part of the intent: a reduceOnly slice must never
+        # ride along with an opening one (values repr'd, they may be lists)
+        params = tuple(sorted((k, repr(v)) for k, v in self.params.items()))
+        return (self.symbol, self.side, self.type, self.price, params)
+
+
+class _Lane:
+    """Queue, schedule and rate limit of a single venue."""
+
+    def __init__(self, name: str, client: Any, bucket: TokenBucket, max_batch: int):
+        self.name = name
+        self.client = client
+        self.bucket = bucket
+        has = getattr(client, "has", None) or {}
+        self.batch_place = bool(has.get("createOrders", hasattr(client, "create_orders")))
+        self.batch_cancel = bool(has.get("cancelOrders", hasattr(client, "cancel_orders")))
+        self.max_batch = max_batch if self.batch_place else 1
+        self.ready: List[Tuple[int, int, ChildOrder]] = []        # (priority, seq, order)
+        self.scheduled: List[Tuple[float, int, ChildOrder]] = []  # (not_before, seq, order)
+        self.wakeup = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+
+
+# ============================================================================
+# DISPATCHER
+# ============================================================================
+
+class OrderDispatcher:
+    """
+    Usage:
+        dispatcher = OrderDispatcher({"okx": okx}, rate=20, burst=60)
+        fill = await dispatcher.submit(ChildOrder("BTC/USDT:USDT", "buy", 1, venue="okx"))
+        ...
+        await dispatcher.close()
+    """
+
+    def __init__(
+        self,
+        venues: Dict[str, Any],
+        clock: Optional[RealClock] = None,
+        rate: float = 20.0,
+        burst: int = 60,
+        max_batch: int = 20,
+        history: int = 10_000,
+    ):
+        self.clock = clock or RealClock()
+        self.rate = rate
+        self.burst = burst
+        self.max_batch = max_batch
+        self.history = history
+        self._clients = dict(venues)
+        self._lanes: Dict[str, _Lane] = {}
+        self._futures: "OrderedDict[str, asyncio.Future]" = OrderedDict()
+        self._orders: Dict[str, ChildOrder] = {}
+        self._exchange_ids: Dict[str, str] = {}
+        self._siblings: Dict[str, Tuple[str, ...]] = {}   # coalesced children per cid
+        self._seq = itertools.count()
+        self.stats = {"submitted": 0, "deduplicated": 0, "coalesced": 0, "requests": 0, "orders": 0}
+
+    @property
+    def venues(self) -> List[str]:
+        return list(self._clients)
+
+    def _lane(self, venue: str) -> _Lane:
+        lane = self._lanes.get(venue)
+        if lane is None:
+            if venue not in self._clients:
+                raise ValueError(f"Unknown venue: {venue}")
+            bucket = TokenBucket(self.rate, self.burst, clock=self.clock.time)
+            lane = _Lane(venue, self._clients[venue], bucket, self.max_batch)
+            self._lanes[venue] = lane
+        if lane.task is None or lane.task.done():
+            lane.task = asyncio.ensure_future(self._run(lane))
+        return lane
+
+    # ------------------------------------------------------------------
+    # Submission
+    # ------------------------------------------------------------------
+
+    def submit(self, order: ChildOrder) -> asyncio.Future:
+        """
+        Queue a child order; returns a future resolving to the exchange
+        order dict. Resubmitting a client ID that is queued, in flight or
+        filled returns the original future instead of a second order.
+        """
+        existing = self._futures.get(order.client_order_id)
+        if existing is not None:
+            self.stats["deduplicated"] += 1
+            return existing
+
+        lane = self._lane(order.venue)
+        fut = asyncio.get_running_loop().create_future()
+        self._futures[order.client_order_id] = fut
+        self._orders[order.client_order_id] = order
+        self._trim_history()
+        self.stats["submitted"] += 1
+
+        if order.not_before > self.clock.time():
+            heapq.heappush(lane.scheduled, (order.not_before, next(self._seq), order))
+        else:
+            heapq.heappush(lane.ready, (order.priority, next(self._seq), order))
+        lane.wakeup.set()
+        return fut
+
+    def submit_many(self, orders: Iterable[ChildOrder]) -> List[asyncio.Future]:
+        return [self.submit(o) for o in orders]
+
+    def _trim_history(self) -> None:
+        while len(self._futures) > self.history:
+            cid, fut = next(iter(self._futures.items()))
+            if not fut.done():
+                break
+            del self._futures[cid]
+            self._orders.pop(cid, None)
+            self._exchange_ids.pop(cid, None)
+            self._siblings.pop(cid, None)
+
+    # ------------------------------------------------------------------
+    # Cancellation
+    # ------------------------------------------------------------------
+
+    async def cancel(self, client_ids: Iterable[str]) -> Dict[str, str]:
+        """
+        Cancel child orders. Queued ones are dropped locally; ones already
+        on the exchange are cancelled in one request per venue/symbol where
+        the client supports cancel_orders. A coalesced exchange order is
+        only cancelled when every child sharing it is in the request; the
+        others are reported as "coalesced" and left alone.
+        """
+        result: Dict[str, str] = {}
+        remote: Dict[Tuple[str, str], List[str]] = defaultdict(list)
+        requested = dict.fromkeys(client_ids)
+        for cid in requested:
+            order = self._orders.get(cid)
+            fut = self._futures.get(cid)
+            if order is None or fut is None:
+                result[cid] = "unknown"
+            elif self._dequeue(order):
+                fut.set_result({"clientOrderId": cid, "status": "canceled", "filled": 0.0})
+                result[cid] = "canceled"
+            elif cid in self._exchange_ids:
+                if not all(c in requested for c in self._siblings.get(cid, ())):
+                    result[cid] = "coalesced"
+                    continue
+                remote[(order.venue, order.symbol)].append(cid)
+            else:
+                result[cid] = "in_flight"
+
+        for (venue, symbol), cids in remote.items():
+            lane = self._lanes[venue]
+            ids = list(dict.fromkeys(self._exchange_ids[c] for c in cids))  # coalesced share one
+            calls = [(lane.client.cancel_orders, ids)] if lane.batch_cancel else \
+                    [(lane.client.cancel_order, i) for i in ids]
+            try:
+                for method, arg in calls:
+                    await self._acquire(lane)
+                    await call_exchange(method, arg, symbol)
+                    self.stats["requests"] += 1
+                result.update({c: "canceled" for c in cids})
+            except Exception as e:
+                print(f"[DISPATCH] ⚠️ Cancel failed on {venue} {symbol}: {e}")
+                result.update({c: "error" for c in cids})
+        return result
+
+    def _dequeue(self, order: ChildOrder) -> bool:
+        lane = self._lanes.get(order.venue)
+        if lane is None:
+            return False
+        for heap in (lane.ready, lane.scheduled):
+            for i, entry in enumerate(heap):
+                if entry[2] is order:
+                    heap[i] = heap[-1]
+                    heap.pop()
+                    heapq.heapify(heap)
+                    return True
+        return False
+
+    # ------------------------------------------------------------------
+    # Venue loop
+    # ------------------------------------------------------------------
+
+    async def _acquire(self, lane: _Lane) -> None:
+        while not lane.bucket.acquire(1, wait=False):
+            await self.clock.sleep(lane.bucket.wait_time(1))
+
+    def _promote(self, lane: _Lane) -> None:
+        now = self.clock.time()
+        while lane.scheduled and lane.scheduled[0][0] <= now:
+            _, seq, order = heapq.heappop(lane.scheduled)
+            heapq.heappush(lane.ready, (order.priority, seq, order))
+
+    def _take_batch(self, lane: _Lane) -> List[List[ChildOrder]]:
+        """Pop up to max_batch exchange orders; each is a group of coalesced children."""
+        groups: "OrderedDict[Tuple, List[ChildOrder]]" = OrderedDict()
+        while lane.ready:
+            order = lane.ready[0][2]
+            if order.coalesce_key not in groups and len(groups) >= lane.max_batch:
+                break
+            heapq.heappop(lane.ready)
+            groups.setdefault(order.coalesce_key, []).append(order)
+        return list(groups.values())
+
+    async def _run(self, lane: _Lane) -> None:
+        while True:
+            self._promote(lane)
+            if not lane.ready:
+                lane.wakeup.clear()
+                timeout = lane.scheduled[0][0] - self.clock.time() if lane.scheduled else None
+                await self.clock.wait(lane.wakeup, timeout)
+                continue
+
+            await self._acquire(lane)
+            self._promote(lane)
+            groups = self._take_batch(lane)
+            if not groups:
+                # Everything ready was cancelled while we waited for a token
+                lane.bucket.release(1)
+                continue
+            await self._send(lane, groups)
+
+    async def _send(self, lane: _Lane, groups: List[List[ChildOrder]]) -> None:
+        requests = []
+        for group in groups:
+            head = group[0]
+            amount = sum(o.amount for o in group)
+            cid = head.client_order_id if len(group) == 1 else \
+                client_order_id("+".join(o.client_order_id for o in group), 0)
+            requests.append({
+                "symbol": head.symbol,
+                "type": head.type,
+                "side": head.side,
+                "amount": amount,
+                "price": head.price,
+                "params": {**head.params, "clientOrderId": cid},
+            })
+            self.stats["coalesced"] += len(group) - 1
+
+        self.stats["requests"] += 1
+        self.stats["orders"] += len(requests)
+        try:
+            if lane.batch_place and len(requests) > 1:
+                results = await call_exchange(lane.client.create_orders, requests)
+            else:
+                r = requests[0]
+                results = [await call_exchange(
+                    lane.client.create_order, r["symbol"], r["type"], r["side"],
+                    r["amount"], r["price"], r["params"],
+                )]
+        except Exception as e:
+            print(f"[DISPATCH] ⚠️ {lane.name} order request failed: {e}")
+            for group in groups:
+                for order in group:
+                    self._fail(order, e)
+            return
+
+        results = list(results or [])
+        if len(results) < len(groups):
+            missing = RuntimeError(
+                f"{lane.name} returned {len(results)} results for {len(groups)} orders")
+            print(f"[DISPATCH] ⚠️ {missing}")
+            for group in groups[len(results):]:
+                for order in group:
+                    self._fail(order, missing)
+
+        for group, request, result in zip(groups, requests, results):
+            for order in group:
+                share = order.amount / request["amount"] if request["amount"] else 0.0
+                fill = dict(result)
+                fill["clientOrderId"] = order.client_order_id
+                fill["amount"] = order.amount
+                if fill.get("filled") is not None:
+                    fill["filled"] = fill["filled"] * share
+                if len(group) > 1:
+                    fill["coalesced"] = len(group)
+                if result.get("id") is not None:
+                    self._exchange_ids[order.client_order_id] = result["id"]
+                    if len(group) > 1:
+                        self._siblings[order.client_order_id] = tuple(
+                            o.client_order_id for o in group)
+                fut = self._futures.get(order.client_order_id)
+                if fut is not None and not fut.done():
+                    fut.set_result(fill)
+
+    def _fail(self, order: ChildOrder, error: Exception) -> None:
+        # Forget the ID so the caller can retry it; the exchange rejects a
+        # duplicate clOrdId if the failed request actually went through.
+        fut = self._futures.pop(order.client_order_id, None)
+        self._orders.pop(order.client_order_id, None)
+        if fut is not None and not fut.done():
+            fut.set_exception(error)
+
+    async def close(self) -> None:
+        tasks = [lane.task for lane in self._lanes.values() if lane.task]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for fut in self._futures.values():
+            if not fut.done():
+                fut.cancel()
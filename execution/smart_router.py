@@ -4,10 +4,13 @@
 Route orders to optimal exchanges.
 """
 
+import uuid
 from datetime import datetime
 from typing import Dict, List, Optional
 from dataclasses import dataclass
 
+from execution.order_dispatcher import ChildOrder, OrderDispatcher
+
 
 @dataclass
 class VenueScore:
@@ -41,10 +44,14 @@ class SmartOrderRouter:
     - Liquidity analysis
     - Fee optimization
     - Latency consideration
+    
+    Routed orders are placed through an OrderDispatcher whose venue names
+    match the router's (execute_routed).
     """
     
-    def __init__(self, exchange_manager=None):
+    def __init__(self, exchange_manager=None, dispatcher: Optional[OrderDispatcher] = None):
         self.exchange_manager = exchange_manager
+        self.dispatcher = dispatcher
         self.venues = ['binance', 'okx', 'bybit', 'coinbase']
         
         # Fee structure (in bps)
@@ -146,6 +153,36 @@ class SmartOrderRouter:
         
         return orders
     
+    async def execute_routed(self, orders: List[RoutedOrder], parent_id: str = "",
+                             priority: int = 5) -> List[Optional[Dict]]:
+        """
+        Place routed orders through the dispatcher, one child per venue.
+        Sets each order's status to 'filled' or 'failed'; returns the fills.
+        """
+        if self.dispatcher is None:
+            raise ValueError("execute_routed requires a dispatcher")
+        unknown = sorted({o.exchange for o in orders} - set(self.dispatcher.venues))
+        if unknown:
+            # Reject the whole route before anything is queued
+            raise ValueError(f"Unknown venue(s): {', '.join(unknown)}")
+        
+        parent_id = parent_id or f"sor:{uuid.uuid4().hex}"
+        fills = self.dispatcher.submit_many(
+            ChildOrder(o.symbol, o.side, o.quantity, venue=o.exchange, priority=priority,
+                       parent_id=parent_id, slice_id=i)
+            for i, o in enumerate(orders)
+        )
+        results = []
+        for order, fill in zip(orders, fills):
+            try:
+                results.append(await fill)
+                order.status = 'filled'
+            except Exception as e:
+                print(f"[SOR] ⚠️ {order.exchange} {order.symbol} failed: {e}")
+                results.append(None)
+                order.status = 'failed'
+        return results
+    
     async def execution_quality_report(self, orders: List[RoutedOrder]) -> Dict:
         """Generate execution quality report."""
         if not orders:
@@ -5,10 +5,13 @@ Split orders across time to minimize market impact.
 """
 
 import asyncio
+import uuid
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 from dataclasses import dataclass, field
 
+from execution.order_dispatcher import ChildOrder, OrderDispatcher
+
 
 @dataclass
 class TWAPSlice:
@@ -52,18 +55,30 @@ class TWAPExecutor:
     Time-Weighted Average Price execution.
     
     Splits large orders into equal time slices to minimize market impact.
+    With a dispatcher, every slice is queued up front with its target time
+    and the dispatcher releases it on schedule (under its clock).
     
     Usage:
         executor = TWAPExecutor(exchange_manager)
         report = await executor.execute('BTC', 'buy', 10, duration_minutes=60, slices=12)
+
+        executor = TWAPExecutor(dispatcher=dispatcher, venue='okx')
     """
     
-    def __init__(self, exchange_manager=None):
+    def __init__(self, exchange_manager=None, dispatcher: Optional[OrderDispatcher] = None,
+                 venue: str = "default"):
         self.exchange_manager = exchange_manager
+        self.dispatcher = dispatcher
+        self.venue = venue
         self._active_orders: Dict[str, List[TWAPSlice]] = {}
+
+    def _now(self) -> datetime:
+        if self.dispatcher is not None:
+            return datetime.fromtimestamp(self.dispatcher.clock.time())
+        return datetime.now()
     
     async def execute(self, symbol: str, side: str, total_qty: float,
-                     duration_minutes: int, slices: int = 10) -> TWAPReport:
+                     duration_minutes: int, slices: int = 10, parent_id: str = "") -> TWAPReport:
         """
         Execute TWAP order.
         
@@ -73,13 +88,12 @@ class TWAPExecutor:
             total_qty: Total quantity to execute
             duration_minutes: Total execution time
             slices: Number of slices
+            parent_id: Reuse to retry idempotently; default is unique per call
         """
         slice_qty = total_qty / slices
         interval = duration_minutes * 60 / slices  # seconds between slices
         
-        start_time = datetime.now()
-        executed_qty = 0
-        prices = []
+        start_time = self._now()
         
         # Create slices
         order_slices = []
@@ -91,20 +105,10 @@ class TWAPExecutor:
                 target_time=target_time
             ))
         
-        # Execute slices (simulated)
-        for slice_order in order_slices:
-            # Wait until target time (in real implementation)
-            # await asyncio.sleep(interval)
-            
-            price = await self._execute_slice(symbol, side, slice_order.quantity)
-            slice_order.executed = True
-            slice_order.execution_price = price
-            slice_order.execution_time = datetime.now()
-            
-            executed_qty += slice_order.quantity
-            prices.append(price)
-        
-        avg_price = sum(prices) / len(prices) if prices else 0
+        await self._run_slices(symbol, side, order_slices, parent_id)
+        executed = [s for s in order_slices if s.executed]
+        executed_qty = sum(s.quantity for s in executed)
+        avg_price = sum(s.execution_price for s in executed) / len(executed) if executed else 0
         
         return TWAPReport(
             symbol=symbol,
@@ -116,9 +120,44 @@ class TWAPExecutor:
             slices=slices,
             completion_pct=executed_qty / total_qty * 100,
             start_time=start_time,
-            end_time=datetime.now()
+            end_time=self._now()
         )
     
+    async def _run_slices(self, symbol: str, side: str, order_slices: List[TWAPSlice],
+                          parent_id: str = "") -> None:
+        """Execute slices in order, marking each one executed with its price."""
+        if self.dispatcher is None:
+            # Simulated: no waiting between slices
+            for slice_order in order_slices:
+                slice_order.execution_price = await self._execute_slice(symbol, side, slice_order.quantity)
+                slice_order.executed = True
+                slice_order.execution_time = datetime.now()
+            return
+        
+        # Two identical TWAPs started at the same instant must not share child IDs
+        parent_id = parent_id or f"twap:{uuid.uuid4().hex}"
+        self._active_orders[parent_id] = order_slices
+        fills = self.dispatcher.submit_many(
+            ChildOrder(
+                symbol, side, slice_order.quantity, venue=self.venue,
+                not_before=slice_order.target_time.timestamp(),
+                parent_id=parent_id, slice_id=slice_order.slice_id,
+            )
+            for slice_order in order_slices
+        )
+        try:
+            for slice_order, fill in zip(order_slices, fills):
+                try:
+                    result = await fill
+                except Exception as e:
+                    print(f"[TWAP] ⚠️ Slice {slice_order.slice_id} failed: {e}")
+                    continue
+                slice_order.execution_price = result.get('average') or result.get('price') or 0
+                slice_order.executed = True
+                slice_order.execution_time = self._now()
+        finally:
+            self._active_orders.pop(parent_id, None)
+    
     async def _execute_slice(self, symbol: str, side: str, qty: float) -> float:
         """Execute a single slice."""
         if self.exchange_manager:
@@ -149,16 +188,17 @@ class TWAPExecutor:
         slice_qtys = [qty * w / total_weight for w in volume_weights]
         
         interval = duration_minutes * 60 / slices
-        start_time = datetime.now()
-        executed_qty = 0
-        prices = []
-        
-        for i, slice_qty in enumerate(slice_qtys):
-            price = await self._execute_slice(symbol, side, slice_qty)
-            executed_qty += slice_qty
-            prices.append(price * slice_qty)  # Weighted
+        start_time = self._now()
+        order_slices = [
+            TWAPSlice(slice_id=i, quantity=slice_qty,
+                      target_time=start_time + timedelta(seconds=i * interval))
+            for i, slice_qty in enumerate(slice_qtys)
+        ]
         
-        avg_price = sum(prices) / executed_qty if executed_qty > 0 else 0
+        await self._run_slices(symbol, side, order_slices)
+        executed = [s for s in order_slices if s.executed]
+        executed_qty = sum(s.quantity for s in executed)
+        avg_price = sum(s.execution_price * s.quantity for s in executed) / executed_qty if executed_qty > 0 else 0
         
         return TWAPReport(
             symbol=symbol,
@@ -168,7 +208,7 @@ class TWAPExecutor:
             average_price=avg_price,
             target_duration_minutes=duration_minutes,
             slices=slices,
-            completion_pct=100,
+            completion_pct=executed_qty / qty * 100,
             start_time=start_time,
-            end_time=datetime.now()
+            end_time=self._now()
         )
@@ -5,10 +5,13 @@ Execute orders matching historical volume distribution.
 """
 
 import asyncio
+import uuid
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 from dataclasses import dataclass
 
+from execution.order_dispatcher import ChildOrder, OrderDispatcher
+
 
 @dataclass
 class VolumeProfile:
@@ -39,16 +42,28 @@ class VWAPExecutor:
     Volume-Weighted Average Price execution.
     
     Matches historical volume distribution to minimize market impact.
+    With a dispatcher, hourly slices are queued up front and released at
+    the start of their hour (under the dispatcher's clock).
     
     Usage:
         executor = VWAPExecutor(exchange_manager)
         profile = await executor.get_volume_profile('BTC', hours=24)
         report = await executor.execute('BTC', 'buy', 10, duration_minutes=120)
+
+        executor = VWAPExecutor(dispatcher=dispatcher, venue='okx')
     """
     
-    def __init__(self, exchange_manager=None):
+    def __init__(self, exchange_manager=None, dispatcher: Optional[OrderDispatcher] = None,
+                 venue: str = "default"):
         self.exchange_manager = exchange_manager
+        self.dispatcher = dispatcher
+        self.venue = venue
         self._volume_cache: Dict[str, VolumeProfile] = {}
+
+    def _now(self) -> datetime:
+        if self.dispatcher is not None:
+            return datetime.fromtimestamp(self.dispatcher.clock.time())
+        return datetime.now()
     
     async def get_volume_profile(self, symbol: str, hours: int = 24) -> VolumeProfile:
         """Get historical volume profile."""
@@ -81,16 +96,19 @@ class VWAPExecutor:
         return profile
     
     async def execute(self, symbol: str, side: str, total_qty: float,
-                     duration_minutes: int) -> VWAPReport:
+                     duration_minutes: int, parent_id: str = "") -> VWAPReport:
         """
         Execute VWAP order.
         
-        Distributes execution based on historical volume profile.
+        Distributes execution based on historical volume profile. Pass
+        ``parent_id`` to retry idempotently; by default every call is a
+        new parent order.
         """
         profile = await self.get_volume_profile(symbol)
         
         # Calculate slices based on volume distribution
-        current_hour = datetime.now().hour
+        start_time = self._now()
+        current_hour = start_time.hour
         hours_needed = min(duration_minutes // 60 + 1, 24)
         
         # Get volume weights for execution period
@@ -102,13 +120,18 @@ class VWAPExecutor:
         total_weight = sum(weights)
         slice_qtys = [total_qty * w / total_weight for w in weights]
         
-        start_time = datetime.now()
         executed_qty = 0
         total_value = 0
         market_vwap_value = 0
         
-        for i, slice_qty in enumerate(slice_qtys):
-            price = await self._execute_slice(symbol, side, slice_qty)
+        if self.dispatcher is not None:
+            prices = await self._dispatch_slices(symbol, side, slice_qtys, start_time, parent_id)
+        else:
+            prices = [await self._execute_slice(symbol, side, q) for q in slice_qtys]
+        
+        for slice_qty, price in zip(slice_qtys, prices):
+            if price is None:
+                continue
             market_price = price * (1 + 0.0001)  # Mock market VWAP
             
             executed_qty += slice_qty
@@ -130,9 +153,29 @@ class VWAPExecutor:
             duration_minutes=duration_minutes,
             participation_rate=0.1,  # 10% of market volume
             start_time=start_time,
-            end_time=datetime.now()
+            end_time=self._now()
         )
     
+    async def _dispatch_slices(self, symbol: str, side: str, slice_qtys: List[float],
+                               start_time: datetime, parent_id: str = "") -> List[Optional[float]]:
+        """Queue one child per hour; None for slices that failed."""
+        start = start_time.timestamp()
+        parent_id = parent_id or f"vwap:{uuid.uuid4().hex}"
+        fills = self.dispatcher.submit_many(
+            ChildOrder(symbol, side, qty, venue=self.venue, not_before=start + i * 3600,
+                       parent_id=parent_id, slice_id=i)
+            for i, qty in enumerate(slice_qtys)
+        )
+        prices = []
+        for i, fill in enumerate(fills):
+            try:
+                result = await fill
+                prices.append(result.get('average') or result.get('price') or 0)
+            except Exception as e:
+                print(f"[VWAP] ⚠️ Slice {i} failed: {e}")
+                prices.append(None)
+        return prices
+    
     async def _execute_slice(self, symbol: str, side: str, qty: float) -> float:
         """Execute a single slice."""
         if self.exchange_manager:
@@ -8,11 +8,14 @@ import math
 import random
 import json
 import time
-from concurrent.futures import ProcessPoolExecutor
-from typing import List, Tuple
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Optional, Tuple
 
 import os
 
+import numpy as np
+
 try:
     import redis
     REDIS_AVAILABLE = True
@@ -27,6 +30,7 @@ REDIS_PORT = int(os.getenv('REDIS_PORT', '16379'))
 REDIS_PASS = os.getenv('REDIS_PASS', 'voltran2024')
 
 from config_center import config
+from genetics.population_eval import PopulationEvaluator
 
 POPULATION_SIZE = 50
 ITERATIONS = 5000
@@ -37,8 +41,16 @@ CHAOS_META_KEY = config.CH_META_KEY
 
 PHI = (1 + math.sqrt(5)) / 2
 
+@dataclass(frozen=True)
+class ChaosTrajectory:
+    """One universe path as arrays; index t is the state DNA sees before step t."""
+    returns: np.ndarray     # price change of step t
+    regime: np.ndarray      # get_regime() before step t
+    chaos: np.ndarray       # get_chaos_level() before step t
+
 class ChaosUniverse:
-    def __init__(self):
+    def __init__(self, noise: random.Random = None):
+        self.noise = noise or random
         self.lx, self.ly, self.lz = 1.0, 1.0, 1.0
         self.logistic_x = 0.5
         self.t = 0
@@ -61,7 +73,7 @@ class ChaosUniverse:
         logistic = (self.logistic_x - 0.5) * 2
         
         # Combine
-        combined = lorenz * 0.4 + logistic * 0.4 + random.gauss(0, 0.1) * 0.2
+        combined = lorenz * 0.4 + logistic * 0.4 + self.noise.gauss(0, 0.1) * 0.2
         return combined * 0.05
     
     def get_regime(self) -> int:
@@ -74,9 +86,64 @@ class ChaosUniverse:
         lyap = abs(math.log(abs(3.9 * (1 - 2*x)) + 0.001))
         return min(1.0, lyap / 2.0)
 
-def evaluate_cosmic(dna: List[int]) -> Tuple[float, float, float, float]:
-    """Returns: (final_capital, max_dd, sharpe, cosmic_harmony)"""
-    universe = ChaosUniverse()
+    @staticmethod
+    @lru_cache(maxsize=4)
+    def _deterministic_path(n_steps: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Noise-free part of n_steps steps: (lx, ly, logistic_x, signal).
+
+        lx/ly/logistic_x have n_steps + 1 entries (state before each step
+        plus the final one); signal is lorenz * 0.4 + logistic * 0.4 of
+        each step. Lorenz and the logistic map are the same for every seed,
+        so this is integrated once per process.
+        """
+        universe = ChaosUniverse()
+        lx = np.empty(n_steps + 1)
+        ly = np.empty(n_steps + 1)
+        logistic_x = np.empty(n_steps + 1)
+        x, y, z, q = universe.lx, universe.ly, universe.lz, universe.logistic_x
+        dt = 0.01
+        for t in range(n_steps):
+            lx[t], ly[t], logistic_x[t] = x, y, q
+            dx = 10 * (y - x) * dt
+            dy = (x * (28 - z) - y) * dt
+            dz = (x * y - 8/3 * z) * dt
+            x += dx
+            y += dy
+            z += dz
+            q = 3.9 * q * (1 - q)
+        lx[n_steps], ly[n_steps], logistic_x[n_steps] = x, y, q
+
+        signal = (lx[1:] + ly[1:]) / 50.0 * 0.4 + (logistic_x[1:] - 0.5) * 2 * 0.4
+        for arr in (lx, ly, logistic_x, signal):
+            arr.setflags(write=False)
+        return lx, ly, logistic_x, signal
+
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def trajectory(n_steps: int, seed: int) -> ChaosTrajectory:
+        """
+        Whole n_steps path as arrays, cached per (n_steps, seed).
+
+        Matches stepping a ChaosUniverse whose gauss noise is
+        ``np.random.default_rng(seed).normal(0, 0.1, n_steps)``.
+        """
+        lx, ly, logistic_x, signal = ChaosUniverse._deterministic_path(n_steps)
+        noise = np.random.default_rng(seed).normal(0, 0.1, n_steps)
+
+        x, y = lx[:-1], ly[:-1]
+        regime = np.where(x > 0, np.where(y > 0, 0, 1), np.where(y < 0, 2, 3))
+        lyap = np.abs(np.log(np.abs(3.9 * (1 - 2 * logistic_x[:-1])) + 0.001))
+        chaos = np.minimum(1.0, lyap / 2.0)
+
+        returns = (signal + noise * 0.2) * 0.05
+        for arr in (returns, regime, chaos):
+            arr.setflags(write=False)
+        return ChaosTrajectory(returns=returns, regime=regime, chaos=chaos)
+
+def evaluate_cosmic_stepwise(dna: List[int], universe: ChaosUniverse = None) -> Tuple[float, float, float, float]:
+    """Step-by-step reference for cosmic_stats(). Returns: (final_capital, max_dd, sharpe, cosmic_harmony)"""
+    universe = universe or ChaosUniverse()
     capital = STARTING_CAPITAL
     peak = capital
     max_dd = 0
@@ -132,6 +199,70 @@ def evaluate_cosmic(dna: List[int]) -> Tuple[float, float, float, float]:
     
     return capital, max_dd, sharpe, harmony
 
+def universe_tape(rng: np.random.Generator) -> ChaosTrajectory:
+    """Common trajectory for one generation."""
+    return ChaosUniverse.trajectory(ITERATIONS, int(rng.integers(2**32)))
+
+def phi_alignment(dna: np.ndarray) -> np.ndarray:
+    """Mean closeness of consecutive gene ratios to PHI, per DNA row."""
+    valid = dna[:, :5] > 0
+    ratio = dna[:, 1:] / np.where(valid, dna[:, :5], 1)
+    scores = np.where(valid, np.maximum(0, 1 - np.abs(ratio - PHI) / PHI), 0)
+    counts = valid.sum(axis=1)
+    return np.where(counts > 0, scores.sum(axis=1) / np.maximum(counts, 1), 0)
+
+def cosmic_stats(dna: np.ndarray, path: ChaosTrajectory) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    (final_capital, max_dd, sharpe, cosmic_harmony) for every DNA row.
+
+    Each step scales capital by (1 + 0.1 * risk * return), so the capital
+    paths of the whole population are one (pop x steps) cumprod. Steps
+    after the first non-positive capital are masked out, like the break in
+    evaluate_cosmic_stepwise().
+    """
+    n_pop = len(dna)
+    chaos_gene = np.where(path.chaos < 0.3, 4, 5)
+    risk = np.sqrt(dna[:, path.regime] / 100.0 * dna[:, chaos_gene] / 100.0)
+    risk = np.clip(risk, 0.05, 2.0)
+
+    pnl_rate = 0.1 * risk * path.returns
+    capital = STARTING_CAPITAL * np.cumprod(1 + pnl_rate, axis=1)
+    prev = np.concatenate([np.full((n_pop, 1), float(STARTING_CAPITAL)), capital[:, :-1]], axis=1)
+
+    # Early ruin: steps up to and including the first capital <= 0 count
+    alive = np.minimum.accumulate(capital > 0, axis=1)
+    walked = np.concatenate([np.ones((n_pop, 1), dtype=bool), alive[:, :-1]], axis=1)
+    final = capital[np.arange(n_pop), walked.sum(axis=1) - 1]
+
+    # Sharpe over the returns of surviving steps
+    n_returns = alive.sum(axis=1)
+    returns = np.where(alive, prev * pnl_rate / np.where(alive, capital, 1), 0)
+    avg = returns.sum(axis=1) / np.maximum(n_returns, 1)
+    std = np.sqrt((np.where(alive, returns - avg[:, None], 0) ** 2).sum(axis=1) / np.maximum(n_returns, 1))
+    sharpe = np.where((n_returns > 1) & (std > 0), avg / np.where(std > 0, std, 1) * math.sqrt(252), 0)
+
+    peak = np.maximum.accumulate(np.where(walked, np.maximum(capital, STARTING_CAPITAL), STARTING_CAPITAL), axis=1)
+    drawdown = np.where(walked & (peak > 0), (peak - capital) / peak, 0)
+    max_dd = np.maximum(0, drawdown.max(axis=1))
+
+    survival = np.where(final > STARTING_CAPITAL * 0.5, 1.0, 0.5)
+    dd_pen = np.maximum(0, 1 - max_dd * 2)
+    sharpe_bon = np.minimum(1, np.maximum(0, sharpe / 2))
+    harmony = (phi_alignment(dna) * 0.3 + (survival + dd_pen + sharpe_bon) / 3 * 0.7) * 100
+    return final, max_dd, sharpe, harmony
+
+def score_population(dna: np.ndarray, path: ChaosTrajectory) -> np.ndarray:
+    """Cosmic harmony of every DNA row on the same trajectory."""
+    return cosmic_stats(dna, path)[3]
+
+def evaluate_cosmic(dna: List[int], seed: Optional[int] = None) -> Tuple[float, float, float, float]:
+    """Returns: (final_capital, max_dd, sharpe, cosmic_harmony)"""
+    if seed is None:
+        seed = random.getrandbits(32)
+    path = ChaosUniverse.trajectory(ITERATIONS, seed)
+    stats = cosmic_stats(np.asarray([dna], dtype=np.float64), path)
+    return tuple(float(s[0]) for s in stats)
+
 def create_cosmic_dna() -> List[int]:
     base = random.randint(50, 150)
     return [
@@ -153,10 +284,6 @@ def mutate_cosmic(dna: List[int]) -> List[int]:
     new[idx] = max(10, min(500, new[idx]))
     return new
 
-def eval_wrapper(dna):
-    _, _, _, harmony = evaluate_cosmic(dna)
-    return dna, harmony
-
 def run_cosmic_evolution(redis_host=None, redis_port=None, redis_pass=None):
     # Use environment variables if not provided
     redis_host = redis_host or REDIS_HOST
@@ -183,11 +310,13 @@ def run_cosmic_evolution(redis_host=None, redis_port=None, redis_pass=None):
     best_ever_score = 0
     gen = 1
     
+    # Whole population trades the same trajectory each generation
+    evaluator = PopulationEvaluator(universe_tape, score_population)
+    
     while True:
         start_t = time.time()
         
-        with ProcessPoolExecutor() as ex:
-            results = list(ex.map(eval_wrapper, population))
+        results = evaluator.evaluate(population)
         
         results.sort(key=lambda x: x[1], reverse=True)
         best_dna, best_score = results[0]
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+🧬 POPULATION EVALUATOR - Common Random Numbers
+Scores a whole generation against one shared scenario tape.
+
+Each lab supplies two functions:
+    make_tape(rng)               -> scenario for this generation
+                                    (hands, spins, chaos trajectory)
+    score_population(dna, tape)  -> one fitness per row of a (pop, genes) array
+
+Every DNA sees the same cards / spins / trajectory, so differences in
+fitness come from the DNA rather than from luck of the draw, and the whole
+population is scored in one batched NumPy pass.
+"""
+
+from typing import Any, Callable, List, Optional, Tuple
+
+import numpy as np
+
+
+TapeFactory = Callable[[np.random.Generator], Any]
+PopulationScorer = Callable[[np.ndarray, Any], np.ndarray]
+
+
+class PopulationEvaluator:
+    """
+    One scenario tape per generation, shared by the whole population.
+
+    Usage:
+        evaluator = PopulationEvaluator(spin_tape, score_population, seed=42)
+        results = evaluator.evaluate(population)   # [(dna, score), ...]
+    """
+
+    def __init__(self, make_tape: TapeFactory, score_population: PopulationScorer,
+                 seed: Optional[int] = None):
+        self.make_tape = make_tape
+        self.score_population = score_population
+        self.rng = np.random.default_rng(seed)
+        self.tape = None
+        self.generation = 0
+
+    def next_tape(self) -> Any:
+        """Draw the scenario tape for the next generation."""
+        self.tape = self.make_tape(self.rng)
+        self.generation += 1
+        return self.tape
+
+    def score(self, population: List[List[int]], tape: Any = None) -> np.ndarray:
+        """Fitness of every DNA on ``tape`` (default: the current tape)."""
+        if tape is None:
+            tape = self.tape if self.tape is not None else self.next_tape()
+        dna = np.asarray(population, dtype=np.float64)
+        return np.asarray(self.score_population(dna, tape), dtype=np.float64)
+
+    def evaluate(self, population: List[List[int]]) -> List[Tuple[List[int], float]]:
+        """Draw a fresh tape and score the population on it."""
+        if not population:
+            return []
+        scores = self.score(population, self.next_tape())
+        return list(zip(population, scores.tolist()))
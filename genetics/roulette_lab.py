@@ -7,11 +7,12 @@ Tests DNA survival in pure random environment
 import random
 import json
 import time
-from concurrent.futures import ProcessPoolExecutor
 from typing import List, Tuple
 
 import os
 
+import numpy as np
+
 try:
     import redis
     REDIS_AVAILABLE = True
@@ -26,6 +27,7 @@ REDIS_PORT = int(os.getenv('REDIS_PORT', '16379'))
 REDIS_PASS = os.getenv('REDIS_PASS', 'voltran2024')
 
 from config_center import config
+from genetics.population_eval import PopulationEvaluator
 
 POPULATION_SIZE = 50
 SPINS_PER_EVAL = 10000
@@ -82,6 +84,107 @@ def evaluate_survival(dna: List[int]) -> Tuple[int, float, float, float]:
     
     return spins, bankroll, max_dd, score
 
+def spin_tape(rng: np.random.Generator) -> np.ndarray:
+    """Common spins for one generation: True where red wins."""
+    return rng.random(SPINS_PER_EVAL) < WIN_PROB
+
+def _loss_streaks(wins: np.ndarray) -> np.ndarray:
+    """Consecutive losses before each spin (shared by every DNA)."""
+    losses = np.cumsum(~wins)
+    reset = np.maximum.accumulate(np.where(wins, losses, 0))
+    after = losses - reset
+    return np.concatenate(([0], after[:-1]))
+
+def score_population(dna: np.ndarray, wins: np.ndarray) -> np.ndarray:
+    """
+    evaluate_survival() score of every DNA row on the same spins.
+
+    While bankroll >= 2 * bet the bet is just the DNA gene for the current
+    loss streak, so the bankroll path is one (pop x spins) cumsum. Once a
+    DNA's bankroll falls into the half-bankroll cap it is stepped from that
+    spin on, together with every other capped DNA: one vector update per
+    spin over the capped lanes.
+    """
+    n_pop, n_spins = len(dna), len(wins)
+    streak = np.minimum(5, _loss_streaks(wins))
+    sign = np.where(wins, 1.0, -1.0)
+
+    genes = np.clip(dna, MIN_BET, MAX_BET)
+    bets = genes[:, streak]
+    bankroll_path = np.empty((n_pop, n_spins + 1))
+    bankroll_path[:, 0] = STARTING_BANKROLL
+    np.multiply(bets, sign, out=bankroll_path[:, 1:])
+    np.cumsum(bankroll_path, axis=1, out=bankroll_path)
+    before = bankroll_path[:, :-1]
+    capped = before * 0.5 < bets
+    first_cap = capped.argmax(axis=1)
+    first_cap[~capped[np.arange(n_pop), first_cap]] = n_spins
+
+    spins = np.full(n_pop, n_spins)
+    bankroll = bankroll_path[np.arange(n_pop), first_cap]
+    peak = np.full(n_pop, float(STARTING_BANKROLL))
+    max_dd = np.zeros(n_pop)
+
+    for i in np.flatnonzero(first_cap):
+        path = bankroll_path[i, :first_cap[i] + 1]
+        high = np.maximum.accumulate(path)
+        peak[i] = high[-1]
+        max_dd[i] = ((high - path) / high).max()
+
+    # Capped tail: a lane joins at its first capped spin and is stepped like
+    # evaluate_survival until it busts. A win can only raise the peak and a
+    # loss can only deepen the drawdown, so each spin updates one of them.
+    tail = np.flatnonzero(first_cap < n_spins)
+    tail = tail[np.argsort(first_cap[tail], kind="stable")]
+    lanes = tail[:0]
+    bank = top = dd = np.empty(0)
+    lane_genes = genes[lanes]
+    joined = 0
+    spin = first_cap[tail[0]] if len(tail) else n_spins
+    while spin < n_spins:
+        start = joined
+        while joined < len(tail) and first_cap[tail[joined]] == spin:
+            joined += 1
+        if joined > start:
+            new = tail[start:joined]
+            lanes = np.concatenate([lanes, new])
+            bank = np.concatenate([bank, bankroll[new]])
+            top = np.concatenate([top, peak[new]])
+            dd = np.concatenate([dd, max_dd[new]])
+            lane_genes = genes[lanes]
+
+        if not len(lanes):
+            if joined == len(tail):
+                break
+            spin = first_cap[tail[joined]]
+            continue
+
+        bet = np.minimum(bank * 0.5, lane_genes[:, streak[spin]])
+        np.maximum(bet, MIN_BET, out=bet)
+        if wins[spin]:
+            bank += bet
+            np.maximum(top, bank, out=top)
+        else:
+            bank -= bet
+            np.maximum(dd, (top - bank) / top, out=dd)
+            if bank.min() < MIN_BET:
+                # evaluate_survival stops at the top of the next spin
+                bust = bank < MIN_BET
+                spins[lanes[bust]] = min(spin + 2, n_spins)
+                bankroll[lanes[bust]] = bank[bust]
+                max_dd[lanes[bust]] = dd[bust]
+                lanes, bank, top, dd = lanes[~bust], bank[~bust], top[~bust], dd[~bust]
+                lane_genes = genes[lanes]
+        spin += 1
+
+    bankroll[lanes] = bank
+    max_dd[lanes] = dd
+
+    longevity = (spins / n_spins) * 100
+    preservation = np.minimum(100, (bankroll / STARTING_BANKROLL) * 100)
+    stability = np.maximum(0, 100 - max_dd * 200)
+    return longevity * 0.4 + preservation * 0.3 + stability * 0.3
+
 def create_dna() -> List[int]:
     """Create survival-oriented DNA (decreasing bets on streaks)"""
     base = random.randint(30, 80)
@@ -105,10 +208,6 @@ def crossover(p1: List[int], p2: List[int]) -> List[int]:
     split = random.randint(1, 5)
     return p1[:split] + p2[split:]
 
-def eval_wrapper(dna):
-    _, _, _, score = evaluate_survival(dna)
-    return dna, score
-
 def run_evolution(redis_host=None, redis_port=None, redis_pass=None):
     # Use environment variables if not provided
     redis_host = redis_host or REDIS_HOST
@@ -136,11 +235,13 @@ def run_evolution(redis_host=None, redis_port=None, redis_pass=None):
     best_ever_score = 0
     gen = 1
     
+    # Whole population faces the same spins each generation
+    evaluator = PopulationEvaluator(spin_tape, score_population)
+    
     while True:
         start_t = time.time()
         
-        with ProcessPoolExecutor(max_workers=8) as ex:
-            results = list(ex.map(eval_wrapper, population))
+        results = evaluator.evaluate(population)
         
         results.sort(key=lambda x: x[1], reverse=True)
         best_dna, best_score = results[0]
@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 """🦅🐺🦁 VOLTRAN BRIDGE - Cloud Connected"""
-import os, json, math, time, redis
+import os, json, math, time
+
+from infrastructure.redis_pool import get_cache, get_redis
 
 GEN_HOST = os.getenv("GENETICS_REDIS_HOST", "127.0.0.1")
 GEN_PORT = int(os.getenv("GENETICS_REDIS_PORT", "6379"))
@@ -12,19 +14,20 @@ LABS_PASS = os.getenv("LABS_REDIS_PASSWORD", None)
 _cache = {"data": None, "ts": 0}
 
 def _get_redis(host, port, password=None):
+    # Pooled; an unreachable host is only re-pinged every 30s
+    return get_redis("voltran", host=host, port=port, password=password, check=True)
+
+def _mget(r, keys):
+    """All keys of one Redis in at most one round trip (cached); Nones when unavailable."""
+    if not r: return [None] * len(keys)
     try:
-        r = redis.Redis(host=host, port=port, password=password, decode_responses=True, socket_timeout=5)
-        r.ping()
-        return r
+        return get_cache(r, keys).mget(keys)
     except:
-        return None
+        return [None] * len(keys)
 
-def _get_score(r, meta_key, dna_key, score_fields, default_dna):
-    if not r: return 50.0, 0, default_dna
+def _parse_score(raw_meta, raw_dna, score_fields, default_dna):
+    if not raw_meta: return 50.0, 0, default_dna
     try:
-        raw_meta = r.get(meta_key)
-        raw_dna = r.get(dna_key)
-        if not raw_meta: return 50.0, 0, default_dna
         meta = json.loads(raw_meta)
         dna = json.loads(raw_dna) if raw_dna else default_dna
         gen = meta.get("gen", 0)
@@ -38,6 +41,10 @@ def _get_score(r, meta_key, dna_key, score_fields, default_dna):
     except:
         return 50.0, 0, default_dna
 
+def _get_score(r, meta_key, dna_key, score_fields, default_dna):
+    raw_meta, raw_dna = _mget(r, [meta_key, dna_key])
+    return _parse_score(raw_meta, raw_dna, score_fields, default_dna)
+
 from config_center import config
 
 def get_voltran_snapshot(force=False):
@@ -51,10 +58,10 @@ def get_voltran_snapshot(force=False):
     
     bj, bj_gen, bj_dna = _get_score(gen_r, config.BJ_META_KEY, config.BJ_DNA_KEY,
                                       ["score", "bj_score", "best_profit"], [10,10,234,326,354,500])
-    rl, rl_gen, rl_dna = _get_score(labs_r, config.RL_META_KEY, config.RL_DNA_KEY,
-                                      ["score"], [50,40,30,25,20,15])
-    ch, ch_gen, ch_dna = _get_score(labs_r, config.CH_META_KEY, config.CH_DNA_KEY,
-                                      ["cosmic_harmony", "score"], [100,50,80,40,120,60])
+    rl_meta, rl_raw, ch_meta, ch_raw = _mget(labs_r, [config.RL_META_KEY, config.RL_DNA_KEY,
+                                                      config.CH_META_KEY, config.CH_DNA_KEY])
+    rl, rl_gen, rl_dna = _parse_score(rl_meta, rl_raw, ["score"], [50,40,30,25,20,15])
+    ch, ch_gen, ch_dna = _parse_score(ch_meta, ch_raw, ["cosmic_harmony", "score"], [100,50,80,40,120,60])
     
     vs = (max(1,bj) * max(1,rl) * max(1,ch)) ** (1/3)
     vf = max(0.8, min(1.2, 0.8 + (vs - 50) * 0.008))
@@ -9,6 +9,7 @@ from .circuit_breaker import CircuitBreaker, CircuitState, CircuitBreakerOpenErr
 from .retry import with_retry, RetryConfig
 from .rate_limiter import RateLimiter, TokenBucket
 from .metrics import MetricsCollector, metrics
+from .redis_pool import get_redis, get_async_redis, mget_json, RedisCache, get_cache
 from .health import HealthCheck, ComponentHealth
 from .config import Settings, get_settings
 from .exceptions import (
@@ -36,6 +37,12 @@ __all__ = [
     # Metrics
     "MetricsCollector",
     "metrics",
+    # Redis
+    "get_redis",
+    "get_async_redis",
+    "mget_json",
+    "RedisCache",
+    "get_cache",
     # Health
     "HealthCheck",
     "ComponentHealth",
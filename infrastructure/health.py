@@ -243,8 +243,9 @@ def check_redis_health(
     """Create a Redis health check function."""
     def check() -> ComponentHealth:
         try:
-            import redis
-            r = redis.Redis(
+            from .redis_pool import get_redis
+            r = get_redis(
+                "health",
                 host=host,
                 port=port,
                 password=password,
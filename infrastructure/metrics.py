@@ -286,6 +286,11 @@ class MetricsCollector:
             "godbrain_loop_duration_seconds",
             "Main loop iteration duration"
         )
+        self.redis_latency = Histogram(
+            "godbrain_redis_latency_seconds",
+            "Redis command latency in seconds",
+            ["service", "command"]
+        )
     
     def export_prometheus(self) -> str:
         """Export metrics in Prometheus text format."""
@@ -337,6 +342,7 @@ class MetricsCollector:
             "histograms": {
                 "decision_latency": self.decision_latency.collect(),
                 "api_latency": self.api_latency.collect(),
+                "redis_latency": self.redis_latency.collect(),
             },
         }
 
@@ -10,7 +10,7 @@ import asyncio
 import threading
 import time
 from dataclasses import dataclass
-from typing import Dict, Optional
+from typing import Callable, Dict, Optional
 
 from .logging_config import get_logger
 from .exceptions import RateLimitError
@@ -34,23 +34,25 @@ class TokenBucket:
     Allows bursts up to burst_size, then throttles to requests_per_second.
     """
     
-    def __init__(self, rate: float, capacity: int):
+    def __init__(self, rate: float, capacity: int, clock: Callable[[], float] = time.monotonic):
         """
         Initialize token bucket.
         
         Args:
             rate: Tokens added per second
             capacity: Maximum tokens in bucket
+            clock: Time source in seconds (inject a simulated clock in tests)
         """
         self.rate = rate
         self.capacity = capacity
+        self.clock = clock
         self.tokens = float(capacity)
-        self.last_update = time.monotonic()
+        self.last_update = clock()
         self._lock = threading.Lock()
     
     def _refill(self) -> None:
         """Refill tokens based on elapsed time."""
-        now = time.monotonic()
+        now = self.clock()
         elapsed = now - self.last_update
         self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
         self.last_update = now
@@ -124,6 +126,18 @@ class TokenBucket:
             
             await asyncio.sleep(min(wait_time, 0.1))
     
+    def wait_time(self, tokens: int = 1) -> float:
+        """Seconds until ``tokens`` are available (0 if they already are)."""
+        with self._lock:
+            self._refill()
+            return max(0.0, (tokens - self.tokens) / self.rate)
+
+    def release(self, tokens: int = 1) -> None:
+        """Return unused tokens (never above capacity)."""
+        with self._lock:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens + tokens)
+
     @property
     def available_tokens(self) -> float:
         """Get current available tokens."""
@@ -145,6 +159,12 @@ class RateLimiter:
         "order": RateLimitConfig(requests_per_second=20, burst_size=60),
         "account": RateLimitConfig(requests_per_second=5, burst_size=10),
         "market": RateLimitConfig(requests_per_second=20, burst_size=40),
+        # Public per-endpoint limits, N requests / 2s per IP. A bucket lets
+        # burst + rate * 2s through any 2s window, so each half is N/2.
+        "market.candles": RateLimitConfig(requests_per_second=10, burst_size=20, max_wait_seconds=60.0),
+        "market.books": RateLimitConfig(requests_per_second=10, burst_size=20, max_wait_seconds=60.0),
+        "market.trades": RateLimitConfig(requests_per_second=25, burst_size=50, max_wait_seconds=60.0),
+        "public.funding_rate": RateLimitConfig(requests_per_second=5, burst_size=10, max_wait_seconds=60.0),
         "default": RateLimitConfig(requests_per_second=10, burst_size=20),
     }
     
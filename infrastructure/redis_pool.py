@@ -0,0 +1,509 @@
+# -*- coding: utf-8 -*-
+"""
+═══════════════════════════════════════════════════════════════════════════════
+GODBRAIN Redis Access Layer
+One connection pool per Redis endpoint, shared by every service in the process.
+═══════════════════════════════════════════════════════════════════════════════
+
+- get_redis / get_async_redis: pooled clients tagged with a service name;
+  every command (and pipeline) is timed per service and command.
+- Idle connections are health-checked by the pool; callers no longer open a
+  socket and PING on each use.
+- mget_json: batched MGET (+ JSON decode) in one round trip.
+- RedisCache / get_cache: client-side read cache invalidated by keyspace
+  notifications, shared per pool and key prefixes.
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .logging_config import get_logger
+from .metrics import metrics
+
+try:
+    import redis
+    import redis.asyncio as redis_async
+except ImportError:
+    redis = None
+    redis_async = None
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class RedisEndpoint:
+    """Connection identity; one pool per endpoint."""
+    host: str
+    port: int
+    db: int = 0
+    password: Optional[str] = None
+    decode_responses: bool = True
+
+    @classmethod
+    def resolve(cls, host=None, port=None, db=0, password=None, decode_responses=True) -> "RedisEndpoint":
+        return cls(
+            host=host or os.getenv("REDIS_HOST", "127.0.0.1"),
+            port=int(port or os.getenv("REDIS_PORT", 6379)),
+            db=int(db or 0),
+            password=password if password is not None else os.getenv("REDIS_PASS"),
+            decode_responses=decode_responses,
+        )
+
+
+# =============================================================================
+# Latency metrics
+# =============================================================================
+
+class RedisLatency:
+    """Per (service, command) call count / total / max latency."""
+
+    def __init__(self):
+        self._stats: Dict[Tuple[str, str], List[float]] = defaultdict(lambda: [0, 0.0, 0.0])
+        self._lock = threading.Lock()
+
+    def observe(self, service: str, command: str, seconds: float) -> None:
+        with self._lock:
+            entry = self._stats[(service, command)]
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] = max(entry[2], seconds)
+        metrics.redis_latency.observe(seconds, labels={"service": service, "command": command})
+
+    def snapshot(self, service: Optional[str] = None) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """{service: {command: {count, avg_ms, max_ms}}}"""
+        out: Dict[str, Dict[str, Dict[str, float]]] = defaultdict(dict)
+        with self._lock:
+            for (svc, cmd), (count, total, peak) in self._stats.items():
+                if service is None or svc == service:
+                    out[svc][cmd] = {
+                        "count": count,
+                        "avg_ms": total / count * 1000 if count else 0.0,
+                        "max_ms": peak * 1000,
+                    }
+        return dict(out)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+latency = RedisLatency()
+
+
+def _command_name(args: tuple) -> str:
+    return str(args[0]).upper() if args else "?"
+
+
+if redis is not None:
+
+    class _TimedPipeline(redis.client.Pipeline):
+        service = "default"
+
+        def execute(self, raise_on_error: bool = True):
+            start = time.perf_counter()
+            try:
+                return super().execute(raise_on_error)
+            finally:
+                latency.observe(self.service, "PIPELINE", time.perf_counter() - start)
+
+    class InstrumentedRedis(redis.Redis):
+        """redis.Redis that records per-service latency of every command."""
+
+        def __init__(self, *args, service: str = "default", **kwargs):
+            super().__init__(*args, **kwargs)
+            self.service = service
+
+        def execute_command(self, *args, **options):
+            start = time.perf_counter()
+            try:
+                return super().execute_command(*args, **options)
+            finally:
+                latency.observe(self.service, _command_name(args), time.perf_counter() - start)
+
+        def pipeline(self, transaction=True, shard_hint=None):
+            pipe = _TimedPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+            pipe.service = self.service
+            return pipe
+
+    class _TimedAsyncPipeline(redis_async.client.Pipeline):
+        service = "default"
+
+        async def execute(self, raise_on_error: bool = True):
+            start = time.perf_counter()
+            try:
+                return await super().execute(raise_on_error)
+            finally:
+                latency.observe(self.service, "PIPELINE", time.perf_counter() - start)
+
+    class InstrumentedAsyncRedis(redis_async.Redis):
+        """redis.asyncio.Redis with the same per-service latency recording."""
+
+        def __init__(self, *args, service: str = "default", **kwargs):
+            super().__init__(*args, **kwargs)
+            self.service = service
+
+        async def execute_command(self, *args, **options):
+            start = time.perf_counter()
+            try:
+                return await super().execute_command(*args, **options)
+            finally:
+                latency.observe(self.service, _command_name(args), time.perf_counter() - start)
+
+        def pipeline(self, transaction=True, shard_hint=None):
+            pipe = _TimedAsyncPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+            pipe.service = self.service
+            return pipe
+
+
+# =============================================================================
+# Pools
+# =============================================================================
+
+POOL_OPTIONS = {
+    "max_connections": 50,
+    "socket_timeout": 5.0,
+    "socket_connect_timeout": 5.0,
+    "socket_keepalive": True,
+    "health_check_interval": 30,     # PING only connections idle this long
+    "retry_on_timeout": True,
+}
+
+_pools: Dict[RedisEndpoint, Any] = {}
+_async_pools: Dict[Tuple[RedisEndpoint, int], Any] = {}
+_reachable: Dict[RedisEndpoint, Tuple[bool, float]] = {}
+_caches: Dict[Tuple[int, Tuple[str, ...]], "RedisCache"] = {}
+_lock = threading.Lock()
+_cache_lock = threading.Lock()
+
+
+def _require_redis() -> None:
+    if redis is None:
+        raise ImportError("redis package not installed")
+
+
+def get_pool(endpoint: RedisEndpoint, **options):
+    """Shared sync ConnectionPool for ``endpoint`` (options apply on first use)."""
+    _require_redis()
+    with _lock:
+        pool = _pools.get(endpoint)
+        if pool is None:
+            pool = redis.ConnectionPool(
+                host=endpoint.host, port=endpoint.port, db=endpoint.db, password=endpoint.password,
+                decode_responses=endpoint.decode_responses, **{**POOL_OPTIONS, **options},
+            )
+            _pools[endpoint] = pool
+        return pool
+
+
+def get_redis(
+    service: str = "default",
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    password: Optional[str] = None,
+    db: int = 0,
+    decode_responses: bool = True,
+    check: bool = False,
+    retry_after: float = 30.0,
+    **pool_options,
+) -> Optional["InstrumentedRedis"]:
+    """
+    Pooled client for ``service``. No connection is opened until the first
+    command.
+
+    check=True pings the endpoint once and returns None if it is down (the
+    old ``try: r.ping() except: r = None`` idiom). A failed endpoint is not
+    retried for ``retry_after`` seconds, so hot loops don't pay a connect
+    timeout on every call.
+    """
+    endpoint = RedisEndpoint.resolve(host, port, db, password, decode_responses)
+    client = InstrumentedRedis(connection_pool=get_pool(endpoint, **pool_options), service=service)
+    if not check:
+        return client
+
+    ok, checked_at = _reachable.get(endpoint, (None, 0.0))
+    now = time.monotonic()
+    if ok is None or (not ok and now - checked_at >= retry_after):
+        try:
+            client.ping()
+            ok = True
+        except Exception as e:
+            logger.warning(f"Redis {endpoint.host}:{endpoint.port} unreachable ({service}): {e}")
+            ok = False
+        _reachable[endpoint] = (ok, now)
+    return client if ok else None
+
+
+def get_async_redis(
+    service: str = "default",
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    password: Optional[str] = None,
+    db: int = 0,
+    decode_responses: bool = True,
+    **pool_options,
+) -> "InstrumentedAsyncRedis":
+    """Pooled asyncio client; pools are per event loop (asyncio connections are loop-bound)."""
+    _require_redis()
+    endpoint = RedisEndpoint.resolve(host, port, db, password, decode_responses)
+    key = (endpoint, id(asyncio.get_running_loop()))
+    with _lock:
+        pool = _async_pools.get(key)
+        if pool is None:
+            pool = redis_async.ConnectionPool(
+                host=endpoint.host, port=endpoint.port, db=endpoint.db, password=endpoint.password,
+                decode_responses=endpoint.decode_responses, **{**POOL_OPTIONS, **pool_options},
+            )
+            _async_pools[key] = pool
+    return InstrumentedAsyncRedis(connection_pool=pool, service=service)
+
+
+def close_pools() -> None:
+    """Disconnect every sync pool (async pools close with their loop)."""
+    with _cache_lock:
+        for cache in _caches.values():
+            cache.stop()
+        _caches.clear()
+    with _lock:
+        for pool in _pools.values():
+            pool.disconnect()
+        _pools.clear()
+        _async_pools.clear()
+        _reachable.clear()
+
+
+# =============================================================================
+# Pipelining helpers
+# =============================================================================
+
+def _decode_json(raw: Any, default: Any = None) -> Any:
+    if raw is None:
+        return default
+    try:
+        return json.loads(raw)
+    except (TypeError, ValueError):
+        return default
+
+
+def mget_json(client, keys: Sequence[str], default: Any = None) -> List[Any]:
+    """GET several JSON keys in one round trip; missing/invalid -> default."""
+    if not keys:
+        return []
+    return [_decode_json(raw, default) for raw in client.mget(list(keys))]
+
+
+async def mget_json_async(client, keys: Sequence[str], default: Any = None) -> List[Any]:
+    if not keys:
+        return []
+    return [_decode_json(raw, default) for raw in await client.mget(list(keys))]
+
+
+def mget_dna_meta(client, pairs: Iterable[Tuple[str, str]]) -> List[Tuple[Any, Any]]:
+    """[(dna_key, meta_key), ...] -> [(dna, meta), ...] with a single MGET."""
+    pairs = list(pairs)
+    values = mget_json(client, [k for pair in pairs for k in pair])
+    return [(values[2 * i], values[2 * i + 1]) for i in range(len(pairs))]
+
+
+# =============================================================================
+# Client-side cache
+# =============================================================================
+
+class RedisCache:
+    """
+    Read-through cache for hot keys, invalidated by keyspace notifications.
+
+    start() checks that the server emits keyspace events and subscribes to
+    ``__keyspace@<db>__:<prefix>*`` for each prefix in a background thread;
+    any write/expire/delete of a key evicts it. The server setting
+    (``notify-keyspace-events KA``) is left alone unless the cache is
+    created with enable_notifications=True, which issues CONFIG SET.
+    Without notifications (not enabled, unverifiable, subscription failed
+    or dropped) entries fall back to ``ttl`` seconds, or are not cached at
+    all when ttl is None.
+
+    Usage:
+        cache = RedisCache(get_redis("harvester"), prefixes=("godbrain:genetics:",), ttl=5)
+        cache.start()
+        dna = cache.get("godbrain:genetics:best_dna")
+    """
+
+    def __init__(
+        self,
+        client,
+        prefixes: Sequence[str] = ("",),
+        ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        enable_notifications: bool = False,
+    ):
+        self.client = client
+        self.prefixes = tuple(prefixes)
+        self.ttl = ttl
+        self.clock = clock
+        self.enable_notifications = enable_notifications
+        self.live = False
+        self.started_at: Optional[float] = None
+        self.hits = 0
+        self.misses = 0
+        self._values: Dict[str, Tuple[Any, float]] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._pubsub = None
+        self._thread = None
+
+    # ------------------------------------------------------------------
+    # Invalidation
+    # ------------------------------------------------------------------
+
+    def _db(self) -> int:
+        kwargs = getattr(getattr(self.client, "connection_pool", None), "connection_kwargs", {})
+        return int(kwargs.get("db", 0))
+
+    def _notifications_enabled(self) -> bool:
+        """Whether the server reports keyspace events for writes, expiries and deletes."""
+        try:
+            current = self.client.config_get("notify-keyspace-events").get("notify-keyspace-events", "")
+        except Exception as e:
+            # Managed Redis may forbid CONFIG; an unconfirmed setting is treated as off
+            logger.debug(f"Could not read notify-keyspace-events: {e}")
+            return False
+        if "K" in current and ("A" in current or set("g$xe") <= set(current)):
+            return True
+        if not self.enable_notifications:
+            return False
+        try:
+            self.client.config_set("notify-keyspace-events", "".join(sorted(set(current) | set("KA"))))
+            return True
+        except Exception as e:
+            logger.debug(f"Could not enable keyspace notifications: {e}")
+            return False
+
+    def start(self) -> bool:
+        """Subscribe to keyspace events; returns whether invalidation is live."""
+        self.stop()
+        self.started_at = time.monotonic()
+        if not self._notifications_enabled():
+            logger.info(f"Keyspace notifications off, Redis cache using ttl={self.ttl}")
+            return False
+        try:
+            self._pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+            patterns = {f"__keyspace@{self._db()}__:{p}*": self.handle_event for p in self.prefixes}
+            self._pubsub.psubscribe(**patterns)
+            self._thread = self._pubsub.run_in_thread(
+                sleep_time=1.0, daemon=True, exception_handler=self._on_stream_error
+            )
+            self.live = True
+        except Exception as e:
+            logger.warning(f"Redis cache invalidation unavailable, using ttl={self.ttl}: {e}")
+            self.live = False
+        return self.live
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._thread.stop()
+            self._thread = None
+        if self._pubsub is not None:
+            try:
+                self._pubsub.close()
+            except Exception:
+                pass
+            self._pubsub = None
+        self.live = False
+        self.invalidate()
+
+    def _on_stream_error(self, error, pubsub, thread) -> None:
+        # Events may have been missed: drop everything and degrade to ttl
+        logger.warning(f"Keyspace notification stream lost: {error}")
+        self.live = False
+        self.invalidate()
+        thread.stop()
+
+    def handle_event(self, message: Dict) -> None:
+        """pubsub message for ``__keyspace@<db>__:<key>`` -> evict ``key``."""
+        channel = message.get("channel")
+        if isinstance(channel, bytes):
+            channel = channel.decode()
+        if channel and ":" in channel:
+            self.invalidate(channel.split("__:", 1)[-1])
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        with self._lock:
+            self._generation += 1
+            if key is None:
+                self._values.clear()
+            else:
+                self._values.pop(key, None)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def _cacheable(self) -> bool:
+        return self.live or self.ttl is not None
+
+    def _lookup(self, key: str) -> Tuple[bool, Any]:
+        entry = self._values.get(key)
+        if entry is None:
+            return False, None
+        value, stored_at = entry
+        if not self.live and (self.ttl is None or self.clock() - stored_at > self.ttl):
+            return False, None
+        return True, value
+
+    def get(self, key: str) -> Any:
+        return self.mget([key])[0]
+
+    def mget(self, keys: Sequence[str]) -> List[Any]:
+        """Cached values; all misses are fetched with one MGET."""
+        result: Dict[str, Any] = {}
+        with self._lock:
+            generation = self._generation
+            for key in keys:
+                found, value = self._lookup(key)
+                if found:
+                    result[key] = value
+                    self.hits += 1
+        missing = [k for k in dict.fromkeys(keys) if k not in result]
+        if missing:
+            self.misses += len(missing)
+            values = self.client.mget(missing)
+            with self._lock:
+                # A write seen while we were reading may be newer than what we got
+                store = self._cacheable() and self._generation == generation
+                for key, value in zip(missing, values):
+                    result[key] = value
+                    if store:
+                        self._values[key] = (value, self.clock())
+        return [result[k] for k in keys]
+
+    def get_json(self, key: str, default: Any = None) -> Any:
+        return _decode_json(self.get(key), default)
+
+
+def get_cache(
+    client,
+    prefixes: Sequence[str],
+    ttl: Optional[float] = None,
+    retry_after: float = 30.0,
+) -> RedisCache:
+    """
+    Process-wide RedisCache for ``prefixes`` on ``client``'s pool.
+
+    Callers reading the same keys share one cache and one notification
+    thread. A cache that is not live is re-started at most every
+    ``retry_after`` seconds, so a Redis that was down (or had notifications
+    off) at first use is picked up later without a subscribe per read.
+    """
+    key = (id(client.connection_pool), tuple(prefixes))
+    with _cache_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = _caches[key] = RedisCache(client, prefixes, ttl=ttl)
+        if not cache.live and (cache.started_at is None or time.monotonic() - cache.started_at >= retry_after):
+            cache.start()
+    return cache
@@ -21,6 +21,8 @@ ROOT = Path(__file__).parent.parent.parent
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
+from backtesting.ohlcv_store import OHLCVStore
+
 
 class HistoricalDownloader:
     """
@@ -28,10 +30,13 @@ class HistoricalDownloader:
     
     Usage:
         downloader = HistoricalDownloader()
+        df = await downloader.sync("DOGE/USDT:USDT", days=365)   # store, tail only
         df = await downloader.download("DOGE/USDT:USDT", days=365)
         downloader.save_parquet(df, "DOGE_1h")
     """
     
+    EXCHANGE = "okx"
+    
     TIMEFRAME_MAP = {
         "1m": 60,
         "5m": 300,
@@ -44,6 +49,7 @@ class HistoricalDownloader:
     def __init__(self, data_dir: Optional[Path] = None):
         self.data_dir = data_dir or ROOT / "data" / "historical"
         self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.store = OHLCVStore(self.data_dir / "store")
         self._exchange = None
     
     async def _get_exchange(self):
@@ -68,7 +74,8 @@ class HistoricalDownloader:
         symbol: str,
         timeframe: str = "1h",
         days: int = 365,
-        end_date: Optional[datetime] = None
+        end_date: Optional[datetime] = None,
+        since_ms: Optional[int] = None
     ) -> pd.DataFrame:
         """
         Download historical OHLCV data.
@@ -78,6 +85,7 @@ class HistoricalDownloader:
             timeframe: Candle timeframe (1m, 5m, 15m, 1h, 4h, 1d)
             days: Number of days to download
             end_date: End date (default: now)
+            since_ms: Start timestamp in ms (overrides ``days``)
         
         Returns:
             DataFrame with columns: timestamp, open, high, low, close, volume
@@ -86,6 +94,8 @@ class HistoricalDownloader:
         
         end_ts = int((end_date or datetime.now()).timestamp() * 1000)
         start_ts = end_ts - (days * 24 * 60 * 60 * 1000)
+        if since_ms is not None:
+            start_ts = since_ms
         
         all_candles = []
         current_ts = start_ts
@@ -122,6 +132,7 @@ class HistoricalDownloader:
                 continue
         
         await exchange.close()
+        self._exchange = None
         
         if not all_candles:
             print("[DOWNLOAD] No data received")
@@ -142,6 +153,39 @@ class HistoricalDownloader:
         
         return df
     
+    async def sync(
+        self,
+        symbol: str,
+        timeframe: str = "1h",
+        days: int = 365
+    ) -> pd.DataFrame:
+        """
+        Bring the shared OHLCV store up to date and return the last ``days``.
+        
+        Downloading resumes at the last stored bar, which is fetched again
+        in case it was still open when stored.
+        """
+        end = datetime.utcnow()
+        start = end - timedelta(days=days)
+        start_ms = int(pd.Timestamp(start).value // 1_000_000)
+        
+        bounds = self.store.bounds(symbol, timeframe, self.EXCHANGE)
+        since_ms = start_ms
+        if bounds and bounds[0] <= start_ms:
+            since_ms = bounds[1]
+        
+        df = await self.download(symbol, timeframe, days=days, since_ms=since_ms)
+        if not df.empty:
+            written = self.store.write(symbol, timeframe, df, self.EXCHANGE)
+            print(f"[STORE] {symbol} {timeframe}: {written} new candles")
+        
+        frame = self.store.read_frame(symbol, timeframe, start, end, self.EXCHANGE)
+        return frame.reset_index()
+    
+    def save_store(self, df: pd.DataFrame, symbol: str, timeframe: str) -> int:
+        """Merge candles into the shared partitioned OHLCV store."""
+        return self.store.write(symbol, timeframe, df, self.EXCHANGE)
+    
     def save_parquet(self, df: pd.DataFrame, name: str) -> Path:
         """Save DataFrame to Parquet file."""
         path = self.data_dir / f"{name}.parquet"
@@ -152,9 +196,10 @@ class HistoricalDownloader:
     def save_csv(self, df: pd.DataFrame, name: str) -> Path:
         """Save DataFrame to CSV file (for backtest compatibility)."""
         # Convert to backtest format: timestamp, symbol, price
-        df_out = df[["timestamp", "close"]].copy()
+        # (the open is the price known at the bar's timestamp)
+        df_out = df[["timestamp", "open"]].copy()
         df_out["symbol"] = name.split("_")[0] + "/USDT:USDT"
-        df_out = df_out.rename(columns={"close": "price"})
+        df_out = df_out.rename(columns={"open": "price"})
         df_out = df_out[["timestamp", "symbol", "price"]]
         
         path = self.data_dir / f"{name}.csv"
@@ -183,7 +228,7 @@ async def main():
     parser.add_argument("--symbol", default="DOGE/USDT:USDT", help="Trading pair")
     parser.add_argument("--timeframe", default="1h", help="Timeframe (1m,5m,15m,1h,4h,1d)")
     parser.add_argument("--days", type=int, default=365, help="Days of history")
-    parser.add_argument("--format", default="both", choices=["parquet", "csv", "both"])
+    parser.add_argument("--format", default="store", choices=["store", "parquet", "csv", "both"])
     
     args = parser.parse_args()
     
@@ -192,7 +237,8 @@ async def main():
     # Extract name from symbol
     name = args.symbol.split("/")[0] + "_" + args.timeframe
     
-    df = await downloader.download(
+    # Shared store first: only the missing tail is downloaded
+    df = await downloader.sync(
         symbol=args.symbol,
         timeframe=args.timeframe,
         days=args.days
@@ -0,0 +1,380 @@
+# -*- coding: utf-8 -*-
+"""
+═══════════════════════════════════════════════════════════════════════════════
+GODBRAIN Decision Log Ingest
+Chunked, parallel, cached parsing of ">>> EXECUTE:" lines from agg_decisions.log.
+═══════════════════════════════════════════════════════════════════════════════
+
+The log is split into newline-aligned byte ranges which are parsed in a
+process pool. Each worker scans its range with bytes.find for "EXECUTE:"
+and only decodes and inspects the matching lines. Timestamps are parsed
+per chunk by numpy's ISO parser, with a hand-written fallback for the
+occasional malformed stamp, instead of strptime per line.
+
+Results come back as columnar DataFrame batches, one per chunk, in file
+order. Every EXECUTE line is kept with the tolerant fields the edge-AI
+dataset uses; ``strict`` marks the lines that match the backtest format
+(``<iso ts> | ... >>> EXECUTE: ACTION SYMBOL | $size | Regime:X | Flow:Yx``).
+
+Parsed chunks are cached as .npz under a key of (path, size, mtime_ns), so
+the backtest and the dataset builder parse a given log only once.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+
+ROOT = Path(__file__).resolve().parent.parent.parent
+CACHE_DIR = ROOT / "data" / "cache" / "log_ingest"
+CHUNK_BYTES = 64 * 1024 * 1024
+CACHE_VERSION = 1
+
+MARKER = b"EXECUTE:"
+
+# Backtest format (also LogParser.PATTERN); the timestamp is parsed per chunk
+RE_STRICT = re.compile(
+    r"^(?P<ts>[\d\-T:\.]+) \|.*>>> EXECUTE: (?P<action>\w+) (?P<symbol>[^ ]+) \| \$(?P<size>[\d\.]+) \| Regime:(?P<regime>[^ ]+) \| Flow:(?P<flow>[\d\.]+)x"
+)
+
+# Tolerant fields (edge-AI dataset)
+RE_HEAD = re.compile(r"EXECUTE:\s*(?P<action>\w+)\s+(?P<symbol>\S+)", re.IGNORECASE)
+RE_REGIME = re.compile(r"Regime:(?P<regime>\S+)", re.IGNORECASE)
+RE_FLOW = re.compile(r"Flow:(?P<flow>[\d\.]+)x", re.IGNORECASE)
+RE_NUMBER = re.compile(r"[\d\.]+")
+RE_DNA = re.compile(r"dnax?:([\d\.]+)")     # searched on the lowered line, like QScore/VOL
+RE_ISO = re.compile(r"\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d(?:\.\d{1,6})?\Z")
+
+DTYPES = {
+    "offset": np.int64,          # byte offset of the line
+    "timestamp": "datetime64[us]",
+    "strict": bool,
+    "action": str,
+    "symbol": str,
+    "size_usd": np.float64,
+    "regime": str,
+    "flow_mult": np.float64,
+    "q_score": np.float64,
+    "dna_mult": np.float64,
+    "voltran": np.float64,
+}
+COLUMNS = list(DTYPES)
+
+_EPOCH_ORDINAL = datetime(1970, 1, 1).toordinal()
+_NAT = np.iinfo(np.int64).min
+
+
+_DAYS: Dict[str, Optional[int]] = {}
+
+
+def _epoch_days(date: str) -> Optional[int]:
+    """'YYYY-MM-DD' to days since epoch; memoized since a log spans few days."""
+    days = _DAYS.get(date, -1)
+    if days == -1:
+        try:
+            days = datetime(int(date[0:4]), int(date[5:7]), int(date[8:10])).toordinal() - _EPOCH_ORDINAL
+        except ValueError:
+            days = None
+        _DAYS[date] = days
+    return days
+
+
+def parse_iso_us(text: str) -> Optional[int]:
+    """
+    'YYYY-MM-DDTHH:MM:SS[.ffffff]' to µs since epoch, None if malformed.
+
+    Accepts what the old strptime pair accepted for zero-padded stamps.
+    """
+    n = len(text)
+    if n < 19 or text[4] != "-" or text[7] != "-" or text[10] != "T" or text[13] != ":" or text[16] != ":":
+        return None
+    if not (text[0:4] + text[5:7] + text[8:10] + text[11:13] + text[14:16] + text[17:19]).isdigit():
+        return None
+    frac = 0
+    if n > 19:
+        tail = text[20:]
+        if text[19] != "." or not 1 <= len(tail) <= 6 or not tail.isdigit():
+            return None
+        frac = int(tail.ljust(6, "0"))
+    hour, minute, second = int(text[11:13]), int(text[14:16]), int(text[17:19])
+    days = _epoch_days(text[0:10])
+    if days is None or hour > 23 or minute > 59 or second > 59:
+        return None
+    return (days * 86400 + hour * 3600 + minute * 60 + second) * 1_000_000 + frac
+
+
+def _to_arrays(rows: List[tuple]) -> Dict[str, np.ndarray]:
+    cols = list(zip(*rows)) if rows else [()] * len(COLUMNS)
+    return {
+        name: (np.asarray(values, dtype=np.int64).view(dtype) if dtype == "datetime64[us]"
+               else np.asarray(values, dtype=dtype))
+        for (name, dtype), values in zip(DTYPES.items(), cols)
+    }
+
+
+def _extra(low: str, key: str, default: float) -> float:
+    at = low.find(key)
+    if at == -1:
+        return default
+    m = RE_NUMBER.match(low, at + len(key))
+    return _number(m.group() if m else None, default)
+
+
+def _parse_line(line: str, offset: int) -> Tuple[Optional[tuple], str]:
+    """
+    One stripped EXECUTE line to a row (None if it has no action/symbol)
+    plus its timestamp text when it is a strict candidate ("" otherwise).
+    The timestamp slot is filled in per chunk by _parse_stamps.
+    """
+    low = line.lower()
+    q_score = _extra(low, "qscore:", 50.0)
+    dna = RE_DNA.search(low)
+    dna = _number(dna.group(1) if dna else None, 1.0)
+    vol = _extra(low, "vol:", 1.0)
+
+    strict = RE_STRICT.match(line)
+    if strict:
+        stamp, action, symbol, size, regime, flow = strict.groups()
+        try:
+            return (offset, _NAT, True, action, symbol, float(size), regime, float(flow), q_score, dna, vol), stamp
+        except ValueError:
+            pass
+
+    head = RE_HEAD.search(line)
+    if not head:
+        return None, ""
+    regime = RE_REGIME.search(line)
+    flow = RE_FLOW.search(line)
+    return (
+        offset, _NAT, False, head.group("action"), head.group("symbol"), np.nan,
+        regime.group("regime") if regime else "UNKNOWN",
+        _number(flow.group("flow") if flow else None, 1.0),
+        q_score, dna, vol,
+    ), ""
+
+
+def _parse_stamps(stamps: List[str]) -> np.ndarray:
+    """
+    µs timestamps (NaT sentinel when malformed). Well-formed stamps go
+    through numpy's C ISO parser; a block containing an out-of-range field
+    is bisected until the bad stamps are parsed one by one.
+    """
+    if len(stamps) > 32:
+        try:
+            if all(RE_ISO.match(s) for s in stamps):
+                return np.array(stamps, dtype="datetime64[us]").view(np.int64)
+        except ValueError:
+            pass
+        mid = len(stamps) // 2
+        return np.concatenate([_parse_stamps(stamps[:mid]), _parse_stamps(stamps[mid:])])
+    out = [parse_iso_us(s) for s in stamps]
+    return np.array([_NAT if v is None else v for v in out], dtype=np.int64)
+
+
+def _number(text: Optional[str], default: float) -> float:
+    if text is None:
+        return default
+    try:
+        return float(text)
+    except ValueError:
+        return default
+
+
+def parse_range(path: str, start: int, end: int) -> Tuple[Dict[str, np.ndarray], int]:
+    """
+    Parse EXECUTE lines whose first byte lies in [start, end).
+
+    Returns (columns, bad_timestamps). Runs in pool workers.
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+
+    rows = []
+    stamps = []
+    candidates = []
+    pos = data.find(MARKER)
+    while pos != -1:
+        line_start = data.rfind(b"\n", 0, pos) + 1
+        line_end = data.find(b"\n", pos)
+        if line_end == -1:
+            line_end = len(data)
+        raw = data[line_start:line_end]
+        stripped = raw.lstrip()
+        line = stripped.decode("utf-8", errors="ignore").rstrip()
+        row, stamp = _parse_line(line, start + line_start + len(raw) - len(stripped))
+        if row is not None:
+            if stamp:
+                candidates.append(len(rows))
+                stamps.append(stamp)
+            rows.append(row)
+        pos = data.find(MARKER, line_end)
+
+    cols = _to_arrays(rows)
+    bad = 0
+    if candidates:
+        ts = _parse_stamps(stamps)
+        cols["timestamp"].view(np.int64)[candidates] = ts
+        bad = int(np.count_nonzero(ts == _NAT))
+        cols["strict"][candidates] = ts != _NAT
+    return cols, bad
+
+
+def chunk_ranges(path: Union[str, Path], chunk_bytes: int = CHUNK_BYTES, size: Optional[int] = None) -> List[Tuple[int, int]]:
+    """Newline-aligned byte ranges of roughly chunk_bytes covering the file."""
+    size = os.path.getsize(path) if size is None else size
+    ranges = []
+    start = 0
+    with open(path, "rb") as f:
+        while start < size:
+            stop = start + chunk_bytes
+            if stop < size:
+                f.seek(stop)
+                f.readline()
+                stop = min(f.tell(), size)
+            else:
+                stop = size
+            ranges.append((start, stop))
+            start = stop
+    return ranges
+
+
+class LogIngest:
+    """
+    Shared ingest stage for decision logs.
+
+    Usage:
+        ingest = LogIngest()
+        for batch in ingest.iter_batches("logs/agg_decisions.log"):
+            strict = batch[batch["strict"]]
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Union[str, Path]] = CACHE_DIR,
+        chunk_bytes: int = CHUNK_BYTES,
+        workers: Optional[int] = None
+    ):
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.chunk_bytes = chunk_bytes
+        self.workers = workers or os.cpu_count() or 1
+        self.bad_timestamps = 0      # strict-format lines with an unparseable timestamp, last file read
+
+    # ------------------------------------------------------------------
+    # Cache
+    # ------------------------------------------------------------------
+
+    def _cache_path(self, path: Path) -> Path:
+        digest = hashlib.sha1(str(path).encode("utf-8")).hexdigest()[:12]
+        return self.cache_dir / f"{path.name}-{digest}"
+
+    @staticmethod
+    def _key(stat: os.stat_result) -> dict:
+        return {"version": CACHE_VERSION, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def _cached(self, entry: Path, key: dict) -> Optional[dict]:
+        try:
+            meta = json.loads((entry / "key.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if {k: meta.get(k) for k in key} != key:
+            return None
+        return meta
+
+    # ------------------------------------------------------------------
+    # Parsing
+    # ------------------------------------------------------------------
+
+    def _parse(self, path: Path, size: int) -> Iterator[Tuple[Dict[str, np.ndarray], int]]:
+        ranges = chunk_ranges(path, self.chunk_bytes, size)
+        if self.workers <= 1 or len(ranges) <= 1:
+            for start, end in ranges:
+                yield parse_range(str(path), start, end)
+            return
+
+        # Bounded in-flight window: results stream out in file order
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(ranges))) as pool:
+            pending = deque()
+            todo = iter(ranges)
+            for start, end in todo:
+                pending.append(pool.submit(parse_range, str(path), start, end))
+                if len(pending) >= 2 * self.workers:
+                    break
+            while pending:
+                yield pending.popleft().result()
+                for start, end in todo:
+                    pending.append(pool.submit(parse_range, str(path), start, end))
+                    break
+
+    def iter_columns(self, path: Union[str, Path]) -> Iterator[Dict[str, np.ndarray]]:
+        """Column dicts per non-empty chunk, from the cache when the log is unchanged."""
+        path = Path(path).resolve()
+        stat = path.stat()
+        key = self._key(stat)
+
+        if self.cache_dir is not None:
+            entry = self._cache_path(path)
+            cached = self._cached(entry, key)
+            if cached is not None:
+                self.bad_timestamps = cached.get("bad", 0)
+                for chunk in cached.get("chunks", []):
+                    with np.load(entry / chunk, allow_pickle=False) as npz:
+                        yield {name: npz[name] for name in COLUMNS}
+                return
+
+        tmp = None
+        if self.cache_dir is not None:
+            tmp = entry.with_name(f"{entry.name}.tmp-{os.getpid()}")
+            shutil.rmtree(tmp, ignore_errors=True)
+            tmp.mkdir(parents=True)
+
+        chunks: List[str] = []
+        self.bad_timestamps = 0
+        complete = False
+        try:
+            for cols, bad in self._parse(path, stat.st_size):
+                self.bad_timestamps += bad
+                if not len(cols["offset"]):
+                    continue
+                if tmp is not None:
+                    name = f"chunk_{len(chunks):05d}.npz"
+                    np.savez(tmp / name, **cols)
+                    chunks.append(name)
+                yield cols
+            complete = True
+        finally:
+            if tmp is not None:
+                if complete:
+                    meta = {**key, "chunks": chunks, "bad": self.bad_timestamps}
+                    (tmp / "key.json").write_text(json.dumps(meta), encoding="utf-8")
+                    shutil.rmtree(entry, ignore_errors=True)
+                    os.replace(tmp, entry)
+                else:
+                    shutil.rmtree(tmp, ignore_errors=True)
+
+    def iter_batches(self, path: Union[str, Path], strict: bool = False) -> Iterator[pd.DataFrame]:
+        """DataFrame batches in file order; ``strict`` keeps only backtest-format lines."""
+        for cols in self.iter_columns(path):
+            batch = pd.DataFrame(cols, copy=False)
+            if strict:
+                batch = batch[batch["strict"].to_numpy()]
+                if batch.empty:
+                    continue
+            yield batch
+
+    def read_frame(self, path: Union[str, Path], strict: bool = False) -> pd.DataFrame:
+        """All batches concatenated."""
+        batches = list(self.iter_batches(path, strict))
+        if not batches:
+            return pd.DataFrame({name: arr for name, arr in _to_arrays([]).items()})
+        return pd.concat(batches, ignore_index=True)
@@ -1,7 +1,7 @@
 import pandas as pd
 import numpy as np
 from dataclasses import dataclass, field
-from typing import List, Dict
+from typing import List, Dict, Tuple
 from collections import deque
 
 from .parser import TradeEvent
@@ -82,35 +82,46 @@ class FifoPositionTracker:
 
         return trade_pnl
 
-def run_metrics_engine(
+def replay_events(
     events: List[TradeEvent],
     price_provider: PriceProvider,
     initial_capital: float = 1000.0
-) -> BacktestReport:
+) -> Tuple[BacktestReport, List[float]]:
+    """
+    Single FIFO replay shared by the metrics engine and Monte Carlo.
+
+    All events are priced in one get_prices batch. Returns the report and
+    the PnL of every completed (non-zero) trade.
+    """
     if not events:
-        return BacktestReport()
+        return BacktestReport(), []
 
     events = sorted(events, key=lambda e: e.timestamp)
+    prices = price_provider.get_prices(
+        [e.symbol for e in events], [e.timestamp for e in events]
+    )
     trackers: Dict[str, FifoPositionTracker] = {}
     equity = initial_capital
     equity_curve: List[float] = []
     timestamps: List = []
+    trade_pnls: List[float] = []
     total_trades = 0
 
     start_date = events[0].timestamp
     end_date = events[-1].timestamp
 
-    for event in events:
+    for event, price in zip(events, prices.tolist()):
         if event.symbol not in trackers:
             trackers[event.symbol] = FifoPositionTracker(event.symbol)
 
-        price = price_provider.get_price(event.symbol, event.timestamp)
         if price > 0:
             pnl_delta = trackers[event.symbol].process_trade(
                 event.action, price, event.size_usd
             )
             equity += pnl_delta
             total_trades += 1
+            if pnl_delta != 0:  # Completed trade
+                trade_pnls.append(pnl_delta)
 
         equity_curve.append(equity)
         timestamps.append(event.timestamp)
@@ -146,7 +157,7 @@ def run_metrics_engine(
             "wins": tracker.winning_trades,
         }
 
-    return BacktestReport(
+    report = BacktestReport(
         total_pnl=equity - initial_capital,
         total_pnl_pct=((equity - initial_capital) / initial_capital) * 100 if initial_capital > 0 else 0.0,
         win_rate=win_rate,
@@ -158,3 +169,11 @@ def run_metrics_engine(
         equity_curve=equity_curve,
         per_symbol=per_symbol_stats,
     )
+    return report, trade_pnls
+
+def run_metrics_engine(
+    events: List[TradeEvent],
+    price_provider: PriceProvider,
+    initial_capital: float = 1000.0
+) -> BacktestReport:
+    return replay_events(events, price_provider, initial_capital)[0]
@@ -13,7 +13,7 @@ from typing import List, Dict, Optional, Tuple
 from pathlib import Path
 import json
 
-from .metrics import BacktestReport, run_metrics_engine
+from .metrics import BacktestReport, replay_events
 from .parser import TradeEvent
 
 
@@ -208,6 +208,134 @@ class MonteCarloSimulator:
             max_dd_distribution=max_dd_values,
         )
     
+    def simulate_batch(
+        self,
+        trade_pnls: List[float],
+        initial_capital: float = 1000.0,
+        n_simulations: int = 1000,
+        ruin_threshold: float = 0.5,
+        method: str = "shuffle",
+        block_size: Optional[int] = None,
+        memory_budget_mb: float = 16.0
+    ) -> MonteCarloResult:
+        """
+        Batched Monte Carlo over a (n_simulations x n_trades) resample matrix.
+        
+        The matrix is built in row chunks sized to ``memory_budget_mb`` and
+        every metric is computed with array ops along the trade axis. With
+        ``method="shuffle"`` the permutations consume the RNG exactly like
+        simulate_from_trades, so the same seed gives the same result.
+        
+        Args:
+            trade_pnls: List of individual trade profit/losses
+            initial_capital: Starting capital
+            n_simulations: Number of simulations
+            ruin_threshold: Fraction of capital loss considered "ruin"
+            method: "shuffle", "block" (circular block bootstrap) or
+                "stationary" (Politis-Romano stationary bootstrap)
+            block_size: Block length / mean block length for bootstraps
+                (default: sqrt(n_trades))
+            memory_budget_mb: Approximate working memory per chunk
+        
+        Returns:
+            MonteCarloResult with statistics
+        """
+        if method not in ("shuffle", "block", "stationary"):
+            raise ValueError(f"Unknown resampling method: {method}")
+        
+        if not trade_pnls:
+            return self._empty_result(n_simulations)
+        
+        trade_pnls = np.asarray(trade_pnls, dtype=np.float64)
+        n_trades = len(trade_pnls)
+        block_size = block_size or max(1, int(round(np.sqrt(n_trades))))
+        
+        # ~4 float64 (rows x n_trades+1) temporaries live at once per chunk
+        row_bytes = 4 * 8 * (n_trades + 1)
+        chunk = max(1, min(n_simulations, int(memory_budget_mb * 1024 * 1024 // row_bytes)))
+        
+        sharpe_arr = np.empty(n_simulations)
+        max_dd_arr = np.empty(n_simulations)
+        pnl_arr = np.empty(n_simulations)
+        winrate_arr = np.empty(n_simulations)
+        ruined = np.empty(n_simulations, dtype=bool)
+        
+        for lo in range(0, n_simulations, chunk):
+            rows = min(chunk, n_simulations - lo)
+            sampled = self._resample(trade_pnls, rows, method, block_size)
+            
+            equity = np.empty((rows, n_trades + 1))
+            equity[:, 0] = initial_capital
+            np.cumsum(sampled, axis=1, out=equity[:, 1:])
+            equity[:, 1:] += initial_capital
+            
+            sl = slice(lo, lo + rows)
+            pnl_arr[sl] = equity[:, -1] - initial_capital
+            winrate_arr[sl] = np.sum(sampled > 0, axis=1) / n_trades
+            
+            running_max = np.maximum.accumulate(equity, axis=1)
+            max_dd_arr[sl] = np.abs(np.min((equity - running_max) / running_max, axis=1))
+            
+            returns = np.diff(equity, axis=1) / equity[:, :-1]
+            std = np.std(returns, axis=1)
+            if n_trades > 1:
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    sharpe = np.mean(returns, axis=1) / std * np.sqrt(252)
+                sharpe_arr[sl] = np.where(std > 0, sharpe, 0.0)
+            else:
+                sharpe_arr[sl] = 0.0
+            
+            ruined[sl] = np.min(equity, axis=1) < initial_capital * (1 - ruin_threshold)
+        
+        return MonteCarloResult(
+            n_simulations=n_simulations,
+            sharpe_mean=float(np.mean(sharpe_arr)),
+            sharpe_std=float(np.std(sharpe_arr)),
+            sharpe_5pct=float(np.percentile(sharpe_arr, 5)),
+            sharpe_95pct=float(np.percentile(sharpe_arr, 95)),
+            max_dd_mean=float(np.mean(max_dd_arr)),
+            max_dd_std=float(np.std(max_dd_arr)),
+            max_dd_5pct=float(np.percentile(max_dd_arr, 5)),
+            max_dd_95pct=float(np.percentile(max_dd_arr, 95)),
+            pnl_mean=float(np.mean(pnl_arr)),
+            pnl_std=float(np.std(pnl_arr)),
+            pnl_5pct=float(np.percentile(pnl_arr, 5)),
+            pnl_95pct=float(np.percentile(pnl_arr, 95)),
+            winrate_mean=float(np.mean(winrate_arr)),
+            winrate_std=float(np.std(winrate_arr)),
+            risk_of_ruin=int(np.sum(ruined)) / n_simulations,
+            sharpe_distribution=sharpe_arr.tolist(),
+            pnl_distribution=pnl_arr.tolist(),
+            max_dd_distribution=max_dd_arr.tolist(),
+        )
+    
+    def _resample(
+        self, trade_pnls: np.ndarray, rows: int, method: str, block_size: int
+    ) -> np.ndarray:
+        """Build a (rows x n_trades) matrix of resampled trade sequences."""
+        n = len(trade_pnls)
+        
+        if method == "shuffle":
+            return self.rng.permuted(np.tile(trade_pnls, (rows, 1)), axis=1)
+        
+        positions = np.arange(n)
+        
+        if method == "block":
+            # Circular block bootstrap: fixed-length blocks, random starts
+            n_blocks = -(-n // block_size)
+            starts = self.rng.integers(0, n, size=(rows, n_blocks))
+            block_start = starts[:, positions // block_size]
+            idx = (block_start + positions % block_size) % n
+        else:
+            # Stationary bootstrap: geometric block lengths with mean block_size
+            new_block = self.rng.random((rows, n)) < 1.0 / block_size
+            new_block[:, 0] = True
+            starts = self.rng.integers(0, n, size=(rows, n))
+            first = np.maximum.accumulate(np.where(new_block, positions, 0), axis=1)
+            idx = (np.take_along_axis(starts, first, axis=1) + positions - first) % n
+        
+        return trade_pnls[idx]
+    
     def _empty_result(self, n: int) -> MonteCarloResult:
         return MonteCarloResult(
             n_simulations=n,
@@ -227,33 +355,12 @@ def extract_trade_pnls_from_events(
     """
     Extract individual trade PnLs from events using FIFO matching.
     
+    Shares one replay (and one batched price lookup) with the full backtest.
+    
     Returns:
         Tuple of (trade_pnls, backtest_report)
     """
-    from .metrics import FifoPositionTracker
-    
-    if not events:
-        return [], BacktestReport()
-    
-    events = sorted(events, key=lambda e: e.timestamp)
-    trackers: Dict[str, FifoPositionTracker] = {}
-    trade_pnls = []
-    
-    for event in events:
-        if event.symbol not in trackers:
-            trackers[event.symbol] = FifoPositionTracker(event.symbol)
-        
-        price = price_provider.get_price(event.symbol, event.timestamp)
-        if price > 0:
-            pnl = trackers[event.symbol].process_trade(
-                event.action, price, event.size_usd
-            )
-            if pnl != 0:  # Completed trade
-                trade_pnls.append(pnl)
-    
-    # Also run full backtest for comparison
-    report = run_metrics_engine(events, price_provider, initial_capital)
-    
+    report, trade_pnls = replay_events(events, price_provider, initial_capital)
     return trade_pnls, report
 
 
@@ -276,3 +383,13 @@ if __name__ == "__main__":
     )
     
     print(result)
+    
+    # Batched kernel with stationary bootstrap
+    batched = MonteCarloSimulator(seed=42).simulate_batch(
+        trade_pnls,
+        initial_capital=1000,
+        n_simulations=10000,
+        method="stationary"
+    )
+    
+    print(batched)
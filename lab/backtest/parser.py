@@ -1,7 +1,11 @@
-import re
 from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Optional
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+import pandas as pd
+
+from .log_ingest import RE_STRICT, LogIngest
 
 @dataclass
 class TradeEvent:
@@ -11,7 +15,7 @@ class TradeEvent:
     size_usd: float
     regime: Optional[str]
     flow_mult: float
-    raw_line: str
+    raw_line: str = ""
 
     @property
     def side(self) -> int:
@@ -21,48 +25,53 @@ class TradeEvent:
 class LogParser:
     # Örnek satır:
     # 2025-12-11T22:25:38.515601 |   >>> EXECUTE: SELL SOL/USDT:USDT | $15 | Regime:TRENDING_DOWN | Flow:1.00x | ...
-    PATTERN = re.compile(
-        r"^(?P<ts>[\d\-T:\.]+) \|.*>>> EXECUTE: (?P<action>\w+) (?P<symbol>[^ ]+) \| \$(?P<size>[\d\.]+) \| Regime:(?P<regime>[^ ]+) \| Flow:(?P<flow>[\d\.]+)x"
-    )
+    PATTERN = RE_STRICT
 
     @staticmethod
-    def parse_file(file_path: str) -> List[TradeEvent]:
-        events: List[TradeEvent] = []
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    if ">>> EXECUTE:" not in line:
-                        continue
-
-                    match = LogParser.PATTERN.search(line.strip())
-                    if not match:
-                        continue
-
-                    data = match.groupdict()
-                    ts_str = data["ts"]
-                    try:
-                        if "." in ts_str:
-                            ts = datetime.strptime(ts_str, "%Y-%m-%dT%H:%M:%S.%f")
-                        else:
-                            ts = datetime.strptime(ts_str, "%Y-%m-%dT%H:%M:%S")
-                    except ValueError:
-                        # Eğer format çok egzotikse, direkt parse etmeyi boş ver
-                        print(f"[PARSER] Bad timestamp format: {ts_str}")
-                        continue
-
-                    try:
-                        event = TradeEvent(
-                            timestamp=ts,
-                            symbol=data["symbol"],
-                            action=data["action"],
-                            size_usd=float(data["size"]),
-                            regime=data["regime"],
-                            flow_mult=float(data["flow"]),
-                            raw_line=line.strip()
-                        )
-                        events.append(event)
-                    except Exception as e:
-                        print(f"[PARSER] Skipped line due to error: {e} | Line: {line.strip()[:80]}...")
-        except FileNotFoundError:
+    def iter_batches(file_path: str, ingest: Optional[LogIngest] = None) -> Iterator[pd.DataFrame]:
+        """Columnar batches of EXECUTE events (see log_ingest), cached per log file."""
+        if not Path(file_path).exists():
             print(f"[PARSER] File not found: {file_path}")
+            return
+        ingest = ingest or LogIngest()
+        yield from ingest.iter_batches(file_path, strict=True)
+        if ingest.bad_timestamps:
+            print(f"[PARSER] Skipped {ingest.bad_timestamps} lines with bad timestamp format")
+
+    @staticmethod
+    def parse_file(file_path: str, keep_raw: bool = False, ingest: Optional[LogIngest] = None) -> List[TradeEvent]:
+        """
+        TradeEvents for every EXECUTE line. raw_line is only filled (by
+        seeking to each line) when keep_raw is set.
+        """
+        events: List[TradeEvent] = []
+        for batch in LogParser.iter_batches(file_path, ingest):
+            raw = LogParser._raw_lines(file_path, batch["offset"]) if keep_raw else None
+            timestamps = batch["timestamp"].to_numpy().astype("datetime64[us]").astype(object)
+            for i, (ts, action, symbol, size, regime, flow) in enumerate(zip(
+                timestamps,
+                batch["action"].tolist(),
+                batch["symbol"].tolist(),
+                batch["size_usd"].tolist(),
+                batch["regime"].tolist(),
+                batch["flow_mult"].tolist(),
+            )):
+                events.append(TradeEvent(
+                    timestamp=ts,
+                    symbol=symbol,
+                    action=action,
+                    size_usd=size,
+                    regime=regime,
+                    flow_mult=flow,
+                    raw_line=raw[i] if raw else "",
+                ))
         return events
+
+    @staticmethod
+    def _raw_lines(file_path: str, offsets) -> List[str]:
+        lines = []
+        with open(file_path, "rb") as f:
+            for offset in offsets:
+                f.seek(int(offset))
+                lines.append(f.readline().decode("utf-8", errors="ignore").strip())
+        return lines
@@ -1,7 +1,18 @@
 import pandas as pd
+import numpy as np
 from datetime import datetime
 from abc import ABC, abstractmethod
-from typing import Dict
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+
+def _to_ns(values) -> np.ndarray:
+    """Datetimes (naive = UTC, tz-aware converted) to int64 ns since epoch."""
+    idx = pd.DatetimeIndex(values)
+    if idx.tz is not None:
+        idx = idx.tz_convert("UTC").tz_localize(None)
+    return idx.as_unit("ns").asi8
+
 
 class PriceProvider(ABC):
     @abstractmethod
@@ -13,11 +24,53 @@ class PriceProvider(ABC):
     def load_data(self, source: str):
         raise NotImplementedError
 
-class CsvPriceProvider(PriceProvider):
+    def get_prices(self, symbols: Sequence[str], timestamps: Sequence[datetime]) -> np.ndarray:
+        """Prices for a batch of (symbol, timestamp) pairs; providers may vectorize this."""
+        return np.array([self.get_price(s, t) for s, t in zip(symbols, timestamps)], dtype=np.float64)
+
+
+class ArrayPriceProvider(PriceProvider):
+    """
+    Per-symbol sorted int64 ns timestamps + float64 prices.
+
+    A batch lookup costs one searchsorted per symbol instead of an
+    index.asof per event. Semantics match the CSV provider: price at or
+    nearest before the timestamp, the first price for earlier timestamps,
+    0.0 for unknown symbols.
+
+    OHLCV sources are priced with each bar's open: bars are stamped with
+    their open time, and the close is not known until the bar ends, so
+    using it there would leak the future into the replay.
+
+    Usage:
+        provider = ArrayPriceProvider()
+        provider.load_store(OHLCVStore("data/historical/store"), ["DOGE/USDT:USDT"], "1h")
+        prices = provider.get_prices(symbols, timestamps)
+    """
+
     def __init__(self):
-        self.data: Dict[str, pd.DataFrame] = {}
+        self.series: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+    def add_series(self, symbol: str, timestamps, prices) -> None:
+        ts = _to_ns(timestamps)
+        px = np.asarray(prices, dtype=np.float64)
+        if len(ts) and np.any(ts[1:] < ts[:-1]):
+            order = np.argsort(ts, kind="stable")
+            ts, px = ts[order], px[order]
+        if len(ts):
+            self.series[symbol] = (ts, px)
+
+    # ------------------------------------------------------------------
+    # Loaders
+    # ------------------------------------------------------------------
 
     def load_data(self, source: str):
+        """CSV (timestamp, symbol, price) or a HistoricalDownloader parquet file."""
+        if Path(source).suffix == ".parquet":
+            return self.load_parquet(source)
+        return self.load_csv(source)
+
+    def load_csv(self, source: str):
         """
         Expects a CSV with columns: timestamp, symbol, price
         """
@@ -27,24 +80,89 @@ class CsvPriceProvider(PriceProvider):
             required = {"timestamp", "symbol", "price"}
             if not required.issubset(df.columns):
                 raise ValueError(f"CSV missing columns. Required: {required}")
+            self.load_frame(df)
+            print(f"[PRICE] Loaded {len(df)} rows for {len(self.series)} symbols.")
+        except Exception as e:
+            print(f"[PRICE] Error loading CSV: {e}")
 
-            df["timestamp"] = pd.to_datetime(df["timestamp"])
-            df = df.sort_values("timestamp")
+    def load_parquet(self, source: str, symbol: Optional[str] = None):
+        """
+        Parquet from HistoricalDownloader.save_parquet (timestamp, open, high,
+        low, close, volume), priced at each bar's open. The symbol defaults to the one save_csv derives
+        from the file name ("DOGE_1h" -> "DOGE/USDT:USDT").
+        """
+        path = Path(source)
+        print(f"[PRICE] Loading market data from {path}...")
+        try:
+            df = pd.read_parquet(path)
+            if "symbol" not in df.columns:
+                df["symbol"] = symbol or path.stem.split("_")[0] + "/USDT:USDT"
+            self.load_frame(df)
+            print(f"[PRICE] Loaded {len(df)} rows for {len(self.series)} symbols.")
+        except Exception as e:
+            print(f"[PRICE] Error loading parquet: {e}")
 
-            for sym, group in df.groupby("symbol"):
-                self.data[sym] = group.set_index("timestamp").sort_index()
+    def load_frame(self, df: pd.DataFrame, price_column: Optional[str] = None):
+        """Frame with timestamp, symbol and a price (or OHLCV open) column."""
+        column = price_column or ("price" if "price" in df.columns else "open")
+        for sym, group in df.groupby("symbol", sort=False):
+            self.add_series(sym, group["timestamp"], group[column].to_numpy())
 
-            print(f"[PRICE] Loaded {len(df)} rows for {len(self.data)} symbols.")
-        except Exception as e:
-            print(f"[PRICE] Error loading CSV: {e}")
+    def load_store(
+        self,
+        store,
+        symbols: Iterable[str],
+        timeframe: str,
+        start=None,
+        end=None,
+        exchange: str = "okx"
+    ):
+        """Open prices from the shared OHLCVStore; range defaults to everything stored."""
+        loaded = 0
+        for sym in symbols:
+            bounds = store.bounds(sym, timeframe, exchange)
+            if bounds is None:
+                continue
+            views = store.read_arrays(
+                sym, timeframe,
+                bounds[0] if start is None else start,
+                bounds[1] if end is None else end,
+                exchange,
+            )
+            if not views:
+                continue
+            block = views[0] if len(views) == 1 else np.concatenate(views, axis=1)
+            ts = block[0].astype(np.int64) * 1_000_000
+            self.series[sym] = (ts, np.asarray(block[1], dtype=np.float64))
+            loaded += block.shape[1]
+        print(f"[PRICE] Loaded {loaded} bars for {len(self.series)} symbols from store.")
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def get_prices(self, symbols: Sequence[str], timestamps: Sequence[datetime]) -> np.ndarray:
+        out = np.zeros(len(symbols), dtype=np.float64)
+        if not len(symbols):
+            return out
+        ts = _to_ns(timestamps)
+        names, inverse = np.unique(np.asarray(symbols, dtype=object), return_inverse=True)
+        for k, sym in enumerate(names):
+            series = self.series.get(sym)
+            if series is None:
+                continue
+            rows = np.flatnonzero(inverse == k)
+            stamps, prices = series
+            pos = np.searchsorted(stamps, ts[rows], side="right") - 1
+            out[rows] = prices[np.maximum(pos, 0)]
+        return out
 
     def get_price(self, symbol: str, timestamp: datetime) -> float:
-        if symbol not in self.data or self.data[symbol].empty:
-            return 0.0
-
-        df = self.data[symbol]
-        idx = df.index.asof(timestamp)
-        if pd.isna(idx):
-            # Çok erken timestamp isteğinde ilk değeri kullan
-            return float(df.iloc[0]["price"])
-        return float(df.loc[idx]["price"])
+        return float(self.get_prices([symbol], [timestamp])[0])
+
+
+class CsvPriceProvider(ArrayPriceProvider):
+    """CSV (timestamp, symbol, price) loader kept for existing callers."""
+
+    def load_data(self, source: str):
+        return self.load_csv(source)
@@ -7,14 +7,19 @@ ROOT = Path(__file__).resolve().parent.parent.parent
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
+from backtesting.ohlcv_store import OHLCVStore
 from lab.backtest.parser import LogParser
-from lab.backtest.price_provider import CsvPriceProvider
+from lab.backtest.price_provider import ArrayPriceProvider
 from lab.backtest.metrics import run_metrics_engine
 
 def main():
     parser = argparse.ArgumentParser(description="GODBRAIN v5 Backtest Runner")
     parser.add_argument("--log-file", required=True, help="Path to agg_decisions.log")
-    parser.add_argument("--price-file", required=True, help="Path to historical prices CSV (timestamp,symbol,price)")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--price-file", help="Historical prices CSV (timestamp,symbol,price) or downloader parquet")
+    source.add_argument("--price-store", help="OHLCVStore root written by HistoricalDownloader (fills at the bar open)")
+    parser.add_argument("--timeframe", default="1h", help="Store timeframe (with --price-store)")
+    parser.add_argument("--exchange", default="okx", help="Store exchange (with --price-store)")
     parser.add_argument(
         "--initial-capital",
         type=float,
@@ -31,9 +36,15 @@ def main():
         print("[ERR] No events found. Exiting.")
         return
 
-    print(f"\n[2/3] Loading Prices: {args.price_file}")
-    provider = CsvPriceProvider()
-    provider.load_data(args.price_file)
+    provider = ArrayPriceProvider()
+    if args.price_store:
+        print(f"\n[2/3] Loading Prices: {args.price_store} ({args.timeframe})")
+        symbols = sorted({e.symbol for e in events})
+        end = max(e.timestamp for e in events)
+        provider.load_store(OHLCVStore(args.price_store), symbols, args.timeframe, end=end, exchange=args.exchange)
+    else:
+        print(f"\n[2/3] Loading Prices: {args.price_file}")
+        provider.load_data(args.price_file)
 
     print(f"\n[3/3] Running Simulation (FIFO)...")
     report = run_metrics_engine(events, provider, initial_capital=args.initial_capital)
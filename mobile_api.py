@@ -24,19 +24,19 @@ from config_center import config
 app = Flask(__name__)
 CORS(app)
 
-# Redis connection
-import redis
+# Redis connection (shared pool; connections are checked out per request)
+from infrastructure.redis_pool import get_cache, get_redis as _pooled_redis
 redis_client = None
 
 def get_redis():
     global redis_client
     if redis_client is None:
         try:
-            redis_client = redis.Redis(
+            redis_client = _pooled_redis(
+                "mobile_api",
                 host=config.REDIS_HOST,
                 port=config.REDIS_PORT,
                 password=config.REDIS_PASS,
-                decode_responses=True
             )
         except:
             redis_client = None
@@ -55,8 +55,10 @@ def get_status():
         
         # 1) Get Voltran & DNA metrics from Redis (Namespaced)
         # BJ = Blackjack (Primary source of DNA alpha)
-        dna_meta = r.get(config.BJ_META_KEY) if r else None
-        voltran_state = r.get("state:voltran:snapshot") if r else None
+        status_keys = (config.BJ_META_KEY, "state:voltran:snapshot", "pulse:orchestrator")
+        dna_meta, voltran_state, pulse = (
+            get_cache(r, status_keys).mget(status_keys) if r else (None, None, None)
+        )
         
         meta = json.loads(dna_meta) if dna_meta else {}
         vstate = json.loads(voltran_state) if voltran_state else {}
@@ -74,7 +76,6 @@ def get_status():
 
         # 3) Get Health Metrics from Aggregator (if available)
         # We can also check the :8080/health endpoint or Redis pulse
-        pulse = r.get("pulse:orchestrator") if r else None
         uptime = 0
         if pulse:
             pulse_data = json.loads(pulse)
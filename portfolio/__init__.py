@@ -6,6 +6,6 @@ Optimization, rebalancing, correlation
 
 from .optimizer import PortfolioOptimizer
 from .rebalancer import DynamicRebalancer
-from .correlation import CorrelationAnalyzer
+from .correlation import CorrelationAnalyzer, CorrelationEngine
 
-__all__ = ['PortfolioOptimizer', 'DynamicRebalancer', 'CorrelationAnalyzer']
+__all__ = ['PortfolioOptimizer', 'DynamicRebalancer', 'CorrelationAnalyzer', 'CorrelationEngine']
@@ -1,10 +1,16 @@
 # -*- coding: utf-8 -*-
 """
 📈 CORRELATION ANALYZER - Correlation Matrix & Regime Detection
+
+CorrelationEngine keeps an exponentially weighted covariance matrix over
+N assets and updates it in O(N²) per bar from real returns. Everything
+else (correlation, clusters, regime, break score) is derived lazily from
+it and cached until the next bar, so readers such as the position sizer
+never recompute.
 """
 
 import numpy as np
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional, Union
 from dataclasses import dataclass
 from datetime import datetime
 import pandas as pd
@@ -18,99 +24,348 @@ class CorrelationRegime:
     timestamp: datetime
 
 
+def _alpha(halflife: float) -> float:
+    return 1.0 - np.exp(np.log(0.5) / halflife)
+
+
+class _EWMoments:
+    """EW mean and covariance, updated in place (same recursion as pandas ewm(adjust=False))."""
+
+    def __init__(self, n: int, alpha: float):
+        self.alpha = alpha
+        self.mean = np.zeros(n)
+        self.cov = np.zeros((n, n))
+        self._outer = np.empty((n, n))
+
+    def grow(self, n: int) -> None:
+        old = len(self.mean)
+        self.mean = np.concatenate([self.mean, np.zeros(n - old)])
+        cov = np.zeros((n, n))
+        cov[:old, :old] = self.cov
+        self.cov = cov
+        self._outer = np.empty((n, n))
+
+    def update(self, x: np.ndarray, seen: Optional[np.ndarray] = None) -> None:
+        """Fold one observation; only the ``seen`` assets' mean and covariance block move."""
+        a = self.alpha
+        if seen is None or seen.all():
+            delta = x - self.mean
+            self.mean += a * delta
+            self.cov *= 1.0 - a
+            np.outer(delta * ((1.0 - a) * a), delta, out=self._outer)
+            self.cov += self._outer
+            return
+        if not seen.any():
+            return
+        # Same rank-1 update on the full matrix with masked vectors: the
+        # seen block decays by (1 - a), unseen rows/columns are scaled by 1
+        # and get a zero outer product, so no sub-block is gathered.
+        mask = seen.astype(np.float64)
+        delta = np.where(seen, x - self.mean, 0.0)
+        self.mean += a * delta
+        np.outer(mask, mask * -a, out=self._outer)
+        self._outer += 1.0
+        self.cov *= self._outer
+        np.outer(delta * ((1.0 - a) * a), delta, out=self._outer)
+        self.cov += self._outer
+
+
+class CorrelationEngine:
+    """
+    Streaming EW covariance / correlation over a growing set of assets.
+
+    A slow (``halflife``) and a fast (``fast_halflife``) estimate are
+    kept; their disagreement is the regime-break score. The last
+    ``history`` return vectors are kept in a ring buffer for pairwise
+    rolling correlations.
+
+    Missing returns (absent symbol or NaN) do not count as an
+    observation: that asset's mean and covariance row/column are left
+    as they were, so gaps neither decay nor shrink its variance.
+
+    Usage:
+        engine = CorrelationEngine.from_store(store, symbols, "1h", start, end)
+        engine.update_prices({"BTC/USDT:USDT": 97000.0, ...})     # each new bar
+        rho = engine.correlation_frame()
+    """
+
+    def __init__(
+        self,
+        symbols: Iterable[str] = (),
+        halflife: float = 60.0,
+        fast_halflife: float = 10.0,
+        min_periods: int = 20,
+        history: int = 500,
+    ):
+        self.symbols: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.halflife = halflife
+        self.fast_halflife = fast_halflife
+        self.min_periods = min_periods
+        self.history = history
+
+        self.slow = _EWMoments(0, _alpha(halflife))
+        self.fast = _EWMoments(0, _alpha(fast_halflife))
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.bars = 0
+        self.version = 0
+        self._returns = np.full((history, 0), np.nan)
+        self._last_prices: Dict[str, float] = {}
+        self._cache: Dict[str, tuple] = {}
+        self.add_symbols(symbols)
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+
+    def add_symbols(self, symbols: Iterable[str]) -> None:
+        new = [s for s in dict.fromkeys(symbols) if s not in self.index]
+        if not new:
+            return
+        for sym in new:
+            self.index[sym] = len(self.symbols)
+            self.symbols.append(sym)
+        n = len(self.symbols)
+        self.slow.grow(n)
+        self.fast.grow(n)
+        self.counts = np.concatenate([self.counts, np.zeros(len(new), dtype=np.int64)])
+        self._returns = np.concatenate([self._returns, np.full((self.history, len(new)), np.nan)], axis=1)
+        self._cache.clear()
+
+    @classmethod
+    def from_returns(cls, returns: pd.DataFrame, **kwargs) -> "CorrelationEngine":
+        """Warm up from a (bars x symbols) returns frame, oldest first."""
+        engine = cls(returns.columns, **kwargs)
+        for row in returns.to_numpy(dtype=np.float64):
+            engine.update(row)
+        return engine
+
+    @classmethod
+    def from_store(cls, store, symbols: List[str], timeframe: str, start, end,
+                   exchange: str = "okx", **kwargs) -> "CorrelationEngine":
+        """Warm up from close-to-close log returns in the shared OHLCVStore."""
+        closes = pd.DataFrame({
+            sym: store.read_frame(sym, timeframe, start, end, exchange)["close"] for sym in symbols
+        })
+        engine = cls.from_returns(np.log(closes).diff().iloc[1:], **kwargs)
+        last = closes.ffill().iloc[-1] if len(closes) else pd.Series(dtype=float)
+        engine._last_prices = {s: float(p) for s, p in last.items() if np.isfinite(p)}
+        return engine
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def _vector(self, returns: Union[Dict[str, float], np.ndarray]) -> np.ndarray:
+        if isinstance(returns, dict):
+            self.add_symbols(returns)
+            x = np.full(len(self.symbols), np.nan)
+            for sym, r in returns.items():
+                x[self.index[sym]] = r
+            return x
+        return np.asarray(returns, dtype=np.float64)
+
+    def update(self, returns: Union[Dict[str, float], np.ndarray]) -> None:
+        """Fold one bar of returns (vector in ``symbols`` order, or symbol -> return)."""
+        x = self._vector(returns)
+        seen = ~np.isnan(x)
+        first = seen & (self.counts == 0)
+        for state in (self.slow, self.fast):
+            state.mean[first] = x[first]
+            state.update(x, seen)
+        self.counts += seen
+
+        self._returns[self.bars % self.history] = x
+        self.bars += 1
+        self.version += 1
+        self._cache.clear()
+
+    def update_prices(self, prices: Dict[str, float]) -> None:
+        """Fold one bar of prices; log returns against the previous bar's prices."""
+        returns = {}
+        for sym, price in prices.items():
+            prev = self._last_prices.get(sym)
+            if prev and price > 0:
+                returns[sym] = float(np.log(price / prev))
+            if price > 0:
+                self._last_prices[sym] = float(price)
+        self.add_symbols(prices)
+        if returns:
+            self.update(returns)
+
+    # ------------------------------------------------------------------
+    # Derived views (cached per update)
+    # ------------------------------------------------------------------
+
+    def _cached(self, key: str, build):
+        hit = self._cache.get(key)
+        if hit is None:
+            hit = self._cache[key] = (build(),)
+        return hit[0]
+
+    @property
+    def ready(self) -> np.ndarray:
+        """Assets with enough observations and non-zero variance."""
+        return self._cached("ready", lambda: (self.counts >= self.min_periods) & (np.diag(self.slow.cov) > 0))
+
+    @staticmethod
+    def _corr(cov: np.ndarray, ready: np.ndarray) -> np.ndarray:
+        std = np.sqrt(np.where(ready, np.diag(cov), 1.0))
+        corr = cov / np.outer(std, std)
+        corr[~ready, :] = 0.0
+        corr[:, ~ready] = 0.0
+        np.clip(corr, -1.0, 1.0, out=corr)
+        np.fill_diagonal(corr, 1.0)
+        return corr
+
+    def covariance(self) -> np.ndarray:
+        return self.slow.cov.copy()
+
+    def correlation(self) -> np.ndarray:
+        """Slow EW correlation; rows/cols of assets that are not ready are 0 off the diagonal."""
+        return self._cached("corr", lambda: self._corr(self.slow.cov, self.ready))
+
+    def fast_correlation(self) -> np.ndarray:
+        return self._cached("fast", lambda: self._corr(self.fast.cov, self.ready))
+
+    def correlation_frame(self, symbols: Optional[List[str]] = None) -> pd.DataFrame:
+        frame = pd.DataFrame(self.correlation(), index=self.symbols, columns=self.symbols)
+        return frame.loc[symbols, symbols] if symbols is not None else frame
+
+    def pair(self, sym1: str, sym2: str) -> float:
+        return float(self.correlation()[self.index[sym1], self.index[sym2]])
+
+    def _off_diagonal(self, corr: np.ndarray, symbols: Optional[List[str]] = None) -> np.ndarray:
+        ready = self.ready
+        if symbols is not None:
+            idx = np.array([self.index[s] for s in symbols if s in self.index], dtype=np.int64)
+            idx = idx[ready[idx]]
+        else:
+            idx = np.flatnonzero(ready)
+        sub = corr[np.ix_(idx, idx)]
+        return sub[np.triu_indices(len(idx), k=1)]
+
+    def average_correlation(self, symbols: Optional[List[str]] = None) -> float:
+        values = self._off_diagonal(self.correlation(), symbols)
+        return float(values.mean()) if len(values) else 0.0
+
+    def break_score(self, symbols: Optional[List[str]] = None) -> float:
+        """Mean |fast - slow| correlation over ready pairs; spikes when the structure shifts."""
+        diff = self._off_diagonal(np.abs(self.fast_correlation() - self.correlation()), symbols)
+        return float(diff.mean()) if len(diff) else 0.0
+
+    def regime_break(self, threshold: float = 0.25, symbols: Optional[List[str]] = None) -> bool:
+        return self.break_score(symbols) > threshold
+
+    def clusters(self, threshold: float = 0.7) -> List[List[str]]:
+        """Groups of ready assets linked by correlation >= threshold (single linkage)."""
+        def build():
+            ready = np.flatnonzero(self.ready)
+            linked = self.correlation()[np.ix_(ready, ready)] >= threshold
+            label = -np.ones(len(ready), dtype=np.int64)
+            groups = []
+            for seed in range(len(ready)):
+                if label[seed] >= 0:
+                    continue
+                label[seed] = len(groups)
+                frontier = [seed]
+                members = [seed]
+                while frontier:
+                    nxt = np.flatnonzero(linked[frontier].any(axis=0) & (label < 0))
+                    label[nxt] = len(groups)
+                    frontier = list(nxt)
+                    members.extend(nxt)
+                groups.append(sorted(self.symbols[ready[i]] for i in members))
+            return sorted(groups, key=len, reverse=True)
+        return self._cached(f"clusters:{threshold}", build)
+
+    def rolling_correlation(self, sym1: str, sym2: str, window: int = 30) -> List[float]:
+        """Window correlation of one pair over the buffered returns (oldest first)."""
+        n = min(self.bars, self.history)
+        order = (np.arange(self.bars - n, self.bars)) % self.history
+        i, j = self.index[sym1], self.index[sym2]
+        pair = pd.DataFrame(self._returns[order][:, [i, j]])
+        rolled = pair[0].rolling(window).corr(pair[1]).dropna()
+        return rolled.tolist()
+
+
 class CorrelationAnalyzer:
     """
     Analyze asset correlations and detect regime changes.
+
+    Reads from a shared CorrelationEngine fed with real returns; symbols
+    the engine has not seen yet are added (and count as uncorrelated
+    until they have ``min_periods`` bars).
     """
-    
+
+    def __init__(self, engine: Optional[CorrelationEngine] = None):
+        self.engine = engine or CorrelationEngine()
+
     def correlation_matrix(self, symbols: List[str], days: int = 90) -> pd.DataFrame:
-        """Calculate correlation matrix."""
-        # Mock returns data
-        import random
-        
-        data = {}
-        for sym in symbols:
-            base_return = random.uniform(-0.001, 0.001)
-            data[sym] = [base_return + random.gauss(0, 0.02) for _ in range(days)]
-        
-        df = pd.DataFrame(data)
-        return df.corr()
-    
+        """Calculate correlation matrix (EW; ``days`` is kept for compatibility)."""
+        self.engine.add_symbols(symbols)
+        return self.engine.correlation_frame(symbols)
+
     def rolling_correlation(self, sym1: str, sym2: str, window: int = 30) -> List[float]:
         """Calculate rolling correlation between two assets."""
-        import random
-        # Mock rolling correlation
-        correlations = []
-        current = random.uniform(0.3, 0.7)
-        
-        for _ in range(100):
-            current += random.gauss(0, 0.05)
-            current = max(-1, min(1, current))
-            correlations.append(current)
-        
-        return correlations
-    
+        self.engine.add_symbols([sym1, sym2])
+        return self.engine.rolling_correlation(sym1, sym2, window)
+
     def correlation_breakdown_detect(self, symbols: List[str]) -> bool:
         """
         Detect correlation breakdown (crisis mode).
         Returns True if correlations spiked to 1.
         """
-        matrix = self.correlation_matrix(symbols)
-        
-        # Check off-diagonal elements
-        off_diag = []
-        for i, sym1 in enumerate(symbols):
-            for j, sym2 in enumerate(symbols):
-                if i < j:
-                    off_diag.append(abs(matrix.loc[sym1, sym2]))
-        
-        avg_corr = np.mean(off_diag) if off_diag else 0
+        self.engine.add_symbols(symbols)
+        values = np.abs(self.engine._off_diagonal(self.engine.correlation(), symbols))
+        avg_corr = values.mean() if len(values) else 0.0
         return avg_corr > 0.8  # Crisis if avg correlation > 0.8
-    
+
     def diversification_score(self, portfolio: Dict[str, float]) -> float:
         """
         Calculate portfolio diversification score.
         0-100, higher = more diversified.
         """
         symbols = list(portfolio.keys())
-        weights = list(portfolio.values())
-        
-        matrix = self.correlation_matrix(symbols)
-        
-        # Weighted average correlation
-        total = 0
-        weight_sum = 0
-        
-        for i, sym1 in enumerate(symbols):
-            for j, sym2 in enumerate(symbols):
-                if i < j:
-                    w = weights[i] * weights[j]
-                    c = matrix.loc[sym1, sym2]
-                    total += w * c
-                    weight_sum += w
-        
-        avg_corr = total / weight_sum if weight_sum > 0 else 0
-        
+        weights = np.array(list(portfolio.values()), dtype=np.float64)
+        matrix = self.correlation_matrix(symbols).to_numpy()
+
+        # Weighted average correlation over pairs i < j
+        w = np.triu(np.outer(weights, weights), k=1)
+        weight_sum = w.sum()
+        avg_corr = (w * matrix).sum() / weight_sum if weight_sum > 0 else 0
+
         # Convert to score
         return (1 - avg_corr) * 100
-    
+
     def regime_detect(self, symbols: List[str]) -> str:
         """
         Detect correlation regime.
         Returns: 'normal', 'crisis', or 'divergence'
         """
-        matrix = self.correlation_matrix(symbols)
-        
-        off_diag = []
-        for i, sym1 in enumerate(symbols):
-            for j, sym2 in enumerate(symbols):
-                if i < j:
-                    off_diag.append(matrix.loc[sym1, sym2])
-        
-        avg = np.mean(off_diag) if off_diag else 0
-        
+        return self.regime(symbols).regime
+
+    def regime(self, symbols: Optional[List[str]] = None) -> CorrelationRegime:
+        if symbols is not None:
+            self.engine.add_symbols(symbols)
+        values = self.engine._off_diagonal(self.engine.correlation(), symbols)
+        avg = float(values.mean()) if len(values) else 0.0
+
         if avg > 0.7:
-            return 'crisis'
+            regime = 'crisis'
         elif avg < 0.2:
-            return 'divergence'
-        return 'normal'
+            regime = 'divergence'
+        else:
+            regime = 'normal'
+        return CorrelationRegime(
+            regime=regime,
+            avg_correlation=avg,
+            max_correlation=float(values.max()) if len(values) else 0.0,
+            timestamp=datetime.now(),
+        )
+
+    def clusters(self, threshold: float = 0.7) -> List[List[str]]:
+        return self.engine.clusters(threshold)
+
+    def regime_break(self, symbols: Optional[List[str]] = None, threshold: float = 0.25) -> bool:
+        return self.engine.regime_break(threshold, symbols)
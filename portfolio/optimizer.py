@@ -2,11 +2,18 @@
 """
 📊 PORTFOLIO OPTIMIZER - Markowitz, Kelly, Risk Parity
 Optimal portfolio allocation algorithms.
+
+Linear systems go through a Cholesky factor of the covariance (cached
+per covariance) instead of an explicit inverse. Whole results are cached
+on a hash of the inputs, so a rebalancer asking the same question every
+tick pays for the solve once.
 """
 
+import hashlib
 import numpy as np
-from typing import Dict, List, Optional
-from dataclasses import dataclass
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass, replace
 from datetime import datetime
 
 
@@ -30,8 +37,102 @@ class PortfolioOptimizer:
     - Risk Parity
     """
     
-    def __init__(self, risk_free_rate: float = 0.05):
+    def __init__(self, risk_free_rate: float = 0.05, cache_size: int = 256):
         self.risk_free_rate = risk_free_rate
+        self.cache_size = cache_size
+        self._factors: OrderedDict = OrderedDict()     # cov hash -> ('chol', L) | ('lu', cov)
+        self._results: OrderedDict = OrderedDict()     # input hash -> OptimizationResult
+        self._last_weights: Dict[Tuple, np.ndarray] = {}
+
+    # ------------------------------------------------------------------
+    # Shared linear algebra / caching
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _hash(*arrays: np.ndarray, **params) -> str:
+        h = hashlib.blake2b(digest_size=16)
+        for a in arrays:
+            a = np.ascontiguousarray(a, dtype=np.float64)
+            h.update(str(a.shape).encode())
+            h.update(a.tobytes())
+        h.update(repr(sorted(params.items())).encode())
+        return h.hexdigest()
+
+    def _remember(self, cache: OrderedDict, key, value):
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return value
+
+    @staticmethod
+    def moments(returns: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Sample mean and covariance (np.cov, ddof=1) of an N x M returns array."""
+        returns = np.asarray(returns, dtype=np.float64)
+        return np.mean(returns, axis=0), np.atleast_2d(np.cov(returns.T))
+
+    def _factor(self, cov_matrix: np.ndarray):
+        """Cholesky factor of the covariance, or the matrix itself when it isn't positive definite."""
+        key = self._hash(cov_matrix)
+        hit = self._factors.get(key)
+        if hit is not None:
+            self._factors.move_to_end(key)
+            return hit
+        try:
+            factor = ('chol', np.linalg.cholesky(cov_matrix))
+        except np.linalg.LinAlgError:
+            factor = ('lu', cov_matrix)
+        return self._remember(self._factors, key, factor)
+
+    def _solve(self, cov_matrix: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """cov_matrix^-1 @ b via the cached factor (LU solve when Cholesky failed)."""
+        kind, f = self._factor(cov_matrix)
+        if kind == 'chol':
+            from scipy.linalg import cho_solve
+            return cho_solve((f, True), b, check_finite=False)
+        return np.linalg.solve(f, b)
+
+    def _cached(self, method: str, build, *arrays, **params) -> OptimizationResult:
+        key = self._hash(*arrays, method=method, rf=self.risk_free_rate, **params)
+        hit = self._results.get(key)
+        if hit is None:
+            hit = self._remember(self._results, key, build())
+        else:
+            self._results.move_to_end(key)
+        return replace(hit, weights=dict(hit.weights), timestamp=datetime.now())
+
+    def portfolio_stats(self, weights: np.ndarray, mean_returns: np.ndarray,
+                        cov_matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Return, volatility and Sharpe for a (K x M) batch of weight vectors
+        in one pass (volatility = row norms of W @ L).
+        """
+        weights = np.atleast_2d(np.asarray(weights, dtype=np.float64))
+        rets = weights @ mean_returns
+        kind, f = self._factor(cov_matrix)
+        if kind == 'chol':
+            vols = np.linalg.norm(weights @ f, axis=1)
+        else:
+            vols = np.sqrt(np.einsum('km,mn,kn->k', weights, f, weights))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sharpes = (rets - self.risk_free_rate) / vols
+        return rets, vols, sharpes
+
+    def _result(self, weights: np.ndarray, symbols: List[str], mean_returns: np.ndarray,
+                cov_matrix: np.ndarray, method: str) -> OptimizationResult:
+        rets, vols, sharpes = self.portfolio_stats(weights, mean_returns, cov_matrix)
+        return OptimizationResult(
+            weights={sym: w for sym, w in zip(symbols, weights)},
+            expected_return=float(rets[0]),
+            expected_volatility=float(vols[0]),
+            sharpe_ratio=float(sharpes[0]),
+            method=method,
+            timestamp=datetime.now()
+        )
+
+    # ------------------------------------------------------------------
+    # Optimizers
+    # ------------------------------------------------------------------
     
     def mean_variance(self, returns: np.ndarray, symbols: List[str], 
                       target_return: Optional[float] = None) -> OptimizationResult:
@@ -43,31 +144,17 @@ class PortfolioOptimizer:
             symbols: List of asset symbols
             target_return: Target return (if None, maximize Sharpe)
         """
-        n_assets = returns.shape[1]
-        
-        # Calculate expected returns and covariance
-        mean_returns = np.mean(returns, axis=0)
-        cov_matrix = np.cov(returns.T)
-        
-        # Simple optimization - equal risk contribution as starting point
-        if target_return is None:
-            weights = self._max_sharpe_weights(mean_returns, cov_matrix)
-        else:
-            weights = self._target_return_weights(mean_returns, cov_matrix, target_return)
-        
-        # Calculate metrics
-        portfolio_return = np.dot(weights, mean_returns)
-        portfolio_vol = np.sqrt(np.dot(weights.T, np.dot(cov_matrix, weights)))
-        sharpe = (portfolio_return - self.risk_free_rate) / portfolio_vol
-        
-        return OptimizationResult(
-            weights={sym: w for sym, w in zip(symbols, weights)},
-            expected_return=float(portfolio_return),
-            expected_volatility=float(portfolio_vol),
-            sharpe_ratio=float(sharpe),
-            method="mean_variance",
-            timestamp=datetime.now()
-        )
+        mean_returns, cov_matrix = self.moments(returns)
+
+        def build():
+            if target_return is None:
+                weights = self._max_sharpe_weights(mean_returns, cov_matrix)
+            else:
+                weights = self._target_return_weights(mean_returns, cov_matrix, target_return)
+            return self._result(weights, symbols, mean_returns, cov_matrix, "mean_variance")
+
+        return self._cached("mean_variance", build, mean_returns, cov_matrix,
+                            symbols=tuple(symbols), target=target_return)
     
     def _max_sharpe_weights(self, mean_returns: np.ndarray, cov_matrix: np.ndarray) -> np.ndarray:
         """Calculate maximum Sharpe ratio weights."""
@@ -78,8 +165,7 @@ class PortfolioOptimizer:
         
         # Solve for optimal weights
         try:
-            inv_cov = np.linalg.inv(cov_matrix)
-            weights = np.dot(inv_cov, excess)
+            weights = self._solve(cov_matrix, excess)
             weights = weights / np.sum(weights)  # Normalize
             weights = np.maximum(weights, 0)  # No short selling
             weights = weights / np.sum(weights)  # Re-normalize
@@ -112,31 +198,21 @@ class PortfolioOptimizer:
     
     def min_variance(self, returns: np.ndarray, symbols: List[str]) -> OptimizationResult:
         """Minimum variance portfolio."""
-        cov_matrix = np.cov(returns.T)
-        mean_returns = np.mean(returns, axis=0)
-        
-        weights = self.min_variance_weights(cov_matrix)
-        
-        portfolio_return = np.dot(weights, mean_returns)
-        portfolio_vol = np.sqrt(np.dot(weights.T, np.dot(cov_matrix, weights)))
-        sharpe = (portfolio_return - self.risk_free_rate) / portfolio_vol
-        
-        return OptimizationResult(
-            weights={sym: w for sym, w in zip(symbols, weights)},
-            expected_return=float(portfolio_return),
-            expected_volatility=float(portfolio_vol),
-            sharpe_ratio=float(sharpe),
-            method="min_variance",
-            timestamp=datetime.now()
-        )
+        mean_returns, cov_matrix = self.moments(returns)
+
+        def build():
+            weights = self.min_variance_weights(cov_matrix)
+            return self._result(weights, symbols, mean_returns, cov_matrix, "min_variance")
+
+        return self._cached("min_variance", build, mean_returns, cov_matrix, symbols=tuple(symbols))
     
     def min_variance_weights(self, cov_matrix: np.ndarray) -> np.ndarray:
         """Calculate minimum variance weights."""
         n = cov_matrix.shape[0]
         try:
-            inv_cov = np.linalg.inv(cov_matrix)
             ones = np.ones(n)
-            weights = np.dot(inv_cov, ones) / np.dot(ones, np.dot(inv_cov, ones))
+            inv_ones = self._solve(cov_matrix, ones)
+            weights = inv_ones / np.dot(ones, inv_ones)
             weights = np.maximum(weights, 0)
             weights = weights / np.sum(weights)
         except:
@@ -170,31 +246,56 @@ class PortfolioOptimizer:
         kelly = (p * b - q) / b
         return max(0, min(kelly, 1))  # Clamp to [0, 1]
     
-    def risk_parity(self, returns: np.ndarray, symbols: List[str]) -> OptimizationResult:
+    def risk_parity(self, returns: np.ndarray, symbols: List[str],
+                    exact: bool = False) -> OptimizationResult:
         """
         Risk parity - each asset contributes equally to portfolio risk.
+
+        The default is the inverse-volatility approximation. With
+        ``exact=True`` the equal-risk-contribution weights are solved by
+        cyclical coordinate descent, warm-started from the last solution
+        for the same symbols.
         """
-        cov_matrix = np.cov(returns.T)
-        mean_returns = np.mean(returns, axis=0)
-        n = len(symbols)
-        
-        # Simplified risk parity: weight inversely to volatility
-        vols = np.sqrt(np.diag(cov_matrix))
-        inv_vols = 1 / vols
-        weights = inv_vols / np.sum(inv_vols)
-        
-        portfolio_return = np.dot(weights, mean_returns)
-        portfolio_vol = np.sqrt(np.dot(weights.T, np.dot(cov_matrix, weights)))
-        sharpe = (portfolio_return - self.risk_free_rate) / portfolio_vol
-        
-        return OptimizationResult(
-            weights={sym: w for sym, w in zip(symbols, weights)},
-            expected_return=float(portfolio_return),
-            expected_volatility=float(portfolio_vol),
-            sharpe_ratio=float(sharpe),
-            method="risk_parity",
-            timestamp=datetime.now()
-        )
+        mean_returns, cov_matrix = self.moments(returns)
+
+        def build():
+            if exact:
+                weights = self._erc_weights(cov_matrix, tuple(symbols))
+                return self._result(weights, symbols, mean_returns, cov_matrix, "risk_parity_erc")
+            # Simplified risk parity: weight inversely to volatility
+            vols = np.sqrt(np.diag(cov_matrix))
+            inv_vols = 1 / vols
+            weights = inv_vols / np.sum(inv_vols)
+            return self._result(weights, symbols, mean_returns, cov_matrix, "risk_parity")
+
+        return self._cached("risk_parity", build, mean_returns, cov_matrix,
+                            symbols=tuple(symbols), exact=exact)
+
+    def _erc_weights(self, cov_matrix: np.ndarray, key: Tuple,
+                     tol: float = 1e-10, max_sweeps: int = 500) -> np.ndarray:
+        """Equal risk contribution: solve y_i (Σy)_i = 1/n for y > 0, then normalize."""
+        n = cov_matrix.shape[0]
+        diag = np.diag(cov_matrix)
+        b = 1.0 / n
+        last = self._last_weights.get(('erc', key))
+        if last is not None and len(last) == n:
+            # Scale the previous weights onto the new covariance: y'Σy = 1 at the solution
+            y = last / np.sqrt(last @ cov_matrix @ last)
+        else:
+            y = 1 / np.sqrt(diag)
+            y /= np.sqrt(y @ cov_matrix @ y)
+        sigma_y = cov_matrix @ y
+        for _ in range(max_sweeps):
+            for i in range(n):
+                c = sigma_y[i] - diag[i] * y[i]
+                new = (-c + np.sqrt(c * c + 4 * diag[i] * b)) / (2 * diag[i])
+                sigma_y += cov_matrix[:, i] * (new - y[i])
+                y[i] = new
+            if np.max(np.abs(y * sigma_y - b)) < tol:
+                break
+        weights = y / y.sum()
+        self._last_weights[('erc', key)] = weights
+        return weights
     
     def black_litterman(self, returns: np.ndarray, symbols: List[str], 
                         views: Dict[str, float]) -> OptimizationResult:
@@ -205,9 +306,7 @@ class PortfolioOptimizer:
             views: Dict of symbol -> expected return view
         """
         # Simplified: blend market equilibrium with views
-        cov_matrix = np.cov(returns.T)
-        mean_returns = np.mean(returns, axis=0)
-        n = len(symbols)
+        mean_returns, cov_matrix = self.moments(returns)
         
         # Adjust expected returns based on views
         adjusted_returns = mean_returns.copy()
@@ -217,17 +316,46 @@ class PortfolioOptimizer:
                 adjusted_returns[i] = 0.5 * mean_returns[i] + 0.5 * views[sym]
         
         # Use adjusted returns for optimization
-        weights = self._max_sharpe_weights(adjusted_returns, cov_matrix)
-        
-        portfolio_return = np.dot(weights, adjusted_returns)
-        portfolio_vol = np.sqrt(np.dot(weights.T, np.dot(cov_matrix, weights)))
-        sharpe = (portfolio_return - self.risk_free_rate) / portfolio_vol
-        
-        return OptimizationResult(
-            weights={sym: w for sym, w in zip(symbols, weights)},
-            expected_return=float(portfolio_return),
-            expected_volatility=float(portfolio_vol),
-            sharpe_ratio=float(sharpe),
-            method="black_litterman",
-            timestamp=datetime.now()
-        )
+        def build():
+            weights = self._max_sharpe_weights(adjusted_returns, cov_matrix)
+            return self._result(weights, symbols, adjusted_returns, cov_matrix, "black_litterman")
+
+        return self._cached("black_litterman", build, adjusted_returns, cov_matrix,
+                            symbols=tuple(symbols))
+
+    def efficient_frontier(self, returns: np.ndarray, symbols: List[str],
+                           n_points: int = 20) -> List[OptimizationResult]:
+        """
+        Target-return portfolios from the min-variance return up to the best
+        single asset, evaluated as one (n_points x M) batch. Each point equals
+        mean_variance(returns, symbols, target_return=t) for its target.
+        """
+        mean_returns, cov_matrix = self.moments(returns)
+        n = len(mean_returns)
+
+        min_var_weights = self.min_variance_weights(cov_matrix)
+        max_ret_weights = np.zeros(n)
+        max_ret_weights[np.argmax(mean_returns)] = 1.0
+        min_ret = np.dot(min_var_weights, mean_returns)
+        max_ret = np.max(mean_returns)
+
+        if max_ret == min_ret:
+            alphas = np.zeros(n_points)
+        else:
+            targets = np.linspace(min_ret, max_ret, n_points)
+            alphas = np.clip((targets - min_ret) / (max_ret - min_ret), 0, 1)
+        weights = (1 - alphas)[:, None] * min_var_weights + alphas[:, None] * max_ret_weights
+
+        rets, vols, sharpes = self.portfolio_stats(weights, mean_returns, cov_matrix)
+        now = datetime.now()
+        return [
+            OptimizationResult(
+                weights={sym: w for sym, w in zip(symbols, row)},
+                expected_return=float(r),
+                expected_volatility=float(v),
+                sharpe_ratio=float(sr),
+                method="efficient_frontier",
+                timestamp=now
+            )
+            for row, r, v, sr in zip(weights, rets, vols, sharpes)
+        ]
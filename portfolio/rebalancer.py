@@ -4,10 +4,13 @@
 Threshold-based rebalancing with tax-loss harvesting.
 """
 
+import numpy as np
 from typing import Dict, List, Optional
 from dataclasses import dataclass
 from datetime import datetime
 
+from .optimizer import OptimizationResult, PortfolioOptimizer
+
 
 @dataclass
 class RebalanceOrder:
@@ -26,11 +29,14 @@ class DynamicRebalancer:
     - Drift detection
     - Threshold-based rebalancing
     - Tax-loss harvesting
+    - Batched drift / risk checks over many candidate weight vectors
     """
     
-    def __init__(self, target_weights: Dict[str, float], threshold: float = 0.05):
+    def __init__(self, target_weights: Dict[str, float], threshold: float = 0.05,
+                 optimizer: Optional[PortfolioOptimizer] = None):
         self.target_weights = target_weights
         self.threshold = threshold
+        self.optimizer = optimizer or PortfolioOptimizer()
     
     def check_drift(self, current_weights: Dict[str, float]) -> Dict[str, float]:
         """Check drift from target weights."""
@@ -47,6 +53,47 @@ class DynamicRebalancer:
         max_drift = max(abs(d) for d in drift.values())
         return max_drift > self.threshold
     
+    def drift_matrix(self, weights: np.ndarray, symbols: List[str]) -> np.ndarray:
+        """
+        Drift from target for K candidate weight vectors at once.
+
+        weights is (K x len(symbols)); the result is (K x len(target_weights))
+        with columns in target_weights order, like check_drift per row.
+        """
+        weights = np.atleast_2d(np.asarray(weights, dtype=np.float64))
+        column = {sym: i for i, sym in enumerate(symbols)}
+        current = np.zeros((len(weights), len(self.target_weights)))
+        for j, sym in enumerate(self.target_weights):
+            if sym in column:
+                current[:, j] = weights[:, column[sym]]
+        return current - np.fromiter(self.target_weights.values(), dtype=np.float64)
+
+    def rebalance_needed_batch(self, weights: np.ndarray, symbols: List[str]) -> np.ndarray:
+        """rebalance_needed for every row of a (K x len(symbols)) weight matrix."""
+        return np.abs(self.drift_matrix(weights, symbols)).max(axis=1) > self.threshold
+
+    def evaluate_candidates(self, weights: np.ndarray, symbols: List[str],
+                            returns: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Expected return, volatility, Sharpe and max drift per candidate row,
+        from one covariance factor shared across the whole batch.
+        """
+        mean_returns, cov_matrix = self.optimizer.moments(returns)
+        rets, vols, sharpes = self.optimizer.portfolio_stats(weights, mean_returns, cov_matrix)
+        return {
+            'expected_return': rets,
+            'expected_volatility': vols,
+            'sharpe_ratio': sharpes,
+            'max_drift': np.abs(self.drift_matrix(weights, symbols)).max(axis=1),
+        }
+
+    def retarget(self, returns: np.ndarray, symbols: List[str],
+                 method: str = 'max_sharpe', **kwargs) -> OptimizationResult:
+        """Reset target weights from the optimizer (cached when inputs repeat)."""
+        result = getattr(self.optimizer, method)(returns, symbols, **kwargs)
+        self.target_weights = {sym: float(w) for sym, w in result.weights.items()}
+        return result
+    
     def generate_rebalance_orders(self, current_weights: Dict[str, float], 
                                    portfolio_value: float) -> List[RebalanceOrder]:
         """Generate orders to rebalance portfolio."""
@@ -4,8 +4,8 @@ GODBRAIN - Advanced Risk Management
 VaR, Tail Risk, Liquidity Risk
 """
 
-from .var_engine import VaREngine
+from .var_engine import VaREngine, IncrementalVaR
 from .tail_risk import TailRiskManager
 from .liquidity_risk import LiquidityRiskManager
 
-__all__ = ['VaREngine', 'TailRiskManager', 'LiquidityRiskManager']
+__all__ = ['VaREngine', 'IncrementalVaR', 'TailRiskManager', 'LiquidityRiskManager']
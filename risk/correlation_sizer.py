@@ -1,13 +1,21 @@
 import numpy as np
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 class CorrelationAwarePositionSizer:
     """
     GODBRAIN V3 RISK MODULE
     Prevents over-exposure to correlated assets.
+
+    With a CorrelationEngine the cut is driven by the live EW correlation
+    between the new symbol and what is already held; the engine's cached
+    matrix is read as-is, nothing is recomputed here.
     """
-    def __init__(self):
-        # Hardcoded correlation matrix for simulation speed
+    def __init__(self, engine=None, max_cut: float = 0.5, min_portfolio_usd: float = 5000.0):
+        self.engine = engine
+        self.max_cut = max_cut
+        self.min_portfolio_usd = min_portfolio_usd
+
+        # Fallback correlation matrix when no engine is attached
         # BTC, ETH, SOL
         self.corr_matrix = np.array([
             [1.0, 0.85, 0.70],
@@ -16,16 +24,60 @@ class CorrelationAwarePositionSizer:
         ])
         self.assets = ["BTC", "ETH", "SOL"]
 
-    def adjust_size(self, symbol: str, proposed_usd: float, current_portfolio_usd: float) -> float:
+    def _engine_index(self, symbol: str) -> Optional[int]:
+        """Engine column for a symbol, matching "BTC" against "BTC/USDT:USDT" too."""
+        index = self.engine.index
+        if symbol in index:
+            return index[symbol]
+        base = symbol.split("/")[0]
+        for name, i in index.items():
+            if name.split("/")[0] == base:
+                return i
+        return None
+
+    def exposure_correlation(self, symbol: str, positions: Dict[str, float]) -> Optional[float]:
+        """
+        Exposure-weighted average correlation of `symbol` with held positions
+        (symbol -> USD notional). None when the engine can't tell yet.
+        """
+        if self.engine is None:
+            return None
+        i = self._engine_index(symbol)
+        if i is None or not self.engine.ready[i]:
+            return None
+        corr = self.engine.correlation()
+        total = weighted = 0.0
+        for held, usd in positions.items():
+            j = self._engine_index(held)
+            if j is None or j == i or not self.engine.ready[j]:
+                continue
+            total += abs(usd)
+            weighted += abs(usd) * corr[i, j]
+        if total <= 0:
+            return None
+        return weighted / total
+
+    def adjust_size(
+        self,
+        symbol: str,
+        proposed_usd: float,
+        current_portfolio_usd: float,
+        positions: Optional[Dict[str, float]] = None
+    ) -> float:
         """
         If portfolio is heavy on correlated assets, reduce new position size.
         """
+        if current_portfolio_usd <= self.min_portfolio_usd:
+            return proposed_usd
+
+        rho = self.exposure_correlation(symbol, positions) if positions else None
+        if rho is not None:
+            # Only positive co-movement adds risk; cut scales linearly up to max_cut at rho = 1
+            return proposed_usd * (1.0 - self.max_cut * max(rho, 0.0))
+
         base_sym = symbol.split("/")[0]
         if base_sym not in self.assets:
             return proposed_usd
-            
-        # Mock logic: If portfolio > $5000, start reducing size by correlation factor
-        if current_portfolio_usd > 5000:
-            return proposed_usd * 0.8 # Safety buffer
-            
-        return proposed_usd
+
+        # No live estimate: flat safety buffer
+        return proposed_usd * 0.8
@@ -148,7 +148,7 @@ class VaREngine:
         var_before = self.portfolio_var(positions, returns_data).var
         
         # Add new position
-        updated_positions = positions.copy()
+        updated_positions = {sym: dict(p) for sym, p in positions.items()}
         updated_positions[new_position['symbol']] = {
             'value': new_position['value'],
             'weight': new_position['weight']
@@ -163,3 +163,200 @@ class VaREngine:
         var_after = self.portfolio_var(updated_positions, returns_data).var
         
         return var_after - var_before
+
+
+@dataclass
+class PortfolioRisk:
+    """Full risk snapshot of a book; VaR figures are fractions of book value."""
+    var: float                      # historical
+    cvar: float                     # historical expected shortfall
+    parametric_var: float
+    monte_carlo_var: float
+    marginal_var: Dict[str, float]  # d(parametric VaR) / d(weight)
+    component_var: Dict[str, float] # weight * marginal; sums to parametric_var
+    value: float                    # gross book value the weights were taken from
+    confidence: float
+    horizon_days: int
+    timestamp: datetime
+
+
+class IncrementalVaR:
+    """
+    Rolling-window VaR service for a fixed asset universe.
+
+    Each bar updates the window, running sums and hence the covariance
+    in O(N²) instead of recomputing from the return history. Everything
+    that only depends on the market (covariance, its Cholesky factor) is
+    cached until the next bar, so re-pricing a changed book costs a few
+    matrix-vector products:
+
+    - historical VaR / CVaR: window @ w
+    - parametric VaR, marginal and component VaR: analytic from Σw
+    - Monte Carlo VaR: pre-generated standard normal scenarios Z, with
+      portfolio scenarios μ_p + Z @ (Lᵀ w); no per-call sampling
+
+    Missing returns are treated as 0 for that bar.
+
+    Usage:
+        service = IncrementalVaR(symbols, window=250)
+        service.update({"BTC/USDT:USDT": 0.004, ...})      # each bar
+        risk = service.risk({"BTC/USDT:USDT": 12000, ...}) # each book change
+    """
+
+    def __init__(self, symbols: List[str], window: int = 250, confidence: float = 0.95,
+                 horizon_days: int = 1, simulations: int = 10000, seed: Optional[int] = 7):
+        from scipy import stats
+
+        self.symbols = list(symbols)
+        self.index = {s: i for i, s in enumerate(self.symbols)}
+        self.window = window
+        self.confidence = confidence
+        self.horizon_days = horizon_days
+        self.z = stats.norm.ppf(1 - confidence)
+
+        n = len(self.symbols)
+        self._returns = np.zeros((window, n))
+        self._sum = np.zeros(n)
+        self._sumsq = np.zeros((n, n))
+        self._pos = 0
+        self.count = 0
+        self.version = 0
+        self._market = None     # (version, mean, cov, chol)
+
+        rng = np.random.default_rng(seed)
+        self.scenarios = rng.standard_normal((simulations, n))
+
+    @classmethod
+    def from_returns(cls, returns, **kwargs) -> "IncrementalVaR":
+        """Warm up from a (bars x symbols) returns DataFrame, oldest first."""
+        service = cls(list(returns.columns), **kwargs)
+        for row in np.asarray(returns, dtype=np.float64)[-service.window:]:
+            service.update(row)
+        return service
+
+    # ------------------------------------------------------------------
+    # Market updates
+    # ------------------------------------------------------------------
+
+    def update(self, returns) -> None:
+        """Push one bar (vector in ``symbols`` order, or symbol -> return)."""
+        if isinstance(returns, dict):
+            x = np.zeros(len(self.symbols))
+            for sym, r in returns.items():
+                if sym in self.index:
+                    x[self.index[sym]] = r
+        else:
+            x = np.array(returns, dtype=np.float64)
+        x[~np.isfinite(x)] = 0.0
+
+        if self.count == self.window:
+            old = self._returns[self._pos]
+            self._sum -= old
+            self._sumsq -= np.outer(old, old)
+        else:
+            self.count += 1
+        self._returns[self._pos] = x
+        self._sum += x
+        self._sumsq += np.outer(x, x)
+        self._pos = (self._pos + 1) % self.window
+
+        if self._pos == 0:
+            # Once per window: re-derive the sums so rounding can't accumulate
+            self._sum = self._returns.sum(axis=0)
+            self._sumsq = self._returns.T @ self._returns
+
+        self.version += 1
+
+    def _market_state(self):
+        """Window mean, covariance (ddof=0) and a Cholesky factor, cached per bar."""
+        if self._market is not None and self._market[0] == self.version:
+            return self._market[1:]
+        n = max(self.count, 1)
+        mean = self._sum / n
+        cov = self._sumsq / n - np.outer(mean, mean)
+        cov = (cov + cov.T) / 2
+        jitter = 1e-12 * max(np.trace(cov) / max(len(cov), 1), 1e-12)
+        for _ in range(6):
+            try:
+                chol = np.linalg.cholesky(cov + jitter * np.eye(len(cov)))
+                break
+            except np.linalg.LinAlgError:
+                jitter *= 100
+        else:
+            # Not positive semi-definite beyond rounding: fall back to the eigen root
+            vals, vecs = np.linalg.eigh(cov)
+            chol = vecs * np.sqrt(np.clip(vals, 0, None))
+        self._market = (self.version, mean, cov, chol)
+        return mean, cov, chol
+
+    def covariance(self) -> np.ndarray:
+        return self._market_state()[1].copy()
+
+    # ------------------------------------------------------------------
+    # Book risk
+    # ------------------------------------------------------------------
+
+    def _weights(self, positions: Dict[str, float]):
+        w = np.zeros(len(self.symbols))
+        for sym, value in positions.items():
+            if sym not in self.index:
+                raise KeyError(f"{sym} is not in the VaR universe")
+            w[self.index[sym]] += value
+        gross = float(np.abs(w).sum())
+        return (w / gross if gross > 0 else w), gross
+
+    def _parametric(self, w: np.ndarray, mean: np.ndarray, cov: np.ndarray):
+        """Portfolio mean, sigma and the analytic marginal VaR vector (Σw / σ)."""
+        h, scale = self.horizon_days, np.sqrt(self.horizon_days)
+        sigma_w = cov @ w
+        sigma = float(np.sqrt(max(w @ sigma_w, 0.0)))
+        if sigma > 0:
+            marginal = -(mean * h + self.z * scale * sigma_w / sigma)
+        else:
+            marginal = -mean * h
+        return float(mean @ w), sigma, marginal
+
+    def risk(self, positions: Dict[str, float]) -> PortfolioRisk:
+        """
+        Risk of a book given as symbol -> signed USD value (shorts negative).
+        """
+        w, gross = self._weights(positions)
+        mean, cov, chol = self._market_state()
+        h = self.horizon_days
+        scale = np.sqrt(h)
+
+        # Historical
+        pnl = self._returns[:self.count] @ w if self.count else np.zeros(1)
+        threshold = np.percentile(pnl, (1 - self.confidence) * 100)
+        tail = pnl[pnl <= threshold]
+        var = abs(threshold) * scale
+        cvar = abs(tail.mean()) * scale if len(tail) else var
+
+        # Parametric + Euler decomposition
+        mu, sigma, marginal = self._parametric(w, mean, cov)
+        parametric = abs(-(mu * h + self.z * sigma * scale))
+        component = w * marginal
+
+        # Monte Carlo on the fixed scenario set
+        simulated = mu * h + (self.scenarios @ (chol.T @ w)) * scale
+        mc = abs(np.percentile(simulated, (1 - self.confidence) * 100))
+
+        return PortfolioRisk(
+            var=float(var),
+            cvar=float(cvar),
+            parametric_var=parametric,
+            monte_carlo_var=float(mc),
+            marginal_var={s: float(marginal[i]) for s, i in self.index.items() if w[i] != 0},
+            component_var={s: float(component[i]) for s, i in self.index.items() if w[i] != 0},
+            value=gross,
+            confidence=self.confidence,
+            horizon_days=h,
+            timestamp=datetime.now()
+        )
+
+    def marginal_var(self, positions: Dict[str, float]) -> Dict[str, float]:
+        """d(parametric VaR)/d(weight) for every asset in the universe, held or not."""
+        w, _ = self._weights(positions)
+        mean, cov, _ = self._market_state()
+        marginal = self._parametric(w, mean, cov)[2]
+        return dict(zip(self.symbols, marginal.astype(float)))
@@ -6,7 +6,6 @@ Persistent memory with Redis backend for context across sessions.
 ═══════════════════════════════════════════════════════════════════════════════
 """
 
-import os
 import json
 import hashlib
 import time
@@ -82,14 +81,8 @@ class LongTermMemory:
         """Lazy load Redis connection."""
         if self._redis is None:
             try:
-                import redis
-                self._redis = redis.Redis(
-                    host=os.getenv("REDIS_HOST", "127.0.0.1"),
-                    port=int(os.getenv("REDIS_PORT", 6379)),
-                    password=os.getenv("REDIS_PASS"),
-                    decode_responses=True
-                )
-                self._redis.ping()
+                from infrastructure.redis_pool import get_redis
+                self._redis = get_redis("seraph_memory", check=True)
             except Exception:
                 self._redis = None
         return self._redis
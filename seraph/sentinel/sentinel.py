@@ -25,9 +25,11 @@ import signal
 import logging
 import argparse
 import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, Iterator, List, Optional, Any, Tuple
 from dataclasses import dataclass, field, asdict
 from enum import Enum
 
@@ -45,6 +47,8 @@ REPORT_HOUR = 9  # Daily report at 9 AM
 EVOLUTION_INTERVAL_CYCLES = 6  # Evolve every 6 cycles (1 hour at 10min intervals)
 EXCLUDED_DIRS = {".git", "__pycache__", ".venv", "venv", "node_modules", ".mypy_cache", ".pytest_cache", "backups"}
 EXCLUDED_FILES = {"__pycache__", ".pyc"}
+CONFIG_SUFFIXES = {".json", ".yaml", ".yml"}
+PARALLEL_MIN_FILES = 64  # Changed files needed before parsing in worker processes
 
 # Logging setup
 LOG_DIR = ROOT / "logs"
@@ -152,46 +156,46 @@ class ScanResult:
 class SyntaxScanner:
     """Scan Python files for syntax errors."""
     
+    @staticmethod
+    def inspect(source_bytes: bytes, tree: Optional[ast.AST], error: Optional[SyntaxError]) -> Dict:
+        """Per-file facts, taken from the shared parse."""
+        return {
+            "bom": source_bytes.startswith(b'\xef\xbb\xbf'),
+            "parsed": tree is not None,
+            "syntax_error": [error.lineno, error.msg] if error else None,
+        }
+    
     def scan(self, root: Path) -> List[Issue]:
+        return self.scan_index(SourceIndex(root).refresh())
+    
+    def scan_index(self, index: "SourceIndex") -> List[Issue]:
         issues = []
         
-        for py_file in root.rglob("*.py"):
-            if any(ex in py_file.parts for ex in EXCLUDED_DIRS):
-                continue
-            
-            try:
-                source_bytes = py_file.read_bytes()
-                has_bom = source_bytes.startswith(b'\xef\xbb\xbf')
-                source = source_bytes.decode('utf-8-sig', errors='ignore')  # Handle BOM
-                ast.parse(source)
-                
-                # Still report BOM as fixable even if syntax is OK
-                if has_bom:
-                    issues.append(Issue(
-                        type=IssueType.SYNTAX_ERROR,
-                        severity=Severity.WARNING,
-                        file=str(py_file.relative_to(root)),
-                        line=1,
-                        message="File has UTF-8 BOM (U+FEFF) - should be removed",
-                        fixable=True,
-                        fix_action="fix_bom"
-                    ))
-            except SyntaxError as e:
-                # Check if BOM is the cause
-                source_bytes = py_file.read_bytes()
-                has_bom = source_bytes.startswith(b'\xef\xbb\xbf')
-                
+        for rel, record in index.python_files():
+            error = record["syntax_error"]
+            if error:
                 issues.append(Issue(
                     type=IssueType.SYNTAX_ERROR,
                     severity=Severity.CRITICAL,
-                    file=str(py_file.relative_to(root)),
-                    line=e.lineno,
-                    message=f"SyntaxError: {e.msg}",
-                    fixable=has_bom,  # Fixable if caused by BOM
-                    fix_action="fix_bom" if has_bom else None
+                    file=rel,
+                    line=error[0],
+                    message=f"SyntaxError: {error[1]}",
+                    fixable=record["bom"],  # Fixable if caused by BOM
+                    fix_action="fix_bom" if record["bom"] else None
                 ))
-            except Exception as e:
-                logger.debug(f"Error parsing {py_file}: {e}")
+            elif record["bom"] and record["parsed"]:
+                # Still report BOM as fixable even if syntax is OK
+                issues.append(Issue(
+                    type=IssueType.SYNTAX_ERROR,
+                    severity=Severity.WARNING,
+                    file=rel,
+                    line=1,
+                    message="File has UTF-8 BOM (U+FEFF) - should be removed",
+                    fixable=True,
+                    fix_action="fix_bom"
+                ))
+            elif "unreadable" in record:
+                logger.debug(f"Error parsing {rel}: {record['unreadable']}")
         
         return issues
 
@@ -199,47 +203,51 @@ class SyntaxScanner:
 class ImportScanner:
     """Check for import issues."""
     
+    @staticmethod
+    def inspect(tree: Optional[ast.AST]) -> Dict:
+        """Imported module names with line numbers, taken from the shared parse."""
+        imports = []
+        if tree is not None:
+            for node in ast.walk(tree):
+                if isinstance(node, ast.Import):
+                    for alias in node.names:
+                        imports.append(["import", alias.name, node.lineno])
+                elif isinstance(node, ast.ImportFrom) and node.module:
+                    imports.append(["from", node.module, node.lineno])
+        return {"imports": imports}
+    
     def scan(self, root: Path) -> List[Issue]:
+        return self.scan_index(SourceIndex(root).refresh())
+    
+    def scan_index(self, index: "SourceIndex") -> List[Issue]:
         issues = []
+        root = index.root
         
-        for py_file in root.rglob("*.py"):
-            if any(ex in py_file.parts for ex in EXCLUDED_DIRS):
-                continue
-            
-            try:
-                source = py_file.read_text(encoding='utf-8', errors='ignore')
-                tree = ast.parse(source)
-                
-                for node in ast.walk(tree):
-                    if isinstance(node, ast.Import):
-                        for alias in node.names:
-                            if not self._can_import(alias.name, root):
-                                issues.append(Issue(
-                                    type=IssueType.IMPORT_ERROR,
-                                    severity=Severity.WARNING,
-                                    file=str(py_file.relative_to(root)),
-                                    line=node.lineno,
-                                    message=f"Import '{alias.name}' may not be available",
-                                    fixable=False
-                                ))
-                    
-                    elif isinstance(node, ast.ImportFrom):
-                        if node.module and not self._can_import(node.module, root):
-                            # Check if it's a local module
-                            module_path = root / node.module.replace(".", "/")
-                            if not (module_path.exists() or (module_path.with_suffix(".py")).exists()):
-                                issues.append(Issue(
-                                    type=IssueType.IMPORT_ERROR,
-                                    severity=Severity.WARNING,
-                                    file=str(py_file.relative_to(root)),
-                                    line=node.lineno,
-                                    message=f"Import from '{node.module}' may not be available",
-                                    fixable=False
-                                ))
-            except SyntaxError:
-                pass  # Handled by SyntaxScanner
-            except Exception as e:
-                logger.debug(f"Error checking imports in {py_file}: {e}")
+        for rel, record in index.python_files():
+            for kind, module, line in record["imports"]:
+                if self._can_import(module, root):
+                    continue
+                if kind == "import":
+                    issues.append(Issue(
+                        type=IssueType.IMPORT_ERROR,
+                        severity=Severity.WARNING,
+                        file=rel,
+                        line=line,
+                        message=f"Import '{module}' may not be available",
+                        fixable=False
+                    ))
+                else:
+                    # Check if it's a local module
+                    module_path = root / module.replace(".", "/")
+                    if not (module_path.exists() or (module_path.with_suffix(".py")).exists()):
+                        issues.append(Issue(
+                            type=IssueType.IMPORT_ERROR,
+                            severity=Severity.WARNING,
+                            file=rel,
+                            line=line,
+                            message=f"Import from '{module}' may not be available",
+                            fixable=False
+                        ))
         
         return issues
     
@@ -271,50 +279,50 @@ class ImportScanner:
 class ConfigScanner:
     """Validate JSON/YAML configuration files."""
     
+    @staticmethod
+    def inspect(rel: str, data: bytes) -> Optional[Dict]:
+        """Per-file facts; None when the file can't be checked here (PyYAML missing)."""
+        yaml = None
+        if not rel.endswith(".json"):
+            try:
+                import yaml
+            except ImportError:
+                return None  # YAML not installed
+        
+        try:
+            content = data.decode('utf-8')
+            if yaml is None:
+                json.loads(content)
+            else:
+                yaml.safe_load(content)
+        except json.JSONDecodeError as e:
+            return {"config_error": [e.lineno, f"Invalid JSON: {e.msg}"]}
+        except Exception as e:
+            if yaml is not None and isinstance(e, yaml.YAMLError):
+                line = getattr(e, 'problem_mark', None) and e.problem_mark.line
+                return {"config_error": [line, f"Invalid YAML: {str(e)[:100]}"]}
+            return {"config_error": None, "unreadable": f"{type(e).__name__}: {e}"}
+        return {"config_error": None}
+    
     def scan(self, root: Path) -> List[Issue]:
+        return self.scan_index(SourceIndex(root).refresh())
+    
+    def scan_index(self, index: "SourceIndex") -> List[Issue]:
         issues = []
         
-        # Scan JSON files
-        for json_file in root.rglob("*.json"):
-            if any(ex in json_file.parts for ex in EXCLUDED_DIRS):
-                continue
-            
-            try:
-                content = json_file.read_text(encoding='utf-8')
-                json.loads(content)
-            except json.JSONDecodeError as e:
+        for rel, record in index.config_files():
+            error = record["config_error"]
+            if error:
                 issues.append(Issue(
                     type=IssueType.CONFIG_ERROR,
                     severity=Severity.ERROR,
-                    file=str(json_file.relative_to(root)),
-                    line=e.lineno,
-                    message=f"Invalid JSON: {e.msg}",
+                    file=rel,
+                    line=error[0],
+                    message=error[1],
                     fixable=False
                 ))
-            except Exception as e:
-                logger.debug(f"Error reading {json_file}: {e}")
-        
-        # Scan YAML files
-        try:
-            import yaml
-            for yaml_file in list(root.rglob("*.yaml")) + list(root.rglob("*.yml")):
-                if any(ex in yaml_file.parts for ex in EXCLUDED_DIRS):
-                    continue
-                
-                try:
-                    content = yaml_file.read_text(encoding='utf-8')
-                    yaml.safe_load(content)
-                except yaml.YAMLError as e:
-                    issues.append(Issue(
-                        type=IssueType.CONFIG_ERROR,
-                        severity=Severity.ERROR,
-                        file=str(yaml_file.relative_to(root)),
-                        line=getattr(e, 'problem_mark', None) and e.problem_mark.line,
-                        message=f"Invalid YAML: {str(e)[:100]}",
-                        fixable=False
-                    ))
-        except ImportError:
-            pass  # YAML not installed
+            elif "unreadable" in record:
+                logger.debug(f"Error reading {rel}: {record['unreadable']}")
         
         return issues
 
@@ -323,26 +331,23 @@ class InitScanner:
     """Find directories missing __init__.py."""
     
     def scan(self, root: Path) -> List[Issue]:
+        return self.scan_index(SourceIndex(root).refresh())
+    
+    def scan_index(self, index: "SourceIndex") -> List[Issue]:
         issues = []
         
-        for dir_path in root.rglob("*"):
-            if not dir_path.is_dir():
-                continue
-            if any(ex in dir_path.parts for ex in EXCLUDED_DIRS):
-                continue
-            
+        for rel_dir, py_files in index.dirs.items():
             # Check if directory contains Python files
-            py_files = list(dir_path.glob("*.py"))
-            if py_files and not (dir_path / "__init__.py").exists():
+            if py_files and "__init__.py" not in py_files:
                 # Check if parent has __init__.py (indicates it should be a package)
-                parent_init = dir_path.parent / "__init__.py"
-                if parent_init.exists() or dir_path.parent == root:
+                parent = os.path.dirname(rel_dir)
+                if not parent or "__init__.py" in index.dirs.get(parent, ()):
                     issues.append(Issue(
                         type=IssueType.MISSING_INIT,
                         severity=Severity.WARNING,
-                        file=str(dir_path.relative_to(root)),
+                        file=rel_dir,
                         line=None,
-                        message=f"Directory '{dir_path.name}' has Python files but no __init__.py",
+                        message=f"Directory '{os.path.basename(rel_dir)}' has Python files but no __init__.py",
                         fixable=True,
                         fix_action="create_init"
                     ))
@@ -483,6 +488,167 @@ class LabScanner:
         return issues
 
 
+# =============================================================================
+# SHARED SCAN PASS
+# =============================================================================
+
+def _inspect_file(root: str, rel: str) -> Optional[Dict]:
+    """Read and parse one file once; every per-file scanner inspects the same AST."""
+    path = os.path.join(root, rel)
+    try:
+        st = os.stat(path)
+        with open(path, "rb") as fh:
+            data = fh.read()
+    except OSError:
+        return None
+    
+    record = {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+    if not rel.endswith(".py"):
+        facts = ConfigScanner.inspect(rel, data)
+        return None if facts is None else {**record, **facts}
+    
+    tree, error = None, None
+    try:
+        tree = ast.parse(data.decode('utf-8-sig', errors='ignore'))  # Handle BOM
+    except SyntaxError as e:
+        error = e
+    except Exception as e:
+        record["unreadable"] = f"{type(e).__name__}: {e}"
+    record.update(SyntaxScanner.inspect(data, tree, error))
+    record.update(ImportScanner.inspect(tree))
+    return record
+
+
+class SourceIndex:
+    """
+    One walk of the tree per scan, shared by the file scanners.
+    
+    Python and config files are read and parsed only when their size or
+    mtime changed; per-file facts (BOM, syntax error, imports, config
+    validity) are kept by relative path and, with a cache_path, persist
+    across restarts. Large batches of changed files (first run, branch
+    switch) are parsed in worker processes.
+    """
+    
+    CACHE_VERSION = 1
+    
+    def __init__(self, root: Path, cache_path: Optional[Path] = None,
+                 workers: Optional[int] = None, parallel_min: int = PARALLEL_MIN_FILES):
+        self.root = Path(root)
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.workers = workers or os.cpu_count() or 1
+        self.parallel_min = parallel_min
+        self.files: Dict[str, Dict] = {}       # rel path -> facts (size, mtime_ns, ...)
+        self.dirs: Dict[str, List[str]] = {}   # rel dir -> Python file names in it
+        self.parsed = 0                        # files (re)read by the last refresh
+        self._loaded = False
+    
+    def _cache_rel(self) -> Optional[str]:
+        if self.cache_path is None:
+            return None
+        try:
+            return str(self.cache_path.relative_to(self.root))
+        except ValueError:
+            return None
+    
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        if self.cache_path is None or not self.cache_path.exists():
+            return
+        try:
+            data = json.loads(self.cache_path.read_text(encoding='utf-8'))
+            if data.get("version") == self.CACHE_VERSION and data.get("root") == str(self.root.resolve()):
+                self.files = data["files"]
+        except (OSError, ValueError, KeyError) as e:
+            logger.debug(f"Ignoring scan cache {self.cache_path}: {e}")
+    
+    def _save(self):
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_path.with_suffix(".tmp")
+            tmp.write_text(json.dumps({
+                "version": self.CACHE_VERSION,
+                "root": str(self.root.resolve()),
+                "files": self.files,
+            }), encoding='utf-8')
+            os.replace(tmp, self.cache_path)
+        except OSError as e:
+            logger.warning(f"Could not save scan cache: {e}")
+    
+    def _walk(self) -> Dict[str, Tuple[int, int]]:
+        """(size, mtime_ns) of every scannable file; fills self.dirs on the way."""
+        root = str(self.root)
+        skip = self._cache_rel()
+        found, dirs = {}, {}
+        
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if d not in EXCLUDED_DIRS]
+            rel_dir = os.path.relpath(dirpath, root)
+            rel_dir = "" if rel_dir == "." else rel_dir
+            py_files = []
+            
+            for name in filenames:
+                suffix = os.path.splitext(name)[1]
+                if suffix == ".py":
+                    py_files.append(name)
+                elif suffix not in CONFIG_SUFFIXES:
+                    continue
+                rel = os.path.join(rel_dir, name) if rel_dir else name
+                if rel == skip:
+                    continue
+                try:
+                    st = os.stat(os.path.join(dirpath, name))
+                except OSError:
+                    continue
+                found[rel] = (st.st_size, st.st_mtime_ns)
+            
+            if rel_dir:
+                dirs[rel_dir] = py_files
+        
+        self.dirs = dirs
+        return found
+    
+    def _inspect(self, rels: List[str]) -> List[Optional[Dict]]:
+        root = str(self.root)
+        if len(rels) >= self.parallel_min and self.workers > 1:
+            chunksize = max(1, len(rels) // (self.workers * 4))
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                return list(pool.map(_inspect_file, repeat(root), rels, chunksize=chunksize))
+        return [_inspect_file(root, rel) for rel in rels]
+    
+    def refresh(self) -> "SourceIndex":
+        """Walk the tree and re-inspect only new or modified files."""
+        self._load()
+        found = self._walk()
+        
+        files, stale = {}, []
+        for rel, stamp in found.items():
+            record = self.files.get(rel)
+            if record is not None and (record["size"], record["mtime_ns"]) == stamp:
+                files[rel] = record
+            else:
+                stale.append(rel)
+        
+        for rel, record in zip(stale, self._inspect(stale)):
+            if record is not None:
+                files[rel] = record
+        
+        changed = bool(stale) or len(files) != len(self.files)
+        self.files = dict(sorted(files.items()))
+        self.parsed = len(stale)
+        if changed and self.cache_path is not None:
+            self._save()
+        return self
+    
+    def python_files(self) -> Iterator[Tuple[str, Dict]]:
+        return ((rel, r) for rel, r in self.files.items() if rel.endswith(".py"))
+    
+    def config_files(self) -> Iterator[Tuple[str, Dict]]:
+        return ((rel, r) for rel, r in self.files.items() if not rel.endswith(".py"))
+
+
 # =============================================================================
 # AUTO-FIXER
 # =============================================================================
@@ -722,6 +888,7 @@ class Sentinel:
             LogScanner(),
             LabScanner(),  # Physics lab monitoring
         ]
+        self.index = SourceIndex(self.root, cache_path=self.root / "data" / "cache" / "sentinel" / "source_index.json")
         self.fixer = AutoFixer(self.root, dry_run=dry_run)
         self.reporter = Reporter(self.root)
         
@@ -739,12 +906,22 @@ class Sentinel:
         logger.info("Starting system scan...")
         
         all_issues: List[Issue] = []
-        files_scanned = len(list(self.root.rglob("*.py")))
+        
+        # One walk + parse of changed files, shared by the file scanners
+        try:
+            self.index.refresh()
+        except Exception as e:
+            logger.error(f"Source index refresh failed: {e}")
+        files_scanned = sum(1 for _ in self.index.python_files())
+        logger.debug(f"Source index: {self.index.parsed} files re-parsed")
         
         # Run all scanners
         for scanner in self.scanners:
             try:
-                issues = scanner.scan(self.root)
+                if hasattr(scanner, "scan_index"):
+                    issues = scanner.scan_index(self.index)
+                else:
+                    issues = scanner.scan(self.root)
                 all_issues.extend(issues)
                 logger.debug(f"{scanner.__class__.__name__}: {len(issues)} issues")
             except Exception as e:
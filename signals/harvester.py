@@ -7,11 +7,11 @@ Collects signals from various sources: Redis (Genetics), Godlang (Pulse), and Vo
 import os
 import json
 import time
-import redis
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 
 from config_center import config
+from infrastructure.redis_pool import get_cache, get_redis
 
 # Import Voltran Bridge
 try:
@@ -33,20 +33,17 @@ class SignalHarvester:
         self.voltran_cache = {"data": None, "last_update": 0.0}
         
     def _connect_redis(self):
-        try:
-            r = redis.Redis(
-                host=config.REDIS_HOST,
-                port=config.REDIS_PORT,
-                password=config.REDIS_PASS,
-                decode_responses=True,
-                socket_timeout=5,
-                socket_connect_timeout=5,
-            )
-            r.ping()
-            return r
-        except Exception as e:
-            print(f"[HARVESTER] ❌ Redis connection failed: {e}")
-            return None
+        # Shared pool: the first call pings, later calls reuse pooled connections
+        r = get_redis(
+            "harvester",
+            host=config.REDIS_HOST,
+            port=config.REDIS_PORT,
+            password=config.REDIS_PASS,
+            check=True,
+        )
+        if r is None:
+            print("[HARVESTER] ❌ Redis connection failed")
+        return r
 
     def _compute_multipliers_from_dna(self, dna: List[int]) -> List[float]:
         if not dna or len(dna) < 6:
@@ -76,8 +73,9 @@ class SignalHarvester:
                 # Still fail-safe
                 return self.active_dna, self.active_meta
 
-            raw_dna = self.redis_conn.get(config.DNA_KEY)
-            raw_meta = self.redis_conn.get(config.META_KEY)
+            # Served from the shared client-side cache while keyspace invalidation is live
+            keys = (config.DNA_KEY, config.META_KEY)
+            raw_dna, raw_meta = get_cache(self.redis_conn, keys).mget(keys)
             if not raw_dna:
                 return self.active_dna, self.active_meta
 
@@ -121,6 +121,36 @@ def sample_ohlcv_bearish() -> pd.DataFrame:
     })
 
 
+@pytest.fixture
+def make_ohlcv_frames():
+    """
+    Factory for backtest input: {symbol: hourly OHLCV frame} from 2024-01-01.
+
+    make_ohlcv_frames(symbols, n, seed, volatility, open_noise, spread);
+    open_noise=0 makes open equal to close.
+    """
+    def make(
+        symbols: List[str], n: int = 1500, seed: int = 7, volatility: float = 0.01,
+        open_noise: float = 0.001, spread: float = 0.005
+    ) -> Dict[str, pd.DataFrame]:
+        rng = np.random.default_rng(seed)
+        index = pd.date_range("2024-01-01", periods=n, freq="1h")
+        data = {}
+        for symbol in symbols:
+            close = 100 * np.cumprod(1 + rng.normal(0, volatility, n))
+            open_ = close * (1 + rng.normal(0, open_noise, n)) if open_noise else close
+            data[symbol] = pd.DataFrame({
+                'open': open_,
+                'high': close * (1 + spread),
+                'low': close * (1 - spread),
+                'close': close,
+                'volume': rng.uniform(1000, 5000, n),
+            }, index=index)
+        return data
+    
+    return make
+
+
 # =============================================================================
 # Mock Exchange Fixtures
 # =============================================================================
@@ -0,0 +1,130 @@
+"""
+Tests for AccountState and GodbrainExecutor sizing from local state,
+with MockExchange standing in for OKX.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from config_center import config
+from execution.account_state import AccountState
+from execution.executor import GodbrainExecutor
+from execution.mock_exchange import MockExchange
+
+
+SYMBOL = "TIA/USDT:USDT"
+LATENCY = 0.05
+
+
+@pytest.fixture
+def live(monkeypatch):
+    monkeypatch.setattr(config, "APEX_LIVE", True)
+
+
+def _exchange(**kwargs):
+    return MockExchange(prices={SYMBOL: 5.0, "PI/USDT:USDT": 2.0}, balance_usdt=100.0,
+                        contract_sizes={SYMBOL: 0.1}, **kwargs)
+
+
+class TestAccountState:
+
+    def test_reconcile_and_local_reads(self):
+        ex = _exchange()
+        account = AccountState(ex)
+
+        async def scenario():
+            await account.start([SYMBOL])
+            await account.stop()
+
+        asyncio.run(scenario())
+
+        assert account.free() == 100.0
+        assert account.last_price(SYMBOL) == 5.0
+        assert account.market(SYMBOL).contract_size == 0.1
+        assert account.is_fresh("balance")
+
+    def test_push_updates_replace_snapshot(self):
+        ex = _exchange()
+        account = AccountState(ex)
+
+        async def scenario():
+            await account.start([SYMBOL])
+            await asyncio.sleep(0)          # watchers subscribe
+            ex.set_price(SYMBOL, 6.5)
+            ex.set_balance(40.0, 120.0)
+            await asyncio.sleep(0.01)
+            await account.stop()
+
+        asyncio.run(scenario())
+
+        assert account.last_price(SYMBOL) == 6.5
+        assert (account.free(), account.total()) == (40.0, 120.0)
+
+    def test_pushed_positions_merge_by_symbol(self):
+        account = AccountState(_exchange())
+        account.apply_positions([
+            {"symbol": SYMBOL, "contracts": 10.0, "side": "long"},
+            {"symbol": "PI/USDT:USDT", "contracts": 5.0, "side": "short"},
+        ], replace=True)
+
+        account.apply_positions([{"symbol": SYMBOL, "contracts": 12.0, "side": "long"}])
+        assert account.positions[SYMBOL]["contracts"] == 12.0
+        assert account.positions["PI/USDT:USDT"]["contracts"] == 5.0
+
+        account.apply_positions([{"symbol": "PI/USDT:USDT", "contracts": 0.0, "side": "short"}])
+        assert list(account.positions) == [SYMBOL]
+
+        account.apply_positions([], replace=True)         # REST snapshot: nothing open
+        assert account.positions == {}
+
+    def test_stale_snapshot_is_not_trusted(self):
+        now = [0.0]
+        account = AccountState(_exchange(), max_age=30.0, clock=lambda: now[0])
+        account.apply_tickers({SYMBOL: {"last": 5.0}})
+
+        now[0] = 31.0
+
+        assert account.last_price(SYMBOL) is None
+        assert not account.is_fresh("balance")
+
+
+class TestExecutorWithAccountState:
+
+    def test_order_is_the_only_round_trip(self, live):
+        ex = _exchange(latency=LATENCY)
+        account = AccountState(ex)
+        executor = GodbrainExecutor(ex, account=account)
+
+        async def scenario():
+            await account.start([SYMBOL])
+            await executor.warm_up([SYMBOL])
+            ex.calls.clear()
+            start = time.perf_counter()
+            order = await executor.execute_trade(SYMBOL, "BUY", 50.0)
+            elapsed = time.perf_counter() - start
+            await account.stop()
+            return order, elapsed
+
+        order, elapsed = asyncio.run(scenario())
+
+        assert ex.calls == ["create_market_order"]
+        assert elapsed < 0.1
+        # 100 free * 10x = 1000 USD / (5.0 * 0.1) = 2000 contracts
+        assert order["amount"] == 2000
+        assert account.free() == 0.0
+
+    def test_without_account_state_every_input_is_fetched(self, live):
+        ex = _exchange(latency=LATENCY)
+        executor = GodbrainExecutor(ex)
+
+        async def scenario():
+            await ex.load_markets()
+            ex.calls.clear()
+            return await executor.execute_trade(SYMBOL, "BUY", 50.0)
+
+        order = asyncio.run(scenario())
+
+        assert ex.calls == ["set_leverage", "fetch_balance", "fetch_ticker", "create_market_order"]
+        assert order["amount"] == 2000
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""
+═══════════════════════════════════════════════════════════════════════════════
+GODBRAIN Backtest Engine Tests
+Parity between the event-driven and vectorized engine modes, and between
+cached and recomputed indicators.
+═══════════════════════════════════════════════════════════════════════════════
+"""
+
+import asyncio
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import sys
+from pathlib import Path
+ROOT = Path(__file__).parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from backtesting.engine import (
+    BacktestConfig,
+    BacktestContext,
+    BacktestEngine,
+    BarArrays,
+    BacktestState,
+    Strategy,
+)
+from backtesting.indicators import compute_indicator, warmup_bars
+
+
+class MomentumStrategy(Strategy):
+    """Deterministic strategy exercising entries, SL/TP and CLOSE."""
+    
+    def init(self, context: BacktestContext) -> None:
+        self.symbols = list(context.data.keys())
+    
+    def next(self, context: BacktestContext) -> Optional[List[Dict]]:
+        signals = []
+        for symbol in self.symbols:
+            df = context.get_ohlcv(symbol, lookback=5)
+            if len(df) < 5:
+                continue
+            price = context.get_price(symbol)
+            change = df['close'].iloc[-1] / df['close'].iloc[0] - 1
+            
+            if symbol in context.positions:
+                if abs(change) < 0.002:
+                    signals.append({'action': 'CLOSE', 'symbol': symbol})
+            elif change > 0.01:
+                signals.append({
+                    'action': 'BUY', 'symbol': symbol, 'size': 0.2,
+                    'stop_loss': price * 0.98, 'take_profit': price * 1.03
+                })
+            elif change < -0.01:
+                signals.append({
+                    'action': 'SELL', 'symbol': symbol, 'size': 0.2,
+                    'stop_loss': price * 1.02, 'take_profit': price * 0.97
+                })
+        return signals or None
+
+
+def _run(mode: str, data: Dict[str, pd.DataFrame]):
+    config = BacktestConfig(
+        start_date=datetime(2024, 1, 1),
+        end_date=datetime(2024, 3, 1),
+        max_drawdown_pct=0.9,
+        engine_mode=mode,
+    )
+    engine = BacktestEngine(config)
+    engine.set_data(data)
+    engine.set_strategy(MomentumStrategy())
+    return asyncio.run(engine.run())
+
+
+class TestVectorizedParity:
+    """Vectorized mode must reproduce the event engine exactly."""
+    
+    def test_results_identical(self, make_ohlcv_frames):
+        data = make_ohlcv_frames(["BTC/USDT", "ETH/USDT", "SOL/USDT"])
+        
+        event = _run("event", data)
+        vectorized = _run("vectorized", data)
+        
+        assert event.total_trades > 10
+        pd.testing.assert_series_equal(event.equity_curve, vectorized.equity_curve)
+        assert event.trades == vectorized.trades
+        assert event.to_dict() == vectorized.to_dict()
+    
+    def test_unknown_mode_rejected(self, make_ohlcv_frames):
+        with pytest.raises(ValueError):
+            _run("turbo", make_ohlcv_frames(["BTC/USDT"], n=10))
+
+
+class TestBarArrays:
+    """Alignment of symbol frames onto the common index."""
+    
+    def test_aligns_on_common_index(self, make_ohlcv_frames):
+        data = make_ohlcv_frames(["BTC/USDT", "ETH/USDT"], n=20)
+        data["ETH/USDT"] = data["ETH/USDT"].iloc[5:]
+        common = data["BTC/USDT"].index.intersection(data["ETH/USDT"].index)
+        
+        bars = BarArrays.from_frames(data, common)
+        
+        assert bars.close.shape == (2, 15)
+        row = bars.rows["ETH/USDT"]
+        np.testing.assert_array_equal(bars.close[row], data["ETH/USDT"]['close'].to_numpy())
+        np.testing.assert_array_equal(
+            bars.high[bars.rows["BTC/USDT"]],
+            data["BTC/USDT"]['high'].iloc[5:].to_numpy()
+        )
+
+
+class TestIndicatorStore:
+    """Cached indicators must match the per-bar trailing-window recompute."""
+    
+    @pytest.mark.parametrize("indicator,kwargs", [
+        ('sma', {'period': 10}),
+        ('rsi', {'period': 14}),
+        ('atr', {'period': 14}),
+        ('bbands', {'period': 20}),
+    ])
+    def test_matches_window_recompute(self, indicator, kwargs, make_ohlcv_frames):
+        data = make_ohlcv_frames(["BTC/USDT"], n=300)
+        df = data["BTC/USDT"]
+        config = BacktestConfig(start_date=datetime(2024, 1, 1), end_date=datetime(2024, 2, 1))
+        context = BacktestContext(data, BacktestState(), config)
+        lookback = kwargs.get('period', 14) * 3
+        
+        for i in range(lookback, 300, 7):
+            context._current_idx = i
+            cached = context.get_indicator("BTC/USDT", indicator, **kwargs)
+            window = df.iloc[i - lookback:i + 1]
+            expected = compute_indicator(window, indicator, **kwargs)
+            
+            assert len(cached) == len(expected)
+            np.testing.assert_allclose(
+                np.asarray(cached.iloc[-1], dtype=float),
+                np.asarray(expected.iloc[-1], dtype=float),
+                rtol=1e-9
+            )
+        
+        assert context.indicators.misses == 1
+    
+    @pytest.mark.parametrize("indicator,kwargs", [
+        ('sma', {'period': 10}),
+        ('rsi', {'period': 14}),
+        ('atr', {'period': 14}),
+        ('bbands', {'period': 20}),
+    ])
+    def test_series_warmup_is_nan_and_windows_are_views(self, indicator, kwargs, make_ohlcv_frames):
+        data = make_ohlcv_frames(["BTC/USDT"], n=300)
+        df = data["BTC/USDT"]
+        config = BacktestConfig(start_date=datetime(2024, 1, 1), end_date=datetime(2024, 2, 1))
+        context = BacktestContext(data, BacktestState(), config)
+        lookback = kwargs.get('period', 14) * 3
+        
+        warmup = warmup_bars(indicator, **kwargs)
+        full = context.indicators.get("BTC/USDT", indicator, **kwargs)
+        
+        for i in (5, lookback, 150):
+            context._current_idx = i
+            view = context.get_indicator("BTC/USDT", indicator, **kwargs)
+            cached = np.asarray(view, dtype=float)
+            window = df.iloc[max(0, i - lookback):i + 1]
+            expected = np.asarray(compute_indicator(window, indicator, **kwargs), dtype=float)
+            
+            assert cached.shape == expected.shape
+            np.testing.assert_allclose(cached[warmup:], expected[warmup:], rtol=1e-9)
+            assert np.shares_memory(view.to_numpy(), full.to_numpy())
+        
+        # Only the series' own warm-up is masked, once per key
+        values = np.asarray(full, dtype=float)
+        assert np.isnan(values[:warmup]).all()
+        assert np.isfinite(values[warmup:]).all()
+
+    @pytest.mark.parametrize("indicator,kwargs", [
+        ('rsi', {'period': 14}),
+        ('bbands', {'period': 20}),
+    ])
+    def test_writes_to_a_window_never_reach_the_cache(self, indicator, kwargs, make_ohlcv_frames):
+        data = make_ohlcv_frames(["BTC/USDT"], n=300)
+        config = BacktestConfig(start_date=datetime(2024, 1, 1), end_date=datetime(2024, 2, 1))
+        context = BacktestContext(data, BacktestState(), config)
+        context._current_idx = 100
+        before = np.asarray(context.indicators.get("BTC/USDT", indicator, **kwargs), dtype=float).copy()
+        
+        for mutate in (lambda w: w.fillna(0.0, inplace=True), lambda w: w.iloc.__setitem__(0, 1e9)):
+            window = context.get_indicator("BTC/USDT", indicator, **kwargs)
+            try:
+                mutate(window)
+            except ValueError:
+                pass        # read-only array; pandas copy-on-write copies instead
+        
+        after = np.asarray(context.indicators.get("BTC/USDT", indicator, **kwargs), dtype=float)
+        np.testing.assert_array_equal(after, before)
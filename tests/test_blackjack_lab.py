@@ -0,0 +1,94 @@
+"""
+Tests for the vectorized blackjack evaluator in genetics/blackjack_lab.py.
+"""
+
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from genetics import blackjack_lab as bj
+
+
+CHAMPION = [10, 10, 234, 326, 354, 500]
+
+
+def _reference_per_hand(dna, runs):
+    """Mean and standard error of evaluate_agent() profit per hand."""
+    random.seed(7)
+    per_hand = np.array([bj.evaluate_agent(dna) / bj.HANDS_PER_GEN for _ in range(runs)])
+    return per_hand.mean(), per_hand.std(ddof=1) / np.sqrt(runs)
+
+
+def _vectorized_per_hand(dna, n_hands):
+    bucket, payoff = bj.simulate_hands(n_hands, np.random.default_rng(7))
+    profit = np.asarray(dna, dtype=np.float64)[bucket] * payoff
+    return profit.mean(), profit.std(ddof=1) / np.sqrt(n_hands)
+
+
+class TestVectorizedEvaluator:
+    """simulate_hands plays the same game as evaluate_agent."""
+
+    @pytest.mark.parametrize("dna", [[1] * 6, CHAMPION])
+    def test_ev_matches_reference(self, dna):
+        ref_mean, ref_se = _reference_per_hand(dna, runs=8)
+        vec_mean, vec_se = _vectorized_per_hand(dna, 2_000_000)
+
+        assert abs(vec_mean - ref_mean) < 4 * np.hypot(ref_se, vec_se)
+
+    def test_bet_buckets_follow_count(self):
+        bucket, payoff = bj.simulate_hands(200_000, np.random.default_rng(1))
+
+        assert bucket.shape == payoff.shape == (200_000,)
+        assert bucket.min() >= 0 and bucket.max() <= 5
+        # Most hands are played at a true count below 1
+        assert (bucket == 0).mean() > 0.5
+        assert set(np.unique(payoff)) <= {-2.0, -1.0, 0.0, 1.0, 1.5, 2.0}
+
+
+
+class TestWorkerPool:
+    """Hands dealt on a persistent process pool."""
+
+    def test_sharded_tape_is_seeded_and_plays_the_same_game(self):
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            first = bj.simulate_hands(400_000, np.random.default_rng(3), pool=pool, shards=4)
+            again = bj.simulate_hands(400_000, np.random.default_rng(3), pool=pool, shards=4)
+        bucket, payoff = first
+
+        assert bucket.shape == payoff.shape == (400_000,)
+        np.testing.assert_array_equal(bucket, again[0])
+        np.testing.assert_array_equal(payoff, again[1])
+        ref_bucket, ref_payoff = bj.simulate_hands(400_000, np.random.default_rng(3))
+        assert abs(payoff.mean() - ref_payoff.mean()) < 4 * np.hypot(payoff.std(), ref_payoff.std()) / np.sqrt(400_000)
+
+    @pytest.mark.slow
+    def test_run_evolution_reuses_one_pool(self):
+        class Stop(Exception):
+            pass
+
+        class ThreeGenerations(bj.PopulationEvaluator):
+            def evaluate(self, population):
+                if self.generation == 3:
+                    raise Stop
+                return super().evaluate(population)
+
+        with patch.object(bj, "ProcessPoolExecutor", wraps=ProcessPoolExecutor) as pools, \
+                patch.object(bj, "PopulationEvaluator", ThreeGenerations), \
+                patch.object(bj, "REDIS_AVAILABLE", False), \
+                patch("builtins.print"):
+            with pytest.raises(Stop):
+                bj.run_evolution(workers=2)
+
+        assert pools.call_count == 1
+
+
+@pytest.mark.skipif(not os.getenv("GODBRAIN_BENCHMARK"), reason="opt-in: set GODBRAIN_BENCHMARK=1")
+def test_pooled_speedup_reaches_target():
+    """Needs two or more idle cores; run with GODBRAIN_BENCHMARK=1."""
+    result = bj.benchmark(n_hands=1_000_000, repeat=3)
+
+    assert result["pooled_speedup"] >= 20, result
@@ -0,0 +1,127 @@
+"""
+Tests for the incremental OHLCV ring buffer (ultimate_pack/feeds/candle_store.py).
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ultimate_pack.feeds.candle_store import CandleRing, CandleStore
+from ultimate_pack.regime.regime_detector import RegimeDetector
+
+
+HOUR_MS = 3_600_000
+
+
+def _candles(n, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.cumprod(1 + rng.normal(0, 0.01, n))
+    high = close * (1 + rng.uniform(0, 0.01, n))
+    low = close * (1 - rng.uniform(0, 0.01, n))
+    return [
+        [i * HOUR_MS, c, h, l, c, v]
+        for i, (c, h, l, v) in enumerate(zip(close, high, low, rng.uniform(10, 100, n)))
+    ]
+
+
+def _pandas_indicators(rows):
+    """RegimeDetector.analyze's indicator definitions."""
+    df = pd.DataFrame(rows, columns=["timestamp", "open", "high", "low", "close", "vol"])
+    returns = df["close"].pct_change()
+    delta = df["close"].diff()
+    gain = delta.where(delta > 0, 0).rolling(14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(14).mean()
+    return pd.DataFrame({
+        "returns": returns,
+        "volatility": returns.rolling(20).std(),
+        "sma_50": df["close"].rolling(50).mean(),
+        "rsi": 100 - (100 / (1 + gain / loss)),
+        "atr": (df["high"] - df["low"]).rolling(14).mean(),
+    })
+
+
+class TestCandleRing:
+
+    @pytest.mark.parametrize("name", ["returns", "volatility", "sma_50", "rsi", "atr"])
+    def test_indicators_match_pandas(self, name):
+        rows = _candles(100)
+        ring = CandleRing(100)
+        ring.update(rows[:60])
+        for row in rows[60:]:
+            ring.update([row])
+
+        expected = _pandas_indicators(rows)[name].to_numpy()
+        np.testing.assert_allclose(ring.column(name), expected, rtol=1e-9, equal_nan=True)
+
+    def test_rollover_keeps_full_history_indicators(self):
+        rows = _candles(250, seed=1)
+        ring = CandleRing(100)
+        for start in range(0, 250, 7):
+            ring.update(rows[start:start + 7])
+
+        expected = _pandas_indicators(rows).iloc[-100:]
+        assert len(ring) == 100
+        assert ring.column("timestamp")[0] == rows[150][0]
+        for name in expected.columns:
+            np.testing.assert_allclose(ring.column(name), expected[name].to_numpy(), rtol=1e-9)
+
+    def test_open_bar_update_replaces_last(self):
+        rows = _candles(60, seed=2)
+        ring = CandleRing(100)
+        ring.update(rows)
+
+        moved = list(rows[-1])
+        moved[4] *= 1.05
+        moved[2] = max(moved[2], moved[4])
+        added = ring.update([rows[-2], moved])       # stale bar is ignored
+
+        assert added == 0
+        assert len(ring) == 60
+        expected = _pandas_indicators(rows[:-1] + [moved]).iloc[-1]
+        latest = ring.latest()
+        assert latest["close"] == moved[4]
+        for name in expected.index:
+            assert latest[name] == pytest.approx(expected[name], rel=1e-9)
+
+    def test_regime_detector_reads_ring(self):
+        rows = _candles(100, seed=3)
+        ring = CandleRing(100)
+        ring.update(rows)
+        df = pd.DataFrame(rows, columns=["timestamp", "open", "high", "low", "close", "vol"])
+
+        from_frame = RegimeDetector().analyze(df)
+        from_ring = RegimeDetector().analyze(ring)
+
+        assert from_ring.regime == from_frame.regime
+        assert from_ring.confidence == from_frame.confidence
+        assert from_ring.indicators == pytest.approx(from_frame.indicators, rel=1e-9)
+
+
+class TestCandleStore:
+
+    def test_fetch_window_after_first_load(self):
+        rows = _candles(100)
+        store = CandleStore(capacity=100, catchup_limit=5, clock=lambda: rows[-1][0] / 1000)
+
+        assert store.fetch_window("TIA/USDT:USDT") == (None, 100)
+
+        store.update("TIA/USDT:USDT", rows)
+
+        assert store.fetch_window("TIA/USDT:USDT") == (rows[-1][0], 5)
+
+    def test_outage_longer_than_catchup_limit_refills_in_one_fetch(self):
+        rows = _candles(160, seed=4)
+        now = {"ms": rows[99][0]}
+        store = CandleStore(capacity=100, catchup_limit=10, clock=lambda: now["ms"] / 1000)
+        store.update("TIA/USDT:USDT", rows[:100])
+
+        now["ms"] = rows[-1][0] + HOUR_MS // 2      # 60 bars missed, the last one open
+        since, limit = store.fetch_window("TIA/USDT:USDT", "1h")
+        assert (since, limit) == (rows[99][0], 62)
+
+        ring = store.update("TIA/USDT:USDT", [r for r in rows if r[0] >= since][:limit])
+        assert ring.last_timestamp == rows[-1][0]
+
+        now["ms"] = rows[-1][0] + 500 * HOUR_MS     # longer than the ring: start over
+        assert store.fetch_window("TIA/USDT:USDT", "1h") == (None, 100)
+        assert len(store.ring("TIA/USDT:USDT")) == 0
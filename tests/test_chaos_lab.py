@@ -0,0 +1,88 @@
+"""
+Tests for precomputed ChaosUniverse trajectories in genetics/chaos_lab.py.
+"""
+
+import numpy as np
+import pytest
+
+from genetics import chaos_lab
+from genetics.chaos_lab import ChaosTrajectory, ChaosUniverse
+
+
+class _ReplayNoise:
+    """gauss() source that replays a fixed noise vector."""
+
+    def __init__(self, values):
+        self._values = iter(values.tolist())
+
+    def gauss(self, mu, sigma):
+        return next(self._values)
+
+
+class _PathUniverse:
+    """Duck-typed universe that walks a ChaosTrajectory."""
+
+    def __init__(self, path):
+        self.path = path
+        self.t = 0
+
+    def get_regime(self):
+        return int(self.path.regime[self.t])
+
+    def get_chaos_level(self):
+        return float(self.path.chaos[self.t])
+
+    def step(self):
+        self.t += 1
+        return float(self.path.returns[self.t - 1])
+
+
+class TestTrajectory:
+
+    def test_matches_stepping_universe(self):
+        n_steps, seed = 2000, 5
+        path = ChaosUniverse.trajectory(n_steps, seed)
+
+        universe = ChaosUniverse(_ReplayNoise(np.random.default_rng(seed).normal(0, 0.1, n_steps)))
+        regime, chaos, returns = [], [], []
+        for _ in range(n_steps):
+            regime.append(universe.get_regime())
+            chaos.append(universe.get_chaos_level())
+            returns.append(universe.step())
+
+        assert path.regime.tolist() == regime
+        assert path.chaos == pytest.approx(chaos, abs=1e-12)
+        assert path.returns == pytest.approx(returns, abs=1e-12)
+
+    def test_cached_per_seed(self):
+        first = ChaosUniverse.trajectory(1000, 1)
+
+        assert ChaosUniverse.trajectory(1000, 1) is first
+        assert not np.array_equal(ChaosUniverse.trajectory(1000, 2).returns, first.returns)
+        assert not first.returns.flags.writeable
+
+
+class TestCosmicStats:
+
+    def test_matches_stepwise_evaluation(self):
+        path = ChaosUniverse.trajectory(chaos_lab.ITERATIONS, 3)
+        population = [chaos_lab.create_cosmic_dna() for _ in range(5)] + [[500] * 6, [10] * 6]
+
+        batched = np.column_stack(chaos_lab.cosmic_stats(np.array(population, dtype=float), path))
+
+        for dna, row in zip(population, batched):
+            expected = chaos_lab.evaluate_cosmic_stepwise(dna, _PathUniverse(path))
+            assert row == pytest.approx(expected, rel=1e-9)
+
+    def test_early_ruin_is_masked(self):
+        n = chaos_lab.ITERATIONS
+        returns = np.full(n, 0.001)
+        returns[10] = -20.0          # capital goes negative on step 10
+        path = ChaosTrajectory(returns=returns, regime=np.zeros(n, dtype=int), chaos=np.zeros(n))
+        dna = [100] * 6
+
+        final, max_dd, sharpe, harmony = (s[0] for s in chaos_lab.cosmic_stats(np.array([dna], float), path))
+        expected = chaos_lab.evaluate_cosmic_stepwise(dna, _PathUniverse(path))
+
+        assert final < 0
+        assert (final, max_dd, sharpe, harmony) == pytest.approx(expected, rel=1e-9)
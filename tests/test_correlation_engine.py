@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""
+GODBRAIN Correlation Engine Tests
+Streaming EW covariance vs pandas ewm, regime-break detection, clustering
+and the correlation-aware position sizer reading from the engine.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import sys
+from pathlib import Path
+ROOT = Path(__file__).parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from portfolio.correlation import CorrelationAnalyzer, CorrelationEngine
+from risk.correlation_sizer import CorrelationAwarePositionSizer
+
+
+def _returns(n_bars=400, seed=0):
+    rng = np.random.default_rng(seed)
+    market = rng.normal(0, 0.01, n_bars)
+    return pd.DataFrame({
+        "BTC/USDT:USDT": market + rng.normal(0, 0.003, n_bars),
+        "ETH/USDT:USDT": market + rng.normal(0, 0.004, n_bars),
+        "DOGE/USDT:USDT": rng.normal(0, 0.01, n_bars),
+    })
+
+
+def test_matches_pandas_ewm():
+    df = _returns()
+    engine = CorrelationEngine.from_returns(df, halflife=30, min_periods=1)
+
+    alpha = 1 - np.exp(np.log(0.5) / 30)
+    expected = df.ewm(alpha=alpha, adjust=False).cov(bias=True).loc[len(df) - 1]
+    np.testing.assert_allclose(engine.covariance(), expected.to_numpy(), rtol=1e-9, atol=1e-15)
+
+    corr = engine.correlation_frame()
+    assert corr.loc["BTC/USDT:USDT", "ETH/USDT:USDT"] > 0.8
+    assert abs(corr.loc["BTC/USDT:USDT", "DOGE/USDT:USDT"]) < 0.3
+
+
+def test_missing_returns_and_late_symbols():
+    df = _returns()
+    engine = CorrelationEngine(halflife=30, min_periods=50)
+    for i, row in enumerate(df.to_dict("records")):
+        if i < 100:
+            row.pop("DOGE/USDT:USDT")          # listed later
+        if i % 7 == 0:
+            row["ETH/USDT:USDT"] = np.nan
+        engine.update(row)
+
+    assert engine.counts[engine.index["DOGE/USDT:USDT"]] == len(df) - 100
+    assert engine.ready.all()
+    assert np.isfinite(engine.correlation()).all()
+    assert engine.pair("BTC/USDT:USDT", "ETH/USDT:USDT") > 0.8
+
+    fresh = CorrelationEngine(["A", "B"], min_periods=50)
+    fresh.update_prices({"A": 100.0, "B": 50.0})
+    fresh.update_prices({"A": 101.0, "B": 50.5})
+    assert not fresh.ready.any()
+    np.testing.assert_array_equal(fresh.correlation(), np.eye(2))
+
+
+def test_gaps_do_not_decay_the_missing_asset():
+    df = _returns()
+    df.loc[df.index % 3 == 0, "ETH/USDT:USDT"] = np.nan     # quoted two bars out of three
+    rows = df.to_dict("records")
+    engine = CorrelationEngine.from_returns(df.iloc[:300], halflife=30, min_periods=1)
+    j = engine.index["ETH/USDT:USDT"]
+
+    before = engine.covariance()[j]
+    engine.update(rows[300])                                # ETH missing on this bar
+    np.testing.assert_array_equal(engine.covariance()[j], before)
+
+    for row in rows[301:]:
+        engine.update(row)
+    alpha = 1 - np.exp(np.log(0.5) / 30)
+    observed = df["ETH/USDT:USDT"].dropna()
+    expected = observed.ewm(alpha=alpha, adjust=False).var(bias=True).iloc[-1]
+    assert engine.covariance()[j, j] == pytest.approx(expected, rel=1e-9)
+
+
+def test_regime_break_and_clusters():
+    rng = np.random.default_rng(1)
+    n = 10
+    engine = CorrelationEngine([f"S{i}" for i in range(n)], halflife=100, fast_halflife=5)
+    for _ in range(300):
+        engine.update(rng.normal(0, 0.01, n))
+    assert not engine.regime_break(0.25)
+    assert all(len(c) == 1 for c in engine.clusters(0.7))
+
+    # Everything starts moving together
+    for _ in range(20):
+        engine.update(rng.normal(0, 0.02) + rng.normal(0, 0.002, n))
+    assert engine.regime_break(0.25)
+    assert engine.clusters(0.3)[0] == sorted(engine.symbols)
+
+    analyzer = CorrelationAnalyzer(engine)
+    assert analyzer.regime_detect(engine.symbols) == "normal"     # slow estimate still catching up
+    assert len(analyzer.rolling_correlation("S0", "S1", window=10)) == 320 - 9
+
+
+def test_update_time_200_assets():
+    n = 200
+    rng = np.random.default_rng(2)
+    engine = CorrelationEngine([f"S{i}" for i in range(n)])
+    bars = rng.normal(0, 0.01, (300, n))
+    for row in bars[:20]:
+        engine.update(row)
+
+    start = time.perf_counter()
+    for row in bars[20:]:
+        engine.update(row)
+    per_bar = (time.perf_counter() - start) / 280
+    assert per_bar < 0.005        # < 1ms on a quiet machine; slack for CI
+
+
+def test_gap_bars_cost_about_a_full_update():
+    n = 200
+    rng = np.random.default_rng(3)
+    bars = rng.normal(0, 0.01, (300, n))
+    gappy = bars.copy()
+    gappy[rng.random(gappy.shape) < 0.1] = np.nan          # every bar misses ~20 assets
+
+    def per_bar(rows):
+        engine = CorrelationEngine([f"S{i}" for i in range(n)])
+        for row in bars[:20]:
+            engine.update(row)
+        start = time.perf_counter()
+        for row in rows[20:]:
+            engine.update(row)
+        return (time.perf_counter() - start) / 280
+
+    full, partial = per_bar(bars), per_bar(gappy)
+    assert partial < 0.005
+    assert partial < 3 * full     # in-place masked update, no sub-block copies
+
+
+def test_sizer_reads_engine():
+    engine = CorrelationEngine.from_returns(_returns(), halflife=30)
+    sizer = CorrelationAwarePositionSizer(engine)
+
+    correlated = sizer.adjust_size("ETH/USDT:USDT", 1000, 10_000, positions={"BTC": 8000})
+    independent = sizer.adjust_size("ETH/USDT:USDT", 1000, 10_000, positions={"DOGE/USDT:USDT": 8000})
+    assert correlated < independent <= 1000
+    assert correlated == pytest.approx(1000 * (1 - 0.5 * engine.pair("BTC/USDT:USDT", "ETH/USDT:USDT")))
+
+    # Small portfolios are untouched; unknown symbols fall back to the fixed rule
+    assert sizer.adjust_size("ETH/USDT:USDT", 1000, 1000, positions={"BTC": 800}) == 1000
+    assert sizer.adjust_size("SOL/USDT:USDT", 1000, 10_000, positions={"BTC": 8000}) == 800
+    assert CorrelationAwarePositionSizer().adjust_size("BTC/USDT", 1000, 10_000) == 800
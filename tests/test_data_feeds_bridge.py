@@ -0,0 +1,271 @@
+"""
+Tests for the tick bridge transports (core/data_feeds_bridge.py): the
+batched file journal with its tail index, and the Redis streams bus.
+"""
+
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from core import data_feeds_bridge as bridge
+from core.data_feeds_bridge import StreamTickBus, TickData, TickJournal
+
+
+def _tick(i, ts=None):
+    return TickData(
+        timestamp=time.time() if ts is None else ts, symbol=f"SYM{i}", side="BUY",
+        size_usd=float(i), equity=1000.0, regime="TRENDING_UP", conviction=0.5,
+    )
+
+
+@pytest.fixture
+def journal(tmp_path):
+    return TickJournal(tmp_path / "tick_stream.jsonl", tmp_path / "tick_latest.json", index_size=50)
+
+
+class TestTickJournal:
+
+    def test_batched_writes_and_history(self, journal):
+        for i in range(500):
+            journal.publish(_tick(i))
+        journal.flush()
+
+        assert journal.path.read_text().count("\n") == 500
+        assert journal.batches_written < 500
+        assert [t.size_usd for t in journal.history(3)] == [499.0, 498.0, 497.0]
+        assert journal.take_latest(consume=False).size_usd == 499.0
+
+    def test_tail_index_follows_external_appends(self, journal):
+        journal.path.write_text("".join(_tick(i).to_json() + "\n" for i in range(10_000)))
+        assert [t.size_usd for t in journal.history(2)] == [9999.0, 9998.0]
+
+        with open(journal.path, "a") as f:
+            f.write(_tick(10_000).to_json() + "\n")
+            f.write(_tick(10_001).to_json()[:20])           # another writer mid-line
+        assert [t.size_usd for t in journal.history(2)] == [10_000.0, 9999.0]
+
+        with open(journal.path, "a") as f:
+            f.write(_tick(10_001).to_json()[20:] + "\n")
+        assert [t.size_usd for t in journal.history(60)][:2] == [10_001.0, 10_000.0]
+        assert len(journal.history(60)) == 50                 # capped by index_size
+
+        journal.path.write_text(_tick(7).to_json() + "\n")    # rotated
+        assert [t.size_usd for t in journal.history(5)] == [7.0]
+
+    def test_consume_is_won_by_one_reader(self, journal):
+        journal.publish(_tick(1))
+        journal.flush()
+
+        got = []
+        readers = [threading.Thread(target=lambda: got.append(journal.take_latest())) for _ in range(8)]
+        for t in readers:
+            t.start()
+        for t in readers:
+            t.join()
+
+        assert [t.size_usd for t in got if t] == [1.0]
+        assert not journal.latest_path.exists()
+
+    def test_stale_latest_is_ignored(self, journal):
+        journal.publish(_tick(1, ts=time.time() - 60))
+        journal.flush()
+        assert journal.take_latest(consume=False) is None
+
+
+class TestStreamTickBus:
+
+    def test_publish_is_one_pipelined_round_trip(self):
+        client = MagicMock()
+        pipe = client.pipeline.return_value
+        pipe.execute.return_value = ["1-0", True]
+
+        assert StreamTickBus(client, maxlen=1000).publish(_tick(1)) == "1-0"
+        pipe.xadd.assert_called_once()
+        assert pipe.xadd.call_args.kwargs == {"maxlen": 1000, "approximate": True}
+        client.pipeline.assert_called_once_with(transaction=False)
+
+    def test_blocking_group_read_and_ack(self):
+        client = MagicMock()
+        client.xreadgroup.return_value = [[bridge.REDIS_TICK_KEY, [("5-0", {"tick": _tick(3).to_json()})]]]
+        bus = StreamTickBus(client, consumer="apex-1")
+
+        entries = bus.read(count=1, block_ms=1000)
+        bus.ack("5-0")
+
+        assert [(i, t.size_usd) for i, t in entries] == [("5-0", 3.0)]
+        client.xgroup_create.assert_called_once_with(bridge.REDIS_TICK_KEY, "apex", id="0", mkstream=True)
+        args, kwargs = client.xreadgroup.call_args
+        assert args == ("apex", "apex-1", {bridge.REDIS_TICK_KEY: ">"}) and kwargs["block"] == 1000
+        client.xack.assert_called_once_with(bridge.REDIS_TICK_KEY, "apex", "5-0")
+
+    def test_existing_group_is_reused(self):
+        client = MagicMock()
+        client.xgroup_create.side_effect = Exception("BUSYGROUP Consumer Group name already exists")
+        client.xreadgroup.return_value = []
+        bus = StreamTickBus(client)
+        assert bus.replay_pending() == []
+        assert client.xreadgroup.call_args.args[2] == {bridge.REDIS_TICK_KEY: "0"}
+
+
+class _TypedRedis:
+    """Just enough Redis to enforce key types (WRONGTYPE) for the stream bus."""
+
+    def __init__(self):
+        self.data = {}
+
+    def type(self, key):
+        value = self.data.get(key)
+        return b"none" if value is None else (b"list" if isinstance(value, list) else b"stream")
+
+    def _stream(self, key):
+        value = self.data.setdefault(key, {"entries": [], "groups": set()})
+        if isinstance(value, list):
+            raise Exception("WRONGTYPE Operation against a key holding the wrong kind of value")
+        return value
+
+    def lpush(self, key, value):
+        self.data.setdefault(key, []).insert(0, value)
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def set(self, key, value):
+        self.data[key + ":str"] = value
+
+    def xgroup_create(self, key, group, id="0", mkstream=False):
+        self._stream(key)["groups"].add(group)
+
+    def xadd(self, key, fields, maxlen=None, approximate=True):
+        entries = self._stream(key)["entries"]
+        entries.append((f"{len(entries) + 1}-0", fields))
+        return entries[-1][0]
+
+    def xrevrange(self, key, count=10):
+        return list(reversed(self._stream(key)["entries"]))[:count]
+
+    def pipeline(self, transaction=False):
+        client, calls = self, []
+
+        class Pipe:
+            def __getattr__(self, name):
+                return lambda *a, **k: calls.append((name, a, k))
+
+            def execute(self):
+                return [getattr(client, name)(*a, **k) for name, a, k in calls]
+
+        return Pipe()
+
+
+def test_legacy_list_on_stream_key_is_replaced():
+    client = _TypedRedis()
+    client.lpush("godbrain:tick_stream", _tick(0).to_json())   # pre-streams bridge
+    client.lpush(bridge.REDIS_TICK_KEY, _tick(0).to_json())    # worst case: list on the new key too
+
+    bus = StreamTickBus(client)
+    bus.ensure_group()
+    bus.publish(_tick(1))
+
+    assert bridge.REDIS_TICK_KEY != "godbrain:tick_stream"
+    assert [t.size_usd for t in bus.history(5)] == [1.0]
+    assert client.type(bridge.REDIS_TICK_KEY) == b"stream"
+    assert client.type("godbrain:tick_stream") == b"list"        # old key left alone
+
+
+def test_get_last_tick_does_not_fall_back_to_journal_with_redis(monkeypatch, journal):
+    client = MagicMock()
+    client.xreadgroup.return_value = []
+    monkeypatch.setattr(bridge, "_get_bus", lambda: StreamTickBus(client))
+    monkeypatch.setattr(bridge, "_journal", journal)
+    journal.publish(_tick(1))
+    journal.flush()
+
+    assert bridge.get_last_tick(block=True, timeout=0.2) is None
+    assert journal.latest_path.exists()
+
+
+class _GroupRedis:
+    """One stream, one group: delivery, pending entries (PEL), ack and XAUTOCLAIM."""
+
+    def __init__(self):
+        self.entries = []
+        self.pending = {}           # entry_id -> [consumer, delivered_at_ms]
+        self.delivered = 0
+        self.now_ms = 0
+
+    def type(self, key):
+        return b"stream"
+
+    def xgroup_create(self, key, group, id="0", mkstream=False):
+        pass
+
+    def xadd(self, key, fields, maxlen=None, approximate=True):
+        self.entries.append((f"{len(self.entries) + 1}-0", fields))
+        return self.entries[-1][0]
+
+    def xreadgroup(self, group, consumer, streams, count=None, block=None):
+        (key, last), = streams.items()
+        if last == ">":
+            out = self.entries[self.delivered:self.delivered + count]
+            self.delivered += len(out)
+            for entry_id, _ in out:
+                self.pending[entry_id] = [consumer, self.now_ms]
+        else:
+            out = [e for e in self.entries if self.pending.get(e[0], [None])[0] == consumer][:count]
+        return [[key, out]] if out else []
+
+    def xautoclaim(self, key, group, consumer, min_idle_time, start_id="0-0", count=None):
+        claimed = []
+        for entry_id, fields in self.entries:
+            owner = self.pending.get(entry_id)
+            if owner and self.now_ms - owner[1] >= min_idle_time:
+                self.pending[entry_id] = [consumer, self.now_ms]
+                claimed.append((entry_id, fields))
+        return ["0-0", claimed[:count], []]
+
+    def xack(self, key, group, *ids):
+        return sum(self.pending.pop(i, None) is not None for i in ids)
+
+
+class TestStreamRecovery:
+
+    def test_default_consumer_name_survives_restart(self):
+        client = _GroupRedis()
+        before = StreamTickBus(client)
+        client.xadd(bridge.REDIS_TICK_KEY, {"tick": _tick(1).to_json()})
+        entry_id, tick = before.next()                 # read, then "crash" before ack
+
+        after = StreamTickBus(client)                  # new process, same default name
+        assert after.consumer == before.consumer == bridge.REDIS_TICK_CONSUMER
+        assert after.next() == (entry_id, tick)
+        after.ack(entry_id)
+        assert after.next() is None
+
+    def test_stale_ticks_of_another_consumer_are_claimed(self):
+        client = _GroupRedis()
+        client.xadd(bridge.REDIS_TICK_KEY, {"tick": _tick(2).to_json()})
+        StreamTickBus(client, consumer="old-host").read()
+
+        bus = StreamTickBus(client, consumer="apex", claim_idle_ms=60_000)
+        assert bus.next() is None                      # not idle long enough yet
+        client.now_ms = 61_000
+        bus._next_claim = 0.0
+        entry_id, tick = bus.next()
+
+        assert tick.size_usd == 2.0
+        assert client.pending[entry_id][0] == "apex"
+
+    def test_read_tick_acks_only_after_execute(self, monkeypatch):
+        client = _GroupRedis()
+        bus = StreamTickBus(client)
+        monkeypatch.setattr(bridge, "_get_bus", lambda: bus)
+        client.xadd(bridge.REDIS_TICK_KEY, {"tick": _tick(3).to_json()})
+
+        entry_id, tick = bridge.read_tick(block=False)
+        assert entry_id in client.pending
+
+        assert bridge.read_tick(block=False) == (entry_id, tick)   # not executed yet: again
+        assert bridge.ack_tick(entry_id)
+        assert bridge.read_tick(block=False) is None
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+GODBRAIN Incremental VaR Tests
+Rolling-window service vs the from-scratch VaREngine, the Euler
+decomposition of parametric VaR, and the fixed Monte Carlo scenarios.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import sys
+from pathlib import Path
+ROOT = Path(__file__).parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from risk.var_engine import IncrementalVaR, VaREngine
+
+
+def _market(n_bars=400, n_assets=20, seed=0):
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0, 0.01, (n_bars, n_assets)) + rng.normal(0, 0.008, (n_bars, 1))
+    return pd.DataFrame(returns, columns=[f"A{i}" for i in range(n_assets)])
+
+
+def _book(symbols, seed=1):
+    rng = np.random.default_rng(seed)
+    return {s: float(rng.uniform(-2000, 6000)) for s in symbols}
+
+
+def test_rolling_window_matches_full_recompute():
+    df = _market()
+    service = IncrementalVaR(list(df.columns), window=120)
+    for row in df.to_numpy():
+        service.update(row)
+
+    window = df.to_numpy()[-120:]
+    np.testing.assert_allclose(service.covariance(), np.cov(window.T, ddof=0), atol=1e-16)
+
+    book = _book(df.columns)
+    w = np.array([book[s] for s in df.columns])
+    portfolio = window @ (w / np.abs(w).sum())
+
+    risk = service.risk(book)
+    engine = VaREngine()
+    assert risk.var == pytest.approx(engine.historical_var(portfolio))
+    assert risk.cvar == pytest.approx(engine.cvar(portfolio))
+    assert risk.parametric_var == pytest.approx(engine.parametric_var(portfolio))
+    assert risk.monte_carlo_var == pytest.approx(risk.parametric_var, rel=0.05)
+    assert risk.value == pytest.approx(np.abs(w).sum())
+
+
+def test_component_var_is_euler_decomposition():
+    df = _market()
+    service = IncrementalVaR.from_returns(df, window=250)
+    book = _book(df.columns)
+    risk = service.risk(book)
+
+    assert sum(risk.component_var.values()) == pytest.approx(risk.parametric_var)
+
+    # Marginal VaR is the gradient of parametric VaR in weight space
+    w, _ = service._weights(book)
+    mean, cov = df.to_numpy()[-250:].mean(axis=0), service.covariance()
+    def pvar(weights):
+        return -(mean @ weights + service.z * np.sqrt(weights @ cov @ weights))
+    eps = 1e-6
+    bump = np.zeros_like(w)
+    bump[3] = eps
+    numeric = (pvar(w + bump) - pvar(w - bump)) / (2 * eps)
+    assert service.marginal_var(book)["A3"] == pytest.approx(numeric, rel=1e-5)
+
+
+def test_scenarios_fixed_and_market_state_cached():
+    df = _market(n_assets=5)
+    service = IncrementalVaR.from_returns(df)
+    book = _book(df.columns)
+
+    first = service.risk(book).monte_carlo_var
+    assert service.risk(book).monte_carlo_var == first
+    state = service._market
+    service.risk({"A0": 1000.0})
+    assert service._market is state           # book changes don't touch the market state
+
+    service.update({"A0": -0.05, "A1": float("nan")})
+    assert service.risk(book).monte_carlo_var != first
+    with pytest.raises(KeyError):
+        service.risk({"UNKNOWN": 1.0})
+
+
+def test_marginal_var_does_not_mutate_positions():
+    returns = {"A": np.random.default_rng(0).normal(0, 0.01, 200),
+               "B": np.random.default_rng(1).normal(0, 0.01, 200)}
+    positions = {"A": {"value": 1000, "weight": 1.0}}
+    VaREngine().marginal_var(positions, returns, {"symbol": "B", "value": 1000, "weight": 1.0})
+    assert positions["A"]["weight"] == 1.0
@@ -0,0 +1,140 @@
+"""
+Tests for core/liquidation_hunter.py: the broadcast zone estimator against
+the original nested loop, and the concurrent, rate-budgeted fetch path on
+the offline mock exchange.
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from core.liquidation_hunter import (
+    LiquidationCalculator,
+    LiquidationHunter,
+    MockHunterExchange,
+    calc_magnetic_strength,
+    estimate_cluster_size,
+)
+from infrastructure.rate_limiter import RateLimitConfig, RateLimiter
+
+
+def _loop_zones(current_price, highs, lows, levs=(5, 10, 20, 25, 50, 100)):
+    """The original per-high, per-leverage loop."""
+    zones = []
+    for side, anchors, sign in (("LONG", highs, -1), ("SHORT", lows, 1)):
+        for anchor in anchors:
+            for lev in levs:
+                liq = anchor * (1 + sign / lev)
+                distance = sign * (liq - current_price) / current_price * 100
+                if 0 < distance < 15:
+                    strength = max(0, 1 - distance / 15) * 0.6 + min(1, lev / 50) * 0.4
+                    zones.append((liq, side, lev, strength, distance))
+    zones.sort(key=lambda z: z[3], reverse=True)
+    return zones[:10]
+
+
+def _limiter(rps=1000.0, burst=1000):
+    return RateLimiter({"market": RateLimitConfig(rps, burst), "default": RateLimitConfig(rps, burst)})
+
+
+def test_broadcast_zones_match_loop():
+    rng = np.random.default_rng(1)
+    for _ in range(200):
+        price = rng.uniform(0.001, 60_000)
+        highs = list(price * (1 + rng.uniform(-0.05, 0.2, 10)))
+        lows = list(price * (1 - rng.uniform(-0.05, 0.2, 10)))
+
+        got = LiquidationCalculator.estimate_liquidation_zones(price, highs, lows)
+
+        expected = _loop_zones(price, highs, lows)
+        assert len(got) == len(expected)
+        for zone, (liq, side, lev, strength, distance) in zip(got, expected):
+            assert (zone.side, zone.leverage_estimate) == (side, lev)
+            assert zone.price == pytest.approx(liq)
+            assert zone.magnetic_strength == pytest.approx(strength)
+            assert zone.distance_pct == pytest.approx(distance)
+            assert zone.estimated_size_usd == estimate_cluster_size(lev)
+
+
+def test_scalar_helpers_keep_their_contract():
+    assert estimate_cluster_size(5) == 5_000_000
+    assert estimate_cluster_size(100) == 1_000_000
+    assert calc_magnetic_strength(0.0, 50) == pytest.approx(1.0)
+    assert isinstance(calc_magnetic_strength(7.5, 10), float)
+
+
+def test_hunt_fetches_concurrently_under_budget():
+    symbols = [f"S{i}/USDT:USDT" for i in range(10)]
+    mock = MockHunterExchange(latency=0.05)
+    limiter = _limiter(rps=0.01, burst=100)      # burst only: every request spends a token
+    hunter = LiquidationHunter(exchange=mock, rate_limiter=limiter, max_workers=30)
+
+    started = time.perf_counter()
+    hunter.hunt(symbols)
+    elapsed = time.perf_counter() - started
+
+    assert len(mock.calls) == 30
+    assert mock.peak_in_flight > 1
+    assert elapsed < 30 * 0.05 / 2
+    status = limiter.get_status()
+    for endpoint in ("market.candles", "market.books", "public.funding_rate"):
+        assert status[endpoint]["available_tokens"] == pytest.approx(90, abs=0.1)
+
+
+def test_signals_match_serial_analysis():
+    symbols = [f"S{i}/USDT:USDT" for i in range(8)]
+    mock = MockHunterExchange(seed=3, funding_rates={s: -0.0005 for s in symbols[:4]})
+    hunter = LiquidationHunter(exchange=mock, rate_limiter=_limiter())
+
+    batch = {s: hunter.analyze_symbol(s) for s in symbols}
+    data = hunter.fetch_market_data(symbols)
+    for symbol in symbols:
+        assert hunter.analyze_market_data(symbol, data[symbol]) == batch[symbol]
+
+
+def test_failed_side_requests_fall_back_to_neutral():
+    mock = MockHunterExchange()
+    mock.fetch_funding_rate = lambda symbol: (_ for _ in ()).throw(RuntimeError("down"))
+    hunter = LiquidationHunter(exchange=mock, rate_limiter=_limiter())
+
+    signal = hunter.analyze_symbol("S0/USDT:USDT")
+    assert signal is not None
+    assert "Unable to fetch funding" in signal.reasoning
+
+    mock.fetch_ohlcv = lambda *a, **k: (_ for _ in ()).throw(RuntimeError("down"))
+    assert hunter.analyze_symbol("S0/USDT:USDT") is None
+
+
+def test_detector_and_funding_calls_use_their_endpoint_budgets():
+    mock = MockHunterExchange()
+    limiter = _limiter(rps=0.01, burst=10)
+    hunter = LiquidationHunter(exchange=mock, rate_limiter=limiter)
+
+    hunter.whale_detector.scan_recent_trades("S0/USDT:USDT")
+    hunter.whale_detector.analyze_order_book_imbalance("S0/USDT:USDT")
+    hunter.funding_analyzer.get_funding_signal("S0/USDT:USDT")
+
+    assert len(mock.calls) == 3
+    status = limiter.get_status()
+    for endpoint in ("market.trades", "market.books", "public.funding_rate"):
+        assert status[endpoint]["available_tokens"] == pytest.approx(9, abs=0.1)
+
+
+def _peak_in_window(times, window):
+    times = sorted(times)
+    return max(sum(1 for t in times[i:] if t - start < window) for i, start in enumerate(times))
+
+
+def test_hunt_stays_under_okx_per_endpoint_limits():
+    symbols = [f"S{i}/USDT:USDT" for i in range(24)]
+    mock = MockHunterExchange()
+    hunter = LiquidationHunter(exchange=mock, rate_limiter=RateLimiter(), max_workers=72)
+
+    data = hunter.fetch_market_data(symbols)
+
+    assert not [s for s, d in data.items() if any(isinstance(v, Exception) for v in d.values())]
+    okx_per_2s = {"fetch_ohlcv": 40, "fetch_order_book": 40, "fetch_funding_rate": 20}
+    for method, limit in okx_per_2s.items():
+        assert len(mock.call_times[method]) == len(symbols)
+        assert _peak_in_window(mock.call_times[method], 2.0) <= limit
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+GODBRAIN Log Ingest Tests
+Chunked/parallel parsing parity with the line-by-line LogParser regex,
+and the (size, mtime) keyed cache.
+"""
+
+import random
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+import sys
+from pathlib import Path
+ROOT = Path(__file__).parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import lab.backtest.log_ingest as log_ingest
+from lab.backtest.log_ingest import LogIngest, parse_iso_us
+from lab.backtest.parser import LogParser
+
+
+def _write_log(path, n=3000, seed=0):
+    rng = random.Random(seed)
+    lines = []
+    for i in range(n):
+        ts = f"2025-12-{1 + i % 28:02d}T{i % 24:02d}:{i % 60:02d}:{(i * 7) % 60:02d}"
+        if i % 3:
+            ts += f".{i:06d}"[:rng.randint(2, 7)]
+        r = rng.random()
+        if r < 0.6:
+            lines.append(f"{ts} | [AGG] DOGE/USDT:USDT HOLD QScore:{i % 100}")
+        elif r < 0.9:
+            lines.append(
+                f"{ts} |   >>> EXECUTE: {rng.choice(['BUY', 'SELL', 'STRONG_BUY'])} "
+                f"{rng.choice(['DOGE/USDT:USDT', 'SOL/USDT:USDT'])} | ${rng.randint(5, 50)} | "
+                f"Regime:{rng.choice(['TRENDING_UP', 'RANGING'])} | Flow:{rng.random() * 2:.2f}x | "
+                f"QScore:{rng.randint(0, 100)} DNAx:1.{i % 10} VOL:0.{i % 7}"
+            )
+        elif r < 0.93:
+            lines.append("2025-02-30T00:00:00 |   >>> EXECUTE: BUY XRP/USDT | $5 | Regime:R | Flow:1.00x")
+        else:
+            lines.append(f"  worker EXECUTE: sell ADA/USDT dna:0.{i % 9}")
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+def _reference(path):
+    """The original per-line regex + strptime parse."""
+    out = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        m = LogParser.PATTERN.search(line.strip())
+        if not m:
+            continue
+        ts = m["ts"]
+        try:
+            ts = datetime.strptime(ts, "%Y-%m-%dT%H:%M:%S.%f" if "." in ts else "%Y-%m-%dT%H:%M:%S")
+        except ValueError:
+            continue
+        out.append((ts, m["symbol"], m["action"], float(m["size"]), m["regime"], float(m["flow"])))
+    return out
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    return _write_log(tmp_path / "agg_decisions.log")
+
+
+def test_iso_parser_matches_strptime():
+    for text in ("2025-12-11T22:25:38.515601", "2025-12-11T22:25:38", "2024-02-29T00:00:00.5"):
+        fmt = "%Y-%m-%dT%H:%M:%S.%f" if "." in text else "%Y-%m-%dT%H:%M:%S"
+        expected = datetime.strptime(text, fmt) - datetime(1970, 1, 1)
+        assert parse_iso_us(text) == expected // np.timedelta64(1, "us")
+    for bad in ("2025-02-30T00:00:00", "2025-12-11 22:25:38", "2025-12-11T22:25:38.", "2025-12-11T24:00:00"):
+        assert parse_iso_us(bad) is None
+
+
+@pytest.mark.parametrize("chunk_bytes,workers", [(1 << 30, 1), (4096, 1), (4096, 2)])
+def test_chunked_parse_matches_line_parser(tmp_path, log_file, chunk_bytes, workers):
+    ingest = LogIngest(cache_dir=tmp_path / "cache", chunk_bytes=chunk_bytes, workers=workers)
+    events = LogParser.parse_file(str(log_file), ingest=ingest)
+
+    got = [(e.timestamp, e.symbol, e.action, e.size_usd, e.regime, e.flow_mult) for e in events]
+    assert got == _reference(log_file)
+    assert ingest.bad_timestamps > 0
+
+    frame = ingest.read_frame(log_file)
+    loose = frame[~frame["strict"]]
+    assert set(loose["action"]) >= {"sell", "BUY"}          # tolerant rows kept for the dataset
+    assert loose.loc[loose["action"] == "sell", "dna_mult"].between(0, 1).all()
+
+
+def test_raw_lines_are_opt_in(tmp_path, log_file):
+    ingest = LogIngest(cache_dir=None)
+    plain = LogParser.parse_file(str(log_file), ingest=ingest)
+    raw = LogParser.parse_file(str(log_file), keep_raw=True, ingest=ingest)
+    assert all(e.raw_line == "" for e in plain)
+    assert all(LogParser.PATTERN.search(e.raw_line) for e in raw)
+
+
+def test_cache_is_keyed_on_size_and_mtime(tmp_path, log_file, monkeypatch):
+    ingest = LogIngest(cache_dir=tmp_path / "cache", chunk_bytes=4096, workers=1)
+    first = ingest.read_frame(log_file)
+
+    calls = []
+    parse = log_ingest.parse_range
+    monkeypatch.setattr(log_ingest, "parse_range", lambda *a: calls.append(a) or parse(*a))
+
+    again = ingest.read_frame(log_file)
+    assert calls == []
+    assert again.equals(first)
+    assert ingest.bad_timestamps > 0
+
+    with open(log_file, "a", encoding="utf-8") as f:
+        f.write("2026-01-01T00:00:00 |   >>> EXECUTE: BUY BTC/USDT:USDT | $9 | Regime:R | Flow:1.00x\n")
+    grown = ingest.read_frame(log_file)
+    assert calls
+    assert len(grown) == len(first) + 1
+    assert grown.iloc[-1]["symbol"] == "BTC/USDT:USDT"
+
+
+def test_abandoned_iteration_leaves_no_cache(tmp_path, log_file):
+    ingest = LogIngest(cache_dir=tmp_path / "cache", chunk_bytes=4096, workers=1)
+    batches = ingest.iter_batches(log_file)
+    next(batches)
+    batches.close()
+    assert not any(p.name.endswith("key.json") for p in (tmp_path / "cache").rglob("*"))
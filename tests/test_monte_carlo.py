@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+═══════════════════════════════════════════════════════════════════════════════
+GODBRAIN Monte Carlo Tests
+Batched kernel parity with the per-simulation loop, and bootstrap modes.
+═══════════════════════════════════════════════════════════════════════════════
+"""
+
+import numpy as np
+import pytest
+
+import sys
+from pathlib import Path
+ROOT = Path(__file__).parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from lab.backtest.monte_carlo import MonteCarloSimulator
+
+
+@pytest.fixture
+def trade_pnls():
+    return list(np.random.default_rng(0).normal(2, 25, 300))
+
+
+class TestBatchedMonteCarlo:
+    """simulate_batch vs simulate_from_trades."""
+    
+    def test_shuffle_matches_loop_for_same_seed(self, trade_pnls):
+        loop = MonteCarloSimulator(seed=11).simulate_from_trades(
+            trade_pnls, initial_capital=500, n_simulations=700
+        )
+        # Tiny budget forces several chunks
+        batch = MonteCarloSimulator(seed=11).simulate_batch(
+            trade_pnls, initial_capital=500, n_simulations=700, memory_budget_mb=0.5
+        )
+        
+        for name in ("sharpe_mean", "sharpe_std", "sharpe_5pct", "sharpe_95pct",
+                     "max_dd_mean", "max_dd_95pct", "pnl_mean", "pnl_5pct",
+                     "winrate_mean", "winrate_std", "risk_of_ruin"):
+            assert getattr(batch, name) == pytest.approx(getattr(loop, name), rel=1e-12, abs=1e-12)
+        np.testing.assert_allclose(batch.sharpe_distribution, loop.sharpe_distribution, rtol=1e-12)
+        np.testing.assert_allclose(batch.max_dd_distribution, loop.max_dd_distribution, rtol=1e-12)
+        assert batch.risk_of_ruin == loop.risk_of_ruin
+    
+    @pytest.mark.parametrize("method", ["block", "stationary"])
+    def test_bootstrap_resamples_from_trades(self, trade_pnls, method):
+        sim = MonteCarloSimulator(seed=3)
+        sampled = sim._resample(np.asarray(trade_pnls), 50, method, block_size=10)
+        
+        assert sampled.shape == (50, len(trade_pnls))
+        assert np.isin(sampled, trade_pnls).all()
+        # Unlike shuffling, bootstraps change the final PnL between paths
+        assert np.std(sampled.sum(axis=1)) > 0
+    
+    def test_unknown_method_rejected(self, trade_pnls):
+        with pytest.raises(ValueError):
+            MonteCarloSimulator(seed=1).simulate_batch(trade_pnls, method="jackknife")
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""
+═══════════════════════════════════════════════════════════════════════════════
+GODBRAIN OHLCV Store Tests
+Partitioned writes, tail appends and memory-mapped range reads.
+═══════════════════════════════════════════════════════════════════════════════
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import sys
+from pathlib import Path
+ROOT = Path(__file__).parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from backtesting.data_manager import HistoricalDataManager
+from backtesting.ohlcv_store import OHLCVStore
+
+
+def _candles(start: str, n: int, freq: str = "1h") -> pd.DataFrame:
+    index = pd.date_range(start, periods=n, freq=freq, name="timestamp")
+    close = np.arange(n, dtype=float) + 100
+    return pd.DataFrame({
+        'open': close, 'high': close + 1, 'low': close - 1,
+        'close': close, 'volume': np.full(n, 10.0),
+    }, index=index)
+
+
+class TestOHLCVStore:
+    """Store layout and read/write semantics."""
+    
+    def test_partitions_by_month(self, tmp_path):
+        store = OHLCVStore(tmp_path)
+        store.write("BTC/USDT", "1h", _candles("2024-01-30", 72))
+        
+        names = [p.stem for p in store.partitions("BTC/USDT", "1h")]
+        assert names == ["2024-01", "2024-02"]
+    
+    def test_range_read_matches_source(self, tmp_path):
+        store = OHLCVStore(tmp_path)
+        df = _candles("2024-01-01", 24 * 70)
+        store.write("BTC/USDT", "1h", df)
+        
+        start, end = datetime(2024, 1, 20, 5), datetime(2024, 2, 10, 17)
+        got = store.read_frame("BTC/USDT", "1h", start, end)
+        expected = df[(df.index >= start) & (df.index <= end)]
+        
+        np.testing.assert_array_equal(got.to_numpy(), expected.to_numpy())
+        np.testing.assert_array_equal(
+            got.index.to_numpy(dtype='datetime64[ms]'),
+            expected.index.to_numpy(dtype='datetime64[ms]')
+        )
+    
+    def test_single_partition_read_is_memory_mapped(self, tmp_path):
+        store = OHLCVStore(tmp_path)
+        store.write("BTC/USDT", "1h", _candles("2024-03-01", 48))
+        
+        views = store.read_arrays("BTC/USDT", "1h", datetime(2024, 3, 1), datetime(2024, 3, 2))
+        assert len(views) == 1
+        assert isinstance(views[0].base, np.memmap) or isinstance(views[0], np.memmap)
+        assert views[0].shape == (6, 25)
+    
+    def test_append_only_rewrites_new_months(self, tmp_path):
+        store = OHLCVStore(tmp_path)
+        df = _candles("2024-01-01", 24 * 45)
+        store.write("BTC/USDT", "1h", df.iloc[:24 * 40])
+        january = store.partitions("BTC/USDT", "1h")[0]
+        mtime = january.stat().st_mtime_ns
+        
+        written = store.write("BTC/USDT", "1h", df.iloc[24 * 35:])
+        
+        assert written == 24 * 5
+        assert january.stat().st_mtime_ns == mtime
+        first, last = store.bounds("BTC/USDT", "1h")
+        assert last == df.index[-1].value // 1_000_000
+    
+    def test_incoming_bar_replaces_stored(self, tmp_path):
+        store = OHLCVStore(tmp_path)
+        df = _candles("2024-01-01", 48)
+        partial = df.copy()
+        partial.iloc[-1, partial.columns.get_loc('close')] = 1.0     # still-open candle
+        store.write("BTC/USDT", "1h", partial)
+        
+        assert store.write("BTC/USDT", "1h", df.iloc[-1:]) == 0
+        got = store.read_frame("BTC/USDT", "1h", df.index[0], df.index[-1])
+        np.testing.assert_array_equal(got.to_numpy(), df.to_numpy())
+        
+        # Identical re-writes leave the partition untouched
+        path = store.partitions("BTC/USDT", "1h")[0]
+        mtime = path.stat().st_mtime_ns
+        assert store.write("BTC/USDT", "1h", df) == 0
+        assert path.stat().st_mtime_ns == mtime
+    
+    def test_list_series_keeps_original_symbol(self, tmp_path):
+        store = OHLCVStore(tmp_path)
+        for symbol in ("BTC-PERP", "1000_SATS/USDT:USDT"):
+            store.write(symbol, "1h", _candles("2024-01-01", 10), exchange="okx")
+        
+        assert sorted(s['symbol'] for s in store.list_series()) == ["1000_SATS/USDT:USDT", "BTC-PERP"]
+
+
+class TestDataManagerStore:
+    """HistoricalDataManager reads through the store."""
+    
+    def test_legacy_parquet_imported(self, tmp_path):
+        pytest.importorskip("pyarrow")
+        df = _candles("2024-01-01", 200)
+        df.to_parquet(tmp_path / "binance_BTC_USDT_1h.parquet")
+        
+        dm = HistoricalDataManager(str(tmp_path))
+        got = dm.load_sync("BTC/USDT", "1h", datetime(2024, 1, 2), datetime(2024, 1, 3))
+        
+        assert len(got) == 25
+        assert dm.list_available_data()[0]['rows'] == 200
+    
+    def test_covers_treats_naive_datetimes_as_utc(self, tmp_path):
+        dm = HistoricalDataManager(str(tmp_path))
+        dm.store.write("BTC/USDT", "1h", _candles("2024-01-01", 24))
+        
+        start, end = datetime(2024, 1, 1), datetime(2024, 1, 1, 23)
+        assert dm._covers("BTC/USDT", "binance", "1h", start, end)
+        assert dm._covers("BTC/USDT", "binance", "1h",
+                          start.replace(tzinfo=timezone.utc), end.replace(tzinfo=timezone.utc))
+        assert not dm._covers("BTC/USDT", "binance", "1h", start, end + timedelta(hours=1))
+    
+    def test_download_refetches_last_stored_bar(self, tmp_path):
+        dm = HistoricalDataManager(str(tmp_path))
+        df = _candles("2024-01-01", 48)
+        stale = df.iloc[:24].copy()
+        stale.iloc[-1, stale.columns.get_loc('close')] = 1.0
+        dm.store.write("BTC/USDT", "1h", stale)
+        
+        rows = [[ts.value // 1_000_000, *bar] for ts, bar in zip(df.index, df.to_numpy().tolist())]
+        
+        class _Exchange:
+            rateLimit = 0
+            calls = []
+            
+            async def fetch_ohlcv(self, symbol, timeframe, since, limit):
+                self.calls.append(since)
+                return [r for r in rows if r[0] >= since][:limit]
+            
+            async def close(self):
+                pass
+        
+        ex = _Exchange()
+        dm._exchanges["binance"] = ex
+        got = asyncio.run(dm.download("BTC/USDT", "binance", "1h", df.index[0], df.index[-1]))
+        
+        assert ex.calls[0] == df.index[23].value // 1_000_000
+        np.testing.assert_array_equal(got.to_numpy(), df.to_numpy())
@@ -0,0 +1,305 @@
+"""
+Tests for the shared order dispatcher (execution/order_dispatcher.py)
+and the algo executors submitting through it, on a simulated clock.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from execution.iceberg import IcebergExecutor
+from execution.mock_exchange import MockExchange
+from execution.order_dispatcher import ChildOrder, OrderDispatcher, SimulatedClock
+from execution.smart_router import RoutedOrder, SmartOrderRouter
+from execution.twap import TWAPExecutor
+
+
+SYMBOLS = [f"COIN{i}/USDT:USDT" for i in range(5)]
+START = 1_700_000_000.0
+
+
+def _exchange():
+    return MockExchange(prices={s: 10.0 for s in SYMBOLS}, balance_usdt=1e9)
+
+
+def _run(scenario, exchange, **kwargs):
+    """Run scenario(dispatcher) on a simulated clock; returns (result, clock)."""
+    clock = SimulatedClock(start=START)
+
+    async def main():
+        dispatcher = OrderDispatcher({"okx": exchange}, clock=clock, **kwargs)
+        try:
+            return await scenario(dispatcher)
+        finally:
+            await dispatcher.close()
+
+    return asyncio.run(main()), clock
+
+
+class TestOrderDispatcher:
+
+    def test_resubmitted_client_id_places_once(self):
+        ex = _exchange()
+        order = dict(symbol=SYMBOLS[0], side="buy", amount=2, venue="okx", parent_id="p", slice_id=3)
+
+        async def scenario(dispatcher):
+            first = dispatcher.submit(ChildOrder(**order))
+            again = dispatcher.submit(ChildOrder(**order))
+            fills = await asyncio.gather(first, again)
+            late = await dispatcher.submit(ChildOrder(**order))
+            return fills + [late], dispatcher.stats
+
+        (fills, stats), _ = _run(scenario, ex)
+
+        assert len(ex.orders) == 1
+        assert {f["id"] for f in fills} == {ex.orders[0]["id"]}
+        assert ex.orders[0]["clientOrderId"] == ChildOrder(**order).client_order_id
+        assert stats["deduplicated"] == 2
+
+    def test_adhoc_orders_without_parent_are_independent(self):
+        ex = _exchange()
+
+        async def scenario(dispatcher):
+            first = await dispatcher.submit(ChildOrder(SYMBOLS[0], "buy", 1, venue="okx"))
+            second = await dispatcher.submit(ChildOrder(SYMBOLS[0], "buy", 1, venue="okx"))
+            return first, second, dispatcher.stats
+
+        (first, second, stats), _ = _run(scenario, ex)
+
+        assert len(ex.orders) == 2
+        assert first["id"] != second["id"]
+        assert first["clientOrderId"] != second["clientOrderId"]
+        assert stats["submitted"] == 2 and stats["deduplicated"] == 0
+
+    def test_short_batch_response_fails_unmatched_children(self):
+        ex = _exchange()
+        create_orders = ex.create_orders
+
+        async def drop_last(orders, params=None):
+            return (await create_orders(orders, params))[:-1]
+
+        ex.create_orders = drop_last
+
+        async def scenario(dispatcher):
+            futures = dispatcher.submit_many(ChildOrder(s, "buy", 1, venue="okx") for s in SYMBOLS[:3])
+            return await asyncio.wait_for(asyncio.gather(*futures, return_exceptions=True), 1.0)
+
+        results, _ = _run(scenario, ex)
+
+        assert [isinstance(r, dict) for r in results] == [True, True, False]
+        assert isinstance(results[2], RuntimeError)
+
+    def test_duplicate_intents_coalesce_into_one_order(self):
+        ex = _exchange()
+
+        async def scenario(dispatcher):
+            return await asyncio.gather(*dispatcher.submit_many(
+                ChildOrder(SYMBOLS[0], "buy", amount, venue="okx", parent_id=f"strategy{i}")
+                for i, amount in enumerate([1, 2, 3])
+            ))
+
+        fills, _ = _run(scenario, ex)
+
+        assert len(ex.orders) == 1
+        assert ex.orders[0]["amount"] == 6
+        assert [f["filled"] for f in fills] == [1, 2, 3]
+        assert all(f["coalesced"] == 3 for f in fills)
+
+    def test_children_with_different_params_are_not_coalesced(self):
+        ex = _exchange()
+        sent = []
+        create_orders = ex.create_orders
+
+        async def record(orders, params=None):
+            sent.extend(orders)
+            return await create_orders(orders, params)
+
+        ex.create_orders = record
+
+        async def scenario(dispatcher):
+            return await asyncio.gather(*dispatcher.submit_many(
+                ChildOrder(SYMBOLS[0], "sell", 1, venue="okx", type="limit", price=11.0,
+                           parent_id=f"strategy{i}", params=params)
+                for i, params in enumerate([{"reduceOnly": True}, {}])
+            ))
+
+        fills, _ = _run(scenario, ex)
+
+        assert len(ex.orders) == 2
+        assert [o["params"].get("reduceOnly") for o in sent] == [True, None]
+        assert fills[0]["id"] != fills[1]["id"]
+
+    def test_batches_respect_the_venue_rate_limit(self):
+        ex = _exchange()
+
+        async def scenario(dispatcher):
+            return await asyncio.gather(*dispatcher.submit_many(
+                ChildOrder(s, "buy", 1, venue="okx") for s in SYMBOLS
+            ))
+
+        fills, clock = _run(scenario, ex, rate=1.0, burst=1, max_batch=2)
+
+        assert len(fills) == 5
+        assert ex.calls == ["create_orders", "create_orders", "create_order"]
+        assert clock.time() == pytest.approx(START + 2.0)
+
+    def test_no_batch_endpoint_sends_one_request_per_order(self):
+        ex = _exchange()
+        ex.has = {"createOrders": False, "cancelOrders": False}
+
+        async def scenario(dispatcher):
+            return await asyncio.gather(*dispatcher.submit_many(
+                ChildOrder(s, "sell", 1, venue="okx") for s in SYMBOLS[:3]
+            ))
+
+        _run(scenario, ex)
+
+        assert ex.calls == ["create_order"] * 3
+
+    def test_cancel_queued_and_resting_orders(self):
+        ex = _exchange()
+
+        async def scenario(dispatcher):
+            resting = [
+                dispatcher.submit(ChildOrder(SYMBOLS[0], "buy", 1, venue="okx", type="limit", price=p))
+                for p in (9.0, 8.0)
+            ]
+            placed = await asyncio.gather(*resting)
+            later = ChildOrder(SYMBOLS[0], "buy", 1, venue="okx", parent_id="x",
+                               not_before=START + 60)
+            queued = dispatcher.submit(later)
+            ids = [f["clientOrderId"] for f in placed] + [later.client_order_id]
+            result = await dispatcher.cancel(ids)
+            return result, await queued
+
+        (result, queued), _ = _run(scenario, ex)
+
+        assert set(result.values()) == {"canceled"}
+        assert queued["status"] == "canceled"
+        assert ex.calls == ["create_orders", "cancel_orders"]
+        assert ex.open_orders == {}
+
+    def test_cancel_one_child_of_coalesced_order_leaves_it_resting(self):
+        ex = _exchange()
+
+        async def scenario(dispatcher):
+            placed = await asyncio.gather(*dispatcher.submit_many(
+                ChildOrder(SYMBOLS[0], "buy", 1, venue="okx", type="limit", price=9.0,
+                           parent_id=f"strategy{i}")
+                for i in range(2)
+            ))
+            first, second = (f["clientOrderId"] for f in placed)
+            partial = await dispatcher.cancel([first])
+            resting = dict(ex.open_orders)
+            both = await dispatcher.cancel([first, second])
+            return partial, resting, both
+
+        (partial, resting, both), _ = _run(scenario, ex)
+
+        assert list(partial.values()) == ["coalesced"]
+        assert len(resting) == 1
+        assert set(both.values()) == {"canceled"}
+        assert ex.calls == ["create_order", "cancel_orders"]
+        assert ex.open_orders == {}
+
+    def test_cancel_while_waiting_for_a_token_sends_nothing(self):
+        ex = _exchange()
+
+        async def scenario(dispatcher):
+            await dispatcher.submit(ChildOrder(SYMBOLS[0], "buy", 1, venue="okx"))
+            order = ChildOrder(SYMBOLS[1], "buy", 1, venue="okx")
+            queued = dispatcher.submit(order)
+            await asyncio.sleep(0)                   # lane is now waiting for a token
+            result = await dispatcher.cancel([order.client_order_id])
+            await dispatcher.clock.sleep(2.0)
+            return result, await queued, dict(dispatcher.stats)
+
+        (result, queued, stats), _ = _run(scenario, ex, rate=1.0, burst=1)
+
+        assert result[queued["clientOrderId"]] == "canceled"
+        assert ex.calls == ["create_order"]
+        assert stats["requests"] == 1
+
+
+class TestAlgosThroughDispatcher:
+
+    def test_four_hour_twap_runs_on_simulated_clock(self):
+        ex = _exchange()
+
+        async def scenario(dispatcher):
+            twap = TWAPExecutor(dispatcher=dispatcher, venue="okx")
+            return await twap.execute(SYMBOLS[0], "buy", 48, duration_minutes=240, slices=48)
+
+        start = time.perf_counter()
+        report, clock = _run(scenario, ex)
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 1.0
+        assert report.completion_pct == pytest.approx(100.0)
+        assert report.average_price == 10.0
+        assert len(ex.orders) == 48
+        assert len({o["clientOrderId"] for o in ex.orders}) == 48
+        # last slice goes out at 235 minutes
+        assert clock.time() == pytest.approx(START + 235 * 60)
+        assert (report.end_time - report.start_time).total_seconds() == pytest.approx(235 * 60)
+
+    def test_identical_twaps_at_the_same_instant_are_separate_orders(self):
+        ex = _exchange()
+
+        async def scenario(dispatcher):
+            twap = TWAPExecutor(dispatcher=dispatcher, venue="okx")
+            first, second = await asyncio.gather(
+                twap.execute(SYMBOLS[0], "buy", 4, duration_minutes=4, slices=4),
+                twap.execute(SYMBOLS[0], "buy", 4, duration_minutes=4, slices=4),
+            )
+            retry = await twap.execute(SYMBOLS[0], "buy", 4, duration_minutes=4, slices=4,
+                                       parent_id="retry")
+            again = await twap.execute(SYMBOLS[0], "buy", 4, duration_minutes=4, slices=4,
+                                       parent_id="retry")
+            return first, second, retry, again, dispatcher.stats
+
+        (first, second, retry, again, stats), _ = _run(scenario, ex)
+
+        assert first.executed_quantity == second.executed_quantity == 4
+        # 8 distinct children (coalesced pairwise) plus one retried parent placed once
+        assert stats["submitted"] == 12
+        assert sum(o["amount"] for o in ex.orders) == 12
+        assert stats["deduplicated"] == 4
+
+    def test_iceberg_chunks_are_sequential_children(self):
+        ex = _exchange()
+
+        async def scenario(dispatcher):
+            iceberg = IcebergExecutor(dispatcher=dispatcher, venue="okx")
+            return await iceberg.execute(SYMBOLS[1], "sell", 10, visible_qty=3)
+
+        order, _ = _run(scenario, ex)
+
+        assert order.status == "completed"
+        assert [o["amount"] for o in ex.orders] == [3, 3, 3, 1]
+        assert ex.calls == ["create_order"] * 4
+
+    def test_router_places_split_through_dispatcher(self):
+        ex = _exchange()
+        routed = [
+            RoutedOrder("okx", SYMBOLS[2], "buy", 1.5, 10.0, 0.0003, "routed"),
+            RoutedOrder("binance", SYMBOLS[2], "buy", 0.5, 10.0, 0.0003, "routed"),
+        ]
+
+        async def scenario(dispatcher):
+            router = SmartOrderRouter(dispatcher=dispatcher)
+            with pytest.raises(ValueError):
+                await router.execute_routed(routed)     # binance isn't a dispatcher venue
+            first = await router.execute_routed(routed[:1])
+            second = await router.execute_routed(routed[:1])
+            return first + second
+
+        fills, _ = _run(scenario, ex)
+
+        # The rejected route queued nothing; two routes at the same instant both execute
+        assert len(ex.orders) == 2
+        assert [f["amount"] for f in fills] == [1.5, 1.5]
+        assert fills[0]["id"] != fills[1]["id"]
+        assert routed[0].status == "filled"
+        assert routed[1].status == "routed"
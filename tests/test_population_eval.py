@@ -0,0 +1,74 @@
+"""
+Tests for the common-random-numbers population evaluator (genetics/).
+"""
+
+import numpy as np
+import pytest
+
+from genetics import blackjack_lab, roulette_lab
+from genetics.population_eval import PopulationEvaluator
+
+
+class TestPopulationEvaluator:
+    """Shared tape per generation."""
+
+    def test_same_seed_same_results(self):
+        population = [roulette_lab.create_dna() for _ in range(10)]
+
+        first = PopulationEvaluator(roulette_lab.spin_tape, roulette_lab.score_population, seed=1)
+        second = PopulationEvaluator(roulette_lab.spin_tape, roulette_lab.score_population, seed=1)
+
+        assert first.evaluate(population) == second.evaluate(population)
+        assert first.generation == 1
+
+    def test_identical_dna_identical_fitness(self):
+        dna = [10, 20, 50, 100, 200, 300]
+        evaluator = PopulationEvaluator(blackjack_lab.hand_tape, blackjack_lab.score_hands, seed=2)
+
+        results = evaluator.evaluate([dna, list(dna), [1] * 6])
+
+        assert results[0][1] == results[1][1]
+        assert evaluator.evaluate([]) == []
+
+    def test_blackjack_score_matches_per_hand_sum(self):
+        tape = blackjack_lab.simulate_hands(10_000, np.random.default_rng(4))
+        dna = np.array([[10, 10, 234, 326, 354, 500], [1, 2, 3, 4, 5, 6]], dtype=float)
+
+        scores = blackjack_lab.score_hands(dna, tape)
+
+        bucket, payoff = tape
+        expected = [(row[bucket] * payoff).sum() for row in dna]
+        assert scores == pytest.approx(expected, rel=1e-9)
+
+
+class TestBatchedScorers:
+    """Batched scorers reproduce the scalar evaluators on the same tape."""
+
+    def test_roulette_matches_evaluate_survival(self, monkeypatch):
+        wins = roulette_lab.spin_tape(np.random.default_rng(3))
+        population = [[60, 50, 40, 35, 25, 15], [500] * 6, [300, 400, 500, 500, 500, 500]]
+
+        batched = roulette_lab.score_population(np.array(population, dtype=float), wins)
+
+        expected = []
+        for dna in population:
+            draws = iter(np.where(wins, 0.0, 0.99).tolist())
+            monkeypatch.setattr(roulette_lab.random, "random", lambda: next(draws))
+            expected.append(roulette_lab.evaluate_survival(dna)[3])
+
+        assert batched.tolist() == pytest.approx(expected, abs=1e-9)
+
+    def test_roulette_capped_lanes_step_together(self, monkeypatch):
+        # Losing wheel: lanes hit the cap at different spins, then bust or recover
+        wins = np.random.default_rng(5).random(roulette_lab.SPINS_PER_EVAL) < 0.4
+        population = np.random.default_rng(6).integers(10, 500, size=(12, 6)).tolist()
+
+        batched = roulette_lab.score_population(np.array(population, dtype=float), wins)
+
+        expected = []
+        for dna in population:
+            draws = iter(np.where(wins, 0.0, 0.99).tolist())
+            monkeypatch.setattr(roulette_lab.random, "random", lambda: next(draws))
+            expected.append(roulette_lab.evaluate_survival(dna)[3])
+
+        assert batched.tolist() == pytest.approx(expected, abs=1e-9)
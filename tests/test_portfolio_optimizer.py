@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+GODBRAIN Portfolio Optimizer Tests
+Cholesky solves vs the explicit-inverse formulas, result caching, the
+warm-started ERC solver, the batched frontier and the rebalancer's
+batched candidate checks.
+"""
+
+import numpy as np
+import pytest
+
+import sys
+from pathlib import Path
+ROOT = Path(__file__).parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from portfolio.optimizer import PortfolioOptimizer
+from portfolio.rebalancer import DynamicRebalancer
+
+
+SYMBOLS = [f"A{i}" for i in range(12)]
+
+
+def _returns(seed=0, n_bars=300):
+    rng = np.random.default_rng(seed)
+    scale = np.linspace(0.01, 0.03, len(SYMBOLS))
+    return rng.normal(0.001, 1, (n_bars, len(SYMBOLS))) * scale + rng.normal(0, 0.01, (n_bars, 1))
+
+
+def _vector(result):
+    return np.array([result.weights[s] for s in SYMBOLS])
+
+
+def test_matches_inverse_formulas():
+    returns = _returns()
+    opt = PortfolioOptimizer(risk_free_rate=0.0005)
+    mean, cov = returns.mean(axis=0), np.cov(returns.T)
+    inv = np.linalg.inv(cov)
+
+    ones = np.ones(len(SYMBOLS))
+    min_var = inv @ ones / (ones @ inv @ ones)
+    min_var = np.maximum(min_var, 0) / np.maximum(min_var, 0).sum()
+    np.testing.assert_allclose(_vector(opt.min_variance(returns, SYMBOLS)), min_var, atol=1e-12)
+
+    sharpe = inv @ (mean - 0.0005)
+    sharpe = np.maximum(sharpe / sharpe.sum(), 0)
+    result = opt.max_sharpe(returns, SYMBOLS)
+    np.testing.assert_allclose(_vector(result), sharpe / sharpe.sum(), atol=1e-12)
+    w = _vector(result)
+    assert result.expected_volatility == pytest.approx(np.sqrt(w @ cov @ w))
+
+
+def test_results_cached_on_inputs():
+    returns = _returns()
+    opt = PortfolioOptimizer()
+    first = opt.mean_variance(returns, SYMBOLS)
+    first.weights["A0"] = 99.0                     # callers can't corrupt the cache
+    again = opt.mean_variance(returns.copy(), SYMBOLS)
+    assert len(opt._results) == 1 and len(opt._factors) == 1
+    assert again.weights["A0"] != 99.0
+
+    opt.mean_variance(returns, SYMBOLS, target_return=0.001)
+    opt.mean_variance(_returns(seed=1), SYMBOLS)
+    assert len(opt._results) == 3
+
+
+def test_erc_warm_start():
+    opt = PortfolioOptimizer()
+    returns = _returns()
+    result = opt.risk_parity(returns, SYMBOLS, exact=True)
+    w = _vector(result)
+    contrib = w * (np.cov(returns.T) @ w)
+    assert contrib.max() / contrib.min() == pytest.approx(1.0, abs=1e-6)
+    assert result.method == "risk_parity_erc"
+
+    # Next bar: slightly different covariance, solved from the previous weights
+    shifted = np.vstack([returns[1:], returns[:1] * 1.5])
+    warm = _vector(opt.risk_parity(shifted, SYMBOLS, exact=True))
+    cold = _vector(PortfolioOptimizer().risk_parity(shifted, SYMBOLS, exact=True))
+    np.testing.assert_allclose(warm, cold, atol=1e-8)
+
+    inverse_vol = _vector(opt.risk_parity(returns, SYMBOLS))
+    vols = returns.std(axis=0, ddof=1)
+    np.testing.assert_allclose(inverse_vol, (1 / vols) / (1 / vols).sum())
+
+
+def test_frontier_matches_target_return_calls():
+    returns = _returns()
+    opt = PortfolioOptimizer()
+    frontier = opt.efficient_frontier(returns, SYMBOLS, n_points=8)
+    assert len(frontier) == 8
+    assert frontier[0].expected_return < frontier[-1].expected_return
+
+    for point in frontier:
+        single = PortfolioOptimizer().mean_variance(returns, SYMBOLS, target_return=point.expected_return)
+        np.testing.assert_allclose(_vector(point), _vector(single), atol=1e-12)
+        assert point.expected_volatility == pytest.approx(single.expected_volatility)
+
+
+def test_rebalancer_batched_checks():
+    returns = _returns()
+    rebalancer = DynamicRebalancer({}, threshold=0.05)
+    target = rebalancer.retarget(returns, SYMBOLS, method="min_variance")
+    assert sum(rebalancer.target_weights.values()) == pytest.approx(1.0)
+
+    rng = np.random.default_rng(3)
+    candidates = rng.dirichlet(np.ones(len(SYMBOLS)), size=500)
+    needed = rebalancer.rebalance_needed_batch(candidates, SYMBOLS)
+    expected = [rebalancer.rebalance_needed(dict(zip(SYMBOLS, row))) for row in candidates]
+    np.testing.assert_array_equal(needed, expected)
+
+    stats = rebalancer.evaluate_candidates(candidates, SYMBOLS, returns)
+    cov = np.cov(returns.T)
+    np.testing.assert_allclose(stats['expected_volatility'],
+                               np.sqrt(np.einsum('km,mn,kn->k', candidates, cov, candidates)))
+    # Nothing in the batch beats the min-variance target on volatility
+    assert stats['expected_volatility'].min() >= target.expected_volatility - 1e-12
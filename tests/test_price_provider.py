@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+GODBRAIN Backtest Price Provider Tests
+Batched searchsorted lookups vs the per-event asof semantics, and the
+single replay shared by the metrics engine and Monte Carlo.
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import sys
+from pathlib import Path
+ROOT = Path(__file__).parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from backtesting.ohlcv_store import OHLCVStore
+from lab.backtest.metrics import run_metrics_engine
+from lab.backtest.monte_carlo import extract_trade_pnls_from_events
+from lab.backtest.parser import TradeEvent
+from lab.backtest.price_provider import ArrayPriceProvider, CsvPriceProvider, PriceProvider
+
+
+T0 = datetime(2025, 1, 1)
+
+
+@pytest.fixture
+def price_csv(tmp_path):
+    rng = np.random.default_rng(3)
+    rows = []
+    for sym, base in (("BTC/USDT:USDT", 40_000), ("DOGE/USDT:USDT", 0.1)):
+        for h in range(0, 24 * 30, 1):
+            rows.append((T0 + timedelta(hours=h), sym, base * (1 + rng.normal(0, 0.01))))
+    path = tmp_path / "prices.csv"
+    pd.DataFrame(rows, columns=["timestamp", "symbol", "price"]).to_csv(path, index=False)
+    return path
+
+
+@pytest.fixture
+def events():
+    rng = np.random.default_rng(5)
+    out = []
+    for i in range(400):
+        out.append(TradeEvent(
+            timestamp=T0 + timedelta(minutes=int(rng.integers(-120, 60 * 24 * 31))),
+            symbol=["BTC/USDT:USDT", "DOGE/USDT:USDT", "XRP/USDT:USDT"][i % 3],
+            action="BUY" if rng.random() < 0.55 else "SELL",
+            size_usd=float(rng.integers(5, 50)),
+            regime="TRENDING_UP", flow_mult=1.0, raw_line="",
+        ))
+    return out
+
+
+def _asof(df, symbol, ts):
+    """Reference: the original per-event index.asof lookup."""
+    frame = df[df.symbol == symbol].set_index("timestamp").sort_index()
+    if frame.empty:
+        return 0.0
+    idx = frame.index.asof(ts)
+    return float(frame.iloc[0]["price"] if pd.isna(idx) else frame.loc[idx]["price"])
+
+
+def test_batch_lookup_matches_asof(price_csv, events):
+    provider = CsvPriceProvider()
+    provider.load_data(str(price_csv))
+    df = pd.read_csv(price_csv, parse_dates=["timestamp"])
+
+    got = provider.get_prices([e.symbol for e in events], [e.timestamp for e in events])
+
+    expected = [_asof(df, e.symbol, e.timestamp) for e in events]
+    np.testing.assert_array_equal(got, expected)
+    assert provider.get_price("XRP/USDT:USDT", T0) == 0.0
+
+
+def test_parquet_and_store_sources(tmp_path):
+    ts = pd.date_range(T0, periods=48, freq="h")
+    opens = np.arange(1, 49, dtype=float)
+    candles = pd.DataFrame({
+        "timestamp": ts, "open": opens, "high": opens + 2, "low": opens - 1,
+        "close": opens + 1, "volume": 1.0,
+    })
+    candles.to_parquet(tmp_path / "DOGE_1h.parquet", index=False)
+    store = OHLCVStore(tmp_path / "store")
+    store.write("DOGE/USDT:USDT", "1h", candles, "okx")
+
+    from_parquet = ArrayPriceProvider()
+    from_parquet.load_data(str(tmp_path / "DOGE_1h.parquet"))
+    from_store = ArrayPriceProvider()
+    from_store.load_store(store, ["DOGE/USDT:USDT", "BTC/USDT:USDT"], "1h")
+
+    query = [T0 - timedelta(hours=1), T0 + timedelta(hours=5, minutes=30), T0 + timedelta(days=5)]
+    for provider in (from_parquet, from_store):
+        prices = provider.get_prices(["DOGE/USDT:USDT"] * 3, query)
+        # Clipped to first bar, asof, last bar; never the close of a bar still open
+        assert prices.tolist() == [1.0, 6.0, 48.0]
+    assert list(from_store.series) == ["DOGE/USDT:USDT"]
+
+
+def test_monte_carlo_shares_one_priced_replay(price_csv, events):
+    provider = CsvPriceProvider()
+    provider.load_data(str(price_csv))
+
+    with patch.object(ArrayPriceProvider, "get_prices", wraps=provider.get_prices) as batch:
+        trade_pnls, report = extract_trade_pnls_from_events(events, provider, 1000.0)
+    assert batch.call_count == 1
+
+    reference = run_metrics_engine(events, provider, 1000.0)
+    assert report.total_pnl == pytest.approx(reference.total_pnl)
+    assert report.equity_curve == reference.equity_curve
+    assert sum(trade_pnls) == pytest.approx(report.total_pnl)
+
+
+def test_per_event_providers_still_work(events):
+    class Flat(PriceProvider):
+        def get_price(self, symbol, timestamp):
+            return 100.0
+
+        def load_data(self, source):
+            pass
+
+    report = run_metrics_engine(events, Flat(), 1000.0)
+    assert report.trade_count == len(events)
+    assert report.total_pnl == pytest.approx(0.0)
@@ -0,0 +1,135 @@
+"""
+Tests for the shared Redis access layer (infrastructure/redis_pool.py).
+No server needed: commands are intercepted below the instrumentation.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+redis = pytest.importorskip("redis")
+
+from infrastructure import redis_pool
+from infrastructure.redis_pool import RedisCache, get_cache, get_redis, latency, mget_dna_meta, mget_json
+
+
+@pytest.fixture(autouse=True)
+def fresh_pools():
+    redis_pool.close_pools()
+    latency.reset()
+    yield
+    redis_pool.close_pools()
+
+
+class TestPools:
+
+    def test_services_share_one_pool_per_endpoint(self):
+        a = get_redis("harvester", host="10.0.0.1", port=7000, password="x")
+        b = get_redis("agg", host="10.0.0.1", port=7000, password="x")
+        c = get_redis("agg", host="10.0.0.1", port=7001, password="x")
+
+        assert a.connection_pool is b.connection_pool
+        assert a.connection_pool is not c.connection_pool
+        assert (a.service, b.service) == ("harvester", "agg")
+        assert a.connection_pool.connection_kwargs["health_check_interval"] == 30
+
+    def test_check_caches_unreachable_endpoint(self):
+        with patch.object(redis.Redis, "execute_command", side_effect=redis.ConnectionError("down")) as cmd:
+            assert get_redis("x", host="10.0.0.2", port=7000, check=True) is None
+            assert get_redis("y", host="10.0.0.2", port=7000, check=True) is None
+        assert cmd.call_count == 1
+
+    def test_commands_and_pipelines_record_latency(self):
+        r = get_redis("harvester", host="10.0.0.3", port=7000)
+        with patch.object(redis.Redis, "execute_command", return_value=["[1,2]", None]):
+            r.mget(["a", "b"])
+            r.mget(["a", "b"])
+        with patch.object(redis.client.Pipeline, "execute", return_value=[True, True]):
+            pipe = r.pipeline(transaction=False)
+            pipe.set("k1", "v")
+            pipe.set("k2", "v")
+            pipe.execute()
+
+        stats = latency.snapshot("harvester")["harvester"]
+        assert stats["MGET"]["count"] == 2
+        assert stats["PIPELINE"]["count"] == 1
+
+
+def test_mget_json_helpers():
+    client = MagicMock()
+    client.mget.return_value = ['[10, 10, 234]', '{"gen": 7}', None, "not json"]
+
+    assert mget_json(client, ["a", "b", "c", "d"], default={}) == [[10, 10, 234], {"gen": 7}, {}, {}]
+    assert mget_dna_meta(client, [("a", "b"), ("c", "d")]) == [([10, 10, 234], {"gen": 7}), (None, None)]
+    assert client.mget.call_count == 2
+
+
+class TestRedisCache:
+
+    def _cache(self, **kwargs):
+        client = MagicMock()
+        client.mget.side_effect = lambda keys: [f"v:{k}" for k in keys]
+        return client, RedisCache(client, prefixes=("godbrain:",), **kwargs)
+
+    def test_keyspace_event_invalidates_key(self):
+        client, cache = self._cache()
+        cache.live = True
+
+        assert cache.mget(["godbrain:a", "godbrain:b"]) == ["v:godbrain:a", "v:godbrain:b"]
+        assert cache.get("godbrain:a") == "v:godbrain:a"
+        assert client.mget.call_count == 1 and cache.hits == 1
+
+        cache.handle_event({"channel": b"__keyspace@0__:godbrain:a", "data": "set"})
+        cache.get("godbrain:a")
+        cache.get("godbrain:b")
+
+        assert client.mget.call_args_list[-1].args[0] == ["godbrain:a"]
+        assert client.mget.call_count == 2
+
+    def test_without_notifications_falls_back_to_ttl(self):
+        now = [0.0]
+        client, cache = self._cache(ttl=5.0, clock=lambda: now[0])
+        client.config_get.side_effect = redis.ResponseError("CONFIG disabled")
+        client.pubsub.side_effect = redis.ConnectionError("no pubsub")
+
+        assert cache.start() is False
+        cache.get("godbrain:a")
+        cache.get("godbrain:a")
+        now[0] = 6.0
+        cache.get("godbrain:a")
+        assert client.mget.call_count == 2
+
+    def test_no_ttl_and_no_notifications_is_pass_through(self):
+        client, cache = self._cache()
+        cache.get("godbrain:a")
+        cache.get("godbrain:a")
+        assert client.mget.call_count == 2
+
+    def test_server_config_left_alone_by_default(self):
+        client, cache = self._cache(ttl=5.0)
+        client.config_get.return_value = {"notify-keyspace-events": ""}
+
+        assert cache.start() is False
+        client.config_set.assert_not_called()
+        client.pubsub.assert_not_called()
+
+        client, cache = self._cache(enable_notifications=True)
+        client.config_get.return_value = {"notify-keyspace-events": "Ex"}
+
+        assert cache.start() is True
+        client.config_set.assert_called_once_with("notify-keyspace-events", "AEKx")
+        client.pubsub.return_value.psubscribe.assert_called_once()
+        cache.stop()
+
+    def test_get_cache_is_shared_and_retried(self):
+        client = get_redis("harvester", host="10.0.0.4", port=7000)
+        keys = ("godbrain:dna", "godbrain:meta")
+        with patch.object(redis.Redis, "config_get", return_value={"notify-keyspace-events": ""}) as config_get:
+            first = get_cache(client, keys)
+            second = get_cache(get_redis("voltran", host="10.0.0.4", port=7000), keys)
+            assert first is second and not first.live
+            assert config_get.call_count == 1
+
+            first.started_at -= 31
+            get_cache(client, keys)
+            assert config_get.call_count == 2
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+GODBRAIN Sentinel Scan Tests
+Shared single-pass source index: one parse per changed file feeding every
+file scanner, the persisted (path, size, mtime) cache and the process pool.
+"""
+
+import os
+
+import pytest
+
+import sys
+from pathlib import Path
+ROOT = Path(__file__).parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from seraph.sentinel.sentinel import (
+    ConfigScanner, ImportScanner, InitScanner, SourceIndex, SyntaxScanner,
+)
+
+
+@pytest.fixture
+def tree(tmp_path):
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "__init__.py").write_text("")
+    (tmp_path / "pkg" / "good.py").write_text("import os\nfrom pkg import good\n")
+    (tmp_path / "pkg" / "broken.py").write_text("def f(:\n    pass\n")
+    (tmp_path / "pkg" / "bom.py").write_bytes(b"\xef\xbb\xbfx = 1\n")
+    (tmp_path / "pkg" / "sub").mkdir()
+    (tmp_path / "pkg" / "sub" / "mod.py").write_text("y = 2\n")
+    (tmp_path / "config.json").write_text('{"a": 1,}')
+    (tmp_path / "ok.json").write_text('{"a": 1}')
+    (tmp_path / "backups").mkdir()
+    (tmp_path / "backups" / "old.py").write_text("def broken(:\n")
+    return tmp_path
+
+
+def _scan(index):
+    issues = []
+    for scanner in (SyntaxScanner(), ImportScanner(), ConfigScanner(), InitScanner()):
+        issues.extend(scanner.scan_index(index))
+    return sorted((i.type.value, i.severity.value, i.file, i.line or 0, i.fixable) for i in issues)
+
+
+def _expected():
+    return sorted([
+        ("syntax_error", "critical", os.path.join("pkg", "broken.py"), 1, False),
+        ("syntax_error", "warning", os.path.join("pkg", "bom.py"), 1, True),
+        ("config_error", "error", "config.json", 1, False),
+        ("missing_init", "warning", os.path.join("pkg", "sub"), 0, True),
+    ])
+
+
+def test_single_pass_feeds_all_scanners(tree):
+    index = SourceIndex(tree).refresh()
+    assert index.parsed == 7                       # 5 .py outside backups/, 2 json
+    assert _scan(index) == _expected()
+    assert index.files[os.path.join("pkg", "good.py")]["imports"] == [["import", "os", 1], ["from", "pkg", 2]]
+
+    # Standalone scanner API still walks on its own
+    assert [i.file for i in SyntaxScanner().scan(tree)] == sorted(
+        [os.path.join("pkg", "bom.py"), os.path.join("pkg", "broken.py")])
+
+
+def test_unchanged_files_skipped_and_cache_persisted(tree):
+    cache = tree / "data" / "cache" / "sentinel" / "index.json"
+    index = SourceIndex(tree, cache_path=cache).refresh()
+    assert cache.exists()
+    assert index.refresh().parsed == 0             # the cache file itself isn't scanned
+    assert _scan(index) == _expected()
+
+    (tree / "pkg" / "broken.py").write_text("def f():\n    pass\n")
+    (tree / "ok.json").unlink()
+    index.refresh()
+    assert index.parsed == 1
+    assert "ok.json" not in index.files
+    assert not any(f == os.path.join("pkg", "broken.py") for _, _, f, _, _ in _scan(index))
+
+    restarted = SourceIndex(tree, cache_path=cache).refresh()
+    assert restarted.parsed == 0
+    assert _scan(restarted) == _scan(index)
+
+
+def test_parallel_parse_matches_inline(tree):
+    inline = SourceIndex(tree, workers=1).refresh()
+    pooled = SourceIndex(tree, workers=2, parallel_min=1).refresh()
+    assert pooled.files == inline.files
+    assert pooled.dirs == inline.dirs
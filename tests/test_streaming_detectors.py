@@ -0,0 +1,134 @@
+"""
+Tests for the incremental anomaly detectors (anomaly_hunter/streaming.py).
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from anomaly_hunter.streaming import (
+    AdaptiveHistogram,
+    Moments,
+    StreamingDetectorSet,
+    StreamingEntropyReversalDetector,
+    StreamingPhaseTransitionDetector,
+    WindowMoments,
+    replay,
+)
+
+
+def _history(n=20_000, seed=0):
+    """Level shift in f_stab, then both metrics settle into a tight skewed attractor."""
+    rng = np.random.default_rng(seed)
+    stab = rng.normal(0.5, 0.05, n)
+    stab[n // 2:] += 0.3
+    energy = rng.normal(1.0, 0.1, n)
+    energy[int(n * 0.75):] = rng.normal(1.2, 0.02, n - int(n * 0.75))
+    stab[int(n * 0.8):] = 1.0 + rng.exponential(0.05, n - int(n * 0.8))
+    return pd.DataFrame({"generation": np.arange(n), "f_stab": stab, "f_energy": energy})
+
+
+class TestOnlineStatistics:
+
+    def test_sliding_window_moments_match_numpy(self):
+        values = np.random.default_rng(1).gamma(2.0, 1.0, 5_000)
+        window = WindowMoments()
+        for n in range(100, 5_001, 137):
+            window.move(values, n - int(n * 0.3), n)
+            ref = values[n - int(n * 0.3):n]
+            assert window.moments.var() == pytest.approx(ref.var(ddof=1), rel=1e-9)
+            assert window.moments.skew() == pytest.approx(stats.skew(ref), rel=1e-7)
+
+    def test_moments_ignore_nan(self):
+        m = Moments.of(np.array([1.0, np.nan, 3.0]))
+        assert (m.n, m.mean) == (2, 2.0)
+
+    def test_adaptive_histogram_tracks_np_histogram(self):
+        data = np.random.default_rng(2).lognormal(0, 1, 20_000)
+        hist = AdaptiveHistogram()
+        for chunk in np.array_split(data, 17):
+            hist.add(chunk)
+
+        approx, edges = hist.coarse(30)
+        exact, exact_edges = np.histogram(data, bins=30)
+
+        assert np.allclose(edges, exact_edges)
+        assert approx.sum() == pytest.approx(len(data))
+        assert np.abs(approx - exact).max() < 0.01 * exact.max()
+
+
+class TestStreamingDetectors:
+
+    def test_replay_matches_batch_detectors(self):
+        report = replay(_history(), batch_size=997)
+
+        timing = report.pop("_timing")
+        assert timing["rows"] == 20_000 and timing["batches"] == 21
+        assert all(r["match"] for r in report.values()), report
+        for name in ("UniversalAttractorDetector", "SymmetryBreakingDetector", "EntropyReversalDetector"):
+            assert report[name]["streaming"] == report[name]["batch"] == 1
+
+    def test_update_reports_each_anomaly_once(self):
+        stream = StreamingDetectorSet()
+        raised = []
+        df = _history()
+        for lo in range(0, len(df), 500):
+            raised += stream.update(df.iloc[lo:lo + 500])
+
+        titles = [a.title for a in raised]
+        assert titles.count("Universal Attractor Detected!") == 1
+        assert stream.update(df.iloc[:0]) == []
+
+    def test_entropy_windows_are_computed_once(self):
+        det = StreamingEntropyReversalDetector(window=100)
+        df = _history(2_000)
+        det.update(df.iloc[:1_000])
+        first = list(det.entropies)
+        det.update(df.iloc[1_000:])
+        assert det.entropies[:len(first)] == first
+        assert len(det.entropies) == len(range(100, 2_000, 50))
+
+    def test_page_hinkley_finds_level_shift_only(self):
+        rng = np.random.default_rng(3)
+        flat = rng.normal(0, 1, 10_000)
+        shifted = flat.copy()
+        shifted[6_000:] += 2.0
+
+        for series, expected in ((flat, 0), (shifted, 1)):
+            det = StreamingPhaseTransitionDetector()
+            df = pd.DataFrame({"generation": np.arange(len(series)), "f_stab": series, "f_energy": 0.0})
+            for lo in range(0, len(df), 1_000):
+                det.update(df.iloc[lo:lo + 1_000])
+            found = [a for a in det.current() if a.raw_data["metric"] == "f_stab"]
+            assert len(found) == expected
+        assert abs(found[0].generation_range[0] + 50 - 6_000) < 50
+
+
+def test_hunter_scans_only_new_rows(tmp_path):
+    from anomaly_hunter import ContinuousLabInterface
+    from anomaly_hunter.hunter import AnomalyHunter
+    from anomaly_hunter.vault_index import GenomeVaultIndex
+
+    vault = tmp_path / "vault"
+    vault.mkdir()
+    hunter = AnomalyHunter.__new__(AnomalyHunter)
+    hunter.lab = ContinuousLabInterface.__new__(ContinuousLabInterface)
+    hunter.lab.index = GenomeVaultIndex(vault)
+    hunter.discoveries_dir = tmp_path / "discoveries"
+    hunter.discoveries_dir.mkdir()
+    hunter.anomalies, hunter.scan_count = [], 0
+    hunter.stream, hunter._cursor = StreamingDetectorSet(), (0, 0, 0, 0)
+
+    df = _history(4_000)
+    log = vault / "evolution_log.jsonl"
+    for lo in (0, 3_000):
+        with open(log, "a") as f:
+            for row in df.iloc[lo:lo + 3_000].itertuples():
+                f.write(json.dumps({"generation": row.generation, "f_stab": row.f_stab, "f_energy": row.f_energy}) + "\n")
+        hunter.scan_incremental()
+
+    assert hunter.stream.history.n == 4_000
+    assert hunter.scan_incremental() == []
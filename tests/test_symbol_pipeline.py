@@ -0,0 +1,159 @@
+"""
+Tests for the concurrent per-symbol pipeline (engines/symbol_pipeline.py).
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from engines.symbol_pipeline import PipelineConfig, SymbolPipeline
+from execution.executor import call_exchange
+from ultimate_pack.feeds.candle_store import CandleRing, CandleStore
+
+
+LATENCY = 0.1
+SYMBOLS = [f"COIN{i}/USDT:USDT" for i in range(20)]
+
+
+class SlowAsyncExchange:
+    """ccxt.async_support-like client where every request takes LATENCY."""
+
+    def __init__(self, stuck=()):
+        self.stuck = set(stuck)
+        self.calls = []
+
+    async def fetch_balance(self):
+        await asyncio.sleep(LATENCY)
+        return {"total": {"USDT": 2000.0}, "free": {"USDT": 500.0}}
+
+    async def fetch_tickers(self, symbols):
+        await asyncio.sleep(LATENCY)
+        return {s: {"last": 1.5} for s in symbols}
+
+    async def fetch_ohlcv(self, symbol, timeframe, since=None, limit=100):
+        self.calls.append((symbol, since, limit))
+        await asyncio.sleep(60 if symbol in self.stuck else LATENCY)
+        first = 0 if since is None else since // 3600_000
+        return [[i * 3600_000, 1.0, 1.1, 0.9, 1.0, 10.0] for i in range(first, first + limit)]
+
+
+class BuyEverything:
+    async def run_symbol_cycle(self, symbol, equity_usd, per_coin_equity, ohlcv, **kwargs):
+        await asyncio.sleep(LATENCY)
+        return {"type": "execute", "raw_action": "BUY", "size_usd": per_coin_equity, "rows": len(ohlcv)}
+
+
+class RecordingExecutor:
+    def __init__(self):
+        self.trades = []
+
+    async def execute_trade(self, symbol, action, size_usd, price=None):
+        self.trades.append((symbol, action, size_usd, price))
+        return {"status": "simulated"}
+
+
+def _pipeline(exchange, executor, candles=None, **config):
+    return SymbolPipeline(
+        exchange, BuyEverything(), executor,
+        signal_filters={s: None for s in SYMBOLS},
+        config=PipelineConfig(**config),
+        candles=candles,
+    )
+
+
+class TestSymbolPipeline:
+
+    def test_twenty_pairs_run_concurrently(self):
+        executor = RecordingExecutor()
+        pipeline = _pipeline(SlowAsyncExchange(), executor)
+
+        report = asyncio.run(pipeline.run_cycle(SYMBOLS, 1.0, 50.0))
+
+        # Sequential would be 20 * (fetch + decide) = 4s
+        assert report.stages["total"] < 1.0
+        assert report.equity_usd == 2000.0
+        assert report.per_coin_equity == pytest.approx(100.0)
+        assert len(executor.trades) == 20
+        assert executor.trades[0] == (SYMBOLS[0], "BUY", pytest.approx(100.0), 1.5)
+        assert set(report.stages) == {"fetch", "decide", "execute", "total"}
+        assert "fetch" in report.symbols[SYMBOLS[0]]
+
+    def test_slow_symbol_times_out_alone(self):
+        exchange = SlowAsyncExchange(stuck={SYMBOLS[3]})
+        executor = RecordingExecutor()
+        pipeline = _pipeline(exchange, executor, fetch_timeout=0.3)
+
+        report = asyncio.run(pipeline.run_cycle(SYMBOLS, 1.0, 50.0))
+
+        assert "timeout" in report.errors[SYMBOLS[3]]
+        assert SYMBOLS[3] not in report.decisions
+        assert len(executor.trades) == 19
+        assert report.stages["total"] < 1.5
+
+    def test_candle_store_fetches_only_new_bars(self):
+        exchange = SlowAsyncExchange()
+        # One bar after the last stored one, so the window stays at catchup_limit
+        candles = CandleStore(capacity=100, catchup_limit=3, clock=lambda: 100 * 3600)
+        pipeline = _pipeline(exchange, RecordingExecutor(), candles=candles)
+
+        asyncio.run(pipeline.run_cycle(SYMBOLS[:2], 1.0, 50.0))
+        exchange.calls.clear()
+        report = asyncio.run(pipeline.run_cycle(SYMBOLS[:2], 1.0, 50.0))
+
+        assert exchange.calls == [(s, 99 * 3600_000, 3) for s in SYMBOLS[:2]]
+        ring = candles.ring(SYMBOLS[0])
+        assert isinstance(ring, CandleRing)
+        assert len(ring) == 100
+        assert ring.last_timestamp == 101 * 3600_000
+        assert report.decisions[SYMBOLS[0]]["rows"] == 100
+
+    def test_balance_and_tickers_errors_kept_apart(self):
+        class DownAccount(SlowAsyncExchange):
+            async def fetch_balance(self):
+                raise RuntimeError("balance down")
+
+            async def fetch_tickers(self, symbols):
+                raise RuntimeError("tickers down")
+
+        report = asyncio.run(_pipeline(DownAccount(), RecordingExecutor()).run_cycle(SYMBOLS[:2], 1.0, 50.0))
+
+        assert "balance down" in report.errors["_balance"]
+        assert "tickers down" in report.errors["_tickers"]
+
+    def test_slow_order_placement_is_not_cancelled(self):
+        class SlowExecutor(RecordingExecutor):
+            async def execute_trade(self, symbol, action, size_usd, price=None):
+                await asyncio.sleep(0.3)
+                return await super().execute_trade(symbol, action, size_usd, price)
+
+        executor = SlowExecutor()
+        pipeline = _pipeline(SlowAsyncExchange(), executor, fetch_timeout=0.2, decision_timeout=0.2)
+
+        report = asyncio.run(pipeline.run_cycle(SYMBOLS[:1], 1.0, 50.0))
+
+        assert report.orders[SYMBOLS[0]] == {"status": "simulated"}
+        assert len(executor.trades) == 1 and not report.errors
+
+    def test_no_exchange_uses_fallback_equity(self):
+        pipeline = _pipeline(None, RecordingExecutor())
+
+        report = asyncio.run(pipeline.run_cycle(SYMBOLS, 1.0, 50.0))
+
+        assert report.equity_usd == 1000.0
+        assert report.decisions == {}
+
+
+class TestCallExchange:
+
+    def test_sync_method_runs_off_the_event_loop(self):
+        def blocking_fetch(symbol):
+            time.sleep(LATENCY)
+            return symbol
+
+        async def fan_out():
+            return await asyncio.gather(*[call_exchange(blocking_fetch, s) for s in SYMBOLS[:5]])
+
+        start = time.perf_counter()
+        assert asyncio.run(fan_out()) == SYMBOLS[:5]
+        assert time.perf_counter() - start < 5 * LATENCY
@@ -0,0 +1,160 @@
+"""
+Tests for the rolling VPIN accumulator and the streaming order-flow engine
+(ultimate_pack/orderflow/tick_engine.py).
+"""
+
+import asyncio
+from collections import deque
+from unittest.mock import AsyncMock
+
+import numpy as np
+import pytest
+
+from ultimate_pack.feeds.ticks import TICK_DTYPE, okx_inst_id, save_ticks
+from ultimate_pack.orderflow.tick_engine import TickEngine
+from ultimate_pack.orderflow.vpin_analyzer import VPINAnalyzer
+from ultimate_pack.ultimate_connector import UltimateConnector
+
+
+BUCKET = 20_000
+WINDOW = 20
+
+
+def _trades(n, seed=0):
+    rng = np.random.default_rng(seed)
+    prices = 100 + np.cumsum(rng.normal(0, 0.01, n))
+    sizes = rng.exponential(5, n)
+    sides = np.where(rng.random(n) < 0.55, 1, -1).astype(np.int8)
+    return prices, sizes, sides
+
+
+def _reference(prices, sizes, sides):
+    """The original list-based VPIN: re-sums the window on every bucket."""
+    buy = sell = 0.0
+    buckets = deque(maxlen=WINDOW * 2)
+    history = deque(maxlen=500)
+    out = []
+    for p, s, d in zip(prices, sizes, sides):
+        if d > 0: buy += p * s
+        else: sell += p * s
+        if buy + sell >= BUCKET:
+            buckets.append((buy, sell))
+            buy = sell = 0.0
+            if len(buckets) >= WINDOW:
+                recent = list(buckets)[-WINDOW:]
+                vpin = sum(abs(b - s_) for b, s_ in recent) / (WINDOW * BUCKET)
+                history.append(vpin)
+                z = 0
+                if len(history) > 30:
+                    arr = np.array(history)
+                    z = (vpin - arr.mean()) / (arr.std() + 1e-6)
+                direction = "BUYING" if sum(b for b, _ in buckets) > sum(s_ for _, s_ in buckets) else "SELLING"
+                out.append((vpin, z, direction))
+    return out
+
+
+class TestVPINAnalyzer:
+
+    def test_batches_match_reference(self):
+        prices, sizes, sides = _trades(100_000)
+        expected = _reference(prices, sizes, sides)
+
+        vpin = VPINAnalyzer(BUCKET, WINDOW)
+        signals = []
+        for lo in range(0, len(prices), 7_777):
+            signals += vpin.process_batch(prices[lo:lo + 7_777], sizes[lo:lo + 7_777], sides[lo:lo + 7_777])
+
+        assert len(expected) > 600                       # history ring wraps
+        assert len(signals) == len(expected)
+        for sig, (value, z, direction) in zip(signals, expected):
+            assert sig.vpin_value == pytest.approx(value, rel=1e-9)
+            assert sig.vpin_zscore == pytest.approx(z, rel=1e-6, abs=1e-6)
+            assert sig.informed_direction == direction
+
+    def test_tick_by_tick_matches_batch(self):
+        prices, sizes, sides = _trades(20_000, seed=1)
+        by_tick = VPINAnalyzer(BUCKET, WINDOW)
+        ticks = [by_tick.process_tick(p, s, "buy" if d > 0 else "sell") for p, s, d in zip(prices, sizes, sides)]
+        batch = VPINAnalyzer(BUCKET, WINDOW).process_batch(prices, sizes, sides)
+
+        values = [t.vpin_value for t in ticks if t]
+        assert values == pytest.approx([s.vpin_value for s in batch], rel=1e-9)
+
+
+class TestTickEngine:
+
+    def test_routes_instruments_and_pushes_to_subscribers(self):
+        n = 60_000
+        prices, sizes, sides = _trades(n, seed=2)
+        ticks = np.zeros(n, TICK_DTYPE)
+        ticks["ts_ns"] = np.arange(n) * 1_000_000
+        ticks["price"], ticks["size"], ticks["side"] = prices, sizes, sides
+        ticks["inst"] = np.arange(n) % 2
+        names = ["BTC-USDT-SWAP", "ETH-USDT-SWAP"]
+
+        engine = TickEngine(BUCKET, WINDOW)
+        pushed = []
+        engine.register_callback(lambda inst, sig: pushed.append(inst))
+
+        async def consume():
+            queue = engine.subscribe(maxsize=10_000)
+            out = engine.process(ticks, names)
+            return out, queue.qsize()
+
+        out, queued = asyncio.run(consume())
+
+        btc = VPINAnalyzer(BUCKET, WINDOW).process_batch(prices[0::2], sizes[0::2], sides[0::2])
+        assert [s.vpin_value for i, s in out if i == names[0]] == pytest.approx([s.vpin_value for s in btc])
+        assert len(pushed) == queued == len(out)
+        assert engine.latest(okx_inst_id("ETH/USDT:USDT")) is out[-1][1]
+        assert engine.ticks_processed == n
+
+    def test_contract_sizes_scaled_to_base_units(self):
+        prices, sizes, sides = _trades(50_000, seed=5)
+        engine = TickEngine(BUCKET, WINDOW, contract_values={"ETH-USDT-SWAP": 0.1})
+
+        contracts = engine.on_trades("ETH-USDT-SWAP", prices, sizes * 10, sides)
+        base = VPINAnalyzer(BUCKET, WINDOW).process_batch(prices, sizes, sides)
+
+        assert len(contracts) == len(base) > 0
+        assert [s.vpin_value for s in contracts] == pytest.approx([s.vpin_value for s in base])
+
+    def test_data_hub_loads_contract_values_before_feeds(self):
+        connector = UltimateConnector(["ETH/USDT:USDT"])
+        hub = connector.data_hub
+        hub.tick_feed.fetch_contract_values = AsyncMock(return_value={"ETH-USDT-SWAP": 0.1})
+
+        asyncio.run(hub.load_contract_values())
+
+        assert hub.order_flow.contract_values == {"ETH-USDT-SWAP": 0.1}
+
+    def test_replay_recorded_file(self, tmp_path):
+        n = 200_000
+        prices, sizes, sides = _trades(n, seed=3)
+        ticks = np.zeros(n, TICK_DTYPE)
+        ticks["price"], ticks["size"], ticks["side"] = prices, sizes, sides
+        path = tmp_path / "ticks.npz"
+        save_ticks(str(path), ticks, ["BTC-USDT-SWAP"])
+
+        stats = TickEngine().replay(str(path))
+
+        assert stats["ticks"] == n
+        assert stats["signals"] == len(VPINAnalyzer().process_batch(prices, sizes, sides)) > 0
+        assert stats["ticks_per_sec"] > 1_000_000
+
+    def test_connector_consumes_stream_for_every_pair(self):
+        connector = UltimateConnector(["BTC/USDT:USDT", "ETH/USDT:USDT"])
+        assert connector.data_hub.tick_feed.symbols == ["BTC-USDT-SWAP", "ETH-USDT-SWAP"]
+
+        async def run():
+            connector.data_hub.start_all_feeds = AsyncMock()     # no network
+            await connector.initialize()
+            prices, sizes, sides = _trades(100_000, seed=4)
+            out = connector.data_hub.order_flow.on_trades("ETH-USDT-SWAP", prices, sizes, sides)
+            await asyncio.sleep(0)
+            connector._vpin_task.cancel()
+            return out
+
+        out = asyncio.run(run())
+
+        assert out and connector.vpin_signals == {"ETH-USDT-SWAP": out[-1]}
@@ -0,0 +1,105 @@
+"""
+Tests for the compact tick ring, the OKX trades decoder and OKXTickFeed
+(ultimate_pack/feeds/ticks.py, ultimate_pack/feeds/data_feeds.py).
+"""
+
+import json
+
+import numpy as np
+
+from ultimate_pack.feeds.data_feeds import OKXTickFeed
+from ultimate_pack.feeds.ticks import BUY, SELL, TICK_DTYPE, OKXTradeDecoder, TickRing, benchmark
+
+
+def _ticks(start, n):
+    ticks = np.zeros(n, TICK_DTYPE)
+    ticks["ts_ns"] = np.arange(start, start + n)
+    ticks["price"] = 100.0 + ticks["ts_ns"]
+    return ticks
+
+
+def _message(inst, trades):
+    return json.dumps({
+        "arg": {"channel": "trades", "instId": inst},
+        "data": [
+            {"instId": inst, "tradeId": str(i), "px": px, "sz": sz, "side": side, "ts": str(1_700_000_000_000 + i)}
+            for i, (px, sz, side) in enumerate(trades)
+        ],
+    })
+
+
+class TestTickRing:
+
+    def test_recent_is_contiguous_view_across_wrap(self):
+        ring = TickRing(capacity=10)
+        for start in range(0, 37, 3):
+            ring.append(_ticks(start, 3))
+
+        recent = ring.recent(8)
+
+        assert len(ring) == 10 and ring.total == 39
+        assert list(recent["ts_ns"]) == list(range(31, 39))
+        assert np.shares_memory(recent, ring._buf)
+        assert not recent.flags.writeable
+        assert list(ring.recent()["ts_ns"]) == list(range(29, 39))
+
+    def test_oversized_batch_keeps_latest(self):
+        ring = TickRing(capacity=4)
+        ring.append(_ticks(0, 2))
+        ring.append(_ticks(2, 9))
+
+        assert list(ring.recent(10)["ts_ns"]) == [7, 8, 9, 10]
+
+
+class TestOKXTradeDecoder:
+
+    def test_decodes_trades_from_bytes_and_str(self):
+        decoder = OKXTradeDecoder()
+        raw = _message("ETH-USDT-SWAP", [("3500.5", "0.2", "buy"), ("3500.1", "1.5", "sell")])
+
+        for payload in (raw, raw.encode()):
+            ticks = decoder.decode(payload)
+            assert ticks.dtype == TICK_DTYPE
+            assert list(ticks["price"]) == [3500.5, 3500.1]
+            assert list(ticks["size"]) == [0.2, 1.5]
+            assert list(ticks["side"]) == [BUY, SELL]
+            assert ticks["ts_ns"][1] == (1_700_000_000_000 + 1) * 1_000_000
+            assert decoder.instruments.name(int(ticks["inst"][0])) == "ETH-USDT-SWAP"
+
+    def test_ignores_non_trade_messages(self):
+        decoder = OKXTradeDecoder()
+        assert decoder.decode('{"event":"subscribe","arg":{"channel":"trades","instId":"BTC-USDT-SWAP"}}') is None
+        assert decoder.decode('{"arg":{"channel":"tickers"},"data":[{"last":"1"}]}') is None
+
+
+class TestOKXTickFeed:
+
+    def test_single_subscribe_and_routing(self):
+        feed = OKXTickFeed(["BTC/USDT:USDT", "ETH-USDT-SWAP"])
+        seen = []
+        feed.callbacks.append(lambda inst, px, sz, side, ts: seen.append((inst, list(px))))
+
+        sub = json.loads(feed.subscribe_message())
+        feed.on_message(_message("BTC-USDT-SWAP", [("43000", "1", "buy")]))
+        feed.on_message(_message("ETH-USDT-SWAP", [("3500", "2", "sell"), ("3501", "1", "buy")]))
+
+        assert [a["instId"] for a in sub["args"]] == ["BTC-USDT-SWAP", "ETH-USDT-SWAP"]
+        assert seen == [("BTC-USDT-SWAP", [43000.0]), ("ETH-USDT-SWAP", [3500.0, 3501.0])]
+        recent = feed.get_recent_ticks(2)
+        assert list(recent["inst"]) == [1, 1]
+        assert np.shares_memory(recent, feed.tick_buffer._buf)
+
+
+def test_benchmark_reports_throughput(tmp_path):
+    path = tmp_path / "messages.jsonl"
+    lines = [_message("BTC-USDT-SWAP", [("43000.1", "0.5", "buy")] * 4) for _ in range(200)]
+    lines.insert(0, '{"event":"subscribe"}')
+    path.write_text("\n".join(lines) + "\n")
+
+    stats = benchmark(str(path))
+
+    assert stats["messages"] == 201
+    assert stats["ticks"] == 800
+    assert stats["stored_bytes_per_tick"] == TICK_DTYPE.itemsize == 27
+    assert stats["wire_bytes_per_tick"] > stats["stored_bytes_per_tick"]
+    assert stats["messages_per_sec"] > 0
@@ -0,0 +1,125 @@
+"""
+Tests for the incremental genome vault index (anomaly_hunter/vault_index.py).
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from anomaly_hunter.vault_index import GenomeVaultIndex
+
+
+def _log(vault, gens, partial=None):
+    with open(vault / "evolution_log.jsonl", "a", encoding="utf-8") as f:
+        for g in gens:
+            f.write(json.dumps({"generation": g, "f_stab": g / 10, "f_energy": -g,
+                                "lineage_depth": g % 7, "alive": g % 2 == 0,
+                                "timestamp": "2025-01-01T00:00:00"}) + "\n")
+        if partial:
+            f.write(partial)
+
+
+def _genome(vault, name, gen):
+    (vault / f"genome_{name}.json").write_text(
+        json.dumps({"generation": gen, "fitness": {"f_stab": 0.5, "f_energy": 1.5}}), encoding="utf-8")
+
+
+@pytest.fixture
+def vault(tmp_path):
+    path = tmp_path / "vault"
+    path.mkdir()
+    return path
+
+
+def _reference(vault):
+    """The original full rescan of log + genome files."""
+    rows = []
+    for line in (vault / "evolution_log.jsonl").read_text().splitlines():
+        g = json.loads(line)
+        rows.append((g["generation"], g["f_stab"], g["f_energy"], g["lineage_depth"]))
+    for f in vault.glob("genome_*.json"):
+        g = json.loads(f.read_text())
+        rows.append((g["generation"], g["fitness"]["f_stab"], g["fitness"]["f_energy"], 0))
+    return sorted(rows)
+
+
+class TestGenomeVaultIndex:
+
+    def test_incremental_refresh_matches_full_scan(self, vault):
+        index = GenomeVaultIndex(vault)
+        _log(vault, range(100), partial='{"generation": 100, "f_st')
+        _genome(vault, "a", 5)
+        assert index.refresh() == 101
+
+        with open(vault / "evolution_log.jsonl", "a") as f:
+            f.write('ab": 10.0, "f_energy": -100, "lineage_depth": 2}\n')
+        _log(vault, range(101, 150))
+        _genome(vault, "b", 120)
+        assert index.refresh() == 51
+        assert index.refresh() == 0
+
+        df = index.metrics_frame()
+        got = sorted(zip(df["generation"], df["f_stab"], df["f_energy"], df["lineage_depth"]))
+        assert got == pytest.approx(_reference(vault))
+        assert df["generation"].is_monotonic_increasing
+        assert df["alive"].dtype == bool and not np.isnan(df["timestamp"].iloc[0])
+
+    def test_reopen_resumes_from_saved_state(self, vault):
+        _log(vault, range(10))
+        _genome(vault, "a", 3)
+        GenomeVaultIndex(vault).refresh()
+
+        _log(vault, range(10, 15))
+        reopened = GenomeVaultIndex(vault)
+        assert reopened.refresh() == 5
+        assert len(reopened.metrics_frame()) == 16
+
+    def test_genome_range_is_index_seek(self, vault):
+        for i, gen in enumerate([30, 10, 20, 10, 40]):
+            _genome(vault, f"g{i}", gen)
+        index = GenomeVaultIndex(vault)
+        index.refresh()
+
+        assert [p.name for p in index.genome_files(10, 20)] == ["genome_g1.json", "genome_g3.json", "genome_g2.json"]
+        assert index.genome_files(41, 50) == []
+
+    def test_truncated_log_is_reindexed(self, vault):
+        index = GenomeVaultIndex(vault)
+        _log(vault, range(20))
+        index.refresh()
+        (vault / "evolution_log.jsonl").unlink()
+        _log(vault, range(3))
+        index.refresh()
+        assert list(index.metrics_frame()["generation"]) == [0, 1, 2]
+
+    def test_rotated_log_longer_than_cursor_is_returned_whole(self, vault):
+        index = GenomeVaultIndex(vault)
+        with open(vault / "evolution_log.jsonl", "w") as f:
+            for g in range(10):
+                f.write(json.dumps({"generation": g, "note": "x" * 200}) + "\n")
+        index.refresh()
+        _, cursor = index.metrics_since()
+
+        (vault / "evolution_log.jsonl").unlink()
+        _log(vault, range(100, 115))            # more rows, fewer bytes than before
+        index.refresh()
+        df, cursor = index.metrics_since(cursor)
+
+        assert list(df["generation"]) == list(range(100, 115))
+        assert index.metrics_since(cursor)[0].empty
+
+
+def test_lab_interface_uses_index(vault, monkeypatch):
+    from anomaly_hunter import ContinuousLabInterface
+
+    lab = ContinuousLabInterface()
+    lab.vault_path = vault
+    lab.index = GenomeVaultIndex(vault)
+    _log(vault, range(5))
+    _genome(vault, "x", 2)
+    _genome(vault, "y", 9)
+
+    assert isinstance(lab.get_all_metrics(), pd.DataFrame) and len(lab.get_all_metrics()) == 7
+    assert [g["generation"] for g in lab.get_genomes_range(0, 5)] == [2]
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+═══════════════════════════════════════════════════════════════════════════════
+GODBRAIN Walk-Forward Tests
+Serial vs process-pool grid search and successive halving.
+═══════════════════════════════════════════════════════════════════════════════
+"""
+
+import asyncio
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import sys
+from pathlib import Path
+ROOT = Path(__file__).parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from backtesting.engine import BacktestConfig, BacktestContext, Strategy
+from backtesting import walk_forward
+from backtesting.walk_forward import WalkForwardConfig, WalkForwardOptimizer
+
+
+class BreakoutStrategy(Strategy):
+    """Parametrised breakout strategy for grid search."""
+    
+    def __init__(self, lookback: int = 5, threshold: float = 0.01):
+        self.lookback = lookback
+        self.threshold = threshold
+    
+    def init(self, context: BacktestContext) -> None:
+        self.symbols = list(context.data.keys())
+    
+    def next(self, context: BacktestContext) -> Optional[List[Dict]]:
+        signals = []
+        for symbol in self.symbols:
+            df = context.get_ohlcv(symbol, lookback=self.lookback)
+            if len(df) <= self.lookback:
+                continue
+            change = df['close'].iloc[-1] / df['close'].iloc[0] - 1
+            if symbol in context.positions:
+                if abs(change) < self.threshold / 4:
+                    signals.append({'action': 'CLOSE', 'symbol': symbol})
+            elif change > self.threshold:
+                signals.append({'action': 'BUY', 'symbol': symbol, 'size': 0.1})
+            elif change < -self.threshold:
+                signals.append({'action': 'SELL', 'symbol': symbol, 'size': 0.1})
+        return signals or None
+
+
+def _data(make_ohlcv_frames):
+    return make_ohlcv_frames(
+        ["BTC/USDT", "ETH/USDT"], n=24 * 40, seed=3, volatility=0.008, open_noise=0, spread=0.004
+    )
+
+
+def _optimize(data, **overrides):
+    config = WalkForwardConfig(
+        parameter_grid={'lookback': [3, 5, 8], 'threshold': [0.005, 0.01, 0.02]},
+        min_trades=5,
+        **overrides
+    )
+    optimizer = WalkForwardOptimizer(config)
+    base = BacktestConfig(start_date=datetime(2024, 1, 1), end_date=datetime(2024, 2, 1))
+    return asyncio.run(optimizer._optimize_in_sample(
+        BreakoutStrategy, data, datetime(2024, 1, 1), datetime(2024, 1, 30), base
+    ))
+
+
+class TestWindowFiles:
+    """Workers must see the same frames as the serial path."""
+    
+    @pytest.mark.parametrize("tz", [None, "UTC", "Europe/Istanbul"])
+    def test_round_trip_keeps_index_and_timezone(self, tz, make_ohlcv_frames, tmp_path):
+        data = _data(make_ohlcv_frames)
+        if tz:
+            data = {s: df.tz_localize("UTC").tz_convert(tz) for s, df in data.items()}
+        walk_forward._WORKER_DATA.clear()
+        
+        walk_forward._write_window(data, tmp_path)
+        loaded = walk_forward._load_window(str(tmp_path))
+        
+        assert list(loaded) == list(data)
+        for symbol, df in data.items():
+            pd.testing.assert_index_equal(loaded[symbol].index, df.index, exact=False)
+            assert str(loaded[symbol].index.tz) == str(df.index.tz)
+            np.testing.assert_array_equal(loaded[symbol].to_numpy(), df[loaded[symbol].columns].to_numpy())
+
+
+class TestParallelGridSearch:
+    """Pool mode must pick the same parameters as the serial search."""
+    
+    @pytest.mark.slow
+    def test_pool_matches_serial(self, make_ohlcv_frames):
+        data = _data(make_ohlcv_frames)
+        serial = _optimize(data)
+        pooled = _optimize(data, n_workers=3)
+        
+        assert serial[0]
+        assert serial == pooled
+    
+    @pytest.mark.slow
+    def test_halving_deterministic_across_workers(self, make_ohlcv_frames):
+        data = _data(make_ohlcv_frames)
+        serial = _optimize(data, halving_rounds=1)
+        pooled = _optimize(data, halving_rounds=1, n_workers=2)
+        
+        assert serial == pooled
+    
+    @pytest.mark.slow
+    def test_run_builds_one_pool_for_all_windows(self, make_ohlcv_frames):
+        config = WalkForwardConfig(
+            in_sample_days=10, out_sample_days=5, step_days=5,
+            parameter_grid={'lookback': [3, 5], 'threshold': [0.005, 0.01]},
+            min_trades=1, n_workers=2,
+        )
+        base = BacktestConfig(start_date=datetime(2024, 1, 1), end_date=datetime(2024, 2, 10))
+        
+        made, mkdtemp = [], tempfile.mkdtemp
+        
+        def record_mkdtemp(**kwargs):
+            made.append(mkdtemp(**kwargs))
+            return made[-1]
+        
+        with patch.object(walk_forward, "ProcessPoolExecutor", wraps=ProcessPoolExecutor) as pools, \
+                patch.object(walk_forward.tempfile, "mkdtemp", side_effect=record_mkdtemp):
+            result = asyncio.run(WalkForwardOptimizer(config).run(
+                BreakoutStrategy, _data(make_ohlcv_frames), base
+            ))
+        
+        assert len(result.windows) > 1
+        assert pools.call_count == 1 and len(made) == 1
+        assert not Path(made[0]).exists()
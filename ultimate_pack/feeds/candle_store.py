@@ -0,0 +1,213 @@
+"""
+Per-symbol OHLCV ring buffers with incremental indicators.
+
+Instead of refetching the last 100 candles every cycle and recomputing
+every rolling indicator, each symbol keeps a fixed-size NumPy ring.
+Only new or updated bars are fetched (``since=`` the last stored bar,
+with a limit large enough to cover the gap since then).
+Indicators are computed once per bar as it arrives; only the still-open
+last bar is recomputed when the exchange updates it.
+
+Indicators match RegimeDetector's pandas definitions:
+    returns     close.pct_change()
+    volatility  returns.rolling(20).std()
+    sma_50      close.rolling(50).mean()
+    rsi         14-bar rolling-mean RSI
+    atr         (high - low).rolling(14).mean()
+"""
+
+import math
+import time
+from typing import Callable, Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = ('timestamp', 'open', 'high', 'low', 'close', 'vol')
+INDICATORS = ('returns', 'volatility', 'sma_50', 'rsi', 'atr')
+
+VOL_WINDOW = 20
+SMA_WINDOW = 50
+RSI_WINDOW = 14
+ATR_WINDOW = 14
+_TAIL = SMA_WINDOW + 1   # bars needed to compute every indicator of one bar
+
+_TIMEFRAME_MS = {'m': 60_000, 'h': 3_600_000, 'd': 86_400_000}
+
+
+def timeframe_ms(timeframe: str) -> int:
+    """ccxt timeframe ('1m', '4h', '1d') in milliseconds."""
+    return int(timeframe[:-1]) * _TIMEFRAME_MS[timeframe[-1]]
+
+
+class CandleRing:
+    """Fixed-capacity OHLCV ring for one symbol plus per-bar indicator values."""
+
+    def __init__(self, capacity: int = 100):
+        if capacity < _TAIL:
+            raise ValueError(f"capacity must be at least {_TAIL}")
+        self.capacity = capacity
+        self._bars = np.full((capacity, len(COLUMNS)), np.nan)
+        self._ind = np.full((capacity, len(INDICATORS)), np.nan)
+        self._head = 0          # next write slot
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def last_timestamp(self) -> Optional[int]:
+        if not self._size:
+            return None
+        return int(self._bars[(self._head - 1) % self.capacity, 0])
+
+    def _order(self, n: Optional[int] = None) -> np.ndarray:
+        """Ring slots of the last n bars, oldest first."""
+        n = self._size if n is None else min(n, self._size)
+        return (self._head - n + np.arange(n)) % self.capacity
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def update(self, rows: Iterable[Sequence[float]]) -> int:
+        """
+        Merge ccxt OHLCV rows. Returns the number of new bars.
+
+        A row with the last stored timestamp replaces that bar (the open
+        candle moved); older rows are ignored.
+        """
+        added = 0
+        for row in sorted(rows, key=lambda r: r[0]):
+            values = np.asarray(row[:len(COLUMNS)], dtype=np.float64)
+            if np.isnan(values).any():
+                continue
+            last = self.last_timestamp
+            if last is not None and values[0] < last:
+                continue
+            if last is not None and values[0] == last:
+                slot = (self._head - 1) % self.capacity
+            else:
+                slot = self._head
+                self._head = (self._head + 1) % self.capacity
+                self._size = min(self._size + 1, self.capacity)
+                added += 1
+            self._bars[slot] = values
+            self._ind[slot] = self._indicators_of_last()
+        return added
+
+    def _indicators_of_last(self) -> np.ndarray:
+        """Indicator values of the newest bar from the bars before it."""
+        slots = self._order(_TAIL)
+        bars = self._bars[slots]
+        close = bars[:, 4]
+        n = len(close)
+        out = np.full(len(INDICATORS), np.nan)
+
+        if n > 1:
+            out[0] = close[-1] / close[-2] - 1
+
+        # Volatility: 20 returns, all defined
+        rets = self._ind[slots, 0][-VOL_WINDOW:].copy()
+        rets[-1] = out[0]
+        if len(rets) == VOL_WINDOW and not np.isnan(rets).any():
+            out[1] = rets.std(ddof=1)
+
+        if n >= SMA_WINDOW:
+            out[2] = close[-SMA_WINDOW:].mean()
+
+        # RSI. The ring only holds fewer than 15 bars before it has ever
+        # been filled, so a short window starts at the first bar, whose
+        # undefined diff pandas' .where() counts as 0.
+        if n >= RSI_WINDOW:
+            delta = np.diff(close[-(RSI_WINDOW + 1):])
+            if len(delta) < RSI_WINDOW:
+                delta = np.concatenate(([0.0], delta))
+            gain = np.where(delta > 0, delta, 0).mean()
+            loss = np.where(delta < 0, -delta, 0).mean()
+            with np.errstate(divide='ignore', invalid='ignore'):
+                out[3] = 100 - (100 / (1 + gain / loss))
+
+        if n >= ATR_WINDOW:
+            out[4] = (bars[-ATR_WINDOW:, 2] - bars[-ATR_WINDOW:, 3]).mean()
+        return out
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def column(self, name: str) -> np.ndarray:
+        """One OHLCV column or indicator, oldest bar first."""
+        slots = self._order()
+        if name in COLUMNS:
+            return self._bars[slots, COLUMNS.index(name)]
+        return self._ind[slots, INDICATORS.index(name)]
+
+    def latest(self) -> Dict[str, float]:
+        """
+        Newest bar's close and indicators plus the mean volatility of the
+        ring (NaN where not yet defined).
+        """
+        if not self._size:
+            return {}
+        slot = (self._head - 1) % self.capacity
+        values = {name: float(self._ind[slot, i]) for i, name in enumerate(INDICATORS)}
+        values['close'] = float(self._bars[slot, 4])
+        vol = self._ind[self._order(), 1]
+        values['mean_volatility'] = float(np.nanmean(vol)) if (~np.isnan(vol)).any() else float('nan')
+        return values
+
+    def to_frame(self) -> pd.DataFrame:
+        """Bars as the DataFrame agg.py used to build from fetch_ohlcv."""
+        return pd.DataFrame(self._bars[self._order()], columns=list(COLUMNS))
+
+
+class CandleStore:
+    """
+    CandleRing per symbol, plus the fetch window each one needs next.
+
+    Usage:
+        store = CandleStore(capacity=100)
+        since, limit = store.fetch_window("TIA/USDT:USDT", "1h")
+        rows = await exchange.fetch_ohlcv(symbol, "1h", since=since, limit=limit)
+        ring = store.update("TIA/USDT:USDT", rows)
+    """
+
+    def __init__(
+        self,
+        capacity: int = 100,
+        catchup_limit: int = 10,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.capacity = capacity
+        self.catchup_limit = catchup_limit
+        self.clock = clock      # seconds; inject a fixed clock in tests
+        self.rings: Dict[str, CandleRing] = {}
+
+    def ring(self, symbol: str) -> CandleRing:
+        if symbol not in self.rings:
+            self.rings[symbol] = CandleRing(self.capacity)
+        return self.rings[symbol]
+
+    def fetch_window(self, symbol: str, timeframe: str = "1h") -> Tuple[Optional[int], int]:
+        """
+        (since, limit): full history first, then only bars from the last
+        one on. The limit covers every bar since the last stored one (at
+        least ``catchup_limit``), so a ring that fell behind during an
+        outage is refilled in one fetch. A gap longer than the ring drops
+        it and starts over from the full window.
+        """
+        ring = self.rings.get(symbol)
+        if ring is None or not len(ring):
+            return None, self.capacity
+        since = ring.last_timestamp
+        needed = math.ceil((self.clock() * 1000 - since) / timeframe_ms(timeframe)) + 1
+        if needed > self.capacity:
+            del self.rings[symbol]
+            return None, self.capacity
+        return since, max(self.catchup_limit, needed)
+
+    def update(self, symbol: str, rows: Iterable[Sequence[float]]) -> CandleRing:
+        ring = self.ring(symbol)
+        ring.update(rows)
+        return ring
@@ -5,11 +5,17 @@ import logging
 from datetime import datetime
 from typing import Dict, List, Optional
 from dataclasses import dataclass
-from collections import deque
 
 try: import websockets
 except ImportError: websockets = None
 
+try:
+    from .ticks import InstrumentRegistry, OKXTradeDecoder, TickRing, okx_inst_id
+    from ..orderflow.tick_engine import TickEngine
+except ImportError:
+    from ultimate_pack.feeds.ticks import InstrumentRegistry, OKXTradeDecoder, TickRing, okx_inst_id
+    from ultimate_pack.orderflow.tick_engine import TickEngine
+
 logging.basicConfig(level=logging.WARNING)
 logger = logging.getLogger("DATA_FEEDS")
 
@@ -40,29 +46,67 @@ class FearGreedData:
 
 class OKXTickFeed:
     WS_URL = "wss://ws.okx.com:8443/ws/v5/public"
-    def __init__(self, symbols=None):
-        self.symbols = symbols or ["BTC-USDT-SWAP"]
+    INSTRUMENTS_URL = "https://www.okx.com/api/v5/public/instruments"
+    def __init__(self, symbols=None, capacity=100_000):
+        self.symbols = [okx_inst_id(s) for s in (symbols or ["BTC-USDT-SWAP"])]
         self.callbacks = []
-        self.tick_buffer = deque(maxlen=10000)
+        self.instruments = InstrumentRegistry(self.symbols)
+        self.decoder = OKXTradeDecoder(self.instruments)
+        self.tick_buffer = TickRing(capacity)
         self.running = False
+    def subscribe_message(self):
+        # every instrument in one subscribe on one connection
+        return json.dumps({"op": "subscribe", "args": [{"channel": "trades", "instId": s} for s in self.symbols]})
+    def on_message(self, raw):
+        ticks = self.decoder.decode(raw)
+        if ticks is None: return 0
+        self.tick_buffer.append(ticks)
+        if self.callbacks:
+            inst = self.instruments.name(int(ticks["inst"][0]))
+            for cb in self.callbacks:
+                try: cb(inst, ticks["price"], ticks["size"], ticks["side"], ticks["ts_ns"])
+                except Exception as e: logger.warning(f"Tick callback failed: {e}")
+        return len(ticks)
     async def start(self):
         if not websockets: return
         self.running = True
         while self.running:
             try:
                 async with websockets.connect(self.WS_URL) as ws:
-                    for sym in self.symbols:
-                        await ws.send(json.dumps({"op": "subscribe", "args": [{"channel": "trades", "instId": sym}]}))
+                    await ws.send(self.subscribe_message())
                     async for msg in ws:
                         if not self.running: break
-                        d = json.loads(msg)
-                        if "data" in d and d.get("arg",{}).get("channel")=="trades":
-                            for t in d["data"]:
-                                tick = TickData(datetime.now(), t["instId"], float(t["px"]), float(t["sz"]), t["side"])
-                                self.tick_buffer.append(tick)
+                        self.on_message(msg)
             except: await asyncio.sleep(5)
     def stop(self): self.running = False
-    def get_recent_ticks(self, count=100): return list(self.tick_buffer)[-count:]
+    async def fetch_contract_values(self):
+        """
+        {instId: base units per contract} for the subscribed derivatives.
+        Trade ``sz`` on SWAP/FUTURES is a contract count (BTC-USDT-SWAP:
+        0.01 BTC each). Inverse contracts (ctVal quoted in USD) are skipped.
+        """
+        values = {}
+        for inst_type in sorted({s.rsplit("-", 1)[-1] for s in self.symbols} & {"SWAP", "FUTURES"}):
+            try:
+                async with aiohttp.ClientSession() as s:
+                    async with s.get(self.INSTRUMENTS_URL, params={"instType": inst_type}) as r:
+                        d = await r.json()
+                for e in d.get("data", []):
+                    if e["instId"] in self.symbols and e.get("ctValCcy") == e["instId"].split("-")[0]:
+                        values[e["instId"]] = float(e["ctVal"])
+            except Exception as e:
+                logger.warning(f"Contract values for {inst_type} unavailable: {e}")
+        return values
+    def get_recent_ticks(self, count=100):
+        """
+        Last ``count`` trades as a read-only TICK_DTYPE structured array
+        (fields ts_ns, price, size, side, inst) viewing the ring, no copy.
+
+        This used to be a list of TickData. Callers now index fields
+        (``ticks["price"]``), map ``inst`` with ``self.instruments.name()``,
+        and copy the result if they keep it past the next append.
+        """
+        return self.tick_buffer.recent(count)
 
 class LongShortRatioFeed:
     URL = "https://fapi.binance.com/futures/data/globalLongShortAccountRatio"
@@ -111,16 +155,29 @@ class MultiExchangePriceFeed:
 
 # THE CRITICAL DATAHUB CLASS
 class DataHub:
-    def __init__(self):
-        self.tick_feed = OKXTickFeed()
+    def __init__(self, symbols=None):
+        # one trades subscription per traded instrument (default: BTC swap)
+        self.tick_feed = OKXTickFeed(symbols)
+        self.order_flow = TickEngine()
+        self.tick_feed.callbacks.append(self.order_flow.on_trades)
         self.ls_ratio_feed = LongShortRatioFeed()
         self.fear_greed_feed = FearGreedFeed()
         self.liq_heatmap = LiquidationHeatmapFeed()
         self.multi_price = MultiExchangePriceFeed()
         self._running = False
 
+    async def load_contract_values(self):
+        """Scale VPIN trade sizes from contracts to base units before ticks flow."""
+        values = await self.tick_feed.fetch_contract_values()
+        self.order_flow.contract_values.update(values)
+        missing = [s for s in self.tick_feed.symbols if s.endswith(("-SWAP", "-FUTURES")) and s not in values]
+        if missing:
+            logger.warning(f"No contract value for {missing}; VPIN buckets count contracts")
+        return values
+
     async def start_all_feeds(self):
         self._running = True
+        await self.load_contract_values()
         asyncio.create_task(self.tick_feed.start())
         asyncio.create_task(self._periodic_fetcher())
         logger.info("DataHub Started")
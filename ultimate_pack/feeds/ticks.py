@@ -0,0 +1,185 @@
+"""
+Compact trade representation shared by the tick feed and order-flow engine.
+
+A tick is one row of TICK_DTYPE; instruments are small integer ids
+resolved through an InstrumentRegistry. Recorded tick files are .npz
+archives holding the tick array and the instrument names.
+
+TickRing stores ticks in a mirrored structured array so the latest N are
+always one contiguous view; OKXTradeDecoder turns a raw websocket trades
+message straight into a TICK_DTYPE batch.
+
+Benchmark the decode path on a captured message file (one raw message
+per line):
+    python -m ultimate_pack.feeds.ticks messages.jsonl
+"""
+
+import argparse
+import json
+import time
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+try:
+    import orjson
+    _loads = orjson.loads          # accepts bytes without a str round trip
+except ImportError:
+    orjson = None
+    _loads = json.loads
+
+BUY = 1
+SELL = -1
+
+TICK_DTYPE = np.dtype([
+    ("ts_ns", "<i8"),     # exchange trade time, ns since epoch
+    ("price", "<f8"),
+    ("size", "<f8"),
+    ("side", "i1"),       # BUY / SELL
+    ("inst", "<u2"),      # InstrumentRegistry id
+])
+
+
+def okx_inst_id(symbol: str) -> str:
+    """'BTC/USDT:USDT' -> 'BTC-USDT-SWAP'; OKX ids pass through unchanged."""
+    if "/" not in symbol:
+        return symbol
+    base, quote = symbol.split(":")[0].split("/")
+    return f"{base}-{quote}-SWAP" if ":" in symbol else f"{base}-{quote}"
+
+
+class InstrumentRegistry:
+    """Bidirectional instrument name <-> small integer id."""
+
+    def __init__(self, names: Sequence[str] = ()):
+        self.names: List[str] = []
+        self._ids: Dict[str, int] = {}
+        for name in names:
+            self.id(name)
+
+    def id(self, name: str) -> int:
+        inst = self._ids.get(name)
+        if inst is None:
+            inst = len(self.names)
+            self._ids[name] = inst
+            self.names.append(name)
+        return inst
+
+    def name(self, inst: int) -> str:
+        return self.names[inst]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+def save_ticks(path: str, ticks: np.ndarray, instruments: Sequence[str]) -> None:
+    np.savez(path, ticks=np.asarray(ticks, dtype=TICK_DTYPE), instruments=np.array(instruments))
+
+
+def load_ticks(path: str) -> Tuple[np.ndarray, List[str]]:
+    with np.load(path) as archive:
+        return archive["ticks"], [str(n) for n in archive["instruments"]]
+
+
+class TickRing:
+    """
+    Fixed-capacity tick buffer. Every tick is written twice (at i and
+    i + capacity), so any window of the latest ticks is a contiguous slice
+    and recent() can return a view instead of a copy.
+    """
+
+    def __init__(self, capacity: int = 100_000):
+        self.capacity = capacity
+        self._buf = np.zeros(2 * capacity, dtype=TICK_DTYPE)
+        self._head = 0            # next write slot in [0, capacity)
+        self.total = 0            # ticks ever appended
+
+    def __len__(self) -> int:
+        return min(self.total, self.capacity)
+
+    def append(self, ticks: np.ndarray) -> None:
+        """Batch append (oldest ticks drop out once full)."""
+        n = len(ticks)
+        self.total += n
+        if n > self.capacity:
+            ticks, n = ticks[-self.capacity:], self.capacity
+        cap, pos = self.capacity, self._head
+        first = min(n, cap - pos)
+        self._buf[pos:pos + first] = ticks[:first]
+        self._buf[pos + cap:pos + cap + first] = ticks[:first]
+        rest = n - first
+        if rest:
+            self._buf[:rest] = ticks[first:]
+            self._buf[cap:cap + rest] = ticks[first:]
+        self._head = (pos + n) % cap
+
+    def recent(self, count: Optional[int] = None) -> np.ndarray:
+        """
+        Read-only view of the latest ``count`` ticks, oldest first. The view
+        aliases the buffer: copy it if it must outlive later appends.
+        """
+        count = len(self) if count is None else min(count, len(self))
+        end = self._head + self.capacity
+        view = self._buf[end - count:end]
+        view.flags.writeable = False
+        return view
+
+
+class OKXTradeDecoder:
+    """Raw OKX ``trades`` channel message -> TICK_DTYPE batch."""
+
+    def __init__(self, instruments: Optional[InstrumentRegistry] = None):
+        self.instruments = instruments or InstrumentRegistry()
+
+    def decode(self, raw: Union[bytes, str]) -> Optional[np.ndarray]:
+        """Ticks of a trades message; None for acks, pongs and other channels."""
+        msg = _loads(raw)
+        data = msg.get("data") if isinstance(msg, dict) else None
+        if not data or msg.get("arg", {}).get("channel") != "trades":
+            return None
+        inst = self.instruments.id(msg["arg"].get("instId") or data[0]["instId"])
+        # One array build from row tuples beats filling columns for the
+        # typical 1-10 trade message.
+        return np.array(
+            [(int(t["ts"]) * 1_000_000, float(t["px"]), float(t["sz"]),
+              BUY if t["side"] == "buy" else SELL, inst) for t in data],
+            dtype=TICK_DTYPE,
+        )
+
+
+def benchmark(path: str, capacity: int = 100_000) -> Dict:
+    """Decode + ring-append every message of a captured file as fast as possible."""
+    with open(path, "rb") as f:
+        messages = [line.rstrip(b"\n") for line in f if line.strip()]
+
+    decoder = OKXTradeDecoder()
+    ring = TickRing(capacity)
+    start = time.perf_counter()
+    for raw in messages:
+        ticks = decoder.decode(raw)
+        if ticks is not None:
+            ring.append(ticks)
+    elapsed = time.perf_counter() - start
+
+    wire = sum(len(m) for m in messages)
+    return {
+        "messages": len(messages),
+        "ticks": ring.total,
+        "seconds": elapsed,
+        "messages_per_sec": len(messages) / elapsed if elapsed > 0 else float("inf"),
+        "ticks_per_sec": ring.total / elapsed if elapsed > 0 else float("inf"),
+        "wire_bytes_per_tick": wire / ring.total if ring.total else 0.0,
+        "stored_bytes_per_tick": TICK_DTYPE.itemsize,
+        "json": "orjson" if orjson else "json",
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay captured OKX trades messages through the tick decoder")
+    parser.add_argument("path")
+    args = parser.parse_args()
+
+    stats = benchmark(args.path)
+    print(f"{stats['messages']:,} messages / {stats['ticks']:,} ticks in {stats['seconds']:.3f}s ({stats['json']})")
+    print(f"  {stats['messages_per_sec']:,.0f} msg/s, {stats['ticks_per_sec']:,.0f} ticks/s")
+    print(f"  {stats['wire_bytes_per_tick']:.0f} wire bytes/tick -> {stats['stored_bytes_per_tick']} stored bytes/tick")
@@ -2,7 +2,6 @@ import numpy as np
 import pandas as pd
 from dataclasses import dataclass
 from datetime import datetime
-from collections import deque
 import logging
 
 logger = logging.getLogger("VPIN")
@@ -17,68 +16,191 @@ class VPINSignal:
     confidence: float
     alert: bool
     recommended_action: str
+    order_imbalance: float = 0.0
+
+class BucketAccumulator:
+    """
+    Volume buckets of one instrument in fixed arrays with rolling sums,
+    so each completed bucket costs O(1) instead of re-summing the window.
+
+    Keeps the last 2*window buckets (buy/sell notional): VPIN uses the last
+    `window`, direction and imbalance use all of them. Sums are rebuilt
+    exactly every time the ring wraps to stop float drift.
+    """
+    def __init__(self, bucket_volume, window=50, history=500):
+        self.bucket_vol = float(bucket_volume)
+        self.window = window
+        self.size = 2 * window
+        self.buy = np.zeros(self.size)
+        self.sell = np.zeros(self.size)
+        self.count = 0
+        self.sum_imbalance = 0.0
+        self.sum_buy = 0.0
+        self.sum_sell = 0.0
+        self.current_buy = 0.0
+        self.current_sell = 0.0
+
+        self.history = np.zeros(history)
+        self.history_len = 0
+        self._hist_sum = 0.0
+        self._hist_sq = 0.0
+
+    def add_bucket(self, buy, sell):
+        """Append a completed bucket; returns VPIN once `window` buckets exist."""
+        i = self.count % self.size
+        if self.count >= self.size:
+            self.sum_buy -= self.buy[i]
+            self.sum_sell -= self.sell[i]
+        if self.count >= self.window:
+            j = (self.count - self.window) % self.size
+            self.sum_imbalance -= abs(self.buy[j] - self.sell[j])
+        self.buy[i] = buy
+        self.sell[i] = sell
+        self.sum_buy += buy
+        self.sum_sell += sell
+        self.sum_imbalance += abs(buy - sell)
+        self.count += 1
+        if self.count % self.size == 0:
+            self._resum()
+
+        if self.count < self.window:
+            return None
+        vpin = self.sum_imbalance / (self.window * self.bucket_vol)
+        self._push_history(vpin)
+        return vpin
+
+    def _resum(self):
+        n = min(self.count, self.size)
+        self.sum_buy = float(self.buy[:n].sum())
+        self.sum_sell = float(self.sell[:n].sum())
+        last = (np.arange(self.count - min(self.count, self.window), self.count)) % self.size
+        self.sum_imbalance = float(np.abs(self.buy[last] - self.sell[last]).sum())
+
+    def _push_history(self, vpin):
+        cap = len(self.history)
+        i = self.history_len % cap
+        if self.history_len >= cap:
+            old = self.history[i]
+            self._hist_sum -= old
+            self._hist_sq -= old * old
+        self.history[i] = vpin
+        self._hist_sum += vpin
+        self._hist_sq += vpin * vpin
+        self.history_len += 1
+        if self.history_len % cap == 0:
+            self._hist_sum = float(self.history.sum())
+            self._hist_sq = float((self.history ** 2).sum())
+
+    def zscore(self, vpin):
+        n = min(self.history_len, len(self.history))
+        if n <= 30:
+            return 0
+        mean = self._hist_sum / n
+        std = np.sqrt(max(self._hist_sq / n - mean * mean, 0.0))
+        return (vpin - mean) / (std + 1e-6)
+
+    def imbalance(self):
+        total = self.sum_buy + self.sum_sell
+        return (self.sum_buy - self.sum_sell) / total if total > 0 else 0.0
+
+    def add_ticks(self, buy_vol, sell_vol, on_bucket):
+        """
+        Feed a batch of per-tick buy/sell notional (one of them 0 per tick).
+        A tick goes whole into the open bucket, which closes on the first
+        tick taking it to bucket_vol (same rule as a tick-by-tick loop).
+        on_bucket(tick_index, vpin or None) runs as each bucket closes,
+        while the rolling sums reflect exactly the buckets so far.
+        """
+        if len(buy_vol) == 0:
+            return
+        cum_buy = np.cumsum(buy_vol)
+        cum_sell = np.cumsum(sell_vol)
+        cum = cum_buy + cum_sell
+        base_buy = base_sell = 0.0
+        carry_buy, carry_sell = self.current_buy, self.current_sell
+        while True:
+            target = base_buy + base_sell + self.bucket_vol - (carry_buy + carry_sell)
+            i = int(np.searchsorted(cum, target, side="left"))
+            if i >= len(cum):
+                break
+            buy = carry_buy + cum_buy[i] - base_buy
+            sell = carry_sell + cum_sell[i] - base_sell
+            on_bucket(i, self.add_bucket(buy, sell))
+            base_buy, base_sell = cum_buy[i], cum_sell[i]
+            carry_buy = carry_sell = 0.0
+        self.current_buy = carry_buy + cum_buy[-1] - base_buy
+        self.current_sell = carry_sell + cum_sell[-1] - base_sell
 
 class VPINAnalyzer:
     def __init__(self, bucket_volume_usd=500000, window_size=50):
         self.bucket_vol = bucket_volume_usd
         self.window = window_size
-        self.current_buy = 0.0
-        self.current_sell = 0.0
-        self.buckets = deque(maxlen=window_size*2)
-        self.vpin_history = deque(maxlen=500)
+        self.acc = BucketAccumulator(bucket_volume_usd, window_size)
         self.last_signal = None
         self.callbacks = []
 
+    @property
+    def current_buy(self): return self.acc.current_buy
+
+    @property
+    def current_sell(self): return self.acc.current_sell
+
     def register_callback(self, cb):
         self.callbacks.append(cb)
 
-    def process_tick(self, price, amount, side):
+    def process_tick(self, price, amount, side, timestamp=None):
         vol = price * amount
-        if side == 'buy': self.current_buy += vol
-        else: self.current_sell += vol
-        
-        if (self.current_buy + self.current_sell) >= self.bucket_vol:
-            return self._complete_bucket()
+        if side == 'buy': self.acc.current_buy += vol
+        else: self.acc.current_sell += vol
+
+        if (self.acc.current_buy + self.acc.current_sell) >= self.bucket_vol:
+            return self._complete_bucket(timestamp)
         return None
 
-    def _complete_bucket(self):
-        self.buckets.append({'buy': self.current_buy, 'sell': self.current_sell})
-        self.current_buy = 0
-        self.current_sell = 0
-        
-        if len(self.buckets) >= self.window:
-            return self._calc_vpin()
+    def process_batch(self, prices, amounts, sides, timestamps_ns=None):
+        """
+        Vectorised process_tick over arrays (sides: +1 buy / -1 sell).
+        Returns the signals of all buckets completed by the batch.
+        """
+        vol = np.asarray(prices, dtype=float) * np.asarray(amounts, dtype=float)
+        is_buy = np.asarray(sides) > 0
+        signals = []
+
+        def on_bucket(i, vpin):
+            if vpin is not None:
+                ts = None if timestamps_ns is None else datetime.fromtimestamp(timestamps_ns[i] / 1e9)
+                signals.append(self._calc_vpin(vpin, ts))
+
+        self.acc.add_ticks(np.where(is_buy, vol, 0.0), np.where(is_buy, 0.0, vol), on_bucket)
+        return signals
+
+    def _complete_bucket(self, timestamp=None):
+        vpin = self.acc.add_bucket(self.acc.current_buy, self.acc.current_sell)
+        self.acc.current_buy = 0.0
+        self.acc.current_sell = 0.0
+
+        if vpin is not None:
+            return self._calc_vpin(vpin, timestamp)
         return None
 
-    def _calc_vpin(self):
-        recent = list(self.buckets)[-self.window:]
-        total_imbalance = sum(abs(b['buy'] - b['sell']) for b in recent)
-        total_vol = len(recent) * self.bucket_vol
-        
-        vpin = total_imbalance / total_vol if total_vol > 0 else 0
-        self.vpin_history.append(vpin)
-        
-        zscore = 0
-        if len(self.vpin_history) > 30:
-            arr = np.array(self.vpin_history)
-            zscore = (vpin - arr.mean()) / (arr.std() + 1e-6)
-            
+    def _calc_vpin(self, vpin, timestamp=None):
+        zscore = self.acc.zscore(vpin)
+
         toxicity = "LOW"
         if vpin > 0.5: toxicity = "EXTREME"
         elif vpin > 0.3: toxicity = "HIGH"
         elif vpin > 0.2: toxicity = "MEDIUM"
-        
-        recent_buy = sum(b['buy'] for b in self.buckets)
-        recent_sell = sum(b['sell'] for b in self.buckets)
-        direction = "BUYING" if recent_buy > recent_sell else "SELLING"
-        
+
+        direction = "BUYING" if self.acc.sum_buy > self.acc.sum_sell else "SELLING"
+
         alert = (toxicity in ["HIGH", "EXTREME"])
         action = "FOLLOW_SMART_MONEY" if alert else "NORMAL"
-        
-        sig = VPINSignal(datetime.now(), vpin, zscore, toxicity, direction, abs(zscore)/3, alert, action)
+
+        sig = VPINSignal(timestamp or datetime.now(), vpin, zscore, toxicity, direction, abs(zscore)/3, alert, action,
+                         self.acc.imbalance())
         self.last_signal = sig
-        
+
         if alert:
             for cb in self.callbacks: cb(sig)
-            
+
         return sig
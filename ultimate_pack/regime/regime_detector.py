@@ -5,6 +5,11 @@ from dataclasses import dataclass
 from typing import Dict
 from datetime import datetime, timedelta
 
+try:
+    from ..feeds.candle_store import CandleRing
+except ImportError:
+    from ultimate_pack.feeds.candle_store import CandleRing
+
 class RegimeType(Enum):
     TRENDING_UP = "TRENDING_UP"
     TRENDING_DOWN = "TRENDING_DOWN"
@@ -35,7 +40,10 @@ class RegimeDetector:
         # Anti-Whipsaw Config
         self.COOLDOWN_SEC = 600 # 5 min
         
-    def analyze(self, ohlcv_df: pd.DataFrame) -> RegimeSignal:
+    def analyze(self, ohlcv_df) -> RegimeSignal:
+        """Classify the latest bar of a DataFrame or a CandleRing."""
+        if isinstance(ohlcv_df, CandleRing):
+            return self.analyze_ring(ohlcv_df)
         if ohlcv_df.empty or len(ohlcv_df) < 20:
             return self._default_signal()
             
@@ -70,6 +78,21 @@ class RegimeDetector:
             atr = float(curr['atr']) if not pd.isna(curr['atr']) else 0.0
         except: return self._default_signal()
 
+        return self._classify(close, vol, mean_vol, rsi, sma)
+
+    def analyze_ring(self, ring: CandleRing) -> RegimeSignal:
+        """Same as analyze(), reading the ring's incrementally kept indicators."""
+        if len(ring) < 20:
+            return self._default_signal()
+        ind = ring.latest()
+        close = ind['close']
+        vol = ind['volatility'] if not np.isnan(ind['volatility']) else 0.0
+        mean_vol = ind['mean_volatility'] if not np.isnan(ind['mean_volatility']) else 0.0
+        rsi = ind['rsi'] if not np.isnan(ind['rsi']) else 50.0
+        sma = ind['sma_50'] if not np.isnan(ind['sma_50']) else close
+        return self._classify(close, vol, mean_vol, rsi, sma)
+
+    def _classify(self, close: float, vol: float, mean_vol: float, rsi: float, sma: float) -> RegimeSignal:
         # Classification Logic
         regime = RegimeType.RANGING
         strategy = "mean_revert"
@@ -10,6 +10,8 @@ try:
     from .smartmoney.divergence_detector import SmartMoneyDivergence
     from .sizing.adaptive_kelly import AdaptiveKelly
     from .feeds.data_feeds import DataHub
+    from .feeds.candle_store import CandleRing
+    from .feeds.ticks import okx_inst_id
     from .integration.ultimate_aggregator import UltimateDecision
 except ImportError:
     from ultimate_pack.regime.regime_detector import RegimeDetector
@@ -17,28 +19,42 @@ except ImportError:
     from ultimate_pack.smartmoney.divergence_detector import SmartMoneyDivergence
     from ultimate_pack.sizing.adaptive_kelly import AdaptiveKelly
     from ultimate_pack.feeds.data_feeds import DataHub
+    from ultimate_pack.feeds.candle_store import CandleRing
+    from ultimate_pack.feeds.ticks import okx_inst_id
     from ultimate_pack.integration.ultimate_aggregator import UltimateDecision
 
 class UltimateConnector:
-    def __init__(self):
+    def __init__(self, symbols=None):
         self.regime = RegimeDetector()
         self.vpin = VPINAnalyzer()
         self.smart = SmartMoneyDivergence()
         self.kelly = AdaptiveKelly()
-        self.data_hub = DataHub()
+        self.data_hub = DataHub(symbols)
+        self.vpin_signals = {}      # instrument -> last VPINSignal from the order-flow stream
+        self._vpin_task = None
         self.initialized = False
         
     async def initialize(self):
         await self.data_hub.start_all_feeds()
+        queue = self.data_hub.order_flow.subscribe()
+        self._vpin_task = asyncio.create_task(self._consume_vpin(queue))
         self.initialized = True
+    
+    async def _consume_vpin(self, queue):
+        # Signals are pushed as buckets close; keep the newest per instrument
+        while True:
+            instrument, sig = await queue.get()
+            self.vpin_signals[instrument] = sig
         
     async def get_signal(self, symbol, capital, market_data) -> UltimateDecision:
+        # CandleRing: indicators are already kept incrementally, no frame needed
         df = pd.DataFrame()
-        if isinstance(market_data, pd.DataFrame): df = market_data
+        if isinstance(market_data, CandleRing): df = market_data
+        elif isinstance(market_data, pd.DataFrame): df = market_data
         elif isinstance(market_data, list) and len(market_data) > 0:
             df = pd.DataFrame(market_data, columns=['timestamp','open','high','low','close','vol'])
             
-        if df.empty:
+        if len(df) == 0:
             return UltimateDecision(
                 datetime.now(), symbol, "HOLD", 0.0, 0.0, "NO_DATA", "Waiting for data",
                 0, 0, 1, 0, {}, {}
@@ -78,8 +94,19 @@ class UltimateConnector:
         if fg_data: reason += f" | F&G:{fg_data.value}"
         if ls_data: reason += f" | L/S:{ls_data.long_short_ratio:.2f}"
         
+        # Latest VPIN received from the order-flow stream for this instrument
+        signals = {}
+        vpin_sig = self.vpin_signals.get(okx_inst_id(symbol))
+        if vpin_sig:
+            signals["vpin"] = {
+                "value": vpin_sig.vpin_value, "zscore": vpin_sig.vpin_zscore,
+                "toxicity": vpin_sig.toxicity_level, "direction": vpin_sig.informed_direction,
+                "imbalance": vpin_sig.order_imbalance,
+            }
+            reason += f" | VPIN:{vpin_sig.vpin_value:.2f}"
+        
         return UltimateDecision(
             datetime.now(), symbol, action, conviction, k_res.position_size_usd,
             regime_sig.regime.value, reason,
-            0, 0, 1, 0, {}, {}
+            0, 0, 1, 0, signals, {}
         )